@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts', '0003_user_schedule_preferences'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='user',
+            name='calendar_feed_token',
+            field=models.CharField(blank=True, db_index=True, help_text='Private token used in the calendar subscription URL', max_length=64),
+        ),
+    ]
@@ -3,6 +3,8 @@ Custom user model and authentication-related models for the accounts app.
 Extends Django's built-in User model with homeowner-specific fields.
 """
 
+import secrets
+
 from django.contrib.auth.models import AbstractUser
 from django.db import models
 from django.core.validators import RegexValidator
@@ -66,6 +68,14 @@ class User(AbstractUser):
         help_text='Schedule customization: preferred_frequency, reminder_days_before, auto_reschedule'
     )
     
+    # Secret token for the read-only iCalendar subscription feed
+    calendar_feed_token = models.CharField(
+        max_length=64,
+        blank=True,
+        db_index=True,
+        help_text='Private token used in the calendar subscription URL'
+    )
+    
     # Timestamps
     profile_updated_at = models.DateTimeField(auto_now=True)
     
@@ -79,6 +89,16 @@ class User(AbstractUser):
     def get_primary_home(self):
         """Get the user's primary (first) home."""
         return self.homes.first()
+    
+    def get_calendar_feed_token(self, regenerate=False):
+        """
+        Return the calendar feed token, creating one on first use.
+        Pass regenerate=True to invalidate previously shared feed URLs.
+        """
+        if regenerate or not self.calendar_feed_token:
+            self.calendar_feed_token = secrets.token_urlsafe(32)
+            User.objects.filter(pk=self.pk).update(calendar_feed_token=self.calendar_feed_token)
+        return self.calendar_feed_token
 
 
 class UserProfile(models.Model):
@@ -6,3 +6,7 @@ pip install -r requirements.txt
 
 python manage.py collectstatic --no-input
 python manage.py migrate
+python manage.py createcachetable
+python manage.py rebuild_calendar_summaries
+python manage.py rebuild_agenda
+python manage.py rebuild_maintenance_stats
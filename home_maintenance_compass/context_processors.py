@@ -2,6 +2,10 @@
 Context processors for the project.
 """
 
+from django.utils.functional import SimpleLazyObject
+
+from maintenance.overdue import overdue_count
+
 
 def expert_status(request):
     """
@@ -20,3 +24,13 @@ def expert_status(request):
         context['is_pending_expert'] = False
     
     return context
+
+
+def overdue_tasks(request):
+    """
+    Add the user's overdue task count for the nav bar.
+    Lazy, so pages that don't show it never query it.
+    """
+    if not request.user.is_authenticated:
+        return {'overdue_count': 0}
+    return {'overdue_count': SimpleLazyObject(lambda: overdue_count(request.user))}
@@ -0,0 +1,45 @@
+"""
+View mixins shared across apps.
+"""
+
+from django.db.models import Q
+from django.views.generic.detail import SingleObjectMixin
+
+
+class OwnerScopedObjectMixin(SingleObjectMixin):
+    """
+    Resolve the view's object once per request, restricted to the current
+    user in the same query.
+    
+    owner_field is the lookup from the model to the owning user ('owner',
+    'home__owner', 'author'); owner_select_related lists relations the view
+    uses and are joined into that query. Objects the user doesn't own are
+    not found, so there is no separate permission check and a 404 leaks
+    nothing about other users' objects. The object is cached on the view,
+    so get_object() can be called from dispatch(), handlers and templates
+    without another lookup.
+    
+    Works with the generic single-object views and with plain View
+    subclasses that set model.
+    """
+    owner_field = 'owner'
+    owner_select_related = ()
+    
+    def get_owner_filter(self):
+        """
+        Q restricting the queryset to objects the user may act on.
+        """
+        return Q(**{self.owner_field: self.request.user})
+    
+    def get_queryset(self):
+        queryset = super().get_queryset().filter(self.get_owner_filter())
+        if self.owner_select_related:
+            queryset = queryset.select_related(*self.owner_select_related)
+        return queryset
+    
+    def get_object(self, queryset=None):
+        if queryset is not None:
+            return super().get_object(queryset)
+        if not hasattr(self, '_owned_object'):
+            self._owned_object = super().get_object()
+        return self._owned_object
@@ -13,6 +13,7 @@ https://docs.djangoproject.com/en/5.2/ref/settings/
 from pathlib import Path
 import os
 import dj_database_url
+from django.core.exceptions import ImproperlyConfigured
 from decouple import config, Csv
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -74,6 +75,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'home_maintenance_compass.context_processors.expert_status',
+                'home_maintenance_compass.context_processors.overdue_tasks',
             ],
         },
     },
@@ -99,6 +101,47 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/5.2/topics/cache/
+
+# Calendar fragment versions and cached overdue counts are only correct if
+# every worker sees the same cache, so production sets CACHE_URL to either
+#   db://<table>         the database cache (build.sh runs createcachetable)
+#   redis://host:port/0  Redis (needs the redis package)
+# Without CACHE_URL each process keeps its own in-memory cache, which is
+# fine for a single development server.
+CACHE_URL = config('CACHE_URL', default='')
+CACHE_OPTIONS = {
+    # Version keys must not be culled to make room for fragments
+    'MAX_ENTRIES': config('CACHE_MAX_ENTRIES', default=100000, cast=int),
+}
+
+if CACHE_URL.startswith('db://'):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.db.DatabaseCache',
+            'LOCATION': CACHE_URL[len('db://'):] or 'django_cache',
+            'OPTIONS': CACHE_OPTIONS,
+        }
+    }
+elif CACHE_URL.startswith(('redis://', 'rediss://')):
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_URL,
+        }
+    }
+elif CACHE_URL:
+    raise ImproperlyConfigured(f'Unsupported CACHE_URL scheme: {CACHE_URL}')
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'OPTIONS': CACHE_OPTIONS,
+        }
+    }
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -182,6 +225,12 @@ else:
 DEFAULT_FROM_EMAIL = config('DEFAULT_FROM_EMAIL', default='noreply@homemaintenance.com')
 SERVER_EMAIL = config('SERVER_EMAIL', default='noreply@homemaintenance.com')
 
+# Public base URL used for links in emails sent outside a request (e.g. send_reminders)
+SITE_URL = config('SITE_URL', default='http://localhost:8000')
+
+# Completed schedules older than this many days are moved to the archive by archive_schedules
+SCHEDULE_ARCHIVE_DAYS = config('SCHEDULE_ARCHIVE_DAYS', default=365, cast=int)
+
 # Security settings for production
 if not DEBUG:
     SECURE_SSL_REDIRECT = True
@@ -0,0 +1,14 @@
+"""
+Test helpers shared across apps.
+"""
+
+from django.test import override_settings
+
+# Per-test cache so cached counts don't skip queries, and no collectstatic manifest
+test_settings = override_settings(
+    CACHES={'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}},
+    STORAGES={
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'django.contrib.staticfiles.storage.StaticFilesStorage'},
+    },
+)
@@ -4,6 +4,8 @@ Views for the main project pages.
 
 from django.views.generic import TemplateView
 
+from maintenance.agenda import dashboard
+
 
 class HomeView(TemplateView):
     """
@@ -21,5 +23,6 @@ class HomeView(TemplateView):
                 context['has_expert_profile'] and 
                 not self.request.user.is_verified_expert
             )
+            context['agenda'] = dashboard(owner=self.request.user)
         
         return context
@@ -3,7 +3,7 @@ Admin configuration for the homes app.
 """
 
 from django.contrib import admin
-from .models import Home, Appliance, ServiceProvider
+from .models import Home, Appliance, OnboardingDraft, ServiceProvider
 
 
 class ApplianceInline(admin.TabularInline):
@@ -75,3 +75,13 @@ class ServiceProviderAdmin(admin.ModelAdmin):
     search_fields = ['company_name', 'contact_name', 'home__name']
     list_editable = ['is_verified']
 
+
+
+@admin.register(OnboardingDraft)
+class OnboardingDraftAdmin(admin.ModelAdmin):
+    """
+    Admin interface for unfinished onboarding wizards.
+    """
+    list_display = ['owner', 'completed_step', 'updated_at']
+    search_fields = ['owner__username', 'owner__email']
+    readonly_fields = ['owner', 'answers', 'appliances', 'completed_step', 'created_at', 'updated_at']
@@ -0,0 +1,57 @@
+"""
+Normalized manufacturer and model number keys for appliances.
+
+Owners type the same appliance many ways ("GE Appliances", "General
+Electric Co."; "WH-40 B/2", "Model # wh40b2"), so recalls are matched on
+keys rather than on the entered text:
+  - manufacturer_key: lowercase letters and digits only, with corporate
+    suffixes ("Inc", "Corp.", "Appliances", ...) dropped and a few common
+    aliases folded together,
+  - model_key: uppercase letters and digits only, without a leading
+    "Model #" or "Mod. No." label.
+
+Appliance stores both keys (see Appliance.set_match_keys()), indexed
+together, and recall rules are normalized the same way.
+"""
+
+import re
+
+WORD_RE = re.compile(r'[a-z0-9]+')
+NON_ALNUM_RE = re.compile(r'[^A-Z0-9]')
+MODEL_LABEL_RE = re.compile(r'^\s*(?:model|mod)\b\.?\s*(?:(?:no|number)\b\.?)?\s*[#:]?\s*', re.IGNORECASE)
+
+# Words dropped from either end of a manufacturer name
+CORPORATE_WORDS = frozenset(
+    'the inc incorporated corp corporation co company llc ltd limited lp plc gmbh ag sa '
+    'mfg manufacturing industries group holdings international intl usa us na '
+    'appliance appliances'.split()
+)
+
+# Normalized names that mean the same manufacturer
+MANUFACTURER_ALIASES = {
+    'generalelectric': 'ge',
+    'lgelectronics': 'lg',
+    'samsungelectronics': 'samsung',
+    'boschhome': 'bosch',
+    'electroluxhome': 'electrolux',
+}
+
+
+def manufacturer_key(name):
+    """
+    'General Electric Co.' -> 'ge'; 'A.O. Smith' -> 'aosmith'.
+    """
+    words = WORD_RE.findall((name or '').lower().replace('&', ' and '))
+    while words and words[-1] in CORPORATE_WORDS:
+        words.pop()
+    while words and words[0] in CORPORATE_WORDS:
+        words.pop(0)
+    key = ''.join(words)
+    return MANUFACTURER_ALIASES.get(key, key)
+
+
+def model_key(model_number):
+    """
+    'Model # wh-40 b/2' -> 'WH40B2'.
+    """
+    return NON_ALNUM_RE.sub('', MODEL_LABEL_RE.sub('', model_number or '').upper())
@@ -0,0 +1,103 @@
+"""
+Offline ZIP code to climate zone lookup.
+
+data/zip_climate.csv maps ranges of 5-digit US ZIP codes (start, end,
+zone, hemisphere) to one of Home.CLIMATE_ZONES. The ranges come from the
+3-digit ZIP prefixes of each state and territory, with South Florida,
+Hawaii, Guam and the Caribbean territories marked tropical and Alaska
+polar; military (APO/FPO) prefixes have no climate and are left out.
+
+The file is read once, on the first lookup, into two sorted arrays of
+range bounds and a parallel array of indexes into a small table of
+(zone, hemisphere) pairs. A lookup is a binary search on the start
+array, so nothing touches the network or the database, and importing
+this module costs nothing.
+"""
+
+import csv
+import os
+import re
+from array import array
+from bisect import bisect_right
+from collections import namedtuple
+
+DATA_FILE = os.path.join(os.path.dirname(__file__), 'data', 'zip_climate.csv')
+
+ZIP_RE = re.compile(r'\s*(\d{5})(?:[-\s]?\d{4})?\s*$')
+
+ClimateInfo = namedtuple('ClimateInfo', ['zone', 'hemisphere'])
+
+
+class ZipClimateIndex:
+    """
+    Sorted, non-overlapping ZIP ranges and the climate of each.
+    """
+    
+    def __init__(self, rows):
+        self.starts = array('I')
+        self.ends = array('I')
+        self.values = array('B')
+        self.climates = []
+        positions = {}
+        for start, end, zone, hemisphere in sorted(rows):
+            if self.ends and start <= self.ends[-1]:
+                raise ValueError(f'ZIP range {start:05d}-{end:05d} overlaps the one before it.')
+            climate = ClimateInfo(zone, hemisphere)
+            if climate not in positions:
+                positions[climate] = len(self.climates)
+                self.climates.append(climate)
+            self.starts.append(start)
+            self.ends.append(end)
+            self.values.append(positions[climate])
+    
+    @classmethod
+    def from_csv(cls, path=DATA_FILE):
+        with open(path, newline='', encoding='utf-8') as file:
+            return cls(
+                (int(row['start']), int(row['end']), row['zone'], row['hemisphere'])
+                for row in csv.DictReader(file)
+            )
+    
+    def __len__(self):
+        return len(self.starts)
+    
+    def get(self, number):
+        """
+        The ClimateInfo for a ZIP code as an integer, or None.
+        """
+        position = bisect_right(self.starts, number) - 1
+        if position < 0 or number > self.ends[position]:
+            return None
+        return self.climates[self.values[position]]
+
+
+_index = None
+
+
+def get_index():
+    """
+    The bundled index, loaded on first use.
+    """
+    global _index
+    if _index is None:
+        _index = ZipClimateIndex.from_csv()
+    return _index
+
+
+def lookup(zip_code):
+    """
+    ClimateInfo for a US ZIP code (ZIP+4 accepted), or None if the code is
+    blank, not a US ZIP code, or not in the dataset.
+    """
+    match = ZIP_RE.match(zip_code or '')
+    if not match:
+        return None
+    return get_index().get(int(match.group(1)))
+
+
+def climate_zone_for_zip(zip_code):
+    """
+    The Home.climate_zone value for a ZIP code, or None.
+    """
+    climate = lookup(zip_code)
+    return climate.zone if climate else None
@@ -5,10 +5,39 @@ Includes multi-step onboarding wizard forms.
 """
 
 from django import forms
+from .climate import climate_zone_for_zip
 from .models import Home, Appliance, ServiceProvider
 
 
-class HomeForm(forms.ModelForm):
+class ClimateZoneFromZipForm(forms.ModelForm):
+    """
+    Base for home forms with a climate_zone field that may be left blank.
+    A blank zone is looked up from zip_code in the bundled ZIP dataset,
+    falling back to the model default for ZIP codes it doesn't cover.
+    """
+    climate_zone = forms.ChoiceField(
+        choices=[('', 'Detect from ZIP code')] + Home.CLIMATE_ZONES,
+        required=False,
+        widget=forms.Select(attrs={'class': 'form-select'}),
+    )
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # New homes start on "Detect from ZIP code", not the model default
+        if self.instance._state.adding and 'climate_zone' not in (kwargs.get('initial') or {}):
+            self.initial['climate_zone'] = ''
+    
+    def clean(self):
+        cleaned_data = super().clean()
+        if not cleaned_data.get('climate_zone'):
+            cleaned_data['climate_zone'] = (
+                climate_zone_for_zip(cleaned_data.get('zip_code'))
+                or Home._meta.get_field('climate_zone').default
+            )
+        return cleaned_data
+
+
+class HomeForm(ClimateZoneFromZipForm):
     """
     Form for creating and editing homes.
     """
@@ -44,7 +73,6 @@ class HomeForm(forms.ModelForm):
             'zip_code': forms.TextInput(attrs={'class': 'form-control', 'placeholder': 'e.g., 78701'}),
             'year_built': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'e.g., 1995'}),
             'construction_type': forms.Select(attrs={'class': 'form-select'}),
-            'climate_zone': forms.Select(attrs={'class': 'form-select'}),
             'square_footage': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'e.g., 1500'}),
             'acreage': forms.NumberInput(attrs={'class': 'form-control', 'placeholder': 'e.g., 0.25', 'step': '0.01'}),
             'location_type': forms.Select(attrs={'class': 'form-select'}),
@@ -82,6 +110,35 @@ class ApplianceForm(forms.ModelForm):
         }
 
 
+class ApplianceImportForm(ApplianceForm):
+    """
+    ApplianceForm plus the record-keeping fields a spreadsheet import can
+    carry, including the last service date the lifecycle scan uses.
+    """
+    class Meta(ApplianceForm.Meta):
+        fields = ApplianceForm.Meta.fields + [
+            'serial_number',
+            'energy_rating',
+            'last_service_date',
+        ]
+
+
+class HomeImportForm(forms.Form):
+    """
+    Upload form for a spreadsheet of homes, appliances and providers.
+    """
+    file = forms.FileField(
+        help_text='An .xlsx workbook or a .csv file',
+        widget=forms.ClearableFileInput(attrs={'class': 'form-control', 'accept': '.xlsx,.csv'}),
+    )
+    
+    def clean_file(self):
+        upload = self.cleaned_data['file']
+        if not upload.name.lower().endswith(('.xlsx', '.csv')):
+            raise forms.ValidationError('Upload an .xlsx or .csv file.')
+        return upload
+
+
 class ServiceProviderForm(forms.ModelForm):
     """
     Form for adding and editing service providers.
@@ -106,7 +163,7 @@ class ServiceProviderForm(forms.ModelForm):
 
 # ===== Multi-Step Onboarding Wizard Forms =====
 
-class SurveyStep1Form(forms.ModelForm):
+class SurveyStep1Form(ClimateZoneFromZipForm):
     """
     Step 1: Basic Home Information
     Collects address, age, construction details, and size.
@@ -156,7 +213,6 @@ class SurveyStep1Form(forms.ModelForm):
                 'placeholder': 'e.g., 2005'
             }),
             'construction_type': forms.Select(attrs={'class': 'form-select'}),
-            'climate_zone': forms.Select(attrs={'class': 'form-select'}),
             'square_footage': forms.NumberInput(attrs={
                 'class': 'form-control',
                 'placeholder': 'e.g., 2000'
@@ -0,0 +1,32 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:34
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0007_add_comprehensive_features'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='OnboardingDraft',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('answers', models.JSONField(blank=True, default=dict)),
+                ('appliances', models.JSONField(blank=True, default=list)),
+                ('completed_step', models.PositiveSmallIntegerField(default=0, help_text='Highest wizard step submitted so far')),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='onboarding_draft', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name': 'Onboarding Draft',
+                'verbose_name_plural': 'Onboarding Drafts',
+            },
+        ),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0008_onboardingdraft'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='appliance',
+            index=models.Index(fields=['warranty_expiration'], name='appliance_warranty_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='appliance',
+            index=models.Index(fields=['appliance_type', 'last_service_date'], name='appliance_type_service_idx'),
+        ),
+    ]
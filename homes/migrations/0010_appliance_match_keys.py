@@ -0,0 +1,81 @@
+# Generated by Django 5.2.7 on 2026-10-19 06:19
+
+import re
+
+from django.db import migrations, models
+
+# The rules of homes.appliance_keys at the time of this migration
+WORD_RE = re.compile(r'[a-z0-9]+')
+NON_ALNUM_RE = re.compile(r'[^A-Z0-9]')
+MODEL_LABEL_RE = re.compile(r'^\s*(?:model|mod)\b\.?\s*(?:(?:no|number)\b\.?)?\s*[#:]?\s*', re.IGNORECASE)
+CORPORATE_WORDS = frozenset(
+    'the inc incorporated corp corporation co company llc ltd limited lp plc gmbh ag sa '
+    'mfg manufacturing industries group holdings international intl usa us na '
+    'appliance appliances'.split()
+)
+MANUFACTURER_ALIASES = {
+    'generalelectric': 'ge',
+    'lgelectronics': 'lg',
+    'samsungelectronics': 'samsung',
+    'boschhome': 'bosch',
+    'electroluxhome': 'electrolux',
+}
+BATCH_SIZE = 1000
+
+
+def manufacturer_key(name):
+    words = WORD_RE.findall((name or '').lower().replace('&', ' and '))
+    while words and words[-1] in CORPORATE_WORDS:
+        words.pop()
+    while words and words[0] in CORPORATE_WORDS:
+        words.pop(0)
+    key = ''.join(words)
+    return MANUFACTURER_ALIASES.get(key, key)
+
+
+def model_key(model_number):
+    return NON_ALNUM_RE.sub('', MODEL_LABEL_RE.sub('', model_number or '').upper())
+
+
+def fill_keys(apps, schema_editor):
+    """
+    Normalize the manufacturer and model number of existing appliances.
+    """
+    Appliance = apps.get_model('homes', 'Appliance')
+    appliances = Appliance.objects.exclude(manufacturer='', model_number='').only(
+        'pk', 'manufacturer', 'model_number',
+    ).order_by('pk')
+    batch = []
+    for appliance in appliances.iterator(chunk_size=BATCH_SIZE):
+        appliance.manufacturer_key = manufacturer_key(appliance.manufacturer)
+        appliance.model_key = model_key(appliance.model_number)
+        batch.append(appliance)
+        if len(batch) >= BATCH_SIZE:
+            Appliance.objects.bulk_update(batch, ['manufacturer_key', 'model_key'])
+            batch = []
+    Appliance.objects.bulk_update(batch, ['manufacturer_key', 'model_key'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0009_appliance_scan_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='appliance',
+            name='manufacturer_key',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.AddField(
+            model_name='appliance',
+            name='model_key',
+            field=models.CharField(blank=True, editable=False, max_length=200),
+        ),
+        migrations.RunPython(fill_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='appliance',
+            index=models.Index(fields=['manufacturer_key', 'model_key'], name='appliance_recall_key_idx'),
+        ),
+    ]
@@ -8,6 +8,8 @@ from django.db import models
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from .appliance_keys import manufacturer_key, model_key
+
 User = get_user_model()
 
 
@@ -312,6 +314,10 @@ class Appliance(models.Model):
     manufacturer = models.CharField(max_length=200, blank=True)
     model_number = models.CharField(max_length=200, blank=True)
     
+    # Normalized copies of manufacturer and model_number for recall matching
+    manufacturer_key = models.CharField(max_length=200, blank=True, editable=False)
+    model_key = models.CharField(max_length=200, blank=True, editable=False)
+    
     serial_number = models.CharField(
         max_length=200,
         blank=True,
@@ -346,9 +352,31 @@ class Appliance(models.Model):
     
     class Meta:
         ordering = ['appliance_type', '-year_installed']
+        indexes = [
+            # Range scans for scan_appliances
+            models.Index(fields=['warranty_expiration'], name='appliance_warranty_idx'),
+            models.Index(fields=['appliance_type', 'last_service_date'], name='appliance_type_service_idx'),
+            # Recall matching by manufacturer, then exact or prefix model
+            models.Index(fields=['manufacturer_key', 'model_key'], name='appliance_recall_key_idx'),
+        ]
     
     def __str__(self):
         return f"{self.get_appliance_type_display()} - {self.home.name}"
+    
+    def set_match_keys(self):
+        """
+        Fill manufacturer_key and model_key from the entered text.
+        Called by save(); call it before bulk_create(), which skips save().
+        """
+        self.manufacturer_key = manufacturer_key(self.manufacturer)
+        self.model_key = model_key(self.model_number)
+    
+    def save(self, *args, **kwargs):
+        self.set_match_keys()
+        update_fields = kwargs.get('update_fields')
+        if update_fields is not None and {'manufacturer', 'model_number'} & set(update_fields):
+            kwargs['update_fields'] = {*update_fields, 'manufacturer_key', 'model_key'}
+        super().save(*args, **kwargs)
 
 
 class ServiceProvider(models.Model):
@@ -405,3 +433,59 @@ class ServiceProvider(models.Model):
     
     def __str__(self):
         return f"{self.company_name} - {self.get_category_display()}"
+
+
+class OnboardingDraft(models.Model):
+    """
+    In-progress answers from the home onboarding wizard, one per user.
+    
+    Kept out of the session so a step submit or an autosaved field writes
+    this one small row, and an unfinished wizard can be resumed later or
+    from another device. answers holds the raw form values keyed by step
+    number ("1".."4"); they are validated with the step's form when the
+    step is submitted and again when the home is created.
+    """
+    owner = models.OneToOneField(
+        User,
+        on_delete=models.CASCADE,
+        related_name='onboarding_draft'
+    )
+    
+    answers = models.JSONField(default=dict, blank=True)
+    appliances = models.JSONField(default=list, blank=True)
+    
+    completed_step = models.PositiveSmallIntegerField(
+        default=0,
+        help_text='Highest wizard step submitted so far'
+    )
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        verbose_name = 'Onboarding Draft'
+        verbose_name_plural = 'Onboarding Drafts'
+    
+    def __str__(self):
+        return f"Onboarding draft for {self.owner} (step {self.completed_step})"
+    
+    def get_answers(self, step):
+        return self.answers.get(str(step), {})
+    
+    def set_answers(self, step, values):
+        """
+        Replace a step's answers after a successful submit.
+        """
+        self.answers[str(step)] = values
+        self.completed_step = max(self.completed_step, step)
+        self.save(update_fields=['answers', 'completed_step', 'updated_at'])
+    
+    def autosave(self, step, name, value):
+        """
+        Store a single field as it is edited.
+        """
+        self.answers.setdefault(str(step), {})[name] = value
+        self.save(update_fields=['answers', 'updated_at'])
+    
+    def save_appliances(self):
+        self.save(update_fields=['appliances', 'updated_at'])
@@ -1,3 +1,421 @@
+import io
+from datetime import date, timedelta
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from openpyxl import Workbook
+
+from accounts.models import User
+from home_maintenance_compass.test_utils import test_settings
+from maintenance.home_import import HomeImport, ImportFormatError, import_homes
+from maintenance.models import (
+    AgendaItem, ArchivedSchedule, MaintenanceStatTotal, MaintenanceTask, MonthlyScheduleSummary, Schedule,
+    ScheduleTaskCompletion,
+)
+from maintenance.overdue import overdue_count
+from .climate import ClimateInfo, ZipClimateIndex, lookup
+from .forms import HomeForm
+from .models import Appliance, Home, OnboardingDraft, ServiceProvider
+
+
+@test_settings
+class OwnerScopedViewTests(TestCase):
+    """
+    Owner-guarded views load their object once, with the ownership check in
+    the same query. Counts include the session and user lookups; the
+    comments give the count before OwnerScopedObjectMixin.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.appliance = Appliance.objects.create(home=cls.home, appliance_type='dryer')
+        cls.provider = ServiceProvider.objects.create(
+            home=cls.home, category='plumber', company_name='Pipes', phone='555'
+        )
+    
+    def setUp(self):
+        # Counts assume the navbar's overdue count is cached, whichever test runs first
+        cache.clear()
+        overdue_count(self.owner)
+    
+    def urls(self):
+        return {
+            'homes:home_update': ({'pk': self.home.pk}, 4),  # was 6
+            'homes:home_delete': ({'pk': self.home.pk}, 4),  # was 6
+            'homes:appliance_update': ({'pk': self.appliance.pk}, 4),  # was 8
+            'homes:appliance_delete': ({'pk': self.appliance.pk}, 4),  # was 8
+            'homes:provider_update': ({'pk': self.provider.pk}, 4),  # was 8
+            'homes:provider_delete': ({'pk': self.provider.pk}, 4),  # was 8
+        }
+    
+    def test_owner_query_counts(self):
+        self.client.force_login(self.owner)
+        for name, (kwargs, queries) in self.urls().items():
+            with self.subTest(name), self.assertNumQueries(queries):
+                response = self.client.get(reverse(name, kwargs=kwargs))
+            self.assertEqual(response.status_code, 200)
+    
+    def test_home_detail_loads_home_once(self):
+        self.client.force_login(self.owner)
+        with self.assertNumQueries(8):  # Includes the cohort benchmark and recall notices
+            response = self.client.get(reverse('homes:home_detail', kwargs={'pk': self.home.pk}))
+        self.assertEqual(response.context['home'].appliance_count, 1)
+    
+    def test_other_users_get_404(self):
+        self.client.force_login(self.other)
+        for name, (kwargs, _) in self.urls().items():
+            with self.subTest(name):
+                self.assertEqual(self.client.get(reverse(name, kwargs=kwargs)).status_code, 404)
+        response = self.client.get(reverse('homes:home_detail', kwargs={'pk': self.home.pk}))
+        self.assertEqual(response.status_code, 404)
+
+
+@test_settings
+class HomeStatsTests(TestCase):
+    """
+    The home list and detail pages show each home's task, appliance and
+    provider counts, loaded with the homes in one query.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.tasks = [
+            MaintenanceTask.objects.create(
+                title=f'Task {number}', slug=f'task-{number}', category='general', description='Short.',
+            )
+            for number in range(3)
+        ]
+    
+    def setUp(self):
+        # Counts assume the navbar's overdue count is cached
+        cache.clear()
+        overdue_count(self.owner)
+    
+    def make_schedule(self, home, days, tasks, completed=False):
+        schedule = Schedule.objects.create(
+            home=home, scheduled_date=date.today() + timedelta(days=days), is_completed=completed,
+        )
+        schedule.tasks.add(*tasks)
+        return schedule
+    
+    def make_home(self, name):
+        home = Home.objects.create(owner=self.owner, name=name, year_built=1990)
+        self.make_schedule(home, -3, self.tasks[:1])
+        upcoming = self.make_schedule(home, 5, self.tasks[:2])
+        ScheduleTaskCompletion.objects.create(schedule=upcoming, task=self.tasks[0])
+        self.make_schedule(home, 90, self.tasks[:1])
+        done = self.make_schedule(home, -30, self.tasks, completed=True)
+        ArchivedSchedule.objects.create(
+            original_id=done.pk + 1000, home=home, scheduled_date=date.today() - timedelta(days=400), task_count=2,
+            created_at=timezone.now(),
+        )
+        for appliance_type, days in (('dryer', 10), ('washer', 900)):
+            Appliance.objects.create(
+                home=home, appliance_type=appliance_type, warranty_expiration=date.today() + timedelta(days=days),
+            )
+        ServiceProvider.objects.create(home=home, category='plumber', company_name='Pipes', phone='555')
+        return home
+    
+    def counts(self, home):
+        return {
+            name: getattr(home, name)
+            for name in ('upcoming_tasks', 'overdue_tasks', 'completed_tasks', 'appliance_count',
+                         'warranties_expiring', 'provider_count')
+        }
+    
+    def test_counts(self):
+        home = self.make_home('Busy')
+        empty = Home.objects.create(owner=self.owner, name='Empty', year_built=2000)
+        self.client.force_login(self.owner)
+        expected = {
+            'upcoming_tasks': 1, 'overdue_tasks': 1, 'completed_tasks': 6,
+            'appliance_count': 2, 'warranties_expiring': 1, 'provider_count': 1,
+        }
+        
+        response = self.client.get(reverse('homes:home_detail', kwargs={'pk': home.pk}))
+        self.assertEqual(self.counts(response.context['home']), expected)
+        response = self.client.get(reverse('homes:home_detail', kwargs={'pk': empty.pk}))
+        self.assertEqual(self.counts(response.context['home']), dict.fromkeys(expected, 0))
+        response = self.client.get(reverse('homes:home_list'))
+        homes = {home.name: self.counts(home) for home in response.context['home_list']}
+        self.assertEqual(homes, {'Busy': expected, 'Empty': dict.fromkeys(expected, 0)})
+    
+    def test_list_query_count_is_fixed(self):
+        self.client.force_login(self.owner)
+        for count in (1, 10):
+            while Home.objects.filter(owner=self.owner).count() < count:
+                self.make_home(f'Home {Home.objects.count()}')
+            with self.subTest(homes=count), self.assertNumQueries(5):  # One for the homes and their stats
+                response = self.client.get(reverse('homes:home_list'))
+            self.assertEqual(len(response.context['home_list']), count)
+    
+    def test_stale_month_summaries_are_refreshed_together(self):
+        first_day = date.today().replace(day=1)
+        if first_day == date.today():
+            self.skipTest('Month summaries only go stale once a day of the month has passed')
+        self.client.force_login(self.owner)
+        for count in (1, 10):
+            with self.captureOnCommitCallbacks(execute=True):
+                while Home.objects.filter(owner=self.owner).count() < count:
+                    home = Home.objects.create(owner=self.owner, name=f'Home {Home.objects.count()}', year_built=1990)
+                    self.make_schedule(home, (first_day - date.today()).days, self.tasks[:1])
+            MonthlyScheduleSummary.objects.update(overdue_tasks=0, computed_on=first_day)
+            overdue_count(self.owner)
+            # The list query, plus one recount and one UPDATE for every stale row
+            with self.subTest(homes=count), self.assertNumQueries(7):
+                response = self.client.get(reverse('homes:home_list'))
+            summaries = response.context['month_summaries'].values()
+            self.assertEqual([summary.overdue_tasks for summary in summaries], [1] * count)
+            self.assertFalse(MonthlyScheduleSummary.objects.exclude(computed_on=date.today()).exists())
+
+
+@test_settings
+class HomeDeleteTests(TestCase):
+    """
+    Deleting a home takes its schedules and derived rows with it in a fixed
+    number of queries, without refreshing each deleted schedule's month.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.task = MaintenanceTask.objects.create(
+            title='Test smoke alarms', slug='test-smoke-alarms', category='safety', description='Press it.',
+        )
+    
+    def make_home(self, months):
+        home = Home.objects.create(owner=self.owner, name=f'{months} months', year_built=1990)
+        with self.captureOnCommitCallbacks(execute=True):
+            for number in range(months):
+                schedule = Schedule.objects.create(home=home, scheduled_date=date(2026, 1, 1) + timedelta(days=31 * number))
+                schedule.tasks.add(self.task)
+        return home
+    
+    def test_delete_query_count(self):
+        self.client.force_login(self.owner)
+        for months in (2, 24):
+            home = self.make_home(months)
+            self.assertEqual(MonthlyScheduleSummary.objects.filter(home=home).count(), months)
+            with self.subTest(months=months), self.captureOnCommitCallbacks(execute=True) as callbacks:
+                with self.assertNumQueries(27):
+                    response = self.client.post(reverse('homes:home_delete', kwargs={'pk': home.pk}))
+            self.assertRedirects(response, reverse('homes:home_list'), fetch_redirect_response=False)
+            # Only the owner's cached overdue count is dropped
+            self.assertEqual(len(callbacks), 1)
+            self.assertFalse(Schedule.objects.filter(home_id=home.pk).exists())
+            self.assertFalse(AgendaItem.objects.filter(home_id=home.pk).exists())
+            self.assertFalse(MonthlyScheduleSummary.objects.filter(home_id=home.pk).exists())
+        self.assertEqual(MaintenanceStatTotal.objects.get(owner=self.owner).due_tasks, 0)
+
+
+@test_settings
+class OnboardingWizardTests(TestCase):
+    """
+    Wizard answers are kept in the user's OnboardingDraft until the last
+    step creates the home and its appliances.
+    """
+    step1 = {
+        'name': 'Cabin', 'year_built': 1990, 'construction_type': 'wood_frame', 'location_type': 'rural',
+        'acreage': 1, 'num_bedrooms': 2, 'num_bathrooms': 1,
+    }
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+    
+    def setUp(self):
+        self.client.force_login(self.owner)
+    
+    def url(self, step):
+        return reverse('homes:survey_wizard', kwargs={'step': step})
+    
+    def post(self, step, data):
+        return self.client.post(self.url(step), data)
+    
+    def draft(self):
+        return OnboardingDraft.objects.get(owner=self.owner)
+    
+    def fill_steps(self):
+        self.post(1, self.step1)
+        self.post(2, {'roof_type': 'metal'})
+        self.post(3, {'has_fencing': 'on'})
+    
+    def test_steps_need_earlier_steps(self):
+        self.assertRedirects(self.client.get(self.url(3)), self.url(1))
+        response = self.post(1, {'name': 'Cabin'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.draft().completed_step, 0)
+    
+    def test_draft_is_resumed_and_cleared(self):
+        self.fill_steps()
+        self.assertEqual(self.draft().completed_step, 3)
+        response = self.client.get(self.url(1))
+        self.assertTrue(response.context['resuming'])
+        self.assertEqual(response.context['form'].initial['name'], 'Cabin')
+        self.assertRedirects(self.post(1, {'start_over': '1'}), self.url(1))
+        self.assertEqual((self.draft().answers, self.draft().completed_step), ({}, 0))
+    
+    def test_autosave(self):
+        autosave = reverse('homes:survey_autosave')
+        response = self.client.post(autosave, {'step': 2, 'field': 'has_basement', 'value': 'on'})
+        self.assertEqual(response.json(), {'saved': True})
+        self.client.post(autosave, {'step': 1, 'field': 'name', 'value': 'Half done'})
+        self.assertEqual(self.draft().answers, {'1': {'name': 'Half done'}, '2': {'has_basement': True}})
+        self.assertEqual(self.client.post(autosave, {'step': 2, 'field': 'owner', 'value': '1'}).status_code, 400)
+    
+    def test_complete_creates_home_and_appliances(self):
+        self.fill_steps()
+        self.post(4, {'add_appliance': '1', 'appliance_type': 'dryer', 'manufacturer': 'GE Appliances'})
+        self.post(4, {'add_appliance': '1', 'appliance_type': 'washer'})
+        response = self.client.get(self.url(4), {'edit': 0})
+        self.assertEqual(response.context['editing_index'], 0)
+        self.assertEqual(response.context['appliance_form'].initial['appliance_type'], 'dryer')
+        self.post(4, {
+            'add_appliance': '1', 'editing_index': '0', 'appliance_type': 'dryer', 'model_number': 'Model # dx-1',
+        })
+        self.post(4, {'remove_appliance_index': '1'})
+        self.assertEqual([appliance['appliance_type'] for appliance in self.draft().appliances], ['dryer'])
+        
+        response = self.post(4, {'complete_wizard': '1'})
+        home = Home.objects.get(owner=self.owner)
+        self.assertRedirects(
+            response, reverse('maintenance:generate_schedule', kwargs={'home_pk': home.pk}),
+            fetch_redirect_response=False,
+        )
+        self.assertEqual((home.name, home.roof_type, home.has_fencing), ('Cabin', 'metal', True))
+        self.assertEqual(list(home.appliances.values_list('appliance_type', 'model_key')), [('dryer', 'DX1')])
+        self.assertFalse(OnboardingDraft.objects.filter(owner=self.owner).exists())
+    
+    def test_complete_without_steps_creates_nothing(self):
+        self.post(1, self.step1)
+        self.assertRedirects(self.post(4, {'complete_wizard': '1'}), self.url(1))
+        self.assertFalse(Home.objects.exists())
+        self.assertEqual(self.draft().completed_step, 1)
+
+
+@test_settings
+class HomeImportTests(TestCase):
+    """
+    Spreadsheet imports validate each row with the site's forms, write the
+    valid ones and report the rest.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        Home.objects.create(owner=cls.owner, name='Lake House', year_built=1975)
+    
+    def test_upload_csv(self):
+        content = (
+            'record,home,name,year_built,has_basement,appliance_type,category,company_name,phone\n'
+            'home,,Cabin,1950,yes,,,,\n'
+            'appliance,cabin,,,,dryer,,,\n'
+            'provider,Lake House,,,,,plumber,Pipes,555\n'
+            'home,,Lake House,2001,,,,,\n'
+            'appliance,Barn,,,,dryer,,,\n'
+            'home,,Shed,1650,,,,,\n'
+        ).encode()
+        self.client.force_login(self.owner)
+        response = self.client.post(reverse('homes:home_import'), {
+            'file': SimpleUploadedFile('homes.csv', content, content_type='text/csv'),
+        })
+        report = response.context['report']
+        self.assertEqual((report['home'], report['appliance'], report['provider'], report['invalid']), (1, 1, 1, 3))
+        self.assertEqual([location for location, _ in report['errors']], ['Row 5', 'Row 6', 'Row 7'])
+        cabin = Home.objects.get(owner=self.owner, name='Cabin')
+        self.assertTrue(cabin.has_basement)
+        self.assertTrue(cabin.has_hvac)  # Blank cell keeps the model default
+        self.assertEqual(cabin.appliances.get().appliance_type, 'dryer')
+        self.assertEqual(ServiceProvider.objects.get().home.name, 'Lake House')
+    
+    def test_xlsx_sheets_in_chunks(self):
+        workbook = Workbook()
+        homes = workbook.active
+        homes.title = 'Homes'
+        homes.append(['Name', 'Year Built'])
+        appliances = workbook.create_sheet('Appliances')
+        appliances.append(['home', 'appliance_type', 'last_service_date'])
+        for number in range(7):
+            homes.append([f'Unit {number}', 1990 + number])
+            appliances.append([f'Unit {number}', 'water_heater', '2025-01-31'])
+        file = io.BytesIO()
+        workbook.save(file)
+        file.seek(0)
+        
+        report = import_homes(file, 'portfolio.xlsx', self.owner, chunk_size=3)
+        self.assertEqual((report['home'], report['appliance'], report['invalid']), (7, 7, 0))
+        self.assertEqual(Appliance.objects.filter(home__name='Unit 6', last_service_date__isnull=False).count(), 1)
+    
+    def test_rejects_unreadable_files(self):
+        self.client.force_login(self.owner)
+        for name in ('homes.txt', 'homes.xlsx'):
+            with self.subTest(name):
+                response = self.client.post(reverse('homes:home_import'), {
+                    'file': SimpleUploadedFile(name, b'not a spreadsheet'),
+                })
+                self.assertEqual(response.status_code, 200)
+                self.assertTrue(response.context['form'].errors)
+        self.assertEqual(Home.objects.count(), 1)
+    
+    def test_only_read_errors_are_format_errors(self):
+        for name, content in (('homes.csv', b'name,year_built\nA,1990\n\xff\xfe,1990\n'), ('homes.xlsx', b'PK')):
+            with self.subTest(name), self.assertRaises(ImportFormatError):
+                import_homes(io.BytesIO(content), name, self.owner)
+        # A bug while handling a readable row isn't reported as a bad file
+        with mock.patch.object(HomeImport, 'add', side_effect=KeyError('home')), self.assertRaises(KeyError):
+            import_homes(io.BytesIO(b'name,year_built\nA,1990\n'), 'homes.csv', self.owner)
+
 
-# Create your tests here.
+class ClimateZoneTests(TestCase):
+    """
+    A blank climate zone is filled in from the ZIP code, offline.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+    
+    def test_lookup(self):
+        self.assertEqual(lookup('02134'), ClimateInfo('northeast', 'north'))
+        self.assertEqual(lookup('33101-1234').zone, 'tropical')
+        self.assertEqual(lookup('78701').zone, 'southwest')
+        self.assertEqual(lookup('99501').zone, 'polar')
+        self.assertEqual(lookup('96799'), ClimateInfo('tropical', 'south'))
+        for zip_code in ('', None, '090', '09012', 'SW1A 1AA', '1234567'):
+            with self.subTest(zip_code):
+                self.assertIsNone(lookup(zip_code))
+    
+    def test_index_rejects_overlapping_ranges(self):
+        with self.assertRaises(ValueError):
+            ZipClimateIndex([(100, 199, 'dry', 'north'), (150, 250, 'polar', 'north')])
+    
+    def test_home_form_detects_blank_zone(self):
+        data = {
+            'name': 'Cabin', 'year_built': 1990, 'construction_type': 'wood_frame', 'location_type': 'rural',
+            'acreage': 1, 'num_bedrooms': 2, 'num_bathrooms': 1,
+        }
+        self.assertEqual(HomeForm().initial['climate_zone'], '')
+        cases = [
+            ({'zip_code': '59715'}, 'continental'),
+            ({'zip_code': '59715', 'climate_zone': 'polar'}, 'polar'),
+            ({'zip_code': 'K1A 0B1'}, 'temperate'),
+        ]
+        for extra, zone in cases:
+            with self.subTest(extra):
+                form = HomeForm({**data, **extra})
+                self.assertTrue(form.is_valid(), form.errors)
+                self.assertEqual(form.save(commit=False).climate_zone, zone)
+    
+    def test_import_detects_blank_zone(self):
+        content = b'name,year_built,zip_code,climate_zone\nA,1990,98101,\nB,1990,98101,dry\n'
+        import_homes(io.BytesIO(content), 'homes.csv', self.owner)
+        zones = dict(Home.objects.values_list('name', 'climate_zone'))
+        self.assertEqual(zones, {'A': 'northwest', 'B': 'dry'})
@@ -12,10 +12,12 @@ urlpatterns = [
     # Multi-step onboarding wizard
     path('wizard/', views.HomeOnboardingWizardView.as_view(), {'step': 1}, name='survey_wizard'),
     path('wizard/<int:step>/', views.HomeOnboardingWizardView.as_view(), name='survey_wizard'),
+    path('wizard/autosave/', views.OnboardingAutosaveView.as_view(), name='survey_autosave'),
     
     # Home CRUD
     path('', views.HomeListView.as_view(), name='home_list'),
     path('create/', views.HomeCreateView.as_view(), name='home_create'),
+    path('import/', views.HomeImportView.as_view(), name='home_import'),
     path('<int:pk>/', views.HomeDetailView.as_view(), name='home_detail'),
     path('<int:pk>/edit/', views.HomeUpdateView.as_view(), name='home_update'),
     path('<int:pk>/delete/', views.HomeDeleteView.as_view(), name='home_delete'),
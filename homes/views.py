@@ -5,14 +5,24 @@ Includes multi-step onboarding wizard.
 """
 
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
-from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView
+from django.contrib.auth.mixins import LoginRequiredMixin
+from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, FormView
 from django.urls import reverse_lazy, reverse
 from django.contrib import messages
+from django.db import transaction
+from django.http import JsonResponse
 from django.views import View
-from .models import Home, Appliance, ServiceProvider
+from home_maintenance_compass.mixins import OwnerScopedObjectMixin
+from datetime import date
+from maintenance.agenda import dashboard
+from maintenance.cohorts import home_comparison
+from maintenance.home_import import ImportFormatError, import_homes
+from maintenance.home_stats import WARRANTY_NOTICE_DAYS, with_stats
+from maintenance.signals import batch_changes
+from maintenance.summaries import get_summaries
+from .models import Home, Appliance, OnboardingDraft, ServiceProvider
 from .forms import (
-    HomeForm, ApplianceForm, ServiceProviderForm,
+    HomeForm, ApplianceForm, ServiceProviderForm, HomeImportForm,
     SurveyStep1Form, SurveyStep2Form, SurveyStep3PropertyForm, 
     SurveyStep4EquipmentForm, SurveyStep3ApplianceForm
 )
@@ -21,6 +31,8 @@ from .forms import (
 class HomeListView(LoginRequiredMixin, ListView):
     """
     List all homes owned by the current user.
+    Homes come back with their task, appliance and warranty counts in one
+    query (see maintenance/home_stats.py), however many there are.
     """
     model = Home
     template_name = 'homes/home_list.html'
@@ -28,33 +40,47 @@ class HomeListView(LoginRequiredMixin, ListView):
     
     def get_queryset(self):
         """
-        Return only homes owned by the current user.
+        Return only homes owned by the current user, with their stats.
         """
-        return Home.objects.filter(owner=self.request.user)
+        return with_stats(Home.objects.filter(owner=self.request.user))
+    
+    def get_context_data(self, **kwargs):
+        """
+        Add this month's task summary for each home (one row per home).
+        """
+        context = super().get_context_data(**kwargs)
+        today = date.today()
+        month = (today.year, today.month)
+        month_summaries = get_summaries([home.pk for home in context['home_list']], start=month, end=month)
+        context['month_summaries'] = {summary.home_id: summary for summary in month_summaries}
+        return context
 
 
-class HomeDetailView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
+class HomeDetailView(LoginRequiredMixin, OwnerScopedObjectMixin, DetailView):
     """
-    Display details of a specific home including appliances and service providers.
+    Display details of a specific home with its task, appliance and service
+    provider counts, which are loaded in the same query as the home.
     """
     model = Home
     template_name = 'homes/home_detail.html'
     context_object_name = 'home'
     
-    def test_func(self):
-        """
-        Ensure the user owns this home.
-        """
-        home = self.get_object()
-        return home.owner == self.request.user
+    def get_queryset(self):
+        return with_stats(super().get_queryset())
     
     def get_context_data(self, **kwargs):
         """
-        Add appliances and service providers to context.
+        Add the home's agenda, open appliance alerts and recall notices, and
+        how it compares with similar homes to context.
         """
         context = super().get_context_data(**kwargs)
-        context['appliances'] = self.object.appliances.all()
-        context['service_providers'] = self.object.service_providers.all()
+        context['agenda'] = dashboard(home=self.object)
+        context['cohort'] = home_comparison(self.object)
+        context['appliance_alerts'] = self.object.appliance_alerts.select_related('appliance')
+        context['recall_notices'] = self.object.recall_notices.filter(
+            dismissed_at__isnull=True,
+        ).select_related('recall', 'appliance')
+        context['warranty_notice_days'] = WARRANTY_NOTICE_DAYS
         return context
 
 
@@ -80,7 +106,34 @@ class HomeCreateView(LoginRequiredMixin, CreateView):
         return reverse_lazy('homes:home_detail', kwargs={'pk': self.object.pk})
 
 
-class HomeUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class HomeImportView(LoginRequiredMixin, FormView):
+    """
+    Import homes, appliances and service providers from an uploaded .xlsx
+    or .csv file, then show what was imported and which rows were skipped.
+    """
+    form_class = HomeImportForm
+    template_name = 'homes/home_import.html'
+    
+    def form_valid(self, form):
+        upload = form.cleaned_data['file']
+        try:
+            report = import_homes(upload, upload.name, self.request.user)
+        except ImportFormatError as error:
+            form.add_error('file', str(error))
+            return self.form_invalid(form)
+        
+        if report['home'] or report['appliance'] or report['provider']:
+            messages.success(
+                self.request,
+                f"Imported {report['home']} home(s), {report['appliance']} appliance(s) "
+                f"and {report['provider']} provider(s)."
+            )
+        if report['invalid']:
+            messages.warning(self.request, f"{report['invalid']} row(s) were skipped; see the list below.")
+        return self.render_to_response(self.get_context_data(form=self.form_class(), report=report))
+
+
+class HomeUpdateView(LoginRequiredMixin, OwnerScopedObjectMixin, UpdateView):
     """
     Update an existing home.
     """
@@ -88,13 +141,6 @@ class HomeUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
     form_class = HomeForm
     template_name = 'homes/home_form.html'
     
-    def test_func(self):
-        """
-        Ensure the user owns this home.
-        """
-        home = self.get_object()
-        return home.owner == self.request.user
-    
     def get_success_url(self):
         """
         Redirect to the home detail page after update.
@@ -102,7 +148,7 @@ class HomeUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         return reverse_lazy('homes:home_detail', kwargs={'pk': self.object.pk})
 
 
-class HomeDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class HomeDeleteView(LoginRequiredMixin, OwnerScopedObjectMixin, DeleteView):
     """
     Delete a home.
     """
@@ -110,12 +156,13 @@ class HomeDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
     template_name = 'homes/home_confirm_delete.html'
     success_url = reverse_lazy('homes:home_list')
     
-    def test_func(self):
+    def form_valid(self, form):
         """
-        Ensure the user owns this home.
+        Delete the home and everything under it in one transaction, without
+        refreshing the derived data of each deleted schedule's month.
         """
-        home = self.get_object()
-        return home.owner == self.request.user
+        with transaction.atomic(), batch_changes():
+            return super().form_valid(form)
 
 
 # Appliance Views
@@ -149,20 +196,15 @@ class ApplianceCreateView(LoginRequiredMixin, CreateView):
         return reverse_lazy('homes:home_detail', kwargs={'pk': self.home.pk})
 
 
-class ApplianceUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class ApplianceUpdateView(LoginRequiredMixin, OwnerScopedObjectMixin, UpdateView):
     """
     Update an appliance.
     """
     model = Appliance
     form_class = ApplianceForm
     template_name = 'homes/appliance_form.html'
-    
-    def test_func(self):
-        """
-        Ensure the user owns the home this appliance belongs to.
-        """
-        appliance = self.get_object()
-        return appliance.home.owner == self.request.user
+    owner_field = 'home__owner'
+    owner_select_related = ('home',)
     
     def get_success_url(self):
         """
@@ -171,19 +213,14 @@ class ApplianceUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         return reverse_lazy('homes:home_detail', kwargs={'pk': self.object.home.pk})
 
 
-class ApplianceDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class ApplianceDeleteView(LoginRequiredMixin, OwnerScopedObjectMixin, DeleteView):
     """
     Delete an appliance.
     """
     model = Appliance
     template_name = 'homes/appliance_confirm_delete.html'
-    
-    def test_func(self):
-        """
-        Ensure the user owns the home this appliance belongs to.
-        """
-        appliance = self.get_object()
-        return appliance.home.owner == self.request.user
+    owner_field = 'home__owner'
+    owner_select_related = ('home',)
     
     def get_success_url(self):
         """
@@ -223,20 +260,15 @@ class ServiceProviderCreateView(LoginRequiredMixin, CreateView):
         return reverse_lazy('homes:home_detail', kwargs={'pk': self.home.pk})
 
 
-class ServiceProviderUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class ServiceProviderUpdateView(LoginRequiredMixin, OwnerScopedObjectMixin, UpdateView):
     """
     Update a service provider.
     """
     model = ServiceProvider
     form_class = ServiceProviderForm
     template_name = 'homes/provider_form.html'
-    
-    def test_func(self):
-        """
-        Ensure the user owns the home this provider is associated with.
-        """
-        provider = self.get_object()
-        return provider.home.owner == self.request.user
+    owner_field = 'home__owner'
+    owner_select_related = ('home',)
     
     def get_success_url(self):
         """
@@ -245,19 +277,14 @@ class ServiceProviderUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateV
         return reverse_lazy('homes:home_detail', kwargs={'pk': self.object.home.pk})
 
 
-class ServiceProviderDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class ServiceProviderDeleteView(LoginRequiredMixin, OwnerScopedObjectMixin, DeleteView):
     """
     Delete a service provider.
     """
     model = ServiceProvider
     template_name = 'homes/provider_confirm_delete.html'
-    
-    def test_func(self):
-        """
-        Ensure the user owns the home this provider is associated with.
-        """
-        provider = self.get_object()
-        return provider.home.owner == self.request.user
+    owner_field = 'home__owner'
+    owner_select_related = ('home',)
     
     def get_success_url(self):
         """
@@ -275,313 +302,229 @@ class HomeOnboardingWizardView(LoginRequiredMixin, View):
     Step 2: Home systems and infrastructure
     Step 3: Property features
     Step 4: Equipment and appliances
+    
+    Answers are kept in the user's OnboardingDraft rather than the session,
+    so the wizard can be resumed and each change writes one small row.
+    Completing it creates the home and its appliances in one transaction.
     """
+    total_steps = 4
+    step_forms = {
+        1: SurveyStep1Form,
+        2: SurveyStep2Form,
+        3: SurveyStep3PropertyForm,
+        4: SurveyStep4EquipmentForm,
+    }
+    step_templates = {
+        1: 'homes/survey_step1.html',
+        2: 'homes/survey_step2.html',
+        3: 'homes/survey_step3.html',
+        4: 'homes/survey_step4.html',
+    }
+    step_messages = {
+        1: "Step 1 complete! Let's configure home systems.",
+        2: "Step 2 complete! Now let's add property features.",
+        3: "Step 3 complete! Finally, let's add equipment and appliances (optional).",
+    }
+    prerequisite_messages = {
+        2: "Please complete Step 1 first.",
+        3: "Please complete Steps 1 and 2 first.",
+        4: "Please complete Steps 1, 2, and 3 first.",
+    }
+    
+    def get_draft(self):
+        draft, _ = OnboardingDraft.objects.get_or_create(owner=self.request.user)
+        return draft
+    
+    @staticmethod
+    def form_values(form):
+        """
+        The submitted value of each field, as the form would re-bind it.
+        """
+        return {name: form[name].value() for name in form.fields}
+    
+    def get_context(self, step, **kwargs):
+        return {
+            'step': step,
+            'total_steps': self.total_steps,
+            'progress_percent': step * 100 // self.total_steps,
+            **kwargs,
+        }
+    
+    def render_appliances_step(self, draft, appliance_form, editing_index=None):
+        equipment_form = SurveyStep4EquipmentForm(initial=draft.get_answers(4))
+        return render(self.request, self.step_templates[4], self.get_context(
+            4,
+            equipment_form=equipment_form,
+            appliance_form=appliance_form,
+            appliances=draft.appliances,
+            appliance_count=len(draft.appliances),
+            editing_index=editing_index,
+        ))
+    
+    @staticmethod
+    def get_appliance_index(draft, value):
+        """
+        Return value as an index into the draft's appliances, or None.
+        """
+        try:
+            index = int(value)
+        except (TypeError, ValueError):
+            return None
+        return index if 0 <= index < len(draft.appliances) else None
     
     def get(self, request, step=1):
         """
         Display the appropriate step of the wizard.
         """
         step = int(step)
+        if step not in self.step_forms:
+            return redirect('homes:survey_wizard', step=1)
         
-        # Get session data for pre-filling forms
-        step1_data = request.session.get('survey_step1', {})
-        step2_data = request.session.get('survey_step2', {})
-        step3_data = request.session.get('survey_step3', {})
-        appliances_data = request.session.get('survey_appliances', [])
-        
-        if step == 1:
-            form = SurveyStep1Form(initial=step1_data)
-            template = 'homes/survey_step1.html'
-            context = {
-                'form': form,
-                'step': 1,
-                'total_steps': 4,
-                'progress_percent': 25,
-            }
-        elif step == 2:
-            if not step1_data:
-                messages.warning(request, "Please complete Step 1 first.")
-                return redirect('homes:survey_wizard', step=1)
-            form = SurveyStep2Form(initial=step2_data)
-            template = 'homes/survey_step2.html'
-            context = {
-                'form': form,
-                'step': 2,
-                'total_steps': 4,
-                'progress_percent': 50,
-            }
-        elif step == 3:
-            if not step1_data or not step2_data:
-                messages.warning(request, "Please complete Steps 1 and 2 first.")
-                return redirect('homes:survey_wizard', step=1)
-            form = SurveyStep3PropertyForm(initial=step3_data)
-            template = 'homes/survey_step3.html'
-            context = {
-                'form': form,
-                'step': 3,
-                'total_steps': 4,
-                'progress_percent': 75,
-            }
-        elif step == 4:
-            if not step1_data or not step2_data or not step3_data:
-                messages.warning(request, "Please complete Steps 1, 2, and 3 first.")
-                return redirect('homes:survey_wizard', step=1)
-            
-            # Check if editing an appliance
-            edit_index = request.GET.get('edit')
-            editing_appliance = None
-            if edit_index is not None:
-                try:
-                    index = int(edit_index)
-                    appliances_data = request.session.get('survey_appliances', [])
-                    if 0 <= index < len(appliances_data):
-                        editing_appliance = appliances_data[index]
-                        # Convert string dates back to date objects for form
-                        from datetime import date as dt_date
-                        for key, value in editing_appliance.items():
-                            if isinstance(value, str) and '-' in value and len(value) == 10:
-                                try:
-                                    editing_appliance[key] = dt_date.fromisoformat(value)
-                                except:
-                                    pass
-                except (ValueError, IndexError):
-                    pass
-            
-            equipment_form = SurveyStep4EquipmentForm(initial=request.session.get('survey_step4', {}))
-            appliance_form = SurveyStep3ApplianceForm(initial=editing_appliance) if editing_appliance else SurveyStep3ApplianceForm()
-            template = 'homes/survey_step4.html'
-            context = {
-                'equipment_form': equipment_form,
-                'appliance_form': appliance_form,
-                'step': 4,
-                'total_steps': 4,
-                'progress_percent': 100,
-                'appliances': appliances_data,
-                'appliance_count': len(appliances_data),
-                'editing_index': edit_index,
-            }
-        else:
+        draft = self.get_draft()
+        if draft.completed_step < step - 1:
+            messages.warning(request, self.prerequisite_messages[step])
             return redirect('homes:survey_wizard', step=1)
         
-        return render(request, template, context)
+        if step < 4:
+            form = self.step_forms[step](initial=draft.get_answers(step))
+            return render(request, self.step_templates[step], self.get_context(
+                step, form=form, resuming=step == 1 and bool(draft.answers),
+            ))
+        
+        # Check if editing an appliance
+        edit_index = self.get_appliance_index(draft, request.GET.get('edit'))
+        if edit_index is not None:
+            appliance_form = SurveyStep3ApplianceForm(initial=draft.appliances[edit_index])
+        else:
+            appliance_form = SurveyStep3ApplianceForm()
+        return self.render_appliances_step(draft, appliance_form, edit_index)
     
     def post(self, request, step=1):
         """
         Process form submission for each step.
         """
         step = int(step)
+        draft = self.get_draft()
         
-        if step == 1:
-            form = SurveyStep1Form(request.POST)
-            if form.is_valid():
-                # Save to session
-                request.session['survey_step1'] = form.cleaned_data
-                # Convert non-serializable data
-                for key, value in list(request.session['survey_step1'].items()):
-                    if hasattr(value, 'isoformat'):
-                        request.session['survey_step1'][key] = value.isoformat()
-                    elif value is None or isinstance(value, (str, int, float, bool)):
-                        pass
-                    else:
-                        request.session['survey_step1'][key] = str(value)
-                request.session.modified = True
-                messages.success(request, "Step 1 complete! Let's configure home systems.")
-                return redirect('homes:survey_wizard', step=2)
-            else:
-                return render(request, 'homes/survey_step1.html', {
-                    'form': form,
-                    'step': 1,
-                    'total_steps': 4,
-                    'progress_percent': 25,
-                })
+        if 'start_over' in request.POST:
+            draft.delete()
+            messages.info(request, "Your saved answers were cleared.")
+            return redirect('homes:survey_wizard', step=1)
         
-        elif step == 2:
-            form = SurveyStep2Form(request.POST)
+        if step in (1, 2, 3):
+            form = self.step_forms[step](request.POST)
             if form.is_valid():
-                # Save to session
-                request.session['survey_step2'] = form.cleaned_data
-                # Convert non-serializable data
-                for key, value in list(request.session['survey_step2'].items()):
-                    if hasattr(value, 'isoformat'):
-                        request.session['survey_step2'][key] = value.isoformat()
-                    elif value is None or isinstance(value, (str, int, float, bool)):
-                        pass
-                    else:
-                        request.session['survey_step2'][key] = str(value)
-                request.session.modified = True
-                messages.success(request, "Step 2 complete! Now let's add property features.")
-                return redirect('homes:survey_wizard', step=3)
-            else:
-                return render(request, 'homes/survey_step2.html', {
-                    'form': form,
-                    'step': 2,
-                    'total_steps': 4,
-                    'progress_percent': 50,
-                })
+                draft.set_answers(step, self.form_values(form))
+                messages.success(request, self.step_messages[step])
+                return redirect('homes:survey_wizard', step=step + 1)
+            return render(request, self.step_templates[step], self.get_context(step, form=form))
         
-        elif step == 3:
-            form = SurveyStep3PropertyForm(request.POST)
-            if form.is_valid():
-                # Save to session
-                request.session['survey_step3'] = form.cleaned_data
-                # Convert non-serializable data
-                for key, value in list(request.session['survey_step3'].items()):
-                    if hasattr(value, 'isoformat'):
-                        request.session['survey_step3'][key] = value.isoformat()
-                    elif value is None or isinstance(value, (str, int, float, bool)):
-                        pass
-                    else:
-                        request.session['survey_step3'][key] = str(value)
-                request.session.modified = True
-                messages.success(request, "Step 3 complete! Finally, let's add equipment and appliances (optional).")
+        if step != 4:
+            return redirect('homes:survey_wizard', step=1)
+        
+        # Saving equipment, editing, adding or removing an appliance, or completing the wizard
+        if 'save_equipment' in request.POST:
+            equipment_form = SurveyStep4EquipmentForm(request.POST)
+            if equipment_form.is_valid():
+                draft.set_answers(4, self.form_values(equipment_form))
+                messages.success(request, "Equipment information saved!")
+            return redirect('homes:survey_wizard', step=4)
+        
+        elif 'edit_appliance_index' in request.POST:
+            index = self.get_appliance_index(draft, request.POST['edit_appliance_index'])
+            if index is None:
+                messages.error(request, "Error loading appliance.")
                 return redirect('homes:survey_wizard', step=4)
+            return redirect(f"{reverse('homes:survey_wizard', kwargs={'step': 4})}?edit={index}")
+        
+        elif 'remove_appliance_index' in request.POST:
+            index = self.get_appliance_index(draft, request.POST['remove_appliance_index'])
+            if index is None:
+                messages.error(request, "Error removing appliance.")
             else:
-                return render(request, 'homes/survey_step3.html', {
-                    'form': form,
-                    'step': 3,
-                    'total_steps': 4,
-                    'progress_percent': 75,
-                })
+                draft.appliances.pop(index)
+                draft.save_appliances()
+                messages.success(request, "Appliance removed!")
+            return redirect('homes:survey_wizard', step=4)
         
-        elif step == 4:
-            # Check if saving equipment, editing appliance, adding appliance, removing appliance, or completing wizard
-            if 'save_equipment' in request.POST:
-                equipment_form = SurveyStep4EquipmentForm(request.POST)
-                if equipment_form.is_valid():
-                    # Save equipment data to session
-                    request.session['survey_step4'] = equipment_form.cleaned_data
-                    # Convert non-serializable data
-                    for key, value in list(request.session['survey_step4'].items()):
-                        if value is None or isinstance(value, (str, int, float, bool)):
-                            pass
-                        else:
-                            request.session['survey_step4'][key] = str(value)
-                    request.session.modified = True
-                    messages.success(request, "Equipment information saved!")
-                    return redirect('homes:survey_wizard', step=4)
+        elif 'add_appliance' in request.POST:
+            appliance_form = SurveyStep3ApplianceForm(request.POST)
+            if not appliance_form.is_valid():
+                return self.render_appliances_step(draft, appliance_form)
             
-            elif 'edit_appliance_index' in request.POST:
-                # Load appliance into edit mode
-                try:
-                    index = int(request.POST['edit_appliance_index'])
-                    appliances = request.session.get('survey_appliances', [])
-                    if 0 <= index < len(appliances):
-                        # Redirect with edit parameter
-                        return redirect(f"{reverse('homes:survey_wizard', kwargs={'step': 4})}?edit={index}")
-                except (ValueError, IndexError):
-                    messages.error(request, "Error loading appliance.")
-                return redirect('homes:survey_wizard', step=4)
-            
-            elif 'remove_appliance_index' in request.POST:
-                # Remove appliance from session
-                try:
-                    index = int(request.POST['remove_appliance_index'])
-                    appliances = request.session.get('survey_appliances', [])
-                    if 0 <= index < len(appliances):
-                        removed = appliances.pop(index)
-                        request.session['survey_appliances'] = appliances
-                        request.session.modified = True
-                        messages.success(request, f"Appliance removed!")
-                except (ValueError, IndexError):
-                    messages.error(request, "Error removing appliance.")
-                return redirect('homes:survey_wizard', step=4)
-            
-            elif 'add_appliance' in request.POST:
-                appliance_form = SurveyStep3ApplianceForm(request.POST)
-                if appliance_form.is_valid():
-                    # Check if we're editing an existing appliance
-                    edit_index = request.POST.get('editing_index')
-                    appliances = request.session.get('survey_appliances', [])
-                    
-                    # Prepare appliance data
-                    appliance_data = {}
-                    for key, value in appliance_form.cleaned_data.items():
-                        if hasattr(value, 'isoformat'):
-                            appliance_data[key] = value.isoformat()
-                        elif value is None or isinstance(value, (str, int, float, bool)):
-                            appliance_data[key] = value
-                        else:
-                            appliance_data[key] = str(value)
-                    
-                    if edit_index:
-                        # Update existing appliance
-                        try:
-                            index = int(edit_index)
-                            if 0 <= index < len(appliances):
-                                appliances[index] = appliance_data
-                                messages.success(request, "Appliance updated!")
-                        except (ValueError, IndexError):
-                            messages.error(request, "Error updating appliance.")
-                    else:
-                        # Add new appliance
-                        appliances.append(appliance_data)
-                        messages.success(request, f"Appliance added! You've added {len(appliances)} appliance(s).")
-                    
-                    request.session['survey_appliances'] = appliances
-                    request.session.modified = True
+            values = self.form_values(appliance_form)
+            if request.POST.get('editing_index'):
+                index = self.get_appliance_index(draft, request.POST['editing_index'])
+                if index is None:
+                    messages.error(request, "Error updating appliance.")
                     return redirect('homes:survey_wizard', step=4)
-                else:
-                    appliances_data = request.session.get('survey_appliances', [])
-                    equipment_form = SurveyStep4EquipmentForm(initial=request.session.get('survey_step4', {}))
-                    return render(request, 'homes/survey_step4.html', {
-                        'equipment_form': equipment_form,
-                        'appliance_form': appliance_form,
-                        'step': 4,
-                        'total_steps': 4,
-                        'progress_percent': 100,
-                        'appliances': appliances_data,
-                        'appliance_count': len(appliances_data),
-                    })
-            
-            elif 'complete_wizard' in request.POST:
-                # Create the home with all collected data
-                step1_data = request.session.get('survey_step1', {})
-                step2_data = request.session.get('survey_step2', {})
-                step3_data = request.session.get('survey_step3', {})
-                step4_data = request.session.get('survey_step4', {})
-                
-                if not step1_data or not step2_data or not step3_data:
-                    messages.error(request, "Missing required information. Please start over.")
-                    return redirect('homes:survey_wizard', step=1)
-                
-                # Combine data and create home
-                from datetime import date as dt_date
-                home_data = {**step1_data, **step2_data, **step3_data, **step4_data}
-                # Convert string dates back to date objects if needed
-                for key, value in home_data.items():
-                    if isinstance(value, str) and '-' in value and len(value) == 10:
-                        try:
-                            home_data[key] = dt_date.fromisoformat(value)
-                        except:
-                            pass
-                
-                home = Home.objects.create(owner=request.user, **home_data)
-                
-                # Create appliances
-                appliances_data = request.session.get('survey_appliances', [])
-                for appliance_data in appliances_data:
-                    # Convert string dates back
-                    for key, value in appliance_data.items():
-                        if isinstance(value, str) and '-' in value and len(value) == 10:
-                            try:
-                                appliance_data[key] = dt_date.fromisoformat(value)
-                            except:
-                                pass
-                    Appliance.objects.create(home=home, **appliance_data)
-                
-                # Clear session data
-                request.session.pop('survey_step1', None)
-                request.session.pop('survey_step2', None)
-                request.session.pop('survey_step3', None)
-                request.session.pop('survey_step4', None)
-                request.session.pop('survey_appliances', None)
-                request.session.modified = True
-                
-                messages.success(
-                    request,
-                    f"Home '{home.name}' created successfully with {len(appliances_data)} appliance(s)! "
-                    f"You can now generate a personalized maintenance schedule."
-                )
-                return redirect('maintenance:generate_schedule', home_pk=home.pk)
+                draft.appliances[index] = values
+                messages.success(request, "Appliance updated!")
+            else:
+                draft.appliances.append(values)
+                messages.success(request, f"Appliance added! You've added {len(draft.appliances)} appliance(s).")
+            draft.save_appliances()
+            return redirect('homes:survey_wizard', step=4)
+        
+        elif 'complete_wizard' in request.POST:
+            return self.complete(draft)
         
         return redirect('homes:survey_wizard', step=1)
+    
+    def complete(self, draft):
+        """
+        Validate every step again and create the home with its appliances.
+        Either everything is saved and the draft removed, or nothing is.
+        """
+        request = self.request
+        step_forms = [form_class(draft.get_answers(step)) for step, form_class in self.step_forms.items()]
+        if draft.completed_step < 3 or not all(form.is_valid() for form in step_forms):
+            messages.error(request, "Missing required information. Please start over.")
+            return redirect('homes:survey_wizard', step=1)
+        
+        appliance_forms = [SurveyStep3ApplianceForm(values) for values in draft.appliances]
+        for index, form in enumerate(appliance_forms):
+            if not form.is_valid():
+                messages.error(request, "Please check this appliance before finishing.")
+                return redirect(f"{reverse('homes:survey_wizard', kwargs={'step': 4})}?edit={index}")
+        
+        with transaction.atomic():
+            home = Home(owner=request.user)
+            for form in step_forms:
+                for name, value in form.cleaned_data.items():
+                    setattr(home, name, value)
+            home.save()
+            appliances = [Appliance(home=home, **form.cleaned_data) for form in appliance_forms]
+            for appliance in appliances:
+                appliance.set_match_keys()
+            Appliance.objects.bulk_create(appliances)
+            draft.delete()
+        
+        messages.success(
+            request,
+            f"Home '{home.name}' created successfully with {len(appliance_forms)} appliance(s)! "
+            f"You can now generate a personalized maintenance schedule."
+        )
+        return redirect('maintenance:generate_schedule', home_pk=home.pk)
+
+
+class OnboardingAutosaveView(LoginRequiredMixin, View):
+    """
+    Save one onboarding wizard field as it is edited, so a half-filled step
+    survives a closed tab. Called from the survey step pages.
+    """
+    def post(self, request, *args, **kwargs):
+        try:
+            step = int(request.POST.get('step', ''))
+        except ValueError:
+            step = None
+        form_class = HomeOnboardingWizardView.step_forms.get(step)
+        name = request.POST.get('field', '')
+        if form_class is None or name not in form_class.base_fields:
+            return JsonResponse({'saved': False, 'error': 'Unknown field'}, status=400)
+        
+        # The widget reads 'value' the way it would read the field from a full form post
+        value = form_class.base_fields[name].widget.value_from_datadict(request.POST, request.FILES, 'value')
+        draft, _ = OnboardingDraft.objects.get_or_create(owner=request.user)
+        draft.autosave(step, name, value)
+        return JsonResponse({'saved': True})
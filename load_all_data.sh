@@ -46,6 +46,15 @@ python manage.py loaddata fixtures/tips.json || echo "⚠️  Skipped tips (empt
 echo "10/10 Loading blog posts..."
 python manage.py loaddata fixtures/blog_posts.json || echo "⚠️  Skipped blog posts (empty or error)"
 
+echo "Rebuilding calendar summaries..."
+python manage.py rebuild_calendar_summaries
+
+echo "Rebuilding agenda..."
+python manage.py rebuild_agenda
+
+echo "Rebuilding maintenance statistics..."
+python manage.py rebuild_maintenance_stats
+
 echo ""
 echo "✅ All fixtures loaded successfully!"
 echo "🎉 Production database is now fully populated"
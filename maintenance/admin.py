@@ -3,7 +3,8 @@ Admin configuration for the maintenance app.
 """
 
 from django.contrib import admin
-from .models import MaintenanceTask, Schedule, TaskCompletion, ScheduleTaskCustomization
+from django.db.models import Count
+from .models import MaintenanceTask, Schedule, TaskCompletion, ScheduleTaskCustomization, MonthlyScheduleSummary, ScheduleEvent, AgendaItem, ArchivedSchedule, ApplianceAlert, Tool, DailyMaintenanceStat, MaintenanceStatTotal, CohortBenchmark, TaskCooccurrence, ApplianceRecall, RecallNotice
 
 
 @admin.register(MaintenanceTask)
@@ -96,3 +97,229 @@ class TaskCompletionAdmin(admin.ModelAdmin):
     readonly_fields = ['completed_date']
 
 
+@admin.register(MonthlyScheduleSummary)
+class MonthlyScheduleSummaryAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for the materialized monthly summaries.
+    Rows are maintained automatically; use rebuild_calendar_summaries to repair.
+    """
+    list_display = ['home', 'year', 'month', 'total_tasks', 'completed_tasks', 'overdue_tasks', 'estimated_minutes', 'computed_on']
+    list_filter = ['year', 'month']
+    search_fields = ['home__name', 'home__owner__username']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(AgendaItem)
+class AgendaItemAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for the agenda read model.
+    Rows are maintained automatically; use rebuild_agenda to repair.
+    """
+    list_display = ['task', 'home', 'owner', 'due_date']
+    search_fields = ['home__name', 'owner__username', 'task__title']
+    list_select_related = ['task', 'home', 'owner']
+    date_hierarchy = 'due_date'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(DailyMaintenanceStat)
+class DailyMaintenanceStatAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for the daily statistics read model.
+    Rows are maintained automatically; use rebuild_maintenance_stats to repair.
+    """
+    list_display = ['day', 'home', 'owner', 'category', 'due_tasks', 'completed_tasks', 'on_time_tasks', 'minutes_spent']
+    list_filter = ['category']
+    search_fields = ['home__name', 'owner__username']
+    list_select_related = ['home', 'owner']
+    date_hierarchy = 'day'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(MaintenanceStatTotal)
+class MaintenanceStatTotalAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for the per-owner statistics totals.
+    Rows are maintained automatically; use rebuild_maintenance_stats to repair.
+    """
+    list_display = ['owner', 'category', 'due_tasks', 'completed_tasks', 'on_time_tasks', 'minutes_spent', 'updated_at']
+    list_filter = ['category']
+    search_fields = ['owner__username']
+    list_select_related = ['owner']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(CohortBenchmark)
+class CohortBenchmarkAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for cohort benchmarks.
+    Rows are replaced by compute_cohort_benchmarks.
+    """
+    list_display = [
+        'climate_zone', 'age_bucket', 'construction_type', 'size_band',
+        'home_count', 'completion_rate', 'on_time_rate', 'yearly_hours', 'computed_at',
+    ]
+    list_filter = ['climate_zone', 'age_bucket', 'construction_type', 'size_band']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(TaskCooccurrence)
+class TaskCooccurrenceAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for task co-occurrence.
+    Rows are replaced by compute_task_cooccurrence.
+    """
+    list_display = ['task', 'related_task', 'score']
+    search_fields = ['task__title', 'related_task__title']
+    list_select_related = ['task', 'related_task']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ScheduleEvent)
+class ScheduleEventAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for the append-only schedule history.
+    """
+    list_display = ['created_at', 'event_type', 'home', 'schedule', 'task', 'actor', 'from_date', 'to_date']
+    list_filter = ['event_type', 'created_at']
+    search_fields = ['home__name', 'task__title', 'actor__username', 'note']
+    date_hierarchy = 'created_at'
+    list_select_related = ['home', 'schedule__home', 'task', 'actor']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+    
+    def has_delete_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ArchivedSchedule)
+class ArchivedScheduleAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for schedules moved out by archive_schedules.
+    """
+    list_display = ['original_id', 'home', 'scheduled_date', 'task_count', 'estimated_minutes', 'archived_at']
+    search_fields = ['home__name', 'home__owner__username', 'notes']
+    date_hierarchy = 'scheduled_date'
+    list_select_related = ['home']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ApplianceAlert)
+class ApplianceAlertAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for alerts maintained by scan_appliances.
+    """
+    list_display = ['appliance', 'home', 'kind', 'due_date', 'checked_on', 'created_at']
+    list_filter = ['kind']
+    search_fields = ['home__name', 'home__owner__username', 'appliance__manufacturer']
+    date_hierarchy = 'due_date'
+    list_select_related = ['appliance__home', 'home']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(ApplianceRecall)
+class ApplianceRecallAdmin(admin.ModelAdmin):
+    """
+    Admin interface for manufacturer recalls.
+    Run match_recalls after adding one to notify affected owners.
+    """
+    list_display = ['recall_date', 'manufacturer', 'model_pattern', 'appliance_type', 'title', 'notice_count', 'is_active']
+    list_filter = ['is_active', 'appliance_type']
+    search_fields = ['manufacturer', 'model_pattern', 'title']
+    date_hierarchy = 'recall_date'
+    readonly_fields = ['manufacturer_key', 'model_key', 'is_prefix']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(notice_count=Count('notices'))
+    
+    def notice_count(self, obj):
+        """Display the number of appliances matched so far."""
+        return obj.notice_count
+    notice_count.short_description = 'Notices'
+    notice_count.admin_order_field = 'notice_count'
+
+
+@admin.register(RecallNotice)
+class RecallNoticeAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for recall notices recorded by match_recalls.
+    """
+    list_display = ['recall', 'appliance', 'home', 'schedule', 'created_at', 'dismissed_at']
+    list_filter = ['recall']
+    search_fields = ['home__name', 'home__owner__username', 'appliance__manufacturer', 'appliance__model_number']
+    date_hierarchy = 'created_at'
+    list_select_related = ['recall', 'appliance__home', 'home', 'schedule__home']
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Tool)
+class ToolAdmin(admin.ModelAdmin):
+    """
+    Read-only admin for tools parsed from task tools_required text.
+    """
+    list_display = ['name', 'slug', 'task_count']
+    search_fields = ['name', 'slug']
+    
+    def get_queryset(self, request):
+        return super().get_queryset(request).annotate(task_count=Count('tasks'))
+    
+    def task_count(self, obj):
+        """Display the number of tasks that name this tool."""
+        return obj.task_count
+    task_count.short_description = 'Tasks'
+    task_count.admin_order_field = 'task_count'
+    
+    def has_add_permission(self, request):
+        return False
+    
+    def has_change_permission(self, request, obj=None):
+        return False
@@ -0,0 +1,132 @@
+"""
+Maintenance of the AgendaItem read model.
+
+The agenda holds one row per task that is still open: its schedule is not
+completed and the task hasn't been ticked off individually. Whenever a
+schedule in a month changes, that home's rows for the month are replaced
+from the source tables with one query (the same trigger as the monthly
+summaries). rebuild_agenda() recreates every row from scratch.
+
+Dashboards then read overdue, this-week and this-month lists with range
+scans over the (owner, due_date) or (home, due_date) indexes.
+"""
+
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+
+from .models import AgendaItem, Schedule, ScheduleTaskCompletion
+from .summaries import month_bounds
+
+WEEK_DAYS = 7
+MONTH_DAYS = 30
+LIST_LIMIT = 10
+BATCH_SIZE = 500
+
+
+def _open_task_rows():
+    """
+    Schedule/task M2M rows for open schedules whose task hasn't been
+    completed individually, as (owner, home, schedule, task, date) tuples.
+    """
+    completed = ScheduleTaskCompletion.objects.filter(
+        schedule_id=OuterRef('schedule_id'),
+        task_id=OuterRef('maintenancetask_id'),
+    )
+    return Schedule.tasks.through.objects.filter(
+        schedule__is_completed=False,
+    ).exclude(
+        Exists(completed)
+    ).values_list(
+        'schedule__home__owner_id', 'schedule__home_id', 'schedule_id',
+        'maintenancetask_id', 'schedule__scheduled_date',
+    ).order_by()
+
+
+def _build(rows):
+    return [
+        AgendaItem(owner_id=owner_id, home_id=home_id, schedule_id=schedule_id,
+                   task_id=task_id, due_date=due_date)
+        for owner_id, home_id, schedule_id, task_id, due_date in rows
+    ]
+
+
+def refresh_month(home_id, year, month):
+    """
+    Replace one home's agenda rows for a month. Returns the number of rows.
+    """
+    first_day, last_day = month_bounds(year, month)
+    items = _build(_open_task_rows().filter(
+        schedule__home_id=home_id,
+        schedule__scheduled_date__range=(first_day, last_day),
+    ))
+    # A schedule moved in from another month may still have rows under its
+    # old date if that month hasn't been refreshed yet
+    stale = Q(due_date__range=(first_day, last_day)) | Q(schedule_id__in={item.schedule_id for item in items})
+    with transaction.atomic():
+        AgendaItem.objects.filter(stale, home_id=home_id).delete()
+        AgendaItem.objects.bulk_create(items, batch_size=BATCH_SIZE)
+    return len(items)
+
+
+def rebuild_agenda(home_ids=None):
+    """
+    Recreate agenda rows from scratch, optionally limited to a set of homes.
+    Returns the number of rows written.
+    """
+    rows = _open_task_rows()
+    existing = AgendaItem.objects.all()
+    if home_ids is not None:
+        rows = rows.filter(schedule__home_id__in=home_ids)
+        existing = existing.filter(home_id__in=home_ids)
+    
+    count = 0
+    with transaction.atomic():
+        existing.delete()
+        batch = []
+        for row in rows.iterator(chunk_size=BATCH_SIZE):
+            batch.append(row)
+            if len(batch) == BATCH_SIZE:
+                count += len(AgendaItem.objects.bulk_create(_build(batch)))
+                batch = []
+        count += len(AgendaItem.objects.bulk_create(_build(batch)))
+    return count
+
+
+def dashboard(owner=None, home=None, today=None, limit=LIST_LIMIT):
+    """
+    Overdue, next-7-days and next-30-days sections for a user's homes or a
+    single home. Each section has up to limit items plus its full count;
+    the 30-day section starts where the 7-day one ends so no task appears
+    twice. Four indexed queries at most.
+    """
+    today = today or date.today()
+    week_end = today + timedelta(days=WEEK_DAYS)
+    month_end = today + timedelta(days=MONTH_DAYS)
+    
+    items = AgendaItem.objects.filter(owner=owner) if home is None else AgendaItem.objects.filter(home=home)
+    items = items.select_related('home', 'task').only(
+        'due_date', 'schedule_id', 'home__name', 'task__title', 'task__estimated_time',
+    )
+    sections = [
+        ('overdue', 'Overdue', Q(due_date__lt=today)),
+        ('week', 'Next 7 days', Q(due_date__gte=today, due_date__lt=week_end)),
+        ('month', 'Within 30 days', Q(due_date__gte=week_end, due_date__lt=month_end)),
+    ]
+    counts = items.filter(due_date__lt=month_end).aggregate(
+        **{key: Count('id', filter=condition) for key, _, condition in sections}
+    )
+    
+    result = []
+    for key, label, condition in sections:
+        # Oldest overdue first; nearest upcoming first
+        rows = list(items.filter(condition).order_by('due_date', 'id')[:limit]) if counts[key] else []
+        result.append({
+            'key': key,
+            'label': label,
+            'items': rows,
+            'count': counts[key],
+            'more': counts[key] - len(rows),
+        })
+    return {'sections': result, 'total': sum(counts.values())}
@@ -0,0 +1,157 @@
+"""
+Archival of completed schedules.
+
+archive_schedules() moves schedules that are finished (marked complete, or
+with tasks that are all ticked off) and dated before a cutoff out of the hot
+tables into ArchivedSchedule, one primary-key range at a time. Each chunk
+runs in its own transaction:
+  1. re-select the chunk's schedules that still qualify,
+  2. load them with their tasks, completions, customizations and events,
+  3. bulk-insert one ArchivedSchedule per schedule,
+  4. delete the schedules (their M2M, completion, customization, reminder
+     and agenda rows cascade; events keep their home and lose the link).
+
+Summary refreshes are batched per chunk and the monthly summaries add the
+archive's task counts, so rollups don't change when history is archived.
+An interrupted run leaves whole chunks either archived or untouched and can
+simply be started again.
+"""
+
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, OuterRef, Prefetch, Q
+
+from .models import ArchivedSchedule, MaintenanceTask, Schedule, ScheduleTaskCompletion
+from .signals import batch_changes
+
+DEFAULT_CHUNK_SIZE = 200
+
+
+def archivable(cutoff, home_ids=None):
+    """
+    Schedules dated before cutoff that are marked complete, or that have
+    tasks and all of them ticked off. An open schedule without tasks isn't
+    finished work, so it stays.
+    """
+    tasks = Schedule.tasks.through.objects.filter(schedule_id=OuterRef('pk'))
+    open_tasks = tasks.exclude(
+        Exists(ScheduleTaskCompletion.objects.filter(
+            schedule_id=OuterRef('schedule_id'),
+            task_id=OuterRef('maintenancetask_id'),
+        ))
+    )
+    schedules = Schedule.objects.filter(scheduled_date__lt=cutoff).filter(
+        Q(is_completed=True) | (Exists(tasks) & ~Exists(open_tasks))
+    )
+    if home_ids is not None:
+        schedules = schedules.filter(home_id__in=home_ids)
+    return schedules
+
+
+def _snapshot(schedule):
+    """
+    Build the ArchivedSchedule for a schedule loaded by _load_chunk().
+    """
+    completed = {completion.task_id: completion for completion in schedule.task_completions.all()}
+    tasks = []
+    for task in schedule.tasks.all():
+        completion = completed.get(task.id)
+        tasks.append({
+            'id': task.id,
+            'title': task.title,
+            'slug': task.slug,
+            'category': task.category,
+            'estimated_time': task.estimated_time,
+            'completed_at': completion.completed_at.isoformat() if completion else None,
+            'completed_by': completion.completed_by_id if completion else None,
+        })
+    payload = {
+        'tasks': tasks,
+        'customizations': [
+            {
+                'task_id': customization.task_id,
+                'custom_description': customization.custom_description,
+                'custom_instructions': customization.custom_instructions,
+                'custom_notes': customization.custom_notes,
+            }
+            for customization in schedule.task_customizations.all()
+        ],
+        'completions': [
+            {
+                'completed_by': completion.completed_by_id,
+                'completed_date': completion.completed_date.isoformat(),
+                'actual_time': completion.actual_time,
+                'feedback': completion.feedback,
+                'rating': completion.rating,
+            }
+            for completion in schedule.completions.all()
+        ],
+        'events': [
+            {
+                'event_type': event.event_type,
+                'task_id': event.task_id,
+                'actor': event.actor_id,
+                'from_date': event.from_date.isoformat() if event.from_date else None,
+                'to_date': event.to_date.isoformat() if event.to_date else None,
+                'note': event.note,
+                'created_at': event.created_at.isoformat(),
+            }
+            for event in schedule.events.all()
+        ],
+    }
+    return ArchivedSchedule(
+        original_id=schedule.pk,
+        home_id=schedule.home_id,
+        scheduled_date=schedule.scheduled_date,
+        completed_at=schedule.completed_at,
+        notes=schedule.notes,
+        task_count=len(tasks),
+        estimated_minutes=sum(task['estimated_time'] or 0 for task in tasks),
+        payload=payload,
+        created_at=schedule.created_at,
+    )
+
+
+def _load_chunk(queryset):
+    return list(queryset.prefetch_related(
+        Prefetch('tasks', queryset=MaintenanceTask.objects.only('id', 'title', 'slug', 'category', 'estimated_time')),
+        'task_completions', 'task_customizations', 'completions', 'events',
+    ).order_by('pk'))
+
+
+def archive_chunk(schedule_ids, cutoff):
+    """
+    Archive whichever of the given schedules still qualify, atomically.
+    Returns the number archived.
+    """
+    with batch_changes(), transaction.atomic():
+        schedules = _load_chunk(archivable(cutoff).filter(pk__in=schedule_ids))
+        if not schedules:
+            return 0
+        ArchivedSchedule.objects.bulk_create([_snapshot(schedule) for schedule in schedules])
+        Schedule.objects.filter(pk__in=[schedule.pk for schedule in schedules]).delete()
+    return len(schedules)
+
+
+def archive_schedules(older_than_days=None, chunk_size=DEFAULT_CHUNK_SIZE, home_ids=None,
+                      dry_run=False, today=None):
+    """
+    Archive every qualifying schedule in chunks of chunk_size.
+    Returns counts of schedules archived (or that would be) and chunks run.
+    """
+    if older_than_days is None:
+        older_than_days = settings.SCHEDULE_ARCHIVE_DAYS
+    cutoff = (today or date.today()) - timedelta(days=older_than_days)
+    candidates = archivable(cutoff, home_ids).order_by('pk').values_list('pk', flat=True)
+    stats = {'schedules': 0, 'chunks': 0, 'cutoff': cutoff}
+    
+    last_pk = 0
+    while True:
+        ids = list(candidates.filter(pk__gt=last_pk)[:chunk_size])
+        if not ids:
+            return stats
+        last_pk = ids[-1]
+        stats['chunks'] += 1
+        stats['schedules'] += len(ids) if dry_run else archive_chunk(ids, cutoff)
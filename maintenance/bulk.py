@@ -0,0 +1,399 @@
+"""
+Bulk schedule operations.
+
+BulkScheduleOperations applies a list of operations from one request inside
+a single transaction. Operations are grouped by type and each group runs as
+a handful of set-based queries, so the cost grows with the number of
+operation types rather than the number of items. Every operation gets a
+result dict; invalid ones are reported without affecting the rest.
+
+Supported operations:
+    {"op": "complete_task", "schedule": <id>, "task": <id>}
+    {"op": "uncomplete_task", "schedule": <id>, "task": <id>}
+    {"op": "reschedule", "schedule": <id>, "date": "YYYY-MM-DD", "reason": "..."}
+    {"op": "delete", "schedule": <id>}
+    {"op": "snooze_overdue", "days": 7, "home": <id>}   (both optional)
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import Case, DateField, Exists, OuterRef, Q, Value, When
+from django.utils import timezone
+
+from .models import MaintenanceTask, Schedule, ScheduleEvent, ScheduleTaskCompletion
+from .signals import batch_changes, month_changed, schedules_changed, touch_schedules
+from .utils import ScheduleOptimizer
+
+MAX_OPERATIONS = 500
+DEFAULT_SNOOZE_DAYS = 7
+
+# Deletes run last so other operations on the same schedule still find it
+OPERATION_ORDER = ('uncomplete_task', 'complete_task', 'reschedule', 'snooze_overdue', 'delete')
+
+
+class OperationError(ValueError):
+    """
+    Raised for a request or operation that can't be applied.
+    """
+
+
+def _int_field(raw, field, default=None, required=True):
+    value = raw.get(field)
+    if value is None:
+        if required:
+            raise OperationError(f"'{field}' is required")
+        return default
+    if isinstance(value, bool):
+        raise OperationError(f"'{field}' must be an integer")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise OperationError(f"'{field}' must be an integer")
+
+
+def _date_field(raw, field):
+    try:
+        return date.fromisoformat(raw.get(field))
+    except (TypeError, ValueError):
+        raise OperationError(f"'{field}' must be a date (YYYY-MM-DD)")
+
+
+def _per_schedule(values, output_field):
+    """CASE expression picking values[pk] for each updated schedule."""
+    return Case(
+        *[When(pk=pk, then=Value(value)) for pk, value in values.items()],
+        output_field=output_field,
+    )
+
+
+class BulkScheduleOperations:
+    """
+    Apply a batch of schedule operations for one user.
+    """
+    
+    def __init__(self, user):
+        self.user = user
+        self.today = date.today()
+        self.results = {}
+        self.schedules = {}
+        self.events = []
+    
+    def apply(self, operations):
+        """
+        Validate and apply operations; return one result per operation, in order.
+        Raises OperationError if the request as a whole is malformed.
+        """
+        if not isinstance(operations, list):
+            raise OperationError("'operations' must be a list")
+        if len(operations) > MAX_OPERATIONS:
+            raise OperationError(f"At most {MAX_OPERATIONS} operations per request")
+        
+        by_type = defaultdict(list)
+        for index, raw in enumerate(operations):
+            try:
+                op = self.parse(raw)
+            except OperationError as exc:
+                self.fail({'index': index, 'op': raw.get('op') if isinstance(raw, dict) else None}, exc)
+                continue
+            op['index'] = index
+            by_type[op['op']].append(op)
+        
+        with transaction.atomic(), batch_changes():
+            self.load_schedules(by_type)
+            for name in OPERATION_ORDER:
+                ops = [op for op in by_type[name] if op['index'] not in self.results]
+                if ops:
+                    getattr(self, name)(ops)
+            self.save_events()
+        
+        return [self.results[index] for index in range(len(operations))]
+    
+    def parse(self, raw):
+        """
+        Turn one raw operation into a validated dict.
+        """
+        if not isinstance(raw, dict):
+            raise OperationError('Each operation must be an object')
+        name = raw.get('op')
+        if name not in OPERATION_ORDER:
+            raise OperationError(f"Unknown operation '{name}'")
+        
+        op = {'op': name}
+        if name in ('complete_task', 'uncomplete_task'):
+            op['schedule'] = _int_field(raw, 'schedule')
+            op['task'] = _int_field(raw, 'task')
+        elif name == 'reschedule':
+            op['schedule'] = _int_field(raw, 'schedule')
+            op['date'] = _date_field(raw, 'date')
+            op['reason'] = str(raw.get('reason') or 'Manually rescheduled')[:200]
+        elif name == 'delete':
+            op['schedule'] = _int_field(raw, 'schedule')
+        elif name == 'snooze_overdue':
+            op['days'] = _int_field(raw, 'days', default=DEFAULT_SNOOZE_DAYS, required=False)
+            if not 0 <= op['days'] <= 365:
+                raise OperationError("'days' must be between 0 and 365")
+            op['home'] = _int_field(raw, 'home', required=False)
+        return op
+    
+    def succeed(self, op, status='ok', **extra):
+        self.results[op['index']] = {'index': op['index'], 'op': op['op'], 'status': status, **extra}
+    
+    def fail(self, op, error):
+        self.results[op['index']] = {'index': op['index'], 'op': op['op'], 'status': 'error', 'error': str(error)}
+    
+    def load_schedules(self, by_type):
+        """
+        Fetch every schedule referenced by the batch in one query, limited to
+        the user's homes; operations on anything else fail as not found.
+        """
+        ids = {op['schedule'] for ops in by_type.values() for op in ops if 'schedule' in op}
+        if not ids:
+            return
+        self.schedules = Schedule.objects.filter(
+            pk__in=ids, home__owner=self.user
+        ).select_related('home').defer('notes').in_bulk()
+        for ops in by_type.values():
+            for op in ops:
+                if 'schedule' in op and op['schedule'] not in self.schedules:
+                    self.fail(op, 'Schedule not found')
+    
+    def complete_task(self, ops):
+        """
+        Record task completions and add each task to the schedule for its
+        next occurrence, as ScheduleRemoveTaskView does.
+        """
+        schedule_ids = {op['schedule'] for op in ops}
+        task_ids = {op['task'] for op in ops}
+        membership = set(Schedule.tasks.through.objects.filter(
+            schedule_id__in=schedule_ids, maintenancetask_id__in=task_ids
+        ).values_list('schedule_id', 'maintenancetask_id'))
+        already_done = set(ScheduleTaskCompletion.objects.filter(
+            schedule_id__in=schedule_ids, task_id__in=task_ids
+        ).values_list('schedule_id', 'task_id'))
+        tasks = MaintenanceTask.objects.only('id', 'title', 'frequency').in_bulk(task_ids)
+        
+        completions = []
+        next_occurrences = defaultdict(list)
+        for op in ops:
+            key = (op['schedule'], op['task'])
+            if key not in membership:
+                self.fail(op, 'Task is not in this schedule')
+                continue
+            if key in already_done:
+                self.succeed(op, status='unchanged')
+                continue
+            already_done.add(key)
+            schedule = self.schedules[op['schedule']]
+            task = tasks[op['task']]
+            next_date = ScheduleOptimizer.generate_next_due_date(task, schedule.home, schedule.scheduled_date)
+            completions.append(ScheduleTaskCompletion(
+                schedule_id=schedule.pk,
+                task_id=task.pk,
+                completed_by=self.user,
+                next_scheduled_date=next_date,
+            ))
+            next_occurrences[(schedule.home_id, next_date)].append(task)
+            self.events.append(ScheduleEvent.build(
+                schedule, 'complete', actor=self.user, task_id=task.pk, to_date=next_date
+            ))
+            self.succeed(op, next_date=next_date.isoformat())
+        
+        if not completions:
+            return
+        ScheduleTaskCompletion.objects.bulk_create(completions)
+        completed_schedule_ids = {completion.schedule_id for completion in completions}
+        touch_schedules(completed_schedule_ids)
+        schedules_changed(completed_schedule_ids)
+        self.add_next_occurrences(next_occurrences)
+    
+    def add_next_occurrences(self, next_occurrences):
+        """
+        Add tasks to the home's schedule on each date, creating the missing
+        schedules with one bulk insert.
+        """
+        targets = {}
+        for pk, home_id, scheduled_date in Schedule.objects.filter(
+            home_id__in={home_id for home_id, _ in next_occurrences},
+            scheduled_date__in={scheduled_date for _, scheduled_date in next_occurrences},
+        ).order_by('pk').values_list('pk', 'home_id', 'scheduled_date'):
+            targets.setdefault((home_id, scheduled_date), pk)
+        
+        new_schedules = {
+            key: Schedule(
+                home_id=key[0],
+                scheduled_date=key[1],
+                notes='Auto-generated: ' + ', '.join(
+                    f"{task.title} ({task.get_frequency_display()} maintenance)" for task in tasks
+                ),
+                is_completed=False,
+            )
+            for key, tasks in next_occurrences.items()
+            if key not in targets
+        }
+        Schedule.objects.bulk_create(new_schedules.values())
+        targets.update({key: schedule.pk for key, schedule in new_schedules.items()})
+        
+        Schedule.tasks.through.objects.bulk_create(
+            [
+                Schedule.tasks.through(schedule_id=targets[key], maintenancetask_id=task.pk)
+                for key, tasks in next_occurrences.items()
+                for task in tasks
+            ],
+            ignore_conflicts=True,
+        )
+        touch_schedules(targets.values())
+        schedules_changed(targets.values())
+    
+    def uncomplete_task(self, ops):
+        """
+        Delete completion records and take each task back off the schedule
+        it was auto-added to, deleting schedules left with no tasks.
+        """
+        completions = {
+            (completion.schedule_id, completion.task_id): completion
+            for completion in ScheduleTaskCompletion.objects.filter(
+                schedule_id__in={op['schedule'] for op in ops},
+                task_id__in={op['task'] for op in ops},
+            ).only('id', 'schedule_id', 'task_id', 'next_scheduled_date')
+        }
+        
+        undone = {}
+        for op in ops:
+            completion = completions.get((op['schedule'], op['task']))
+            if completion is None:
+                self.succeed(op, status='unchanged')
+                continue
+            undone[completion.pk] = completion
+            self.events.append(ScheduleEvent.build(
+                self.schedules[op['schedule']], 'uncomplete', actor=self.user, task_id=op['task']
+            ))
+            self.succeed(op)
+        if not undone:
+            return
+        ScheduleTaskCompletion.objects.filter(pk__in=undone).delete()
+        
+        # (home, date, task) triples whose auto-generated occurrence goes away
+        occurrences = {
+            (self.schedules[completion.schedule_id].home_id, completion.next_scheduled_date, completion.task_id)
+            for completion in undone.values()
+            if completion.next_scheduled_date
+        }
+        if not occurrences:
+            return
+        future = defaultdict(list)
+        for pk, home_id, scheduled_date in Schedule.objects.filter(
+            home_id__in={home_id for home_id, _, _ in occurrences},
+            scheduled_date__in={scheduled_date for _, scheduled_date, _ in occurrences},
+        ).values_list('pk', 'home_id', 'scheduled_date'):
+            future[(home_id, scheduled_date)].append(pk)
+        
+        rows = Q()
+        future_ids = set()
+        for home_id, scheduled_date, task_id in occurrences:
+            pks = future.get((home_id, scheduled_date))
+            if pks:
+                rows |= Q(schedule_id__in=pks, maintenancetask_id=task_id)
+                future_ids.update(pks)
+        if not future_ids:
+            return
+        Schedule.tasks.through.objects.filter(rows).delete()
+        touch_schedules(future_ids)
+        schedules_changed(future_ids)
+        Schedule.objects.filter(pk__in=future_ids).exclude(
+            Exists(Schedule.tasks.through.objects.filter(schedule_id=OuterRef('pk')))
+        ).delete()
+    
+    def reschedule(self, ops):
+        """
+        Move schedules to new dates with one UPDATE. If a schedule appears
+        more than once, the last operation wins.
+        """
+        latest = {op['schedule']: op for op in ops}
+        for op in ops:
+            old_date = self.schedules[op['schedule']].scheduled_date
+            self.succeed(op, old_date=old_date.isoformat(), new_date=latest[op['schedule']]['date'].isoformat())
+        
+        moved = {pk: op for pk, op in latest.items() if op['date'] != self.schedules[pk].scheduled_date}
+        if moved:
+            self.move_schedules(
+                {pk: op['date'] for pk, op in moved.items()},
+                {pk: op['reason'] for pk, op in moved.items()},
+            )
+    
+    def snooze_overdue(self, ops):
+        """
+        Push every overdue schedule that still has pending tasks to
+        today + days (optionally for one home only).
+        """
+        pending_task = Schedule.tasks.through.objects.filter(schedule_id=OuterRef('pk')).exclude(
+            Exists(ScheduleTaskCompletion.objects.filter(
+                schedule_id=OuterRef('schedule_id'), task_id=OuterRef('maintenancetask_id')
+            ))
+        )
+        for op in ops:
+            overdue = Schedule.objects.filter(
+                home__owner=self.user,
+                is_completed=False,
+                scheduled_date__lt=self.today,
+            ).filter(Exists(pending_task))
+            if op['home'] is not None:
+                overdue = overdue.filter(home_id=op['home'])
+            new_date = self.today + timedelta(days=op['days'])
+            
+            schedules = {
+                pk: (home_id, scheduled_date)
+                for pk, home_id, scheduled_date in overdue.values_list('pk', 'home_id', 'scheduled_date')
+            }
+            if schedules:
+                self.move_schedules(
+                    {pk: new_date for pk in schedules},
+                    {pk: 'Snoozed overdue tasks' for pk in schedules},
+                    origins=schedules,
+                )
+            self.succeed(op, count=len(schedules), new_date=new_date.isoformat(), schedules=sorted(schedules))
+    
+    def move_schedules(self, new_dates, reasons, origins=None):
+        """
+        Set scheduled_date per schedule with one UPDATE, log the moves and
+        refresh both the old and new months.
+        """
+        if origins is None:
+            origins = {pk: (self.schedules[pk].home_id, self.schedules[pk].scheduled_date) for pk in new_dates}
+        Schedule.objects.filter(pk__in=new_dates).update(
+            scheduled_date=_per_schedule(new_dates, DateField()),
+            updated_at=timezone.now(),
+        )
+        for pk, new_date in new_dates.items():
+            home_id, old_date = origins[pk]
+            self.events.append(ScheduleEvent(
+                schedule_id=pk,
+                home_id=home_id,
+                event_type='reschedule',
+                actor=self.user,
+                from_date=old_date,
+                to_date=new_date,
+                note=reasons[pk],
+            ))
+            month_changed(home_id, old_date)
+            month_changed(home_id, new_date)
+            if pk in self.schedules:
+                self.schedules[pk].scheduled_date = new_date
+    
+    def save_events(self):
+        """
+        Insert the events logged so far with one bulk INSERT.
+        """
+        ScheduleEvent.objects.bulk_create(self.events)
+        self.events = []
+    
+    def delete(self, ops):
+        """
+        Delete schedules with one cascading delete.
+        """
+        # Earlier operations' events must exist before their schedules go away
+        self.save_events()
+        Schedule.objects.filter(pk__in={op['schedule'] for op in ops}).delete()
+        for op in ops:
+            self.succeed(op)
@@ -0,0 +1,252 @@
+"""
+Benchmarks of maintenance habits across similar homes.
+
+Homes are grouped by climate zone, age bucket (from Home.get_age()),
+construction type and square-footage band. compute_benchmarks() is the
+periodic batch job: over the last PERIOD_DAYS days it reads each home's
+totals from DailyMaintenanceStat and its skipped tasks from the schedule
+tables, in three aggregate queries, and replaces the CohortBenchmark
+table with, per cohort:
+  - the median completion and on-time rates,
+  - average hours of maintenance logged,
+  - the tasks most often left undone.
+
+Every home also counts towards broader cohorts that ignore size, then
+construction type, then age (LEVELS). Cohorts with fewer than
+MIN_COHORT_HOMES active homes are not stored, so no benchmark describes
+a handful of identifiable neighbours; home_comparison() uses the
+narrowest stored cohort that a home belongs to, found with one indexed
+lookup, and never aggregates other homes at request time.
+"""
+
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+from statistics import median
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q, Sum
+
+from homes.models import Home
+from .models import (
+    ArchivedSchedule, CohortBenchmark, DailyMaintenanceStat, MaintenanceTask, Schedule, ScheduleTaskCompletion,
+)
+
+PERIOD_DAYS = 365
+MIN_COHORT_HOMES = 5
+MAX_SKIPPED_TASKS = 5
+
+# A task must have come due this many times in a cohort to be ranked
+MIN_TASK_DUE = 3
+
+# (upper bound in years, key, label); the last bucket has no upper bound
+AGE_BUCKETS = [
+    (10, 'under_10', 'Under 10 years'),
+    (30, '10_29', '10-29 years'),
+    (50, '30_49', '30-49 years'),
+    (None, '50_plus', '50+ years'),
+]
+
+# (upper bound in square feet, key, label)
+SIZE_BANDS = [
+    (1500, 'small', 'Under 1,500 sq ft'),
+    (2500, 'medium', '1,500-2,499 sq ft'),
+    (3500, 'large', '2,500-3,499 sq ft'),
+    (None, 'very_large', '3,500+ sq ft'),
+]
+UNKNOWN_SIZE = 'unknown'
+
+KEY_FIELDS = ('climate_zone', 'age_bucket', 'construction_type', 'size_band')
+
+# Narrowest first: how many of KEY_FIELDS each level keeps
+LEVELS = (4, 3, 2, 1)
+
+AGE_LABELS = {key: label for _, key, label in AGE_BUCKETS}
+SIZE_LABELS = {key: label for _, key, label in SIZE_BANDS}
+SIZE_LABELS[UNKNOWN_SIZE] = 'Size not given'
+
+
+def _bucket(value, buckets):
+    for upper, key, _ in buckets:
+        if upper is None or value < upper:
+            return key
+
+
+def age_bucket(age):
+    return _bucket(max(age, 0), AGE_BUCKETS)
+
+
+def size_band(square_footage):
+    if square_footage is None:
+        return UNKNOWN_SIZE
+    return _bucket(square_footage, SIZE_BANDS)
+
+
+def cohort_key(climate_zone, age, construction_type, square_footage):
+    """
+    The narrowest cohort a home belongs to, as a tuple of KEY_FIELDS values.
+    """
+    return (climate_zone, age_bucket(age), construction_type, size_band(square_footage))
+
+
+def cohort_keys(key):
+    """
+    The key at every level of LEVELS, narrowest first; dropped fields are blank.
+    """
+    return [key[:level] + ('',) * (len(KEY_FIELDS) - level) for level in LEVELS]
+
+
+def _rate(part, whole):
+    return round(100 * part / whole)
+
+
+def compute_benchmarks(today=None):
+    """
+    Replace every CohortBenchmark with numbers for the PERIOD_DAYS days
+    before today. Returns counts of active homes and cohorts stored.
+    """
+    today = today or date.today()
+    start = today - timedelta(days=PERIOD_DAYS)
+    end = today - timedelta(days=1)
+    
+    # Age as Home.get_age() computes it, for the year being benchmarked
+    homes = {
+        pk: cohort_key(zone, today.year - year_built, construction, square_footage)
+        for pk, zone, year_built, construction, square_footage in Home.objects.values_list(
+            'pk', 'climate_zone', 'year_built', 'construction_type', 'square_footage',
+        ).iterator()
+    }
+    
+    # Each home's totals over the period, from the statistics read model
+    per_home = DailyMaintenanceStat.objects.filter(day__range=(start, end)).values('home_id').annotate(
+        due=Sum('due_tasks'), completed=Sum('completed_tasks'),
+        on_time=Sum('on_time_tasks'), minutes=Sum('minutes_spent'),
+    ).order_by()
+    cohorts = defaultdict(lambda: {
+        'completion': [], 'on_time': [], 'minutes': 0, 'due': Counter(), 'skipped': Counter(),
+    })
+    active = {}
+    for row in per_home.iterator():
+        key = homes.get(row['home_id'])
+        if key is None or not row['due']:
+            continue
+        active[row['home_id']] = cohort_keys(key)
+        for cohort in active[row['home_id']]:
+            numbers = cohorts[cohort]
+            numbers['completion'].append(_rate(row['completed'], row['due']))
+            numbers['on_time'].append(_rate(row['on_time'], row['due']))
+            numbers['minutes'] += row['minutes']
+    
+    # Per task: how often it came due and how often it was left undone.
+    # Archived schedules were finished, so they only add to the due counts.
+    ticked = ScheduleTaskCompletion.objects.filter(
+        schedule_id=OuterRef('schedule_id'),
+        task_id=OuterRef('maintenancetask_id'),
+    )
+    due = Schedule.tasks.through.objects.filter(
+        schedule__scheduled_date__range=(start, end),
+    ).values_list('schedule__home_id', 'maintenancetask_id').annotate(
+        due=Count('pk'), skipped=Count('pk', filter=Q(schedule__is_completed=False) & ~Exists(ticked)),
+    ).order_by()
+    for home_id, task_id, due_count, skipped_count in due.iterator():
+        for cohort in active.get(home_id, ()):
+            cohorts[cohort]['due'][task_id] += due_count
+            cohorts[cohort]['skipped'][task_id] += skipped_count
+    archived = ArchivedSchedule.objects.filter(
+        scheduled_date__range=(start, end), home_id__in=list(active),
+    ).values_list('home_id', 'payload__tasks')
+    for home_id, tasks in archived.iterator():
+        task_ids = [task['id'] for task in tasks or [] if task.get('id')]
+        for cohort in active[home_id]:
+            cohorts[cohort]['due'].update(task_ids)
+    
+    benchmarks = []
+    for key, numbers in cohorts.items():
+        home_count = len(numbers['completion'])
+        if home_count < MIN_COHORT_HOMES:
+            continue
+        skip_rates = sorted(
+            (
+                (_rate(skipped, numbers['due'][task_id]), task_id)
+                for task_id, skipped in numbers['skipped'].items()
+                if skipped and numbers['due'][task_id] >= MIN_TASK_DUE
+            ),
+            key=lambda item: (-item[0], item[1]),
+        )[:MAX_SKIPPED_TASKS]
+        benchmarks.append((key, CohortBenchmark(
+            **dict(zip(KEY_FIELDS, key)),
+            home_count=home_count,
+            completion_rate=round(median(numbers['completion'])),
+            on_time_rate=round(median(numbers['on_time'])),
+            yearly_hours=round(numbers['minutes'] / 60 / home_count, 1),
+            skipped_tasks=skip_rates,
+            period_start=start,
+            period_end=end,
+        )))
+    
+    titles = MaintenanceTask.objects.in_bulk(
+        {task_id for _, benchmark in benchmarks for _, task_id in benchmark.skipped_tasks}
+    )
+    for _, benchmark in benchmarks:
+        benchmark.skipped_tasks = [
+            {'id': task_id, 'title': titles[task_id].title, 'slug': titles[task_id].slug, 'skip_rate': rate}
+            for rate, task_id in benchmark.skipped_tasks
+            if task_id in titles
+        ]
+    
+    with transaction.atomic():
+        CohortBenchmark.objects.all().delete()
+        CohortBenchmark.objects.bulk_create(
+            [benchmark for _, benchmark in sorted(benchmarks, key=lambda item: item[0])]
+        )
+    return {'homes': len(active), 'cohorts': len(benchmarks)}
+
+
+def home_comparison(home, today=None):
+    """
+    The home's numbers next to those of the narrowest stored cohort it
+    belongs to, or None when no cohort is large enough. Two queries: the
+    benchmark lookup and the home's own totals for the same period.
+    """
+    today = today or date.today()
+    keys = cohort_keys(cohort_key(
+        home.climate_zone, home.get_age(), home.construction_type, home.square_footage,
+    ))
+    lookup = Q()
+    for key in keys:
+        lookup |= Q(**dict(zip(KEY_FIELDS, key)))
+    found = {
+        tuple(getattr(benchmark, field) for field in KEY_FIELDS): benchmark
+        for benchmark in CohortBenchmark.objects.filter(lookup)
+    }
+    benchmark = next((found[key] for key in keys if key in found), None)
+    if benchmark is None:
+        return None
+    
+    own = DailyMaintenanceStat.objects.filter(
+        home=home, day__range=(benchmark.period_start, benchmark.period_end),
+    ).aggregate(
+        due=Sum('due_tasks'), completed=Sum('completed_tasks'),
+        on_time=Sum('on_time_tasks'), minutes=Sum('minutes_spent'),
+    )
+    due = own['due'] or 0
+    return {
+        'benchmark': benchmark,
+        'description': describe(benchmark),
+        'completion_rate': _rate(own['completed'], due) if due else None,
+        'on_time_rate': _rate(own['on_time'], due) if due else None,
+        'yearly_hours': round((own['minutes'] or 0) / 60, 1),
+    }
+
+
+def describe(benchmark):
+    """
+    A short label for a cohort, e.g. "Temperate, 10-29 years, Brick homes".
+    """
+    parts = [dict(Home.CLIMATE_ZONES).get(benchmark.climate_zone, benchmark.climate_zone)]
+    if benchmark.age_bucket:
+        parts.append(AGE_LABELS.get(benchmark.age_bucket, benchmark.age_bucket))
+    if benchmark.construction_type:
+        parts.append(dict(Home.CONSTRUCTION_TYPES).get(benchmark.construction_type, benchmark.construction_type))
+    if benchmark.size_band:
+        parts.append(SIZE_LABELS.get(benchmark.size_band, benchmark.size_band))
+    return ', '.join(parts) + ' homes'
@@ -0,0 +1,159 @@
+"""
+"Homes like yours also schedule" suggestions.
+
+compute_cooccurrence() is a periodic batch job. It reads which tasks each
+home has scheduled over the last PERIOD_DAYS days, with completed tasks
+(ticked off, in a completed schedule, or archived) counting fully and
+tasks that were only scheduled counting SCHEDULED_WEIGHT. Co-occurrence
+is counted between pairs of homes rather than only within one home: task
+a in home h and task b in home g add sim(h, g) times their weights, where
+sim is the Jaccard similarity of the homes' feature profiles (climate,
+construction, age bucket and the has_* features). A task is therefore
+linked most strongly with what similar homes do alongside it.
+
+Homes with the same profile are summed together first, so the work grows
+with the number of distinct profiles rather than with pairs of homes.
+Scores are normalized (cosine), and only the TOP_K best related tasks of
+each task are kept, with tasks scheduled by fewer than MIN_SUPPORT homes
+left out. The TaskCooccurrence table is then replaced.
+
+suggested_tasks() reads that table in one query at request time, joined
+on the unique (task, related_task) index, summing the scores of the
+tasks the home already schedules.
+"""
+
+import math
+from collections import Counter, defaultdict
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.db.models import BooleanField, Count, Exists, OuterRef, Q, Sum
+
+from homes.models import Home
+from .cohorts import age_bucket
+from .models import ArchivedSchedule, MaintenanceTask, Schedule, ScheduleTaskCompletion, TaskCooccurrence
+
+PERIOD_DAYS = 730
+SCHEDULED_WEIGHT = 0.5
+MIN_SIMILARITY = 0.5
+MIN_SUPPORT = 3
+TOP_K = 20
+BATCH_SIZE = 1000
+
+FEATURE_FLAGS = tuple(
+    field.name for field in Home._meta.fields
+    if field.name.startswith('has_') and isinstance(field, BooleanField)
+)
+
+
+def home_profile(climate_zone, construction_type, age, flags):
+    """
+    A home's features as a set of strings, for Jaccard similarity.
+    """
+    profile = {f'climate:{climate_zone}', f'construction:{construction_type}', f'age:{age_bucket(age)}'}
+    profile.update(name for name, value in zip(FEATURE_FLAGS, flags) if value)
+    return frozenset(profile)
+
+
+def similarity(a, b):
+    return len(a & b) / len(a | b)
+
+
+def _home_tasks(start, end):
+    """
+    {home id: {task id: weight}} for tasks scheduled between start and end.
+    """
+    ticked = ScheduleTaskCompletion.objects.filter(
+        schedule_id=OuterRef('schedule_id'),
+        task_id=OuterRef('maintenancetask_id'),
+    )
+    scheduled = Schedule.tasks.through.objects.filter(
+        schedule__scheduled_date__range=(start, end),
+    ).values_list('schedule__home_id', 'maintenancetask_id').annotate(
+        done=Count('pk', filter=Q(schedule__is_completed=True) | Exists(ticked)),
+    ).order_by()
+    home_tasks = defaultdict(dict)
+    for home_id, task_id, done in scheduled.iterator():
+        home_tasks[home_id][task_id] = 1.0 if done else SCHEDULED_WEIGHT
+    archived = ArchivedSchedule.objects.filter(
+        scheduled_date__range=(start, end),
+    ).values_list('home_id', 'payload__tasks')
+    for home_id, tasks in archived.iterator():
+        for task in tasks or []:
+            if task.get('id'):
+                home_tasks[home_id][task['id']] = 1.0
+    return home_tasks
+
+
+def compute_cooccurrence(today=None):
+    """
+    Replace the TaskCooccurrence table from schedules over the PERIOD_DAYS
+    days up to today. Returns counts of homes, profiles and rows stored.
+    """
+    today = today or date.today()
+    home_tasks = _home_tasks(today - timedelta(days=PERIOD_DAYS), today)
+    active_tasks = set(MaintenanceTask.objects.filter(is_active=True).values_list('pk', flat=True))
+    
+    # Sum the task weights of homes that share a profile
+    profiles = {}
+    support = Counter()
+    homes = Home.objects.filter(pk__in=list(home_tasks)).values_list(
+        'pk', 'climate_zone', 'construction_type', 'year_built', *FEATURE_FLAGS,
+    )
+    for pk, climate_zone, construction_type, year_built, *flags in homes.iterator():
+        profile = home_profile(climate_zone, construction_type, today.year - year_built, flags)
+        totals = profiles.setdefault(profile, Counter())
+        for task_id, weight in home_tasks[pk].items():
+            if task_id in active_tasks:
+                totals[task_id] += weight
+                support[task_id] += 1
+    profiles = list(profiles.items())
+    
+    # Task weights of every home, each scaled by its similarity to a profile
+    counts = defaultdict(Counter)
+    for profile, totals in profiles:
+        nearby = Counter()
+        for other, other_totals in profiles:
+            weight = similarity(profile, other)
+            if weight >= MIN_SIMILARITY:
+                for task_id, value in other_totals.items():
+                    nearby[task_id] += weight * value
+        nearby = list(nearby.items())
+        for task_id, value in totals.items():
+            row = counts[task_id]
+            for other_id, other_value in nearby:
+                row[other_id] += value * other_value
+    
+    rows = []
+    for task_id, row in counts.items():
+        own = row[task_id]
+        scored = [
+            (value / math.sqrt(own * counts[other_id][other_id]), other_id)
+            for other_id, value in row.items()
+            if other_id != task_id and support[other_id] >= MIN_SUPPORT
+        ]
+        scored.sort(key=lambda item: (-item[0], item[1]))
+        rows.extend(
+            TaskCooccurrence(task_id=task_id, related_task_id=other_id, score=round(score, 4))
+            for score, other_id in scored[:TOP_K]
+        )
+    
+    with transaction.atomic():
+        TaskCooccurrence.objects.all().delete()
+        TaskCooccurrence.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+    return {'homes': len(home_tasks), 'profiles': len(profiles), 'rows': len(rows)}
+
+
+def suggested_tasks(home, limit=10):
+    """
+    Active tasks similar homes do alongside the ones this home schedules,
+    best first, each with a similar_score. Tasks the home already has are
+    left out. One query.
+    """
+    scheduled = Schedule.tasks.through.objects.filter(schedule__home=home).values('maintenancetask_id')
+    return MaintenanceTask.objects.filter(
+        is_active=True,
+        cooccurrence_sources__task_id__in=scheduled,
+    ).exclude(pk__in=scheduled).annotate(
+        similar_score=Sum('cooccurrence_sources__score'),
+    ).order_by('-similar_score', 'title')[:limit]
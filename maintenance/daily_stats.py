@@ -0,0 +1,345 @@
+"""
+Maintenance of the DailyMaintenanceStat and MaintenanceStatTotal read
+models behind the statistics page.
+
+Whenever a schedule in a month changes (the same trigger as the monthly
+summaries and the agenda), or time is logged against one, that home's
+daily rows for the month are recomputed from the source tables: one
+query over the month's schedule tasks, one for logged time and one for
+archived schedules, so archiving history leaves the numbers unchanged.
+The difference between the old and new rows is then added to the
+owner's per-category totals, so totals never need a scan of history.
+
+owner_statistics() reads those totals, the rows for days still ahead
+and one grouped query over the last STREAK_MONTHS months: three queries
+whose size doesn't grow with the length of an owner's history.
+rebuild_stats() recreates everything from scratch.
+"""
+
+import calendar
+from datetime import date, datetime
+
+from django.db import transaction
+from django.db.models import F, OuterRef, Subquery, Sum
+from django.db.models.functions import ExtractMonth, ExtractYear
+from django.utils import timezone
+
+from homes.models import Home
+from .models import (
+    ArchivedSchedule, DailyMaintenanceStat, MaintenanceStatTotal, MaintenanceTask, Schedule,
+    ScheduleTaskCompletion, TaskCompletion,
+)
+from .summaries import month_bounds
+
+FIELDS = ('due_tasks', 'completed_tasks', 'on_time_tasks', 'minutes_spent')
+BATCH_SIZE = 500
+TREND_MONTHS = 12
+STREAK_MONTHS = 24
+
+CATEGORIES = dict(MaintenanceTask.CATEGORY_CHOICES)
+
+
+def _local_date(value):
+    """
+    The local date of a completion time; archived rows store ISO strings.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if timezone.is_aware(value):
+        value = timezone.localtime(value)
+    return value.date()
+
+
+def month_counts(home_id, year, month):
+    """
+    {(day, category): {field: count}} for one home and month, from live
+    and archived schedules. A task is on time if it was ticked off, or
+    its whole schedule completed, no later than its scheduled day.
+    """
+    first_day, last_day = month_bounds(year, month)
+    counts = {}
+    
+    def add(day, category, **values):
+        row = counts.setdefault((day, category), dict.fromkeys(FIELDS, 0))
+        for field, value in values.items():
+            row[field] += value
+    
+    ticked = ScheduleTaskCompletion.objects.filter(
+        schedule_id=OuterRef('schedule_id'),
+        task_id=OuterRef('maintenancetask_id'),
+    ).values('completed_at')[:1]
+    tasks = Schedule.tasks.through.objects.filter(
+        schedule__home_id=home_id,
+        schedule__scheduled_date__range=(first_day, last_day),
+    ).annotate(ticked_at=Subquery(ticked)).values_list(
+        'schedule__scheduled_date', 'maintenancetask__category',
+        'schedule__is_completed', 'schedule__completed_at', 'ticked_at',
+    ).order_by()
+    for day, category, is_completed, schedule_completed_at, ticked_at in tasks:
+        done_at = ticked_at or (schedule_completed_at if is_completed else None)
+        completed = ticked_at is not None or is_completed
+        add(
+            day, category, due_tasks=1, completed_tasks=int(completed),
+            on_time_tasks=int(done_at is not None and _local_date(done_at) <= day),
+        )
+    
+    logged = TaskCompletion.objects.filter(
+        schedule__home_id=home_id,
+        schedule__scheduled_date__range=(first_day, last_day),
+        actual_time__gt=0,
+    ).values_list('schedule__scheduled_date').annotate(minutes=Sum('actual_time')).order_by()
+    for day, minutes in logged:
+        add(day, '', minutes_spent=minutes)
+    
+    # Archived schedules are finished: every task was ticked off or the
+    # schedule as a whole was completed
+    archived = ArchivedSchedule.objects.filter(
+        home_id=home_id,
+        scheduled_date__range=(first_day, last_day),
+    ).values_list('scheduled_date', 'completed_at', 'payload__tasks', 'payload__completions')
+    for day, schedule_completed_at, archived_tasks, completions in archived:
+        for task in archived_tasks or []:
+            done_at = task.get('completed_at') or schedule_completed_at
+            add(
+                day, task.get('category') or 'general', due_tasks=1, completed_tasks=1,
+                on_time_tasks=int(done_at is not None and _local_date(done_at) <= day),
+            )
+        minutes = sum(completion.get('actual_time') or 0 for completion in completions or [])
+        if minutes > 0:
+            add(day, '', minutes_spent=minutes)
+    return counts
+
+
+def _apply_deltas(owner_id, deltas):
+    """
+    Add {category: {field: delta}} to an owner's running totals.
+    """
+    for category, delta in deltas.items():
+        if not any(delta.values()):
+            continue
+        updated = MaintenanceStatTotal.objects.filter(owner_id=owner_id, category=category).update(
+            updated_at=timezone.now(), **{field: F(field) + delta[field] for field in FIELDS}
+        )
+        if not updated:
+            MaintenanceStatTotal.objects.create(owner_id=owner_id, category=category, **delta)
+
+
+def refresh_month(home_id, year, month):
+    """
+    Recompute one home's daily rows for a month and fold the change into
+    its owner's totals. Returns the number of daily rows.
+    """
+    owner_id = Home.objects.filter(pk=home_id).values_list('owner_id', flat=True).first()
+    if owner_id is None:
+        # Deleted home; home_deleted() already took its rows out of the totals
+        return 0
+    first_day, last_day = month_bounds(year, month)
+    counts = month_counts(home_id, year, month)
+    zero = dict.fromkeys(FIELDS, 0)
+    
+    with transaction.atomic():
+        existing = {
+            (row.day, row.category): row
+            for row in DailyMaintenanceStat.objects.select_for_update().filter(
+                home_id=home_id, day__range=(first_day, last_day),
+            )
+        }
+        deltas = {}
+        changed = []
+        for key in existing.keys() | counts.keys():
+            new = counts.get(key, zero)
+            old = {field: getattr(existing[key], field) for field in FIELDS} if key in existing else zero
+            if new == old:
+                continue
+            delta = deltas.setdefault(key[1], dict(zero))
+            for field in FIELDS:
+                delta[field] += new[field] - old[field]
+            if key in counts:
+                changed.append(DailyMaintenanceStat(
+                    owner_id=owner_id, home_id=home_id, day=key[0], category=key[1], **new,
+                ))
+        
+        stale = [row.pk for key, row in existing.items() if key not in counts]
+        if stale:
+            DailyMaintenanceStat.objects.filter(pk__in=stale).delete()
+        if changed:
+            DailyMaintenanceStat.objects.bulk_create(
+                changed,
+                batch_size=BATCH_SIZE,
+                update_conflicts=True,
+                unique_fields=['home', 'day', 'category'],
+                update_fields=['owner', *FIELDS],
+            )
+        _apply_deltas(owner_id, deltas)
+    return len(counts)
+
+
+def home_deleted(home_id):
+    """
+    Take a home that is about to be deleted out of its owner's totals.
+    Its daily rows go with it.
+    """
+    sums = DailyMaintenanceStat.objects.filter(home_id=home_id).values('owner_id', 'category').annotate(
+        **{f'sum_{field}': Sum(field) for field in FIELDS}
+    ).order_by()
+    for row in sums:
+        _apply_deltas(row['owner_id'], {row['category']: {field: -row[f'sum_{field}'] for field in FIELDS}})
+
+
+def rebuild_stats(home_ids=None):
+    """
+    Recreate daily rows for every home and month with schedules, then the
+    totals of the owners concerned from those rows. Returns the number of
+    daily rows written.
+    """
+    months = set()
+    for model in (Schedule, ArchivedSchedule):
+        queryset = model.objects.all()
+        if home_ids is not None:
+            queryset = queryset.filter(home_id__in=home_ids)
+        months.update(queryset.values_list(
+            'home_id', ExtractYear('scheduled_date'), ExtractMonth('scheduled_date'),
+        ).distinct().order_by())
+    owners = dict(Home.objects.filter(pk__in={home_id for home_id, _, _ in months}).values_list('pk', 'owner_id'))
+    
+    rows = [
+        DailyMaintenanceStat(owner_id=owners[home_id], home_id=home_id, day=day, category=category, **values)
+        for home_id, year, month in sorted(months)
+        for (day, category), values in month_counts(home_id, year, month).items()
+    ]
+    
+    with transaction.atomic():
+        existing = DailyMaintenanceStat.objects.all()
+        if home_ids is not None:
+            existing = existing.filter(home_id__in=home_ids)
+        owner_ids = set(owners.values()) | set(existing.values_list('owner_id', flat=True).distinct())
+        existing.delete()
+        DailyMaintenanceStat.objects.bulk_create(rows, batch_size=BATCH_SIZE)
+        
+        totals = DailyMaintenanceStat.objects.filter(owner_id__in=owner_ids).values('owner_id', 'category').annotate(
+            **{f'sum_{field}': Sum(field) for field in FIELDS}
+        ).order_by()
+        MaintenanceStatTotal.objects.filter(owner_id__in=owner_ids).delete()
+        MaintenanceStatTotal.objects.bulk_create([
+            MaintenanceStatTotal(
+                owner_id=row['owner_id'], category=row['category'],
+                **{field: row[f'sum_{field}'] for field in FIELDS},
+            )
+            for row in totals
+        ], batch_size=BATCH_SIZE)
+    return len(rows)
+
+
+def _rate(part, whole):
+    return round(100 * part / whole) if whole else None
+
+
+def _months_back(today, count):
+    """
+    (year, month) for the count months ending with today's, oldest first.
+    """
+    index = today.year * 12 + today.month - 1
+    return [
+        (year, month + 1)
+        for year, month in (divmod(index - back, 12) for back in range(count - 1, -1, -1))
+    ]
+
+
+def _streaks(months, today):
+    """
+    (current, best) runs of months in which every task due was completed.
+    Months with nothing due don't break a run; the current month only
+    counts once everything due so far is done.
+    """
+    current = best = run = 0
+    ended = False
+    for (year, month), row in reversed(months):
+        due, completed = row['due_tasks'], row['completed_tasks']
+        if not due or ((year, month) == (today.year, today.month) and completed < due):
+            continue
+        if completed == due:
+            run += 1
+        else:
+            ended = True
+            run = 0
+        if not ended:
+            current = run
+        best = max(best, run)
+    return current, best
+
+
+def owner_statistics(owner, today=None):
+    """
+    Everything the statistics page shows, counting tasks due up to today:
+    completion and on-time rates overall and by category, hours logged,
+    a monthly compliance score (share of due tasks done on time) for the
+    last TREND_MONTHS months, and completion streaks within the last
+    STREAK_MONTHS months.
+    """
+    today = today or date.today()
+    sums = {f'sum_{field}': Sum(field) for field in FIELDS}
+    
+    by_category = {
+        row.category: {field: getattr(row, field) for field in FIELDS}
+        for row in MaintenanceStatTotal.objects.filter(owner=owner)
+    }
+    # Totals include schedules still ahead; take those back out
+    ahead = DailyMaintenanceStat.objects.filter(owner=owner, day__gt=today).values('category').annotate(
+        **sums
+    ).order_by()
+    for row in ahead:
+        totals = by_category.get(row['category'])
+        if totals is not None:
+            for field in FIELDS:
+                if field != 'minutes_spent':
+                    totals[field] -= row[f'sum_{field}']
+    
+    overall = dict.fromkeys(FIELDS, 0)
+    categories = []
+    for category, totals in by_category.items():
+        for field in FIELDS:
+            overall[field] += totals[field]
+        if category and totals['due_tasks']:
+            categories.append({
+                'category': category,
+                'label': CATEGORIES.get(category, category),
+                **totals,
+                'late_tasks': totals['completed_tasks'] - totals['on_time_tasks'],
+                'completion_rate': _rate(totals['completed_tasks'], totals['due_tasks']),
+            })
+    categories.sort(key=lambda row: (row['completion_rate'], row['label']))
+    
+    window = _months_back(today, STREAK_MONTHS)
+    monthly = DailyMaintenanceStat.objects.filter(
+        owner=owner, day__range=(date(*window[0], 1), today),
+    ).annotate(
+        year=ExtractYear('day'), month=ExtractMonth('day'),
+    ).values('year', 'month').annotate(**sums).order_by()
+    found = {
+        (row['year'], row['month']): {field: row[f'sum_{field}'] for field in FIELDS}
+        for row in monthly
+    }
+    months = [(key, found.get(key, dict.fromkeys(FIELDS, 0))) for key in window]
+    current_streak, best_streak = _streaks(months, today)
+    
+    late = overall['completed_tasks'] - overall['on_time_tasks']
+    return {
+        **overall,
+        'late_tasks': late,
+        'missed_tasks': overall['due_tasks'] - overall['completed_tasks'],
+        'completion_rate': _rate(overall['completed_tasks'], overall['due_tasks']),
+        'on_time_rate': _rate(overall['on_time_tasks'], overall['completed_tasks']),
+        'hours_spent': round(overall['minutes_spent'] / 60, 1),
+        'categories': categories,
+        'trend': [
+            {
+                'label': f'{calendar.month_abbr[month]} {year}',
+                'due_tasks': row['due_tasks'],
+                'score': _rate(row['on_time_tasks'], row['due_tasks']),
+            }
+            for (year, month), row in months[-TREND_MONTHS:]
+        ],
+        'current_streak': current_streak,
+        'best_streak': best_streak,
+        'streak_months': STREAK_MONTHS,
+    }
@@ -0,0 +1,242 @@
+"""
+Excel export of schedules, maintenance history, appliances and providers.
+
+write_workbook() writes one sheet per section for a queryset of homes:
+  - Upcoming: open scheduled tasks, overdue ones included, with priority,
+  - History: schedule completions with actual time, rating and feedback,
+  - Completed Tasks: individual task completions,
+  - Appliances and Providers.
+History and Completed Tasks include schedules moved to ArchivedSchedule.
+
+XlsxWriter runs in constant_memory mode, so each row is flushed to a
+temporary file as soon as the next one starts, and every row comes from
+an .iterator() over values_list() tuples (archived rows only bring the
+JSON keys they need). Memory stays flat however many years of history a
+portfolio has; the finished workbook is written to `output`, which the
+view streams back from disk.
+"""
+
+from datetime import datetime
+
+import xlsxwriter
+from django.contrib.auth import get_user_model
+from django.db.models import Exists, OuterRef, Value
+from django.db.models.functions import Least
+from django.utils import timezone
+
+from homes.models import Appliance, ServiceProvider
+from .models import ArchivedSchedule, MaintenanceTask, Schedule, ScheduleTaskCompletion, TaskCompletion
+from .utils import ScheduleOptimizer
+
+User = get_user_model()
+
+CONTENT_TYPE = 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
+CHUNK_SIZE = 2000
+
+CATEGORIES = dict(MaintenanceTask.CATEGORY_CHOICES)
+APPLIANCE_TYPES = dict(Appliance.APPLIANCE_TYPES)
+PROVIDER_CATEGORIES = dict(ServiceProvider.SERVICE_CATEGORIES)
+
+
+def _datetime(value):
+    """
+    A naive local datetime for Excel, which has no time zones. Archived
+    rows store ISO strings.
+    """
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value)
+    if value is not None and timezone.is_aware(value):
+        value = timezone.make_naive(value)
+    return value
+
+
+class _Usernames(dict):
+    """
+    User id -> username, looked up on first use. Archived rows keep only
+    ids, and a portfolio's history has few distinct users.
+    """
+    
+    def __missing__(self, user_id):
+        self[user_id] = User.objects.filter(pk=user_id).values_list('username', flat=True).first() or ''
+        return self[user_id]
+
+
+class SheetWriter:
+    """
+    Writes rows to one worksheet. columns is a list of (header, width,
+    kind), where kind is 'date', 'datetime' or None.
+    """
+    
+    def __init__(self, workbook, formats, title, columns):
+        self.sheet = workbook.add_worksheet(title)
+        self.kinds = [kind for _, _, kind in columns]
+        self.formats = formats
+        self.row = 0
+        for column, (header, width, kind) in enumerate(columns):
+            self.sheet.set_column(column, column, width)
+            self.sheet.write_string(0, column, header, formats['header'])
+        self.sheet.freeze_panes(1, 0)
+    
+    def write(self, values):
+        self.row += 1
+        for column, (value, kind) in enumerate(zip(values, self.kinds)):
+            if value is None or value == '':
+                continue
+            if kind:
+                self.sheet.write_datetime(self.row, column, value, self.formats[kind])
+            elif isinstance(value, str):
+                # Never read text as a formula
+                self.sheet.write_string(self.row, column, value)
+            else:
+                self.sheet.write(self.row, column, value)
+    
+    def finish(self):
+        if self.row:
+            self.sheet.autofilter(0, 0, self.row, len(self.kinds) - 1)
+        return self.row
+
+
+def upcoming_rows(homes, today):
+    """
+    Open schedule tasks for the homes, oldest first.
+    """
+    done = ScheduleTaskCompletion.objects.filter(
+        schedule_id=OuterRef('schedule_id'),
+        task_id=OuterRef('maintenancetask_id'),
+    )
+    rows = Schedule.tasks.through.objects.filter(
+        schedule__home__in=homes,
+        schedule__is_completed=False,
+    ).exclude(Exists(done)).annotate(
+        priority=Least(ScheduleOptimizer.get_task_priority_expression('maintenancetask__'), Value(100)),
+    ).order_by('schedule__scheduled_date', 'schedule__home__name', 'maintenancetask__title').values_list(
+        'schedule__home__name', 'schedule__scheduled_date', 'maintenancetask__title',
+        'maintenancetask__category', 'maintenancetask__estimated_time', 'priority',
+    )
+    for home, scheduled, title, category, minutes, priority in rows.iterator(chunk_size=CHUNK_SIZE):
+        status = 'Overdue' if scheduled < today else 'Upcoming'
+        yield home, scheduled, status, title, CATEGORIES.get(category, category), minutes, priority
+
+
+def history_rows(homes, today):
+    """
+    Schedule completions, most recent schedules first, then archived ones.
+    """
+    usernames = _Usernames()
+    rows = TaskCompletion.objects.filter(schedule__home__in=homes).order_by(
+        '-schedule__scheduled_date', '-completed_date'
+    ).values_list(
+        'schedule__home__name', 'schedule__scheduled_date', 'completed_date',
+        'actual_time', 'rating', 'feedback', 'completed_by__username',
+    )
+    for home, scheduled, completed, minutes, rating, feedback, username in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield home, scheduled, _datetime(completed), minutes, rating, feedback, username or '', 'No'
+    
+    archived = ArchivedSchedule.objects.filter(home__in=homes).order_by('-scheduled_date').values_list(
+        'home__name', 'scheduled_date', 'payload__completions',
+    )
+    for home, scheduled, completions in archived.iterator(chunk_size=CHUNK_SIZE):
+        for completion in completions or []:
+            user_id = completion.get('completed_by')
+            yield (
+                home, scheduled, _datetime(completion.get('completed_date')),
+                completion.get('actual_time'), completion.get('rating'), completion.get('feedback'),
+                usernames[user_id] if user_id else '', 'Yes',
+            )
+
+
+def completed_task_rows(homes, today):
+    """
+    Individual task completions, most recent schedules first, then
+    archived ones.
+    """
+    usernames = _Usernames()
+    rows = ScheduleTaskCompletion.objects.filter(schedule__home__in=homes).order_by(
+        '-schedule__scheduled_date', 'task__title'
+    ).values_list(
+        'schedule__home__name', 'schedule__scheduled_date', 'task__title',
+        'task__category', 'completed_at', 'completed_by__username',
+    )
+    for home, scheduled, title, category, completed, username in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield home, scheduled, title, CATEGORIES.get(category, category), _datetime(completed), username or '', 'No'
+    
+    archived = ArchivedSchedule.objects.filter(home__in=homes).order_by('-scheduled_date').values_list(
+        'home__name', 'scheduled_date', 'payload__tasks',
+    )
+    for home, scheduled, tasks in archived.iterator(chunk_size=CHUNK_SIZE):
+        for task in tasks or []:
+            if not task.get('completed_at'):
+                continue
+            user_id = task.get('completed_by')
+            yield (
+                home, scheduled, task.get('title'), CATEGORIES.get(task.get('category'), task.get('category')),
+                _datetime(task['completed_at']), usernames[user_id] if user_id else '', 'Yes',
+            )
+
+
+def appliance_rows(homes, today):
+    rows = Appliance.objects.filter(home__in=homes).order_by('home__name', 'appliance_type', 'pk').values_list(
+        'home__name', 'appliance_type', 'manufacturer', 'model_number', 'serial_number', 'year_installed',
+        'purchase_date', 'warranty_expiration', 'last_service_date', 'notes',
+    )
+    for home, appliance_type, *rest in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield (home, APPLIANCE_TYPES.get(appliance_type, appliance_type), *rest)
+
+
+def provider_rows(homes, today):
+    rows = ServiceProvider.objects.filter(home__in=homes).order_by('home__name', 'category', 'company_name').values_list(
+        'home__name', 'category', 'company_name', 'contact_name', 'phone', 'email', 'website', 'notes',
+    )
+    for home, category, *rest in rows.iterator(chunk_size=CHUNK_SIZE):
+        yield (home, PROVIDER_CATEGORIES.get(category, category), *rest)
+
+
+SHEETS = [
+    ('Upcoming', upcoming_rows, [
+        ('Home', 28, None), ('Date', 12, 'date'), ('Status', 10, None), ('Task', 40, None),
+        ('Category', 16, None), ('Est. Minutes', 12, None), ('Priority', 9, None),
+    ]),
+    ('History', history_rows, [
+        ('Home', 28, None), ('Scheduled', 12, 'date'), ('Completed', 17, 'datetime'),
+        ('Actual Minutes', 14, None), ('Rating', 8, None), ('Feedback', 50, None),
+        ('Completed By', 16, None), ('Archived', 9, None),
+    ]),
+    ('Completed Tasks', completed_task_rows, [
+        ('Home', 28, None), ('Scheduled', 12, 'date'), ('Task', 40, None), ('Category', 16, None),
+        ('Completed', 17, 'datetime'), ('Completed By', 16, None), ('Archived', 9, None),
+    ]),
+    ('Appliances', appliance_rows, [
+        ('Home', 28, None), ('Type', 20, None), ('Manufacturer', 18, None), ('Model', 16, None),
+        ('Serial', 16, None), ('Year Installed', 13, None), ('Purchased', 12, 'date'),
+        ('Warranty Ends', 13, 'date'), ('Last Service', 12, 'date'), ('Notes', 40, None),
+    ]),
+    ('Providers', provider_rows, [
+        ('Home', 28, None), ('Category', 18, None), ('Company', 28, None), ('Contact', 20, None),
+        ('Phone', 16, None), ('Email', 26, None), ('Website', 28, None), ('Notes', 40, None),
+    ]),
+]
+
+
+def write_workbook(output, homes, today=None):
+    """
+    Write the export for a Home queryset to output (a path or a binary
+    file). Each entry in SHEETS names a row generator taking (homes,
+    today). Returns the number of data rows written per sheet.
+    """
+    today = today or timezone.localdate()
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
+    formats = {
+        'header': workbook.add_format({'bold': True, 'bg_color': '#DDEBF7', 'bottom': 1}),
+        'date': workbook.add_format({'num_format': 'yyyy-mm-dd'}),
+        'datetime': workbook.add_format({'num_format': 'yyyy-mm-dd hh:mm'}),
+    }
+    counts = {}
+    try:
+        for title, rows, columns in SHEETS:
+            writer = SheetWriter(workbook, formats, title, columns)
+            for values in rows(homes, today):
+                writer.write(values)
+            counts[title] = writer.finish()
+    finally:
+        workbook.close()
+    return counts
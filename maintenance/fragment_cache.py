@@ -0,0 +1,126 @@
+"""
+Versioned fragment cache for calendar month blocks.
+
+Each (home, year, month) has a version stored in the cache. Signal
+handlers replace it whenever anything shown in that month changes, so cached
+fragments are never invalidated by deletion - they simply stop being
+looked up. Hit/miss counters are kept alongside for monitoring
+(see the calendar_cache_stats management command).
+"""
+
+import hashlib
+import logging
+import uuid
+
+from django.core.cache import cache
+
+logger = logging.getLogger(__name__)
+
+FRAGMENT_TIMEOUT = 60 * 60 * 24 * 7  # a week; versions make staleness impossible
+VERSION_TIMEOUT = None  # versions must outlive the fragments they guard
+
+# Stands in for the per-user CSRF token inside cached HTML
+CSRF_PLACEHOLDER = '__calendar_csrf_token__'
+
+CATALOG_VERSION_KEY = 'calendar:catalog_version'
+STATS_KEYS = {
+    'hits': 'calendar:fragment_stats:hits',
+    'misses': 'calendar:fragment_stats:misses',
+}
+
+
+def _new_version():
+    # A random version per bump rather than cache.incr(), which isn't
+    # atomic on every backend: two concurrent bumps could both land on the
+    # same number and leave a fragment cached between them current. Random
+    # values also never repeat one an older fragment was cached under
+    # when a version key has been evicted.
+    return uuid.uuid4().hex
+
+
+def month_version_key(home_id, year, month):
+    return f'calendar:month_version:{home_id}:{year}:{month}'
+
+
+def bump_month_version(home_id, year, month):
+    """
+    Invalidate cached fragments for one home and month.
+    """
+    cache.set(month_version_key(home_id, year, month), _new_version(), VERSION_TIMEOUT)
+
+
+def bump_catalog_version():
+    """
+    Invalidate every cached month block (task titles, categories, etc. changed).
+    """
+    cache.set(CATALOG_VERSION_KEY, _new_version(), VERSION_TIMEOUT)
+
+
+def get_month_versions(home_ids, months):
+    """
+    Return {(home_id, year, month): version} for every combination,
+    creating versions that don't exist yet. One cache round trip in the
+    common case.
+    """
+    keys = {
+        month_version_key(home_id, year, month): (home_id, year, month)
+        for home_id in home_ids
+        for year, month in months
+    }
+    found = cache.get_many(list(keys)) if keys else {}
+    missing = {key: _new_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, VERSION_TIMEOUT)
+        found.update(missing)
+    return {keys[key]: version for key, version in found.items()}
+
+
+def get_catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        version = _new_version()
+        cache.add(CATALOG_VERSION_KEY, version, VERSION_TIMEOUT)
+    return version
+
+
+def fragment_key(scope, year, month, version_parts):
+    """
+    Build the cache key for a month block. scope identifies which homes the
+    block shows; version_parts is everything whose change must invalidate it.
+    """
+    digest = hashlib.md5(':'.join(str(part) for part in version_parts).encode()).hexdigest()
+    return f'calendar:month_fragment:{scope}:{year}:{month}:{digest}'
+
+
+def record_lookups(hits, misses):
+    """
+    Add to the running hit/miss counters.
+    """
+    for name, count in (('hits', hits), ('misses', misses)):
+        if not count:
+            continue
+        key = STATS_KEYS[name]
+        try:
+            cache.incr(key, count)
+        except ValueError:
+            cache.set(key, count, None)
+    logger.debug('Calendar month fragments: %d hit(s), %d miss(es)', hits, misses)
+
+
+def get_stats():
+    """
+    Return the hit/miss counters and hit ratio.
+    """
+    values = cache.get_many(list(STATS_KEYS.values()))
+    hits = values.get(STATS_KEYS['hits'], 0)
+    misses = values.get(STATS_KEYS['misses'], 0)
+    total = hits + misses
+    return {
+        'hits': hits,
+        'misses': misses,
+        'hit_ratio': hits / total if total else 0.0,
+    }
+
+
+def reset_stats():
+    cache.delete_many(list(STATS_KEYS.values()))
@@ -0,0 +1,280 @@
+"""
+Bulk import of homes, appliances and service providers from XLSX or CSV.
+
+import_homes() reads the file one row at a time (openpyxl in read-only
+mode, or the csv module), so memory stays flat however long the file is:
+  1. each row is validated with the form the site uses for that record
+     (HomeForm, ApplianceForm plus its record-keeping fields,
+     ServiceProviderForm),
+  2. valid rows are queued and written with bulk_create once chunk_size
+     of them are waiting, one transaction per chunk,
+  3. invalid rows are skipped and reported with their location and form
+     errors; the rest of the file still imports.
+
+Layout: headers are form field names (name, year_built, appliance_type,
+company_name, ...). A sheet named Homes, Appliances or Providers holds
+that kind of record; otherwise, and in CSV files, a `record` column says
+what each row is, defaulting to home. Appliance and provider rows name
+their home in a `home` column: a home earlier in the file, or one the
+owner already has. Blank cells take the field's default (a blank
+climate_zone is detected from zip_code, as on the home form), booleans
+accept yes/no, true/false, 1/0 or x, and other columns are ignored.
+
+Home names identify homes, so a home row whose name the owner already
+uses is rejected rather than duplicated.
+"""
+
+import copy
+import csv
+import io
+import os
+from zipfile import BadZipFile
+
+from django import forms
+from django.db import transaction
+from openpyxl import load_workbook
+from openpyxl.utils.exceptions import InvalidFileException
+
+from homes.forms import ApplianceImportForm, HomeForm, ServiceProviderForm
+from homes.models import Appliance, Home, ServiceProvider
+
+DEFAULT_CHUNK_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+
+RECORD_FORMS = {
+    'home': HomeForm,
+    'appliance': ApplianceImportForm,
+    'provider': ServiceProviderForm,
+}
+
+# Sheet names and `record` values for each kind of row
+RECORD_ALIASES = {
+    'home': 'home',
+    'homes': 'home',
+    'appliance': 'appliance',
+    'appliances': 'appliance',
+    'provider': 'provider',
+    'providers': 'provider',
+    'service_provider': 'provider',
+    'service_providers': 'provider',
+}
+
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'x'}
+
+
+class ImportFormatError(ValueError):
+    """
+    Raised when the file can't be read as a spreadsheet of homes.
+    """
+
+
+def _key(value):
+    """
+    Normalize a header, record type or home name for matching.
+    """
+    return str(value).strip().lower().replace(' ', '_') if value is not None else ''
+
+
+def _xlsx_rows(file):
+    workbook = load_workbook(file, read_only=True, data_only=True)
+    try:
+        for sheet in workbook.worksheets:
+            record = RECORD_ALIASES.get(_key(sheet.title), 'home')
+            rows = sheet.iter_rows(values_only=True)
+            header = [_key(cell) for cell in next(rows, ())]
+            for number, cells in enumerate(rows, start=2):
+                yield f'{sheet.title} row {number}', record, dict(zip(header, cells))
+    finally:
+        workbook.close()
+
+
+def _csv_rows(file):
+    text = io.TextIOWrapper(file, encoding='utf-8-sig', newline='')
+    try:
+        reader = csv.reader(text)
+        header = [_key(cell) for cell in next(reader, ())]
+        for number, cells in enumerate(reader, start=2):
+            yield f'Row {number}', 'home', dict(zip(header, cells))
+    finally:
+        text.detach()
+
+
+def read_rows(file, filename):
+    """
+    Yield (location, default record type, {header: cell}) for each row of
+    an .xlsx or .csv file opened in binary mode.
+    """
+    extension = os.path.splitext(filename)[1].lower()
+    if extension == '.xlsx':
+        return _xlsx_rows(file)
+    if extension == '.csv':
+        return _csv_rows(file)
+    raise ImportFormatError(f"Unsupported file type '{extension or filename}'; use .xlsx or .csv.")
+
+
+def _readable_rows(file, filename):
+    """
+    read_rows(), with errors from reading the file raised as
+    ImportFormatError. Errors raised by the caller while handling a row
+    are left alone.
+    """
+    rows = read_rows(file, filename)
+    while True:
+        try:
+            row = next(rows)
+        except StopIteration:
+            return
+        except (BadZipFile, InvalidFileException, KeyError) as error:
+            raise ImportFormatError(f'Not a readable .xlsx workbook ({error}).')
+        except (UnicodeDecodeError, csv.Error) as error:
+            raise ImportFormatError(f'Not a readable UTF-8 .csv file ({error}).')
+        yield row
+
+
+def form_data(form_class, row):
+    """
+    Form data for a row: blank cells take the field's initial value (the
+    model default) and boolean cells are read as checkbox values.
+    """
+    data = {}
+    for name, field in form_class.base_fields.items():
+        value = row.get(name)
+        if isinstance(value, str):
+            value = value.strip()
+        if value is None or value == '':
+            initial = field.initial() if callable(field.initial) else field.initial
+            if initial is not None:
+                data[name] = initial
+            continue
+        if isinstance(field, forms.BooleanField) and not isinstance(value, bool):
+            value = _key(value) in TRUE_VALUES
+        if value is not False:
+            data[name] = value
+    return data
+
+
+def bind(template, data):
+    """
+    A bound copy of an unbound template form, for one row. Copies share the
+    template's fields, which hold no per-form state, so the deep copy of
+    every field, widget and choice list that a new form makes (most of the
+    cost of validating a row) happens once per import rather than per row.
+    """
+    form = copy.copy(template)
+    form.data = data
+    form.is_bound = True
+    form._errors = None
+    form._bound_fields_cache = {}
+    form.instance = template._meta.model()
+    return form
+
+
+def _form_errors(form):
+    return '; '.join(
+        ' '.join(messages) if field == '__all__' else f"{field}: {' '.join(messages)}"
+        for field, messages in form.errors.items()
+    )
+
+
+class HomeImport:
+    """
+    One import run for an owner. Feed rows to add() and call finish();
+    created, invalid and errors hold the results.
+    """
+    
+    def __init__(self, owner, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+        self.owner = owner
+        self.chunk_size = chunk_size
+        self.dry_run = dry_run
+        self.created = {kind: 0 for kind in RECORD_FORMS}
+        self.invalid = 0
+        self.errors = []
+        self.pending = {kind: [] for kind in RECORD_FORMS}
+        self.forms = {kind: form_class() for kind, form_class in RECORD_FORMS.items()}
+        # Home name -> pk; None until a home queued in this run is written
+        self.homes = {}
+        self.ambiguous = set()
+        for pk, name in Home.objects.filter(owner=owner).values_list('pk', 'name'):
+            key = _key(name)
+            if key in self.homes:
+                self.ambiguous.add(key)
+            self.homes[key] = pk
+    
+    def reject(self, location, message):
+        self.invalid += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((location, message))
+    
+    def add(self, location, record, row):
+        """
+        Validate one row and queue it, flushing when the chunk is full.
+        """
+        if not any(value not in (None, '') for value in row.values()):
+            return
+        kind = RECORD_ALIASES.get(_key(row.get('record') or record))
+        if kind is None:
+            return self.reject(location, f"Unknown record type '{row.get('record')}'.")
+        form = bind(self.forms[kind], form_data(RECORD_FORMS[kind], row))
+        if not form.is_valid():
+            return self.reject(location, _form_errors(form))
+        
+        if kind == 'home':
+            name = form.cleaned_data['name']
+            if _key(name) in self.homes:
+                return self.reject(location, f"A home named '{name}' already exists.")
+            form.instance.owner = self.owner
+            self.homes[_key(name)] = None
+            self.pending['home'].append(form.instance)
+        else:
+            home = _key(row.get('home'))
+            if not home:
+                return self.reject(location, "home: Name the home this row belongs to.")
+            if home not in self.homes:
+                return self.reject(location, f"home: No home named '{row['home']}'.")
+            if home in self.ambiguous:
+                return self.reject(location, f"home: More than one home is named '{row['home']}'.")
+            self.pending[kind].append((home, form.instance))
+        
+        if sum(len(rows) for rows in self.pending.values()) >= self.chunk_size:
+            self.flush()
+    
+    def flush(self):
+        """
+        Write the queued rows: homes first, so the appliances and providers
+        that name them can be given their keys.
+        """
+        if not self.dry_run:
+            with transaction.atomic():
+                homes = Home.objects.bulk_create(self.pending['home'])
+                self.homes.update((_key(home.name), home.pk) for home in homes)
+                for kind, model in (('appliance', Appliance), ('provider', ServiceProvider)):
+                    objects = []
+                    for home, obj in self.pending[kind]:
+                        obj.home_id = self.homes[home]
+                        if kind == 'appliance':
+                            obj.set_match_keys()
+                        objects.append(obj)
+                    model.objects.bulk_create(objects)
+        for kind, rows in self.pending.items():
+            self.created[kind] += len(rows)
+            rows.clear()
+    
+    def finish(self):
+        self.flush()
+        return {**self.created, 'invalid': self.invalid, 'errors': self.errors}
+
+
+def import_homes(file, filename, owner, chunk_size=DEFAULT_CHUNK_SIZE, dry_run=False):
+    """
+    Import an .xlsx or .csv file (opened in binary mode) for owner.
+    Returns the number of homes, appliances and providers created, the
+    number of invalid rows, and up to MAX_REPORTED_ERRORS (location,
+    message) pairs. A dry run validates every row and writes nothing.
+    
+    Raises ImportFormatError if the file can't be read; chunks written
+    before the problem was found are kept.
+    """
+    run = HomeImport(owner, chunk_size=chunk_size, dry_run=dry_run)
+    for location, record, row in _readable_rows(file, filename):
+        run.add(location, record, row)
+    return run.finish()
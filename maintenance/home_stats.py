@@ -0,0 +1,74 @@
+"""
+Per-home aggregates for the home list and home detail pages.
+
+with_stats() annotates a Home queryset with correlated COUNT/SUM
+subqueries, so any number of homes is loaded together with their numbers
+in a single query:
+  - upcoming_tasks: open tasks due in the next UPCOMING_DAYS days,
+  - overdue_tasks: open tasks dated before today,
+  - completed_tasks: tasks done, including archived schedules,
+  - appliance_count / provider_count,
+  - warranties_expiring: appliance warranties ending within
+    WARRANTY_NOTICE_DAYS days.
+
+Subqueries rather than joined Count()s keep the counts from multiplying
+each other and let each one use its own (home, ...) index.
+"""
+
+from datetime import date, timedelta
+
+from django.db.models import Exists, F, Func, IntegerField, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from homes.models import Appliance, ServiceProvider
+from .lifecycle import WARRANTY_NOTICE_DAYS
+from .models import ArchivedSchedule, Schedule, ScheduleTaskCompletion
+
+UPCOMING_DAYS = 30
+
+
+def _scalar(queryset, function='COUNT', field='pk'):
+    """
+    Wrap an aggregate over queryset (already correlated to the outer home)
+    as a subquery that is 0 when there are no rows.
+    """
+    aggregate = Func(F(field), function=function, output_field=IntegerField())
+    return Coalesce(
+        Subquery(queryset.order_by().annotate(value=aggregate).values('value')[:1]),
+        Value(0),
+    )
+
+
+def with_stats(homes, today=None):
+    """
+    Annotate a Home queryset with the aggregates listed in the module
+    docstring.
+    """
+    today = today or date.today()
+    rows = Schedule.tasks.through.objects.filter(
+        schedule__home_id=OuterRef('pk'),
+    ).annotate(
+        task_done=Exists(ScheduleTaskCompletion.objects.filter(
+            schedule_id=OuterRef('schedule_id'),
+            task_id=OuterRef('maintenancetask_id'),
+        )),
+    )
+    open_rows = rows.filter(schedule__is_completed=False, task_done=False)
+    appliances = Appliance.objects.filter(home_id=OuterRef('pk'))
+    
+    completed_live = _scalar(rows.filter(Q(schedule__is_completed=True) | Q(task_done=True)))
+    completed_archived = _scalar(
+        ArchivedSchedule.objects.filter(home_id=OuterRef('pk')), function='SUM', field='task_count'
+    )
+    return homes.annotate(
+        upcoming_tasks=_scalar(open_rows.filter(
+            schedule__scheduled_date__range=(today, today + timedelta(days=UPCOMING_DAYS)),
+        )),
+        overdue_tasks=_scalar(open_rows.filter(schedule__scheduled_date__lt=today)),
+        completed_tasks=completed_live + completed_archived,
+        appliance_count=_scalar(appliances),
+        warranties_expiring=_scalar(appliances.filter(
+            warranty_expiration__range=(today, today + timedelta(days=WARRANTY_NOTICE_DAYS)),
+        )),
+        provider_count=_scalar(ServiceProvider.objects.filter(home_id=OuterRef('pk'))),
+    )
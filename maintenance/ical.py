@@ -0,0 +1,117 @@
+"""
+iCalendar (RFC 5545) serialization for maintenance schedules.
+Used by the calendar subscription feed so homeowners can see their plan
+in Google Calendar, Apple Calendar, Outlook, etc.
+"""
+
+from datetime import timedelta, timezone as dt_timezone
+
+CRLF = '\r\n'
+
+
+def escape_text(value):
+    """
+    Escape a value for use in an iCalendar TEXT property.
+    """
+    return (
+        str(value)
+        .replace('\\', '\\\\')
+        .replace(';', '\\;')
+        .replace(',', '\\,')
+        .replace('\r\n', '\\n')
+        .replace('\n', '\\n')
+    )
+
+
+def fold_line(line):
+    """
+    Fold a content line to 75 octets as required by RFC 5545.
+    Continuation lines start with a single space.
+    """
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line + CRLF
+    
+    parts = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Never split a multi-byte UTF-8 character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        parts.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+        limit = 74  # leave room for the leading space
+    return (CRLF + ' ').join(parts) + CRLF
+
+
+def format_date(value):
+    """Format a date as an iCalendar DATE value."""
+    return value.strftime('%Y%m%d')
+
+
+def format_datetime(value):
+    """Format an aware datetime as an iCalendar UTC DATE-TIME value."""
+    return value.astimezone(dt_timezone.utc).strftime('%Y%m%dT%H%M%SZ')
+
+
+def calendar_header(name):
+    """
+    Return the opening VCALENDAR block.
+    """
+    lines = [
+        'BEGIN:VCALENDAR',
+        'VERSION:2.0',
+        'PRODID:-//Homestead Compass//Maintenance Schedule//EN',
+        'CALSCALE:GREGORIAN',
+        'METHOD:PUBLISH',
+        f'X-WR-CALNAME:{escape_text(name)}',
+        # Hint to clients how often to poll (RFC 7986 / Outlook extension)
+        'REFRESH-INTERVAL;VALUE=DURATION:PT1H',
+        'X-PUBLISHED-TTL:PT1H',
+    ]
+    return ''.join(fold_line(line) for line in lines)
+
+
+def calendar_footer():
+    """Return the closing VCALENDAR line."""
+    return fold_line('END:VCALENDAR')
+
+
+def schedule_event(schedule, url=None, completed_task_ids=()):
+    """
+    Serialize a Schedule (with prefetched tasks and home) as an all-day VEVENT.
+    """
+    tasks = list(schedule.tasks.all())
+    if len(tasks) == 1:
+        summary = f"{tasks[0].title} - {schedule.home.name}"
+    else:
+        summary = f"{len(tasks)} maintenance tasks - {schedule.home.name}"
+    
+    description_lines = []
+    for task in tasks:
+        marker = '[x]' if task.id in completed_task_ids else '[ ]'
+        line = f"{marker} {task.title}"
+        if task.estimated_time:
+            line += f" ({task.estimated_time} min)"
+        description_lines.append(line)
+    if url:
+        description_lines.append('')
+        description_lines.append(url)
+    
+    lines = [
+        'BEGIN:VEVENT',
+        f'UID:schedule-{schedule.pk}@homestead-compass',
+        f'DTSTAMP:{format_datetime(schedule.updated_at)}',
+        f'LAST-MODIFIED:{format_datetime(schedule.updated_at)}',
+        f'DTSTART;VALUE=DATE:{format_date(schedule.scheduled_date)}',
+        f'DTEND;VALUE=DATE:{format_date(schedule.scheduled_date + timedelta(days=1))}',
+        f'SUMMARY:{escape_text(summary)}',
+        f'DESCRIPTION:{escape_text(chr(10).join(description_lines))}',
+        'STATUS:CONFIRMED',
+        'TRANSP:TRANSPARENT',
+    ]
+    if url:
+        lines.append(f'URL:{url}')
+    lines.append('END:VEVENT')
+    return ''.join(fold_line(line) for line in lines)
@@ -0,0 +1,202 @@
+"""
+Appliance lifecycle rules.
+
+Each appliance type implies some maintenance tasks (matched on task titles,
+the same way ScheduleOptimizer matches home features), has an expected
+lifespan, and needs service at a regular interval. From those:
+  - task_priority_bonuses() raises the priority of a home's tasks that
+    belong to appliances in the later part of their life,
+  - scan_appliances() finds warranties ending within the next N days and
+    service that is overdue, across all homes, and writes them as
+    ApplianceAlert rows.
+
+The scan is a handful of range queries on the appliance indexes
+(warranty_expiration, and appliance_type + last_service_date), one per
+service interval, so only matching appliances are read. Alerts are
+upserted in bulk and alerts that no longer apply are deleted, so reruns
+on the same day are safe. Each query's rows are fetched as plain tuples
+before any alert is written, so no cursor stays open during the writes.
+"""
+
+from datetime import date, timedelta
+
+from homes.models import Appliance
+from .models import ApplianceAlert
+
+WARRANTY_NOTICE_DAYS = 90
+DEFAULT_BATCH_SIZE = 500
+
+# Lowercase fragments of task titles each appliance type implies
+APPLIANCE_TASK_KEYWORDS = {
+    'hvac': ('hvac', 'air filter'),
+    'furnace': ('hvac', 'air filter'),
+    'ac_unit': ('hvac', 'air filter'),
+    'water_heater': ('water heater',),
+    'refrigerator': ('refrigerator', 'appliance coil'),
+    'washer': ('washing machine', 'washer hose'),
+    'dryer': ('dryer',),
+    'dishwasher': ('dishwasher',),
+    'oven': ('range hood', 'oven'),
+    'sump_pump': ('sump pump',),
+    'garage_door': ('garage door',),
+    'other': (),
+}
+
+EXPECTED_LIFESPAN_YEARS = {
+    'hvac': 15,
+    'furnace': 18,
+    'ac_unit': 15,
+    'water_heater': 10,
+    'refrigerator': 13,
+    'washer': 11,
+    'dryer': 13,
+    'dishwasher': 10,
+    'oven': 15,
+    'sump_pump': 10,
+    'garage_door': 12,
+    'other': 15,
+}
+
+SERVICE_INTERVAL_DAYS = {
+    'hvac': 365,
+    'furnace': 365,
+    'ac_unit': 365,
+    'water_heater': 365,
+    'refrigerator': 730,
+    'washer': 730,
+    'dryer': 365,
+    'dishwasher': 730,
+    'oven': 730,
+    'sump_pump': 365,
+    'garage_door': 365,
+    'other': 730,
+}
+
+# (share of expected lifespan reached, priority bonus), checked in order
+AGING_BONUSES = [
+    (1.0, 15),   # Past its expected life
+    (0.75, 10),
+    (0.5, 5),
+]
+
+
+def implies_task(appliance_type, task):
+    """
+    Whether an appliance of this type calls for the task.
+    """
+    title = task.title.lower()
+    return any(keyword in title for keyword in APPLIANCE_TASK_KEYWORDS.get(appliance_type, ()))
+
+
+def appliance_age(appliance, today=None):
+    """
+    Age in years from year_installed, else purchase_date; None if unknown.
+    """
+    today = today or date.today()
+    year = appliance.year_installed or (appliance.purchase_date and appliance.purchase_date.year)
+    if not year:
+        return None
+    return max(today.year - year, 0)
+
+
+def aging_bonus(appliance, today=None):
+    """
+    Priority bonus for an appliance's tasks as it nears or passes its
+    expected lifespan.
+    """
+    age = appliance_age(appliance, today)
+    if age is None:
+        return 0
+    share = age / EXPECTED_LIFESPAN_YEARS.get(appliance.appliance_type, EXPECTED_LIFESPAN_YEARS['other'])
+    for threshold, bonus in AGING_BONUSES:
+        if share >= threshold:
+            return bonus
+    return 0
+
+
+def task_priority_bonuses(home, tasks, today=None):
+    """
+    Map task id -> aging bonus for the tasks implied by the home's
+    appliances, taking the oldest matching appliance. One query.
+    """
+    bonuses = {}
+    appliances = home.appliances.only('appliance_type', 'year_installed', 'purchase_date')
+    for appliance in appliances:
+        bonus = aging_bonus(appliance, today)
+        if not bonus:
+            continue
+        for task in tasks:
+            if implies_task(appliance.appliance_type, task) and bonus > bonuses.get(task.id, 0):
+                bonuses[task.id] = bonus
+    return bonuses
+
+
+def expiring_warranties(today, days=WARRANTY_NOTICE_DAYS):
+    """
+    (appliance_id, home_id, warranty_expiration) for warranties ending in
+    the next `days` days. Range scan on appliance_warranty_idx.
+    """
+    return Appliance.objects.filter(
+        warranty_expiration__range=(today, today + timedelta(days=days)),
+    ).order_by().values_list('pk', 'home_id', 'warranty_expiration')
+
+
+def overdue_service(today):
+    """
+    Yield (appliance_id, home_id, due_date) for appliances whose last
+    service is older than their type's interval. One range scan on
+    appliance_type_service_idx per distinct interval. Appliances with no
+    recorded service are left out: there is nothing to count from.
+    """
+    by_interval = {}
+    for appliance_type, _ in Appliance.APPLIANCE_TYPES:
+        interval = SERVICE_INTERVAL_DAYS.get(appliance_type, SERVICE_INTERVAL_DAYS['other'])
+        by_interval.setdefault(interval, []).append(appliance_type)
+    for interval, types in by_interval.items():
+        rows = Appliance.objects.filter(
+            appliance_type__in=types,
+            last_service_date__lt=today - timedelta(days=interval),
+        ).order_by().values_list('pk', 'home_id', 'last_service_date')
+        for appliance_id, home_id, last_service in rows:
+            yield appliance_id, home_id, last_service + timedelta(days=interval)
+
+
+def scan_appliances(today=None, days=WARRANTY_NOTICE_DAYS, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """
+    Record an ApplianceAlert for every expiring warranty and overdue
+    service, and delete alerts the scan no longer finds. Returns counts;
+    a dry run writes and deletes nothing.
+    """
+    today = today or date.today()
+    stats = {'warranty': 0, 'service': 0, 'removed': 0}
+    batch = []
+    
+    def flush():
+        if batch and not dry_run:
+            ApplianceAlert.objects.bulk_create(
+                batch,
+                batch_size=batch_size,
+                update_conflicts=True,
+                unique_fields=['appliance', 'kind', 'due_date'],
+                update_fields=['checked_on'],
+            )
+        batch.clear()
+    
+    sources = [
+        ('warranty', expiring_warranties(today, days)),
+        ('service', overdue_service(today)),
+    ]
+    for kind, rows in sources:
+        for appliance_id, home_id, due_date in rows:
+            batch.append(ApplianceAlert(
+                appliance_id=appliance_id, home_id=home_id, kind=kind,
+                due_date=due_date, checked_on=today,
+            ))
+            stats[kind] += 1
+            if len(batch) >= batch_size:
+                flush()
+    flush()
+    
+    if not dry_run:
+        stats['removed'], _ = ApplianceAlert.objects.exclude(checked_on=today).delete()
+    return stats
@@ -0,0 +1,70 @@
+"""
+Management command to move old completed schedules into the archive.
+Run periodically (e.g. weekly from cron) to keep the schedule tables
+proportional to the active horizon. Each chunk is its own transaction,
+so the command can be interrupted and rerun safely.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from maintenance.archive import DEFAULT_CHUNK_SIZE, archive_schedules
+
+
+class Command(BaseCommand):
+    help = 'Archive completed schedules older than a cutoff in bounded transactional chunks'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            help='Archive schedules dated more than this many days ago (default: settings.SCHEDULE_ARCHIVE_DAYS)',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Schedules archived per transaction (default: {DEFAULT_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--home',
+            type=int,
+            action='append',
+            dest='home_ids',
+            help='Only archive schedules for this home ID (repeatable)',
+        )
+        parser.add_argument(
+            '--date',
+            help='Treat this date (YYYY-MM-DD) as today',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the schedules that would be archived without moving them',
+        )
+    
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format')
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive')
+        if options['days'] is not None and options['days'] < 0:
+            raise CommandError('--days cannot be negative')
+        
+        stats = archive_schedules(
+            older_than_days=options['days'],
+            chunk_size=options['chunk_size'],
+            home_ids=options['home_ids'],
+            dry_run=options['dry_run'],
+            today=today,
+        )
+        
+        prefix = '[dry run] Would archive' if options['dry_run'] else 'Archived'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {stats['schedules']} completed schedule(s) dated before {stats['cutoff']} "
+            f"in {stats['chunks']} chunk(s)."
+        ))
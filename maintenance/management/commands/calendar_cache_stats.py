@@ -0,0 +1,26 @@
+"""
+Management command to report calendar month-fragment cache effectiveness.
+"""
+
+from django.core.management.base import BaseCommand
+from maintenance.fragment_cache import get_stats, reset_stats
+
+
+class Command(BaseCommand):
+    help = 'Show hit/miss counts for cached calendar month blocks'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--reset',
+            action='store_true',
+            help='Reset the counters after printing them',
+        )
+    
+    def handle(self, *args, **options):
+        stats = get_stats()
+        self.stdout.write(f"Hits:      {stats['hits']}")
+        self.stdout.write(f"Misses:    {stats['misses']}")
+        self.stdout.write(self.style.SUCCESS(f"Hit ratio: {stats['hit_ratio']:.1%}"))
+        if options['reset']:
+            reset_stats()
+            self.stdout.write('Counters reset.')
@@ -0,0 +1,34 @@
+"""
+Management command to recompute cohort benchmarks.
+Run nightly or weekly (e.g. from cron), after the statistics read model
+is current. Replaces every CohortBenchmark with figures for the year
+before --date; home pages only read the stored rows.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from maintenance.cohorts import compute_benchmarks
+
+
+class Command(BaseCommand):
+    help = 'Recompute completion rates, skipped tasks and hours for cohorts of similar homes'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            help='Treat this date (YYYY-MM-DD) as today',
+        )
+    
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format')
+        
+        stats = compute_benchmarks(today=today)
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {stats['cohorts']} cohort benchmark(s) from {stats['homes']} active home(s)."
+        ))
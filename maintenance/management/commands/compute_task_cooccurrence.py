@@ -0,0 +1,35 @@
+"""
+Management command to recompute "homes like yours also schedule" data.
+Run nightly or weekly (e.g. from cron). Replaces the TaskCooccurrence
+table from every home's schedules; the schedule generation page only
+reads the stored rows.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from maintenance.cooccurrence import compute_cooccurrence
+
+
+class Command(BaseCommand):
+    help = 'Recompute which tasks similar homes schedule together'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            help='Treat this date (YYYY-MM-DD) as today',
+        )
+    
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format')
+        
+        stats = compute_cooccurrence(today=today)
+        self.stdout.write(self.style.SUCCESS(
+            f"Stored {stats['rows']} related task(s) from {stats['homes']} home(s) "
+            f"in {stats['profiles']} feature profile(s)."
+        ))
@@ -49,6 +49,7 @@ class Command(BaseCommand):
             ('maintenance.MaintenanceTask', 'maintenance_tasks.json'),
             ('maintenance.Schedule', 'schedules.json'),
             ('maintenance.TaskCompletion', 'task_completions.json'),
+            ('maintenance.ArchivedSchedule', 'archived_schedules.json'),
             ('tips', 'tips.json'),
         ])
         
@@ -0,0 +1,68 @@
+"""
+Management command to import homes, appliances and service providers for
+one owner from an .xlsx or .csv file. See maintenance/home_import.py for
+the file layout. Invalid rows are listed and skipped; valid rows are
+written in chunks.
+"""
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from maintenance.home_import import DEFAULT_CHUNK_SIZE, ImportFormatError, import_homes
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = 'Import homes, appliances and service providers from an .xlsx or .csv file'
+    
+    def add_arguments(self, parser):
+        parser.add_argument('path', help='Path to the .xlsx or .csv file')
+        parser.add_argument(
+            '--owner',
+            required=True,
+            help='Username of the user the homes belong to',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=DEFAULT_CHUNK_SIZE,
+            help=f'Rows written per transaction (default: {DEFAULT_CHUNK_SIZE})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Validate every row without writing anything',
+        )
+    
+    def handle(self, *args, **options):
+        try:
+            owner = User.objects.get(username=options['owner'])
+        except User.DoesNotExist:
+            raise CommandError(f"No user named '{options['owner']}'")
+        if options['chunk_size'] < 1:
+            raise CommandError('--chunk-size must be positive')
+        
+        try:
+            with open(options['path'], 'rb') as file:
+                report = import_homes(
+                    file,
+                    options['path'],
+                    owner,
+                    chunk_size=options['chunk_size'],
+                    dry_run=options['dry_run'],
+                )
+        except OSError as error:
+            raise CommandError(f"Can't open {options['path']}: {error.strerror}")
+        except ImportFormatError as error:
+            raise CommandError(str(error))
+        
+        for location, message in report['errors']:
+            self.stdout.write(self.style.ERROR(f'{location}: {message}'))
+        if report['invalid'] > len(report['errors']):
+            self.stdout.write(self.style.ERROR(f"... and {report['invalid'] - len(report['errors'])} more invalid row(s)."))
+        
+        prefix = '[dry run] Would import' if options['dry_run'] else 'Imported'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {report['home']} home(s), {report['appliance']} appliance(s) and "
+            f"{report['provider']} provider(s); skipped {report['invalid']} invalid row(s)."
+        ))
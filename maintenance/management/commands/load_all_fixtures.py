@@ -60,6 +60,10 @@ class Command(BaseCommand):
                     self.style.ERROR(f'❌ Failed to load {fixture_file}: {str(e)}')
                 )
         
+        # Fixture loads skip the signal handlers that keep read models current
+        for command in ('rebuild_calendar_summaries', 'rebuild_agenda', 'rebuild_maintenance_stats'):
+            call_command(command, verbosity=0, stdout=self.stdout)
+        
         self.stdout.write('')
         self.stdout.write(
             self.style.SUCCESS(f'🎉 Successfully loaded {loaded_count} fixture files!')
@@ -0,0 +1,70 @@
+"""
+Management command to match appliance recalls against every home.
+Run after adding recalls, and nightly (e.g. from cron) so newly added
+appliances are caught too. Records a recall notice for each affected
+appliance; reruns only add what is new.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from maintenance.recalls import DEFAULT_BATCH_SIZE, match_recalls
+
+
+class Command(BaseCommand):
+    help = 'Record recall notices for appliances matching active manufacturer recalls'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--recall',
+            type=int,
+            action='append',
+            dest='recall_ids',
+            help='Only match this recall ID (repeatable)',
+        )
+        parser.add_argument(
+            '--schedule-days',
+            type=int,
+            help='Also give each home with new notices a schedule entry this many days from today',
+        )
+        parser.add_argument(
+            '--date',
+            help='Treat this date (YYYY-MM-DD) as today',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Rows written per insert (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the notices that would be recorded without writing anything',
+        )
+    
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format')
+        if options['schedule_days'] is not None and options['schedule_days'] < 0:
+            raise CommandError('--schedule-days cannot be negative')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        
+        stats = match_recalls(
+            recall_ids=options['recall_ids'],
+            schedule_days=options['schedule_days'],
+            today=today,
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+        
+        prefix = '[dry run] Would record' if options['dry_run'] else 'Recorded'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {stats['created']} new recall notice(s) and {stats['schedules']} schedule(s); "
+            f"{stats['matched']} affected appliance(s) across {stats['recalls']} active recall(s)."
+        ))
@@ -0,0 +1,27 @@
+"""
+Management command to rebuild the AgendaItem read model.
+The agenda is kept current by signals; run this after bulk imports,
+raw SQL fixes, or to repair drift.
+"""
+
+from django.core.management.base import BaseCommand
+from maintenance.agenda import rebuild_agenda
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the per-home agenda of open tasks from schedules and completions'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--home',
+            type=int,
+            action='append',
+            dest='home_ids',
+            help='Only rebuild the agenda for this home ID (repeatable)',
+        )
+    
+    def handle(self, *args, **options):
+        home_ids = options['home_ids']
+        count = rebuild_agenda(home_ids=home_ids)
+        scope = f"{len(home_ids)} home(s)" if home_ids else 'all homes'
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} agenda items for {scope}.'))
@@ -0,0 +1,27 @@
+"""
+Management command to rebuild the MonthlyScheduleSummary read model.
+Summaries are kept current by signals; run this after bulk imports,
+raw SQL fixes, or to repair drift.
+"""
+
+from django.core.management.base import BaseCommand
+from maintenance.summaries import rebuild_summaries
+
+
+class Command(BaseCommand):
+    help = 'Rebuild per-home monthly schedule summaries from schedules and completions'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--home',
+            type=int,
+            action='append',
+            dest='home_ids',
+            help='Only rebuild summaries for this home ID (repeatable)',
+        )
+    
+    def handle(self, *args, **options):
+        home_ids = options['home_ids']
+        count = rebuild_summaries(home_ids=home_ids)
+        scope = f"{len(home_ids)} home(s)" if home_ids else 'all homes'
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} monthly summaries for {scope}.'))
@@ -0,0 +1,28 @@
+"""
+Management command to rebuild the DailyMaintenanceStat and
+MaintenanceStatTotal read models behind the statistics page.
+They are kept current by signals; run this once after migrating, after
+bulk imports or raw SQL fixes, or to repair drift.
+"""
+
+from django.core.management.base import BaseCommand
+from maintenance.daily_stats import rebuild_stats
+
+
+class Command(BaseCommand):
+    help = 'Rebuild daily maintenance statistics and per-owner totals from schedules and history'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--home',
+            type=int,
+            action='append',
+            dest='home_ids',
+            help='Only rebuild statistics for this home ID (repeatable)',
+        )
+    
+    def handle(self, *args, **options):
+        home_ids = options['home_ids']
+        count = rebuild_stats(home_ids=home_ids)
+        scope = f"{len(home_ids)} home(s)" if home_ids else 'all homes'
+        self.stdout.write(self.style.SUCCESS(f'Rebuilt {count} daily statistics rows for {scope}.'))
@@ -0,0 +1,67 @@
+"""
+Management command to refresh appliance alerts.
+Run nightly (e.g. from cron). Records an alert for every appliance whose
+warranty ends within --days days or whose service is overdue, across all
+homes, and removes alerts that no longer apply; reruns are safe.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from maintenance.lifecycle import DEFAULT_BATCH_SIZE, WARRANTY_NOTICE_DAYS, scan_appliances
+
+
+class Command(BaseCommand):
+    help = 'Record alerts for expiring appliance warranties and overdue appliance service'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--days',
+            type=int,
+            default=WARRANTY_NOTICE_DAYS,
+            help=f'Alert on warranties ending within this many days (default: {WARRANTY_NOTICE_DAYS})',
+        )
+        parser.add_argument(
+            '--date',
+            help='Treat this date (YYYY-MM-DD) as today',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help=f'Alerts written per insert (default: {DEFAULT_BATCH_SIZE})',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the alerts that would be recorded without writing anything',
+        )
+    
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format')
+        if options['days'] < 0:
+            raise CommandError('--days cannot be negative')
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size must be positive')
+        
+        stats = scan_appliances(
+            today=today,
+            days=options['days'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+        )
+        
+        if options['dry_run']:
+            self.stdout.write(self.style.SUCCESS(
+                f"[dry run] Would record {stats['warranty']} warranty and {stats['service']} service alert(s)."
+            ))
+            return
+        self.stdout.write(self.style.SUCCESS(
+            f"Recorded {stats['warranty']} warranty and {stats['service']} service alert(s); "
+            f"removed {stats['removed']} that no longer apply."
+        ))
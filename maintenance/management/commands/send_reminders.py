@@ -0,0 +1,68 @@
+"""
+Management command to email maintenance reminder digests.
+Run daily (e.g. from cron). Each user gets at most one digest per run
+covering schedules due within their reminder_days_before window; schedules
+already reminded for their current date are skipped, so reruns are safe.
+"""
+
+from datetime import date
+
+from django.core.management.base import BaseCommand, CommandError
+from maintenance.reminders import send_reminder_digests
+
+
+class Command(BaseCommand):
+    help = 'Send one maintenance reminder digest per user for upcoming schedules'
+    
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--date',
+            help='Treat this date (YYYY-MM-DD) as today',
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=500,
+            help='Users loaded per query (default: 500)',
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=100,
+            help='Emails sent per batch on the shared connection (default: 100)',
+        )
+        parser.add_argument(
+            '--site-url',
+            help='Base URL for links in the emails (default: settings.SITE_URL)',
+        )
+        parser.add_argument(
+            '--dry-run',
+            action='store_true',
+            help='Count the digests that would be sent without sending or recording them',
+        )
+    
+    def handle(self, *args, **options):
+        today = None
+        if options['date']:
+            try:
+                today = date.fromisoformat(options['date'])
+            except ValueError:
+                raise CommandError('--date must be in YYYY-MM-DD format')
+        if options['chunk_size'] < 1 or options['batch_size'] < 1:
+            raise CommandError('--chunk-size and --batch-size must be positive')
+        
+        stats = send_reminder_digests(
+            today=today,
+            chunk_size=options['chunk_size'],
+            batch_size=options['batch_size'],
+            dry_run=options['dry_run'],
+            site_url=options['site_url'],
+        )
+        
+        prefix = '[dry run] Would send' if options['dry_run'] else 'Sent'
+        self.stdout.write(self.style.SUCCESS(
+            f"{prefix} {stats['emails']} digest(s) covering {stats['schedules']} schedule(s) "
+            f"to {stats['users']} user(s) checked."
+        ))
+        if stats['failed']:
+            self.stdout.write(self.style.ERROR(f"{stats['failed']} digest(s) failed and will be retried on the next run."))
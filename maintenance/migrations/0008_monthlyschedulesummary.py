@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:05
+
+import django.core.validators
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0007_add_comprehensive_features'),
+        ('maintenance', '0007_scheduletaskcustomization_custom_description'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MonthlyScheduleSummary',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('year', models.PositiveSmallIntegerField()),
+                ('month', models.PositiveSmallIntegerField(validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(12)])),
+                ('total_tasks', models.PositiveIntegerField(default=0)),
+                ('completed_tasks', models.PositiveIntegerField(default=0)),
+                ('overdue_tasks', models.PositiveIntegerField(default=0, help_text='Open tasks dated before computed_on')),
+                ('estimated_minutes', models.PositiveIntegerField(default=0, help_text='Sum of estimated_time for all tasks in the month')),
+                ('computed_on', models.DateField(help_text='Day the counts were computed (overdue depends on it)')),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('home', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='monthly_summaries', to='homes.home')),
+            ],
+            options={
+                'verbose_name': 'Monthly Schedule Summary',
+                'verbose_name_plural': 'Monthly Schedule Summaries',
+                'ordering': ['home', 'year', 'month'],
+                'constraints': [models.UniqueConstraint(fields=('home', 'year', 'month'), name='unique_home_month_summary')],
+            },
+        ),
+    ]
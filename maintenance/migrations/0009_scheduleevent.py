@@ -0,0 +1,37 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:12
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0007_add_comprehensive_features'),
+        ('maintenance', '0008_monthlyschedulesummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event_type', models.CharField(choices=[('reschedule', 'Rescheduled'), ('complete', 'Completed'), ('uncomplete', 'Marked Pending'), ('customize', 'Customized')], max_length=20)),
+                ('from_date', models.DateField(blank=True, null=True)),
+                ('to_date', models.DateField(blank=True, help_text='New date for reschedules; next occurrence for completions', null=True)),
+                ('note', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('actor', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='schedule_events', to=settings.AUTH_USER_MODEL)),
+                ('home', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_events', to='homes.home')),
+                ('schedule', models.ForeignKey(help_text='Kept as null after the schedule is deleted so history survives', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='events', to='maintenance.schedule')),
+                ('task', models.ForeignKey(blank=True, help_text='The task involved, for task-level events', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='schedule_events', to='maintenance.maintenancetask')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['schedule', 'created_at'], name='maintenance_schedul_8e94d0_idx'), models.Index(fields=['home', 'created_at'], name='maintenance_home_id_ca662e_idx'), models.Index(fields=['event_type', 'created_at'], name='maintenance_event_t_7bcce7_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:12
+
+import re
+from datetime import date, datetime, timezone
+
+from django.db import migrations
+
+# Lines written by the old Schedule.reschedule():
+# "[2025-11-26 20:33] Rescheduled from 2025-12-01 to 2025-12-08 - Reason: Vacation"
+RESCHEDULE_LINE = re.compile(
+    r'^\[(\d{4}-\d{2}-\d{2} \d{2}:\d{2})\] Rescheduled from (\d{4}-\d{2}-\d{2}) '
+    r'to (\d{4}-\d{2}-\d{2})(?: - Reason: (.*))?$'
+)
+BATCH_SIZE = 500
+
+
+def notes_to_events(apps, schema_editor):
+    """
+    Move reschedule lines out of Schedule.notes into ScheduleEvent rows,
+    keeping any other text the user wrote.
+    """
+    Schedule = apps.get_model('maintenance', 'Schedule')
+    ScheduleEvent = apps.get_model('maintenance', 'ScheduleEvent')
+    
+    # Collect ids first: SQLite gives no isolation between reading and
+    # updating the same table on one connection.
+    ids = list(Schedule.objects.filter(notes__contains='] Rescheduled from ').values_list('id', flat=True))
+    for start in range(0, len(ids), BATCH_SIZE):
+        events = []
+        schedules = list(Schedule.objects.filter(pk__in=ids[start:start + BATCH_SIZE]).only('id', 'home_id', 'notes'))
+        for schedule in schedules:
+            kept = []
+            for line in schedule.notes.splitlines():
+                match = RESCHEDULE_LINE.match(line.strip())
+                if not match:
+                    kept.append(line)
+                    continue
+                timestamp, from_date, to_date, reason = match.groups()
+                events.append(ScheduleEvent(
+                    schedule_id=schedule.id,
+                    home_id=schedule.home_id,
+                    event_type='reschedule',
+                    from_date=date.fromisoformat(from_date),
+                    to_date=date.fromisoformat(to_date),
+                    note=reason or '',
+                    created_at=datetime.strptime(timestamp, '%Y-%m-%d %H:%M').replace(tzinfo=timezone.utc),
+                ))
+            schedule.notes = '\n'.join(kept).strip()
+        ScheduleEvent.objects.bulk_create(events)
+        Schedule.objects.bulk_update(schedules, ['notes'])
+
+
+def events_to_notes(apps, schema_editor):
+    """
+    Reverse migration - append reschedule events to notes in the old format.
+    """
+    Schedule = apps.get_model('maintenance', 'Schedule')
+    ScheduleEvent = apps.get_model('maintenance', 'ScheduleEvent')
+    
+    lines = {}
+    events = ScheduleEvent.objects.filter(
+        event_type='reschedule', schedule__isnull=False
+    ).order_by('schedule_id', 'created_at')
+    for event in events.iterator(chunk_size=BATCH_SIZE):
+        line = f"[{event.created_at:%Y-%m-%d %H:%M}] Rescheduled from {event.from_date} to {event.to_date}"
+        if event.note:
+            line += f" - Reason: {event.note}"
+        lines.setdefault(event.schedule_id, []).append(line)
+    
+    schedules = list(Schedule.objects.filter(pk__in=lines).only('id', 'notes'))
+    for schedule in schedules:
+        schedule.notes = '\n'.join(filter(None, [schedule.notes] + lines[schedule.id]))
+    Schedule.objects.bulk_update(schedules, ['notes'], batch_size=BATCH_SIZE)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0009_scheduleevent'),
+    ]
+
+    operations = [
+        migrations.RunPython(notes_to_events, events_to_notes),
+    ]
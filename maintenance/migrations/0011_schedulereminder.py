@@ -0,0 +1,31 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:14
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0010_migrate_reschedule_notes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ScheduleReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scheduled_date', models.DateField(help_text='The date the schedule had when the reminder went out')),
+                ('sent_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='maintenance.schedule')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='schedule_reminders', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['-sent_at'],
+                'constraints': [models.UniqueConstraint(fields=('schedule', 'scheduled_date'), name='unique_schedule_reminder')],
+            },
+        ),
+    ]
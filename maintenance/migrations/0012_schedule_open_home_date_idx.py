@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0007_add_comprehensive_features'),
+        ('maintenance', '0011_schedulereminder'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='schedule',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['home', 'scheduled_date'], name='schedule_open_home_date_idx'),
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:19
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0007_add_comprehensive_features'),
+        ('maintenance', '0012_schedule_open_home_date_idx'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AgendaItem',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('due_date', models.DateField(help_text="The schedule's scheduled_date")),
+                ('home', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='agenda_items', to='homes.home')),
+                ('owner', models.ForeignKey(help_text="Copied from the home's owner for per-user range scans", on_delete=django.db.models.deletion.CASCADE, related_name='agenda_items', to=settings.AUTH_USER_MODEL)),
+                ('schedule', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='agenda_items', to='maintenance.schedule')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='agenda_items', to='maintenance.maintenancetask')),
+            ],
+            options={
+                'ordering': ['due_date', 'id'],
+                'indexes': [models.Index(fields=['owner', 'due_date'], name='maintenance_owner_i_695363_idx'), models.Index(fields=['home', 'due_date'], name='maintenance_home_id_1264df_idx')],
+                'constraints': [models.UniqueConstraint(fields=('schedule', 'task'), name='unique_agenda_schedule_task')],
+            },
+        ),
+    ]
@@ -0,0 +1,36 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:22
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0007_add_comprehensive_features'),
+        ('maintenance', '0013_agendaitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ArchivedSchedule',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('original_id', models.PositiveIntegerField(help_text='Primary key the schedule had before it was archived', unique=True)),
+                ('scheduled_date', models.DateField()),
+                ('completed_at', models.DateTimeField(blank=True, null=True)),
+                ('notes', models.TextField(blank=True)),
+                ('task_count', models.PositiveIntegerField(default=0)),
+                ('estimated_minutes', models.PositiveIntegerField(default=0)),
+                ('payload', models.JSONField(default=dict, help_text='Snapshot of tasks, completions, customizations and events')),
+                ('created_at', models.DateTimeField(help_text='When the original schedule was created')),
+                ('archived_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('home', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='archived_schedules', to='homes.home')),
+            ],
+            options={
+                'ordering': ['-scheduled_date'],
+                'indexes': [models.Index(fields=['home', 'scheduled_date'], name='maintenance_home_id_cbb009_idx')],
+            },
+        ),
+    ]
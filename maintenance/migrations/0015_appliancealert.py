@@ -0,0 +1,33 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:38
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0009_appliance_scan_indexes'),
+        ('maintenance', '0014_archivedschedule'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplianceAlert',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('warranty', 'Warranty expiring'), ('service', 'Service overdue')], max_length=20)),
+                ('due_date', models.DateField(help_text='Warranty end date, or the date service became due')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('checked_on', models.DateField(help_text='Date of the last scan that found this alert')),
+                ('appliance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='alerts', to='homes.appliance')),
+                ('home', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='appliance_alerts', to='homes.home')),
+            ],
+            options={
+                'ordering': ['due_date'],
+                'indexes': [models.Index(fields=['home', 'due_date'], name='maintenance_home_id_70e611_idx')],
+                'constraints': [models.UniqueConstraint(fields=('appliance', 'kind', 'due_date'), name='unique_appliance_alert')],
+            },
+        ),
+    ]
@@ -0,0 +1,29 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:54
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0015_appliancealert'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Tool',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100)),
+                ('slug', models.SlugField(help_text='Normalized name; one tool per slug', max_length=100, unique=True)),
+            ],
+            options={
+                'ordering': ['name'],
+            },
+        ),
+        migrations.AddField(
+            model_name='maintenancetask',
+            name='tools',
+            field=models.ManyToManyField(blank=True, editable=False, help_text='Parsed from tools_required when the task is saved', related_name='tasks', to='maintenance.tool'),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.7 on 2026-10-19 05:54
+
+import re
+
+from django.db import migrations
+from django.utils.text import slugify
+
+# The parsing rules of maintenance.tools.parse_tools() at the time of this migration
+ITEM_SEPARATOR = re.compile(r'[\n;]|,(?![^()]*\))')
+BULLET = re.compile(r'^(?:[-*•]+|\d+[.)])\s*')
+PARENTHETICAL = re.compile(r'\s*\([^)]*\)')
+MAX_NAME_LENGTH = 100
+BATCH_SIZE = 500
+
+
+def parse_tools(text):
+    tools = {}
+    for item in ITEM_SEPARATOR.split(text or ''):
+        name = PARENTHETICAL.sub('', BULLET.sub('', item.strip()))
+        name = ' '.join(name.split()).rstrip('.')[:MAX_NAME_LENGTH]
+        slug = slugify(name)[:MAX_NAME_LENGTH]
+        if slug and slug not in tools:
+            tools[slug] = name[0].upper() + name[1:]
+    return list(tools.items())
+
+
+def link_tools(apps, schema_editor):
+    """
+    Parse every task's tools_required into Tool rows and link them.
+    """
+    MaintenanceTask = apps.get_model('maintenance', 'MaintenanceTask')
+    Tool = apps.get_model('maintenance', 'Tool')
+    TaskTool = MaintenanceTask.tools.through
+
+    parsed = {
+        pk: parse_tools(text)
+        for pk, text in MaintenanceTask.objects.exclude(tools_required='').values_list('pk', 'tools_required')
+    }
+    names = {}
+    for items in parsed.values():
+        for slug, name in items:
+            names.setdefault(slug, name)
+    Tool.objects.bulk_create(
+        [Tool(slug=slug, name=name) for slug, name in names.items()],
+        batch_size=BATCH_SIZE, ignore_conflicts=True,
+    )
+    tool_ids = dict(Tool.objects.values_list('slug', 'pk'))
+    TaskTool.objects.bulk_create([
+        TaskTool(maintenancetask_id=task_id, tool_id=tool_ids[slug])
+        for task_id, items in parsed.items()
+        for slug, _ in items
+    ], batch_size=BATCH_SIZE, ignore_conflicts=True)
+
+
+def unlink_tools(apps, schema_editor):
+    apps.get_model('maintenance', 'Tool').objects.all().delete()
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0016_tool'),
+    ]
+
+    operations = [
+        migrations.RunPython(link_tools, unlink_tools),
+    ]
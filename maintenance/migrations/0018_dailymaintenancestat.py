@@ -0,0 +1,53 @@
+# Generated by Django 5.2.7 on 2026-10-19 06:10
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0009_appliance_scan_indexes'),
+        ('maintenance', '0017_backfill_task_tools'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DailyMaintenanceStat',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('day', models.DateField(help_text="The schedules' scheduled_date")),
+                ('category', models.CharField(blank=True, help_text='Task category; blank on the row holding time logged for whole schedules', max_length=50)),
+                ('due_tasks', models.PositiveIntegerField(default=0)),
+                ('completed_tasks', models.PositiveIntegerField(default=0)),
+                ('on_time_tasks', models.PositiveIntegerField(default=0, help_text='Completed on or before the day they were due')),
+                ('minutes_spent', models.PositiveIntegerField(default=0, help_text='TaskCompletion.actual_time logged for schedules on this day')),
+                ('home', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='daily_maintenance_stats', to='homes.home')),
+                ('owner', models.ForeignKey(help_text="Copied from the home's owner for per-user range scans", on_delete=django.db.models.deletion.CASCADE, related_name='daily_maintenance_stats', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['home', 'day', 'category'],
+                'indexes': [models.Index(fields=['owner', 'day'], name='maintenance_owner_i_09e036_idx')],
+                'constraints': [models.UniqueConstraint(fields=('home', 'day', 'category'), name='unique_home_day_category_stat')],
+            },
+        ),
+        migrations.CreateModel(
+            name='MaintenanceStatTotal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(blank=True, max_length=50)),
+                ('due_tasks', models.PositiveIntegerField(default=0)),
+                ('completed_tasks', models.PositiveIntegerField(default=0)),
+                ('on_time_tasks', models.PositiveIntegerField(default=0)),
+                ('minutes_spent', models.PositiveIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='maintenance_stat_totals', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ['owner', 'category'],
+                'constraints': [models.UniqueConstraint(fields=('owner', 'category'), name='unique_owner_category_stat_total')],
+            },
+        ),
+    ]
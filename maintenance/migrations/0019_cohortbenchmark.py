@@ -0,0 +1,35 @@
+# Generated by Django 5.2.7 on 2026-10-19 06:14
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0018_dailymaintenancestat'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CohortBenchmark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('climate_zone', models.CharField(max_length=50)),
+                ('age_bucket', models.CharField(blank=True, max_length=20)),
+                ('construction_type', models.CharField(blank=True, max_length=50)),
+                ('size_band', models.CharField(blank=True, max_length=20)),
+                ('home_count', models.PositiveIntegerField(help_text='Homes with tasks due in the period')),
+                ('completion_rate', models.PositiveSmallIntegerField(help_text='Median percentage of due tasks completed')),
+                ('on_time_rate', models.PositiveSmallIntegerField(help_text='Median percentage of due tasks completed by their date')),
+                ('yearly_hours', models.FloatField(help_text='Average hours of maintenance logged per home')),
+                ('skipped_tasks', models.JSONField(default=list, help_text='Most often skipped tasks: id, title, slug and skip_rate (percent)')),
+                ('period_start', models.DateField()),
+                ('period_end', models.DateField()),
+                ('computed_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['climate_zone', 'age_bucket', 'construction_type', 'size_band'],
+                'constraints': [models.UniqueConstraint(fields=('climate_zone', 'age_bucket', 'construction_type', 'size_band'), name='unique_cohort_benchmark')],
+            },
+        ),
+    ]
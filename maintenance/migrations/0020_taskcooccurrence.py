@@ -0,0 +1,27 @@
+# Generated by Django 5.2.7 on 2026-10-19 06:16
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0019_cohortbenchmark'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskCooccurrence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(help_text='Similarity-weighted co-occurrence, normalized to 0-1')),
+                ('related_task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cooccurrence_sources', to='maintenance.maintenancetask')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='cooccurrences', to='maintenance.maintenancetask')),
+            ],
+            options={
+                'ordering': ['task', '-score'],
+                'constraints': [models.UniqueConstraint(fields=('task', 'related_task'), name='unique_task_cooccurrence')],
+            },
+        ),
+    ]
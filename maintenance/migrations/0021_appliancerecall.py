@@ -0,0 +1,55 @@
+# Generated by Django 5.2.7 on 2026-10-19 06:19
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('homes', '0010_appliance_match_keys'),
+        ('maintenance', '0020_taskcooccurrence'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ApplianceRecall',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('manufacturer', models.CharField(max_length=200)),
+                ('model_pattern', models.CharField(help_text='Model number as published; end with * to match every model starting with it', max_length=200)),
+                ('appliance_type', models.CharField(blank=True, choices=[('hvac', 'HVAC System'), ('water_heater', 'Water Heater'), ('furnace', 'Furnace'), ('ac_unit', 'Air Conditioning Unit'), ('refrigerator', 'Refrigerator'), ('washer', 'Washing Machine'), ('dryer', 'Dryer'), ('dishwasher', 'Dishwasher'), ('oven', 'Oven/Stove'), ('sump_pump', 'Sump Pump'), ('garage_door', 'Garage Door Opener'), ('other', 'Other')], help_text='Only match appliances of this type; blank for any', max_length=50)),
+                ('title', models.CharField(max_length=200)),
+                ('description', models.TextField(blank=True, help_text='Hazard and remedy')),
+                ('url', models.URLField(blank=True, help_text='Official recall notice')),
+                ('recall_date', models.DateField()),
+                ('is_active', models.BooleanField(default=True)),
+                ('manufacturer_key', models.CharField(editable=False, max_length=200)),
+                ('model_key', models.CharField(editable=False, max_length=200)),
+                ('is_prefix', models.BooleanField(default=False, editable=False)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['-recall_date', 'manufacturer'],
+                'indexes': [models.Index(fields=['manufacturer_key', 'model_key'], name='maintenance_manufac_f4c161_idx')],
+            },
+        ),
+        migrations.CreateModel(
+            name='RecallNotice',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField(default=django.utils.timezone.now)),
+                ('dismissed_at', models.DateTimeField(blank=True, null=True)),
+                ('appliance', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recall_notices', to='homes.appliance')),
+                ('home', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='recall_notices', to='homes.home')),
+                ('recall', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notices', to='maintenance.appliancerecall')),
+                ('schedule', models.ForeignKey(blank=True, help_text='Schedule entry created to deal with the recall, if any', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='recall_notices', to='maintenance.schedule')),
+            ],
+            options={
+                'ordering': ['-created_at'],
+                'indexes': [models.Index(fields=['home', 'dismissed_at'], name='maintenance_home_id_3a1891_idx')],
+                'constraints': [models.UniqueConstraint(fields=('recall', 'appliance'), name='unique_recall_notice')],
+            },
+        ),
+    ]
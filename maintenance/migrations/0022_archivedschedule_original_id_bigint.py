@@ -0,0 +1,18 @@
+# Generated by Django 5.2.7 on 2026-10-19 07:03
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('maintenance', '0021_appliancerecall'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivedschedule',
+            name='original_id',
+            field=models.PositiveBigIntegerField(help_text='Primary key the schedule had before it was archived', unique=True),
+        ),
+    ]
@@ -3,14 +3,39 @@ Models for the maintenance app.
 Defines maintenance tasks, schedules, and task completion records.
 """
 
-from django.db import models
+from django.db import models, transaction
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.urls import reverse
+from django.utils import timezone
+
+from homes.appliance_keys import manufacturer_key, model_key
+from homes.models import Appliance
 
 User = get_user_model()
 
 
+class Tool(models.Model):
+    """
+    A tool or supply named in a task's tools_required text. Tools are
+    parsed from that text whenever a task is saved (see maintenance.tools),
+    so tasks can be filtered by tool and supply lists built with a join.
+    """
+    name = models.CharField(max_length=100)
+    
+    slug = models.SlugField(
+        max_length=100,
+        unique=True,
+        help_text='Normalized name; one tool per slug'
+    )
+    
+    class Meta:
+        ordering = ['name']
+    
+    def __str__(self):
+        return self.name
+
+
 class MaintenanceTask(models.Model):
     """
     Represents a type of maintenance task with instructions and guidelines.
@@ -95,6 +120,14 @@ class MaintenanceTask(models.Model):
         help_text='List of tools needed (one per line or comma-separated)'
     )
     
+    tools = models.ManyToManyField(
+        Tool,
+        related_name='tasks',
+        blank=True,
+        editable=False,
+        help_text='Parsed from tools_required when the task is saved'
+    )
+    
     step_by_step = models.TextField(
         blank=True,
         help_text='Step-by-step instructions for completing this task'
@@ -198,36 +231,35 @@ class Schedule(models.Model):
         ordering = ['-scheduled_date']
         indexes = [
             models.Index(fields=['home', 'scheduled_date']),
+            # Partial index over open schedules only: overdue and upcoming lookups
+            models.Index(
+                fields=['home', 'scheduled_date'],
+                condition=models.Q(is_completed=False),
+                name='schedule_open_home_date_idx',
+            ),
         ]
     
     def __str__(self):
         return f"Schedule for {self.home.name} on {self.scheduled_date}"
     
-    def mark_complete(self):
-        """Mark this schedule as completed."""
-        from django.utils import timezone
+    def mark_complete(self, user=None):
+        """Mark this schedule as completed and log the event."""
         self.is_completed = True
         self.completed_at = timezone.now()
-        self.save()
+        with transaction.atomic():
+            self.save(update_fields=['is_completed', 'completed_at', 'updated_at'])
+            ScheduleEvent.log(self, 'complete', actor=user)
     
-    def reschedule(self, new_date, reason=None):
-        """Reschedule to a new date and log the change."""
-        from django.utils import timezone
+    def reschedule(self, new_date, reason=None, user=None):
+        """Reschedule to a new date and log the change as a ScheduleEvent."""
         old_date = self.scheduled_date
         self.scheduled_date = new_date
-        
-        # Add reschedule note
-        timestamp = timezone.now().strftime('%Y-%m-%d %H:%M')
-        reschedule_note = f"\n[{timestamp}] Rescheduled from {old_date} to {new_date}"
-        if reason:
-            reschedule_note += f" - Reason: {reason}"
-        
-        if self.notes:
-            self.notes += reschedule_note
-        else:
-            self.notes = reschedule_note.strip()
-        
-        self.save()
+        with transaction.atomic():
+            self.save(update_fields=['scheduled_date', 'updated_at'])
+            ScheduleEvent.log(
+                self, 'reschedule', actor=user,
+                from_date=old_date, to_date=new_date, note=reason or '',
+            )
         return True
 
 
@@ -358,3 +390,600 @@ class TaskCompletion(models.Model):
         task_count = self.schedule.tasks.count()
         return f"Schedule for {self.schedule.home.name} completed on {self.completed_date.date()} ({task_count} tasks)"
 
+
+
+class MonthlyScheduleSummary(models.Model):
+    """
+    Materialized per-home, per-month rollup of scheduled tasks.
+    Maintained by signal handlers (see maintenance/summaries.py) so the calendar
+    header, workload heatmap and home list can render from a handful of rows.
+    Rebuild with: python manage.py rebuild_calendar_summaries
+    """
+    home = models.ForeignKey(
+        'homes.Home',
+        on_delete=models.CASCADE,
+        related_name='monthly_summaries'
+    )
+    
+    year = models.PositiveSmallIntegerField()
+    month = models.PositiveSmallIntegerField(
+        validators=[MinValueValidator(1), MaxValueValidator(12)]
+    )
+    
+    total_tasks = models.PositiveIntegerField(default=0)
+    completed_tasks = models.PositiveIntegerField(default=0)
+    
+    overdue_tasks = models.PositiveIntegerField(
+        default=0,
+        help_text='Open tasks dated before computed_on'
+    )
+    
+    estimated_minutes = models.PositiveIntegerField(
+        default=0,
+        help_text='Sum of estimated_time for all tasks in the month'
+    )
+    
+    computed_on = models.DateField(
+        help_text='Day the counts were computed (overdue depends on it)'
+    )
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['home', 'year', 'month']
+        verbose_name = 'Monthly Schedule Summary'
+        verbose_name_plural = 'Monthly Schedule Summaries'
+        constraints = [
+            models.UniqueConstraint(fields=['home', 'year', 'month'], name='unique_home_month_summary'),
+        ]
+    
+    def __str__(self):
+        return f"{self.home_id} {self.year}-{self.month:02d}: {self.completed_tasks}/{self.total_tasks} done"
+    
+    @property
+    def pending_tasks(self):
+        return self.total_tasks - self.completed_tasks
+    
+    @property
+    def estimated_hours(self):
+        return round(self.estimated_minutes / 60, 1)
+
+
+class AgendaItem(models.Model):
+    """
+    Denormalized agenda: one row per still-open task occurrence per home.
+    Maintained by signal handlers (see maintenance/agenda.py) so dashboards
+    can list overdue and upcoming work with a range scan on due_date
+    instead of joining schedules, their tasks and task completions.
+    Rebuild with: python manage.py rebuild_agenda
+    """
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='agenda_items',
+        help_text="Copied from the home's owner for per-user range scans"
+    )
+    
+    home = models.ForeignKey(
+        'homes.Home',
+        on_delete=models.CASCADE,
+        related_name='agenda_items'
+    )
+    
+    schedule = models.ForeignKey(
+        Schedule,
+        on_delete=models.CASCADE,
+        related_name='agenda_items'
+    )
+    
+    task = models.ForeignKey(
+        MaintenanceTask,
+        on_delete=models.CASCADE,
+        related_name='agenda_items'
+    )
+    
+    due_date = models.DateField(
+        help_text="The schedule's scheduled_date"
+    )
+    
+    class Meta:
+        ordering = ['due_date', 'id']
+        constraints = [
+            models.UniqueConstraint(fields=['schedule', 'task'], name='unique_agenda_schedule_task'),
+        ]
+        indexes = [
+            models.Index(fields=['owner', 'due_date']),
+            models.Index(fields=['home', 'due_date']),
+        ]
+    
+    def __str__(self):
+        return f"Task {self.task_id} for home {self.home_id} due {self.due_date}"
+
+
+class ScheduleEvent(models.Model):
+    """
+    Append-only history of what happened to a schedule: reschedules,
+    completions, undos and customizations, with who/when/from/to.
+    Rows are only ever inserted; history is read per schedule or home
+    through the (schedule, created_at) and (home, created_at) indexes.
+    """
+    EVENT_CHOICES = [
+        ('reschedule', 'Rescheduled'),
+        ('complete', 'Completed'),
+        ('uncomplete', 'Marked Pending'),
+        ('customize', 'Customized'),
+    ]
+    
+    schedule = models.ForeignKey(
+        Schedule,
+        on_delete=models.SET_NULL,
+        null=True,
+        related_name='events',
+        help_text='Kept as null after the schedule is deleted so history survives'
+    )
+    
+    home = models.ForeignKey(
+        'homes.Home',
+        on_delete=models.CASCADE,
+        related_name='schedule_events'
+    )
+    
+    task = models.ForeignKey(
+        MaintenanceTask,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='schedule_events',
+        help_text='The task involved, for task-level events'
+    )
+    
+    event_type = models.CharField(max_length=20, choices=EVENT_CHOICES)
+    
+    actor = models.ForeignKey(
+        User,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='schedule_events'
+    )
+    
+    from_date = models.DateField(null=True, blank=True)
+    to_date = models.DateField(
+        null=True,
+        blank=True,
+        help_text='New date for reschedules; next occurrence for completions'
+    )
+    
+    note = models.TextField(blank=True)
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-created_at']
+        indexes = [
+            models.Index(fields=['schedule', 'created_at']),
+            models.Index(fields=['home', 'created_at']),
+            models.Index(fields=['event_type', 'created_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_event_type_display()} schedule {self.schedule_id} at {self.created_at:%Y-%m-%d %H:%M}"
+    
+    @classmethod
+    def build(cls, schedule, event_type, actor=None, **fields):
+        """Return an unsaved event for schedule (for bulk_create)."""
+        return cls(
+            schedule_id=schedule.pk,
+            home_id=schedule.home_id,
+            event_type=event_type,
+            actor=actor,
+            **fields
+        )
+    
+    @classmethod
+    def log(cls, schedule, event_type, actor=None, **fields):
+        """Record one event with a single INSERT."""
+        event = cls.build(schedule, event_type, actor=actor, **fields)
+        event.save(force_insert=True)
+        return event
+
+
+class ScheduleReminder(models.Model):
+    """
+    Record of a reminder email sent for a schedule on a given date.
+    Makes send_reminders idempotent: a schedule is reminded once per
+    scheduled_date, and again only if it is moved to a new date.
+    """
+    schedule = models.ForeignKey(
+        Schedule,
+        on_delete=models.CASCADE,
+        related_name='reminders'
+    )
+    
+    user = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='schedule_reminders'
+    )
+    
+    scheduled_date = models.DateField(
+        help_text='The date the schedule had when the reminder went out'
+    )
+    
+    sent_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-sent_at']
+        constraints = [
+            models.UniqueConstraint(fields=['schedule', 'scheduled_date'], name='unique_schedule_reminder'),
+        ]
+    
+    def __str__(self):
+        return f"Reminder to {self.user_id} for schedule {self.schedule_id} ({self.scheduled_date})"
+
+
+class ArchivedSchedule(models.Model):
+    """
+    A completed schedule moved out of the hot tables by archive_schedules.
+    Its tasks, completions, customizations and events are kept as a JSON
+    snapshot; task_count and estimated_minutes let the monthly summaries
+    keep counting archived work without reading the snapshot.
+    """
+    original_id = models.PositiveBigIntegerField(
+        unique=True,
+        help_text='Primary key the schedule had before it was archived'
+    )
+    
+    home = models.ForeignKey(
+        'homes.Home',
+        on_delete=models.CASCADE,
+        related_name='archived_schedules'
+    )
+    
+    scheduled_date = models.DateField()
+    completed_at = models.DateTimeField(null=True, blank=True)
+    notes = models.TextField(blank=True)
+    
+    task_count = models.PositiveIntegerField(default=0)
+    estimated_minutes = models.PositiveIntegerField(default=0)
+    
+    payload = models.JSONField(
+        default=dict,
+        help_text='Snapshot of tasks, completions, customizations and events'
+    )
+    
+    created_at = models.DateTimeField(help_text='When the original schedule was created')
+    archived_at = models.DateTimeField(default=timezone.now)
+    
+    class Meta:
+        ordering = ['-scheduled_date']
+        indexes = [
+            models.Index(fields=['home', 'scheduled_date']),
+        ]
+    
+    def __str__(self):
+        return f"Archived schedule {self.original_id} for home {self.home_id} on {self.scheduled_date}"
+    
+    @property
+    def tasks(self):
+        return self.payload.get('tasks', [])
+    
+    @property
+    def events(self):
+        return self.payload.get('events', [])
+
+
+class ApplianceAlert(models.Model):
+    """
+    An open warning about an appliance: its warranty ends soon, or its
+    service is overdue. Maintained by scan_appliances, which refreshes
+    checked_on for alerts that still apply and drops the rest, so the
+    table only ever holds current alerts.
+    """
+    KIND_CHOICES = [
+        ('warranty', 'Warranty expiring'),
+        ('service', 'Service overdue'),
+    ]
+    
+    appliance = models.ForeignKey(
+        'homes.Appliance',
+        on_delete=models.CASCADE,
+        related_name='alerts'
+    )
+    
+    home = models.ForeignKey(
+        'homes.Home',
+        on_delete=models.CASCADE,
+        related_name='appliance_alerts'
+    )
+    
+    kind = models.CharField(max_length=20, choices=KIND_CHOICES)
+    
+    due_date = models.DateField(
+        help_text='Warranty end date, or the date service became due'
+    )
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    checked_on = models.DateField(help_text='Date of the last scan that found this alert')
+    
+    class Meta:
+        ordering = ['due_date']
+        constraints = [
+            models.UniqueConstraint(fields=['appliance', 'kind', 'due_date'], name='unique_appliance_alert'),
+        ]
+        indexes = [
+            models.Index(fields=['home', 'due_date']),
+        ]
+    
+    def __str__(self):
+        return f"{self.get_kind_display()} for appliance {self.appliance_id} ({self.due_date})"
+
+
+class DailyMaintenanceStat(models.Model):
+    """
+    Per-home, per-day, per-category counts of scheduled tasks and logged
+    time, including archived schedules. Maintained by signal handlers
+    (see maintenance/daily_stats.py), which also keep MaintenanceStatTotal
+    in step, so the statistics page reads a bounded number of rows
+    however much history an owner has.
+    Rebuild with: python manage.py rebuild_maintenance_stats
+    """
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='daily_maintenance_stats',
+        help_text="Copied from the home's owner for per-user range scans"
+    )
+    
+    home = models.ForeignKey(
+        'homes.Home',
+        on_delete=models.CASCADE,
+        related_name='daily_maintenance_stats'
+    )
+    
+    day = models.DateField(
+        help_text="The schedules' scheduled_date"
+    )
+    
+    category = models.CharField(
+        max_length=50,
+        blank=True,
+        help_text='Task category; blank on the row holding time logged for whole schedules'
+    )
+    
+    due_tasks = models.PositiveIntegerField(default=0)
+    completed_tasks = models.PositiveIntegerField(default=0)
+    
+    on_time_tasks = models.PositiveIntegerField(
+        default=0,
+        help_text='Completed on or before the day they were due'
+    )
+    
+    minutes_spent = models.PositiveIntegerField(
+        default=0,
+        help_text='TaskCompletion.actual_time logged for schedules on this day'
+    )
+    
+    class Meta:
+        ordering = ['home', 'day', 'category']
+        constraints = [
+            models.UniqueConstraint(fields=['home', 'day', 'category'], name='unique_home_day_category_stat'),
+        ]
+        indexes = [
+            models.Index(fields=['owner', 'day']),
+        ]
+    
+    def __str__(self):
+        return f"{self.home_id} {self.day} {self.category or 'all'}: {self.completed_tasks}/{self.due_tasks} done"
+
+
+class MaintenanceStatTotal(models.Model):
+    """
+    Running all-time totals of DailyMaintenanceStat per owner and category,
+    updated with the difference each daily refresh makes.
+    """
+    owner = models.ForeignKey(
+        User,
+        on_delete=models.CASCADE,
+        related_name='maintenance_stat_totals'
+    )
+    
+    category = models.CharField(max_length=50, blank=True)
+    
+    due_tasks = models.PositiveIntegerField(default=0)
+    completed_tasks = models.PositiveIntegerField(default=0)
+    on_time_tasks = models.PositiveIntegerField(default=0)
+    minutes_spent = models.PositiveIntegerField(default=0)
+    
+    updated_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['owner', 'category']
+        constraints = [
+            models.UniqueConstraint(fields=['owner', 'category'], name='unique_owner_category_stat_total'),
+        ]
+    
+    def __str__(self):
+        return f"{self.owner_id} {self.category or 'all'}: {self.completed_tasks}/{self.due_tasks} done"
+
+
+class CohortBenchmark(models.Model):
+    """
+    Typical maintenance numbers for a cohort of similar homes, written in
+    bulk by compute_cohort_benchmarks (see maintenance/cohorts.py) so home
+    pages compare against a stored row instead of aggregating every home.
+    A blank age_bucket, construction_type or size_band means any value,
+    giving broader cohorts to fall back on when a narrow one is too small.
+    """
+    climate_zone = models.CharField(max_length=50)
+    age_bucket = models.CharField(max_length=20, blank=True)
+    construction_type = models.CharField(max_length=50, blank=True)
+    size_band = models.CharField(max_length=20, blank=True)
+    
+    home_count = models.PositiveIntegerField(
+        help_text='Homes with tasks due in the period'
+    )
+    
+    completion_rate = models.PositiveSmallIntegerField(
+        help_text='Median percentage of due tasks completed'
+    )
+    
+    on_time_rate = models.PositiveSmallIntegerField(
+        help_text='Median percentage of due tasks completed by their date'
+    )
+    
+    yearly_hours = models.FloatField(
+        help_text='Average hours of maintenance logged per home'
+    )
+    
+    skipped_tasks = models.JSONField(
+        default=list,
+        help_text='Most often skipped tasks: id, title, slug and skip_rate (percent)'
+    )
+    
+    period_start = models.DateField()
+    period_end = models.DateField()
+    computed_at = models.DateTimeField(auto_now=True)
+    
+    class Meta:
+        ordering = ['climate_zone', 'age_bucket', 'construction_type', 'size_band']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['climate_zone', 'age_bucket', 'construction_type', 'size_band'],
+                name='unique_cohort_benchmark',
+            ),
+        ]
+    
+    def __str__(self):
+        parts = [self.climate_zone, self.age_bucket, self.construction_type, self.size_band]
+        return f"Cohort {'/'.join(part or '*' for part in parts)} ({self.home_count} homes)"
+
+
+class TaskCooccurrence(models.Model):
+    """
+    How strongly doing `task` goes with doing `related_task` across homes,
+    kept for only the top related tasks of each task. Replaced in bulk by
+    compute_task_cooccurrence (see maintenance/cooccurrence.py).
+    """
+    task = models.ForeignKey(
+        MaintenanceTask,
+        on_delete=models.CASCADE,
+        related_name='cooccurrences'
+    )
+    
+    related_task = models.ForeignKey(
+        MaintenanceTask,
+        on_delete=models.CASCADE,
+        related_name='cooccurrence_sources'
+    )
+    
+    score = models.FloatField(
+        help_text='Similarity-weighted co-occurrence, normalized to 0-1'
+    )
+    
+    class Meta:
+        ordering = ['task', '-score']
+        constraints = [
+            models.UniqueConstraint(fields=['task', 'related_task'], name='unique_task_cooccurrence'),
+        ]
+    
+    def __str__(self):
+        return f"{self.task_id} -> {self.related_task_id} ({self.score:.2f})"
+
+
+class ApplianceRecall(models.Model):
+    """
+    A manufacturer recall, matched against every appliance by normalized
+    manufacturer and model number (see homes.appliance_keys). A model
+    pattern ending in * matches every model number that starts with it.
+    match_recalls records a RecallNotice for each affected appliance.
+    """
+    manufacturer = models.CharField(max_length=200)
+    
+    model_pattern = models.CharField(
+        max_length=200,
+        help_text='Model number as published; end with * to match every model starting with it'
+    )
+    
+    appliance_type = models.CharField(
+        max_length=50,
+        choices=Appliance.APPLIANCE_TYPES,
+        blank=True,
+        help_text='Only match appliances of this type; blank for any'
+    )
+    
+    title = models.CharField(max_length=200)
+    description = models.TextField(blank=True, help_text='Hazard and remedy')
+    url = models.URLField(blank=True, help_text='Official recall notice')
+    recall_date = models.DateField()
+    is_active = models.BooleanField(default=True)
+    
+    manufacturer_key = models.CharField(max_length=200, editable=False)
+    model_key = models.CharField(max_length=200, editable=False)
+    is_prefix = models.BooleanField(default=False, editable=False)
+    
+    created_at = models.DateTimeField(auto_now_add=True)
+    
+    class Meta:
+        ordering = ['-recall_date', 'manufacturer']
+        indexes = [
+            models.Index(fields=['manufacturer_key', 'model_key']),
+        ]
+    
+    def __str__(self):
+        return f"{self.manufacturer} {self.model_pattern}: {self.title}"
+    
+    def save(self, *args, **kwargs):
+        pattern = self.model_pattern.strip()
+        self.is_prefix = pattern.endswith('*')
+        self.manufacturer_key = manufacturer_key(self.manufacturer)
+        self.model_key = model_key(pattern.rstrip('*'))
+        super().save(*args, **kwargs)
+
+
+class RecallNotice(models.Model):
+    """
+    An appliance affected by a recall, shown to the home's owner until
+    dismissed. Written in bulk by match_recalls; one per recall and appliance.
+    """
+    recall = models.ForeignKey(
+        ApplianceRecall,
+        on_delete=models.CASCADE,
+        related_name='notices'
+    )
+    
+    appliance = models.ForeignKey(
+        'homes.Appliance',
+        on_delete=models.CASCADE,
+        related_name='recall_notices'
+    )
+    
+    home = models.ForeignKey(
+        'homes.Home',
+        on_delete=models.CASCADE,
+        related_name='recall_notices'
+    )
+    
+    schedule = models.ForeignKey(
+        Schedule,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='recall_notices',
+        help_text='Schedule entry created to deal with the recall, if any'
+    )
+    
+    created_at = models.DateTimeField(default=timezone.now)
+    dismissed_at = models.DateTimeField(null=True, blank=True)
+    
+    class Meta:
+        ordering = ['-created_at']
+        constraints = [
+            models.UniqueConstraint(fields=['recall', 'appliance'], name='unique_recall_notice'),
+        ]
+        indexes = [
+            models.Index(fields=['home', 'dismissed_at']),
+        ]
+    
+    def __str__(self):
+        return f"Recall {self.recall_id} for appliance {self.appliance_id}"
@@ -0,0 +1,79 @@
+"""
+Overdue task queries.
+
+A task is overdue when its schedule is still open (is_completed=False),
+dated before today, and the task hasn't been completed individually.
+Every query here filters open schedules by home and scheduled_date, which
+the partial index schedule_open_home_date_idx serves directly.
+"""
+
+from datetime import date
+
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Value
+from django.db.models.functions import Least
+
+from homes.models import Home
+from .models import Schedule, ScheduleTaskCompletion
+from .utils import ScheduleOptimizer
+
+COUNT_TIMEOUT = 60 * 5
+
+
+def overdue_tasks(user, today=None):
+    """
+    Schedule/task rows overdue for all of the user's homes, annotated with
+    priority and ordered by priority, then oldest first. One query.
+    """
+    today = today or date.today()
+    completed = ScheduleTaskCompletion.objects.filter(
+        schedule_id=OuterRef('schedule_id'),
+        task_id=OuterRef('maintenancetask_id'),
+    )
+    return Schedule.tasks.through.objects.filter(
+        schedule__home__owner=user,
+        schedule__is_completed=False,
+        schedule__scheduled_date__lt=today,
+    ).exclude(
+        Exists(completed)
+    ).select_related(
+        'schedule__home', 'maintenancetask'
+    ).only(
+        'schedule__id', 'schedule__scheduled_date', 'schedule__home__name',
+        'maintenancetask__title', 'maintenancetask__slug', 'maintenancetask__category',
+        'maintenancetask__frequency', 'maintenancetask__estimated_time',
+    ).annotate(
+        # Capped like calculate_task_priority(); ties fall back to age
+        priority=Least(ScheduleOptimizer.get_task_priority_expression('maintenancetask__'), Value(100)),
+    ).order_by('-priority', 'schedule__scheduled_date', 'pk')
+
+
+def count_cache_key(user_id, today=None):
+    return f'overdue_count:{user_id}:{(today or date.today()).isoformat()}'
+
+
+def overdue_count(user):
+    """
+    Number of overdue tasks across the user's homes, cached briefly and
+    dropped whenever one of their past schedules changes.
+    """
+    key = count_cache_key(user.pk)
+    count = cache.get(key)
+    if count is None:
+        count = overdue_tasks(user).order_by().count()
+        cache.set(key, count, COUNT_TIMEOUT)
+    return count
+
+
+def forget_count(owner_id):
+    cache.delete(count_cache_key(owner_id))
+
+
+def home_changed(home_id):
+    """
+    Drop the cached count of the home's owner. Called after commit for
+    changes to schedules dated today or earlier (later dates can't be overdue).
+    """
+    owner_id = Home.objects.filter(pk=home_id).values_list('owner_id', flat=True).first()
+    if owner_id is not None:
+        forget_count(owner_id)
@@ -0,0 +1,112 @@
+"""
+Portfolio queries for users who manage many homes.
+
+Everything is grouped in the database over the schedule/task M2M table,
+so the cost of a page depends on the number of homes shown and weeks in
+the window, not on how many schedules exist:
+  - week_grid(): task counts per (home, week) split by priority tier,
+  - overdue_by_home(): open tasks dated before today per home,
+  - tier_totals(): the same tier counts for the whole filtered portfolio.
+
+Tiers follow the thresholds used on the schedule generation page and the
+priority comes from ScheduleOptimizer.get_task_priority_expression().
+"""
+
+from datetime import timedelta
+
+from django.db.models import Count, Exists, F, OuterRef, Q, Value
+from django.db.models.functions import Least, TruncWeek
+
+from .models import Schedule, ScheduleTaskCompletion
+from .utils import ScheduleOptimizer
+
+# (key, label, lowest score in the tier)
+TIERS = [
+    ('critical', 'Critical', 85),
+    ('high', 'High', 70),
+    ('medium', 'Medium', 55),
+    ('low', 'Low', 0),
+]
+
+
+def week_start(day):
+    """Monday of the week containing day."""
+    return day - timedelta(days=day.weekday())
+
+
+def _task_rows(home_ids, category=None):
+    """
+    Schedule/task M2M rows for the given homes, annotated with priority
+    (capped at 100) and whether the task is done.
+    """
+    completed = ScheduleTaskCompletion.objects.filter(
+        schedule_id=OuterRef('schedule_id'),
+        task_id=OuterRef('maintenancetask_id'),
+    )
+    rows = Schedule.tasks.through.objects.filter(schedule__home_id__in=home_ids)
+    if category:
+        rows = rows.filter(maintenancetask__category=category)
+    return rows.annotate(
+        priority=Least(ScheduleOptimizer.get_task_priority_expression('maintenancetask__'), Value(100)),
+        task_done=Exists(completed),
+    )
+
+
+def _tier_counts(today):
+    """
+    Count aggregates per tier, plus totals, completed and overdue.
+    """
+    done = Q(task_done=True) | Q(schedule__is_completed=True)
+    counts = {
+        'total': Count('id'),
+        'completed': Count('id', filter=done),
+        'overdue': Count('id', filter=Q(schedule__scheduled_date__lt=today) & ~done),
+    }
+    upper = None
+    for key, _, lowest in TIERS:
+        condition = Q(priority__gte=lowest)
+        if upper is not None:
+            condition &= Q(priority__lt=upper)
+        counts[key] = Count('id', filter=condition)
+        upper = lowest
+    return counts
+
+
+def week_grid(home_ids, start, weeks, today, category=None):
+    """
+    Return {(home_id, monday): counts} for the weeks starting at start
+    (a Monday) with one grouped query. Weeks with no tasks are absent.
+    """
+    end = start + timedelta(weeks=weeks)
+    grouped = _task_rows(home_ids, category).filter(
+        schedule__scheduled_date__gte=start,
+        schedule__scheduled_date__lt=end,
+    ).values(
+        home=F('schedule__home_id'),
+        week=TruncWeek('schedule__scheduled_date'),
+    ).annotate(**_tier_counts(today)).order_by()
+    return {(row.pop('home'), row.pop('week')): row for row in grouped}
+
+
+def overdue_by_home(home_ids, today, category=None):
+    """
+    Return {home_id: open tasks dated before today} with one grouped query
+    over the open-schedule index.
+    """
+    grouped = _task_rows(home_ids, category).filter(
+        schedule__is_completed=False,
+        schedule__scheduled_date__lt=today,
+        task_done=False,
+    ).values(home=F('schedule__home_id')).annotate(count=Count('id')).order_by()
+    return {row['home']: row['count'] for row in grouped}
+
+
+def tier_totals(home_ids, start, weeks, today, category=None):
+    """
+    Totals per tier for every given home over the window, in one query.
+    """
+    end = start + timedelta(weeks=weeks)
+    return _task_rows(home_ids, category).filter(
+        schedule__scheduled_date__gte=start,
+        schedule__scheduled_date__lt=end,
+    ).aggregate(**_tier_counts(today))
@@ -0,0 +1,150 @@
+"""
+Matching manufacturer recalls against every appliance.
+
+Appliances and ApplianceRecall rows both carry normalized manufacturer
+and model keys (homes.appliance_keys). match_recalls() loads the active
+recalls once into hash tables: exact rules by (manufacturer, model) and
+prefix rules by (manufacturer, prefix), with the prefix lengths used by
+each manufacturer. Appliances are then read only for the recalled
+manufacturers, MANUFACTURER_CHUNK manufacturers per query over the
+(manufacturer_key, model_key) index, and each appliance is matched with
+one dictionary probe per prefix length. No per-rule query and no
+rule-by-appliance loop, so 10k recalls against a million appliances is a
+handful of index scans and a few million dictionary lookups.
+
+New matches are written as RecallNotice rows in bulk; reruns skip pairs
+already recorded. Optionally each home with new notices also gets one
+Schedule entry to deal with them.
+"""
+
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db import transaction
+
+from homes.models import Appliance
+from .models import ApplianceRecall, RecallNotice, Schedule
+from .signals import schedules_changed
+
+DEFAULT_BATCH_SIZE = 1000
+MANUFACTURER_CHUNK = 500
+
+
+class RecallRules:
+    """
+    Active recalls as hash tables keyed on normalized manufacturer and model.
+    """
+    
+    def __init__(self, recalls):
+        self.exact = defaultdict(list)
+        self.prefixes = defaultdict(list)
+        self.prefix_lengths = defaultdict(set)
+        self.titles = {}
+        for pk, manufacturer, model, is_prefix, appliance_type, title in recalls:
+            if not manufacturer:
+                continue
+            self.titles[pk] = title
+            if is_prefix:
+                self.prefixes[manufacturer, model].append((pk, appliance_type))
+                self.prefix_lengths[manufacturer].add(len(model))
+            elif model:
+                self.exact[manufacturer, model].append((pk, appliance_type))
+        self.prefix_lengths = {
+            manufacturer: sorted(lengths) for manufacturer, lengths in self.prefix_lengths.items()
+        }
+    
+    @classmethod
+    def load(cls, recall_ids=None):
+        recalls = ApplianceRecall.objects.filter(is_active=True)
+        if recall_ids is not None:
+            recalls = recalls.filter(pk__in=recall_ids)
+        return cls(recalls.values_list(
+            'pk', 'manufacturer_key', 'model_key', 'is_prefix', 'appliance_type', 'title',
+        ))
+    
+    def __len__(self):
+        return len(self.titles)
+    
+    def manufacturers(self):
+        return sorted({manufacturer for manufacturer, _ in self.exact} | set(self.prefix_lengths))
+    
+    def match(self, manufacturer, model, appliance_type):
+        """
+        Ids of the recalls covering one appliance.
+        """
+        candidates = list(self.exact.get((manufacturer, model), ()))
+        for length in self.prefix_lengths.get(manufacturer, ()):
+            if length > len(model):
+                break
+            candidates.extend(self.prefixes.get((manufacturer, model[:length]), ()))
+        return [pk for pk, recall_type in candidates if not recall_type or recall_type == appliance_type]
+
+
+def find_matches(rules):
+    """
+    Yield (recall_id, appliance_id, home_id) for every affected appliance.
+    Each chunk's rows are fetched before any are yielded, so no cursor
+    stays open while the caller writes.
+    """
+    manufacturers = rules.manufacturers()
+    for start in range(0, len(manufacturers), MANUFACTURER_CHUNK):
+        rows = list(Appliance.objects.filter(
+            manufacturer_key__in=manufacturers[start:start + MANUFACTURER_CHUNK],
+        ).order_by().values_list('pk', 'home_id', 'manufacturer_key', 'model_key', 'appliance_type'))
+        for appliance_id, home_id, manufacturer, model, appliance_type in rows:
+            for recall_id in rules.match(manufacturer, model, appliance_type):
+                yield recall_id, appliance_id, home_id
+
+
+def match_recalls(recall_ids=None, schedule_days=None, today=None, batch_size=DEFAULT_BATCH_SIZE,
+                  dry_run=False):
+    """
+    Record a RecallNotice for every appliance affected by an active recall
+    (or only the given recalls) that doesn't have one yet. With
+    schedule_days, each home with new notices also gets one schedule that
+    many days after today, noting the recalled appliances. Returns counts;
+    a dry run writes nothing.
+    """
+    today = today or date.today()
+    rules = RecallRules.load(recall_ids)
+    stats = {'recalls': len(rules), 'matched': 0, 'created': 0, 'schedules': 0}
+    if not rules:
+        return stats
+    
+    known = set(RecallNotice.objects.filter(
+        recall_id__in=list(rules.titles),
+    ).values_list('recall_id', 'appliance_id'))
+    new = []
+    for recall_id, appliance_id, home_id in find_matches(rules):
+        stats['matched'] += 1
+        if (recall_id, appliance_id) not in known:
+            new.append(RecallNotice(recall_id=recall_id, appliance_id=appliance_id, home_id=home_id))
+    stats['created'] = len(new)
+    if dry_run or not new:
+        if schedule_days is not None:
+            stats['schedules'] = len({notice.home_id for notice in new})
+        return stats
+    
+    with transaction.atomic():
+        if schedule_days is not None:
+            by_home = defaultdict(list)
+            for notice in new:
+                by_home[notice.home_id].append(notice)
+            schedules = Schedule.objects.bulk_create([
+                Schedule(
+                    home_id=home_id,
+                    scheduled_date=today + timedelta(days=schedule_days),
+                    notes='Appliance recall: ' + '; '.join(
+                        sorted({rules.titles[notice.recall_id] for notice in notices})
+                    ),
+                )
+                for home_id, notices in by_home.items()
+            ], batch_size=batch_size)
+            for schedule, notices in zip(schedules, by_home.values()):
+                for notice in notices:
+                    notice.schedule = schedule
+            stats['schedules'] = len(schedules)
+            # bulk_create() skips the post_save handlers
+            schedules_changed([schedule.pk for schedule in schedules])
+        RecallNotice.objects.bulk_create(new, batch_size=batch_size, ignore_conflicts=True)
+    return stats
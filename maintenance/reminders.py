@@ -0,0 +1,171 @@
+"""
+Maintenance reminder digests.
+
+send_reminder_digests() walks the users who have email notifications on,
+one primary-key range at a time. For each chunk it:
+  1. loads every schedule due within each user's reminder window that has
+     not been reminded for its current date (one query plus prefetches),
+  2. builds one digest email per user,
+  3. sends the digests over a single reused connection in batches, and
+  4. records a ScheduleReminder per schedule once its batch has been sent.
+
+Memory is bounded by the chunk size. Reruns skip everything already
+recorded, so an interrupted run can simply be started again.
+"""
+
+import logging
+from datetime import date, timedelta
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.mail import EmailMessage, get_connection
+from django.db.models import Exists, OuterRef, Prefetch
+from django.template.loader import render_to_string
+from django.urls import reverse
+
+from .models import MaintenanceTask, Schedule, ScheduleReminder, ScheduleTaskCompletion
+
+logger = logging.getLogger(__name__)
+
+User = get_user_model()
+
+DEFAULT_REMINDER_DAYS = 3
+MAX_REMINDER_DAYS = 30
+
+
+def reminder_days(user):
+    """
+    The user's reminder window in days, from
+    schedule_preferences['reminder_days_before'].
+    """
+    preferences = user.schedule_preferences if isinstance(user.schedule_preferences, dict) else {}
+    try:
+        days = int(preferences.get('reminder_days_before', DEFAULT_REMINDER_DAYS))
+    except (TypeError, ValueError):
+        days = DEFAULT_REMINDER_DAYS
+    return max(0, min(days, MAX_REMINDER_DAYS))
+
+
+def recipient_chunks(chunk_size):
+    """
+    Yield lists of users who want reminders, paging by primary key so no
+    cursor stays open while reminders are written.
+    """
+    queryset = User.objects.filter(
+        email_notifications=True, is_active=True
+    ).exclude(email='').only(
+        'id', 'username', 'first_name', 'email', 'schedule_preferences'
+    ).order_by('pk')
+    last_pk = 0
+    while True:
+        chunk = list(queryset.filter(pk__gt=last_pk)[:chunk_size])
+        if not chunk:
+            return
+        yield chunk
+        last_pk = chunk[-1].pk
+
+
+def due_schedules(users, today):
+    """
+    Return {user_id: [schedule, ...]} with the schedules due within each
+    user's window that still have pending tasks and haven't been reminded
+    for their current date. Each schedule gets a pending_tasks list.
+    """
+    windows = {user.pk: today + timedelta(days=reminder_days(user)) for user in users}
+    already_reminded = ScheduleReminder.objects.filter(
+        schedule_id=OuterRef('pk'), scheduled_date=OuterRef('scheduled_date')
+    )
+    schedules = Schedule.objects.filter(
+        home__owner_id__in=windows,
+        is_completed=False,
+        scheduled_date__gte=today,
+        scheduled_date__lte=max(windows.values()),
+    ).exclude(
+        Exists(already_reminded)
+    ).select_related('home').only(
+        'id', 'scheduled_date', 'home__name', 'home__owner'
+    ).prefetch_related(
+        Prefetch('tasks', queryset=MaintenanceTask.objects.only('id', 'title', 'estimated_time')),
+        Prefetch('task_completions', queryset=ScheduleTaskCompletion.objects.only('id', 'schedule_id', 'task_id')),
+    ).order_by('scheduled_date', 'pk')
+    
+    by_user = {}
+    for schedule in schedules:
+        owner_id = schedule.home.owner_id
+        if schedule.scheduled_date > windows[owner_id]:
+            continue
+        done = {completion.task_id for completion in schedule.task_completions.all()}
+        schedule.pending_tasks = [task for task in schedule.tasks.all() if task.id not in done]
+        if schedule.pending_tasks:
+            by_user.setdefault(owner_id, []).append(schedule)
+    return by_user
+
+
+def build_digest(user, schedules, site_url):
+    """
+    Build the digest email for one user.
+    """
+    task_count = sum(len(schedule.pending_tasks) for schedule in schedules)
+    context = {
+        'user': user,
+        'schedules': schedules,
+        'task_count': task_count,
+        'site_url': site_url,
+        'calendar_url': site_url + reverse('maintenance:schedule_calendar'),
+    }
+    subject = f"Maintenance reminder: {task_count} task{'s' if task_count != 1 else ''} coming up"
+    body = render_to_string('maintenance/email/reminder_digest.txt', context)
+    return EmailMessage(subject, body, settings.DEFAULT_FROM_EMAIL, [user.email])
+
+
+def send_reminder_digests(today=None, chunk_size=500, batch_size=100, dry_run=False,
+                          connection=None, site_url=None):
+    """
+    Send one digest per user for schedules due within their reminder window.
+    Returns counts of users checked, emails sent, schedules covered and
+    emails that failed to send.
+    """
+    today = today or date.today()
+    site_url = (site_url or settings.SITE_URL).rstrip('/')
+    stats = {'users': 0, 'emails': 0, 'schedules': 0, 'failed': 0}
+    
+    connection = connection or get_connection()
+    if not dry_run:
+        connection.open()
+    try:
+        for users in recipient_chunks(chunk_size):
+            stats['users'] += len(users)
+            by_user = due_schedules(users, today)
+            digests = [
+                (build_digest(user, by_user[user.pk], site_url), user, by_user[user.pk])
+                for user in users if user.pk in by_user
+            ]
+            for start in range(0, len(digests), batch_size):
+                batch = digests[start:start + batch_size]
+                if dry_run:
+                    stats['emails'] += len(batch)
+                    stats['schedules'] += sum(len(schedules) for _, _, schedules in batch)
+                    continue
+                try:
+                    connection.send_messages([message for message, _, _ in batch])
+                except Exception:
+                    # Nothing from this batch is recorded, so a rerun retries it
+                    logger.exception('Failed to send a batch of %d reminder digests', len(batch))
+                    stats['failed'] += len(batch)
+                    connection.close()
+                    connection.open()
+                    continue
+                ScheduleReminder.objects.bulk_create(
+                    [
+                        ScheduleReminder(schedule_id=schedule.pk, user_id=user.pk, scheduled_date=schedule.scheduled_date)
+                        for _, user, schedules in batch
+                        for schedule in schedules
+                    ],
+                    ignore_conflicts=True,
+                )
+                stats['emails'] += len(batch)
+                stats['schedules'] += sum(len(schedules) for _, _, schedules in batch)
+    finally:
+        if not dry_run:
+            connection.close()
+    return stats
@@ -0,0 +1,253 @@
+"""
+In-process ranked search over the maintenance task catalog.
+
+TaskSearchIndex is a BM25 index over each active task's title,
+description and step-by-step text, with the title weighted highest.
+Terms are lowercased and lightly stemmed ("guttering" -> "gutter",
+"hoses" -> "hose"). Each query term also matches:
+  - vocabulary terms it is a prefix of ("furn" finds "furnace"),
+  - when it is not in the vocabulary at all, terms within a small edit
+    distance ("filtre" finds "filter"), found through a trigram index
+    so only a handful of candidates are compared.
+Expanded matches score less than exact ones.
+
+The index lives in this process and is tied to the catalog version that
+task saves and deletes bump (fragment_cache.bump_catalog_version), so
+get_index() costs one cache read per search and rebuilds from a single
+query only after the catalog has changed. Updates that skip model saves
+(queryset.update()) are not seen until the next bump.
+"""
+
+import math
+import re
+import threading
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from functools import lru_cache
+from operator import itemgetter
+
+from django.utils.html import strip_tags
+
+from . import fragment_cache
+from .models import MaintenanceTask
+
+# Weight of each field's terms, relative to the description
+FIELD_WEIGHTS = (
+    ('title', 3.0),
+    ('description', 1.0),
+    ('step_by_step', 0.5),
+)
+
+# BM25 term saturation and length normalization
+K1 = 1.2
+B = 0.75
+
+PREFIX_FACTOR = 0.6
+FUZZY_FACTOR = 0.5
+MAX_PREFIX_TERMS = 30
+MIN_EXPAND_LENGTH = 3
+MIN_FUZZY_LENGTH = 4
+MAX_RESULTS = 200
+
+TOKEN_RE = re.compile(r'[a-z0-9]+')
+STOP_WORDS = frozenset(
+    'a an and are as at be by for from if in into is it of on or so than that the then this to '
+    'was with you your'.split()
+)
+
+
+@lru_cache(maxsize=65536)
+def stem(term):
+    """
+    Strip the commonest English suffixes, keeping at least three letters.
+    """
+    if len(term) > 5 and term.endswith('ing'):
+        return term[:-3]
+    if len(term) > 4 and term.endswith('ies'):
+        return term[:-3] + 'y'
+    if len(term) > 4 and term.endswith('ed'):
+        return term[:-2]
+    if len(term) > 3 and term.endswith('s') and not term.endswith('ss'):
+        return term[:-1]
+    return term
+
+
+def tokenize(text):
+    """
+    Stemmed terms of a text, in order, without stop words.
+    """
+    return [stem(term) for term in TOKEN_RE.findall(text.lower()) if term not in STOP_WORDS]
+
+
+def trigrams(term):
+    padded = f'^{term}$'
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def max_edits(term):
+    return 1 if len(term) < 7 else 2
+
+
+def within_edits(a, b, limit):
+    """
+    Whether the optimal string alignment distance (edits, with adjacent
+    transpositions counting as one) between a and b is at most limit.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return False
+    previous, current = None, list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        before, previous, current = previous, current, [i] + [0] * len(b)
+        for j in range(1, len(b) + 1):
+            cost = a[i - 1] != b[j - 1]
+            current[j] = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if i > 1 and j > 1 and a[i - 1] == b[j - 2] and a[i - 2] == b[j - 1]:
+                current[j] = min(current[j], before[j - 2] + 1)
+    return current[-1] <= limit
+
+
+class TaskSearchIndex:
+    """
+    BM25 postings for a list of (task id, title, description, steps)
+    rows. Per-document term weights are computed when the index is built,
+    so a search only adds up precomputed floats.
+    """
+    
+    def __init__(self, rows, version=None):
+        self.version = version
+        self.task_ids = array('I')
+        field_terms = []
+        for task_id, *texts in rows:
+            self.task_ids.append(task_id)
+            field_terms.append([
+                tokenize(strip_tags(text or '')) for text in texts
+            ])
+        
+        # Weighted term frequencies and lengths per document
+        frequencies = []
+        lengths = []
+        document_frequency = Counter()
+        for fields in field_terms:
+            counts = {}
+            length = 0.0
+            for terms, (_, weight) in zip(fields, FIELD_WEIGHTS):
+                for term, count in Counter(terms).items():
+                    counts[term] = counts.get(term, 0.0) + weight * count
+                length += weight * len(terms)
+            frequencies.append(counts)
+            lengths.append(length)
+            document_frequency.update(counts.keys())
+        average = (sum(lengths) / len(lengths)) if lengths else 1.0
+        total = len(self.task_ids)
+        idf = {
+            term: math.log(1 + (total - count + 0.5) / (count + 0.5))
+            for term, count in document_frequency.items()
+        }
+        
+        # Each posting's weight is the term's whole BM25 contribution
+        postings = {term: ([], []) for term in idf}
+        for doc, counts in enumerate(frequencies):
+            norm = K1 * (1 - B + B * lengths[doc] / (average or 1.0))
+            for term, frequency in counts.items():
+                docs, weights = postings[term]
+                docs.append(doc)
+                weights.append(idf[term] * frequency * (K1 + 1) / (frequency + norm))
+        self.postings = {
+            term: (array('I', docs), array('f', weights)) for term, (docs, weights) in postings.items()
+        }
+        self.vocabulary = sorted(self.postings)
+        self.trigram_terms = {}
+        for term in self.vocabulary:
+            if len(term) >= MIN_FUZZY_LENGTH - 1:
+                for gram in trigrams(term):
+                    self.trigram_terms.setdefault(gram, []).append(term)
+    
+    @classmethod
+    def build(cls, version=None):
+        """
+        Index the active tasks, in title order so ties rank alphabetically.
+        """
+        rows = MaintenanceTask.objects.filter(is_active=True).order_by('title', 'pk').values_list(
+            'pk', *(name for name, _ in FIELD_WEIGHTS)
+        )
+        return cls(rows.iterator(), version=version)
+    
+    def __len__(self):
+        return len(self.task_ids)
+    
+    def expand(self, term):
+        """
+        (vocabulary term, score factor) pairs a query term matches.
+        """
+        matches = {}
+        if term in self.postings:
+            matches[term] = 1.0
+        if len(term) >= MIN_EXPAND_LENGTH:
+            start = bisect_left(self.vocabulary, term)
+            for candidate in self.vocabulary[start:start + MAX_PREFIX_TERMS + 1]:
+                if not candidate.startswith(term):
+                    break
+                matches.setdefault(candidate, PREFIX_FACTOR)
+        if not matches and len(term) >= MIN_FUZZY_LENGTH:
+            # A trigram index narrows the vocabulary to terms sharing enough
+            # trigrams to be within reach; each edit changes at most three.
+            limit = max_edits(term)
+            grams = trigrams(term)
+            shared = {}
+            for gram in grams:
+                for candidate in self.trigram_terms.get(gram, ()):
+                    shared[candidate] = shared.get(candidate, 0) + 1
+            needed = max(1, len(grams) - 3 * limit)
+            for candidate, count in shared.items():
+                if count >= needed and within_edits(term, candidate, limit):
+                    matches[candidate] = FUZZY_FACTOR
+        return matches.items()
+    
+    def search(self, query, limit=MAX_RESULTS):
+        """
+        Task ids matching the query, best first. Each query term counts
+        once per task, through its best kind of match (exact, then prefix,
+        then fuzzy).
+        """
+        scores = {}
+        for term in dict.fromkeys(tokenize(query)):
+            term_scores = {}
+            # Weakest matches first, so stronger ones overwrite them
+            for match, factor in sorted(self.expand(term), key=itemgetter(1)):
+                docs, weights = self.postings[match]
+                term_scores.update(zip(docs, weights if factor == 1.0 else map(factor.__mul__, weights)))
+            if len(term_scores) > len(scores):
+                scores, term_scores = term_scores, scores
+            get = scores.get
+            for doc, score in term_scores.items():
+                scores[doc] = get(doc, 0.0) + score
+        best = sorted(scores.items(), key=itemgetter(1), reverse=True)[:limit]
+        return [self.task_ids[doc] for doc, _ in best]
+
+
+_index = None
+_lock = threading.Lock()
+
+
+def get_index():
+    """
+    The index for the current catalog version, rebuilt if the catalog has
+    changed since it was built.
+    """
+    global _index
+    version = fragment_cache.get_catalog_version()
+    index = _index
+    if index is None or index.version != version:
+        with _lock:
+            if _index is None or _index.version != version:
+                _index = TaskSearchIndex.build(version)
+            index = _index
+    return index
+
+
+def search_tasks(query, limit=MAX_RESULTS):
+    """
+    Ids of active tasks matching the query, best match first.
+    """
+    return get_index().search(query, limit)
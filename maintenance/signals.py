@@ -0,0 +1,282 @@
+"""
+Signal handlers for the maintenance app.
+- Keep Schedule.updated_at in step with changes made outside Schedule.save(),
+  so it can be used as a freshness marker (e.g. for calendar feed ETags).
+- Keep the MonthlyScheduleSummary, AgendaItem and DailyMaintenanceStat
+  read models up to date.
+- Bump calendar month fragment cache versions.
+- Drop cached overdue counts.
+- Parse MaintenanceTask.tools_required into Tool rows.
+
+All of a month's derived data is refreshed by one MonthRefresh callback,
+queued at most once per (home, month) and transaction. Bulk operations
+can also wrap their writes in batch_changes() so the per-row handlers
+collapse into one lookup per affected schedule and month.
+"""
+
+import threading
+from contextlib import contextmanager
+from datetime import date
+from functools import partial
+
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_init, post_save, post_delete, pre_delete
+from django.dispatch import receiver
+from django.utils import timezone
+
+from homes.models import Home
+from . import agenda, daily_stats, fragment_cache, overdue, summaries, tools
+from .models import (
+    MaintenanceTask, Schedule, ScheduleTaskCompletion, ScheduleTaskCustomization, TaskCompletion,
+)
+
+
+_batch = threading.local()
+
+
+@contextmanager
+def batch_changes():
+    """
+    Collect the refreshes requested inside the block and run each of them
+    once on exit. Months of homes deleted inside the block are skipped;
+    their derived rows were deleted with them. Nested blocks join the
+    outermost one.
+    """
+    if getattr(_batch, 'pending', None) is not None:
+        yield
+        return
+    _batch.pending = {'touched': set(), 'schedules': set(), 'months': set(), 'deleted_homes': set()}
+    try:
+        yield
+    except BaseException:
+        _batch.pending = None
+        raise
+    pending, _batch.pending = _batch.pending, None
+    touch_schedules(pending['touched'])
+    schedules_changed(pending['schedules'])
+    for home_id, first_day in pending['months']:
+        if home_id not in pending['deleted_homes']:
+            month_changed(home_id, first_day)
+
+
+def _pending():
+    return getattr(_batch, 'pending', None)
+
+
+def touch_schedules(schedule_ids):
+    """
+    Bump updated_at on the given schedules with a single UPDATE.
+    """
+    schedule_ids = [pk for pk in schedule_ids if pk is not None]
+    if _pending() is not None:
+        _pending()['touched'].update(schedule_ids)
+        return
+    if schedule_ids:
+        Schedule.objects.filter(pk__in=schedule_ids).update(updated_at=timezone.now())
+
+
+class MonthRefresh:
+    """
+    Refresh everything derived from one home's month: the summary, agenda
+    and statistics rows, the cached month blocks and, for months that can
+    hold overdue tasks, the owner's cached overdue count. Instances for the
+    same month compare equal, so month_changed() can see one is queued.
+    """
+    
+    def __init__(self, home_id, first_day):
+        self.home_id = home_id
+        self.first_day = first_day
+        self.done = False
+    
+    def __eq__(self, other):
+        return isinstance(other, MonthRefresh) and (self.home_id, self.first_day) == (other.home_id, other.first_day)
+    
+    def __hash__(self):
+        return hash((self.home_id, self.first_day))
+    
+    def __call__(self):
+        self.done = True
+        year, month = self.first_day.year, self.first_day.month
+        summaries.refresh_month(self.home_id, year, month)
+        agenda.refresh_month(self.home_id, year, month)
+        daily_stats.refresh_month(self.home_id, year, month)
+        fragment_cache.bump_month_version(self.home_id, year, month)
+        if self.first_day <= date.today():
+            overdue.home_changed(self.home_id)
+
+
+def month_changed(home_id, scheduled_date):
+    """
+    Everything derived from one home's month needs refreshing. The refresh
+    runs after the surrounding transaction commits (immediately in
+    autocommit), once however many changes the transaction made to the month.
+    """
+    if home_id is None or scheduled_date is None:
+        return
+    if _pending() is not None:
+        _pending()['months'].add((home_id, scheduled_date.replace(day=1)))
+        return
+    refresh = MonthRefresh(home_id, scheduled_date.replace(day=1))
+    connection = transaction.get_connection()
+    if connection.in_atomic_block and any(
+        func == refresh and not func.done for _, func, _ in connection.run_on_commit
+    ):
+        return
+    transaction.on_commit(refresh)
+
+
+def schedules_changed(schedule_ids):
+    """
+    Like month_changed(), for every month touched by the given schedules.
+    """
+    schedule_ids = [pk for pk in schedule_ids if pk is not None]
+    if _pending() is not None:
+        _pending()['schedules'].update(schedule_ids)
+        return
+    if not schedule_ids:
+        return
+    months = {
+        (home_id, scheduled_date.replace(day=1))
+        for home_id, scheduled_date in Schedule.objects.filter(
+            pk__in=schedule_ids
+        ).values_list('home_id', 'scheduled_date')
+    }
+    for home_id, first_day in months:
+        month_changed(home_id, first_day)
+
+
+@receiver(post_init, sender=Schedule)
+def remember_schedule_month(sender, instance, **kwargs):
+    """
+    Remember where a schedule was loaded from so a reschedule can refresh
+    the month it moved out of. Reads __dict__ to avoid loading deferred fields.
+    """
+    instance._summary_origin = (
+        instance.__dict__.get('home_id'),
+        instance.__dict__.get('scheduled_date'),
+    )
+
+
+@receiver(post_save, sender=Schedule)
+def schedule_saved(sender, instance, raw=False, **kwargs):
+    """
+    Creating, completing or rescheduling a schedule changes its month.
+    Fixture loads (raw saves, and the tasks loaddata then sets on the same
+    instance) are left to the rebuild commands.
+    """
+    if raw:
+        instance._loaded_raw = True
+        return
+    month_changed(instance.home_id, instance.scheduled_date)
+    old_home_id, old_date = getattr(instance, '_summary_origin', (None, None))
+    if old_date and (old_home_id, old_date.year, old_date.month) != (
+        instance.home_id, instance.scheduled_date.year, instance.scheduled_date.month
+    ):
+        month_changed(old_home_id, old_date)
+    instance._summary_origin = (instance.home_id, instance.scheduled_date)
+
+
+@receiver(post_delete, sender=Schedule)
+def schedule_deleted(sender, instance, **kwargs):
+    month_changed(instance.home_id, instance.scheduled_date)
+
+
+@receiver(m2m_changed, sender=Schedule.tasks.through)
+def schedule_tasks_changed(sender, instance, action, reverse, pk_set, **kwargs):
+    """
+    Adding or removing tasks changes what a schedule shows.
+    """
+    if reverse and action == 'pre_clear':
+        # instance is a MaintenanceTask; remember which schedules it leaves
+        instance._cleared_schedule_ids = list(instance.schedules.values_list('pk', flat=True))
+        return
+    if action not in ('post_add', 'post_remove', 'post_clear'):
+        return
+    if getattr(instance, '_loaded_raw', False):
+        return
+    if reverse:
+        # instance is a MaintenanceTask; pk_set holds schedule ids
+        schedule_ids = pk_set if action != 'post_clear' else getattr(instance, '_cleared_schedule_ids', [])
+        touch_schedules(schedule_ids or [])
+        schedules_changed(schedule_ids or [])
+    else:
+        touch_schedules([instance.pk])
+        month_changed(instance.home_id, instance.scheduled_date)
+
+
+@receiver(post_save, sender=ScheduleTaskCompletion)
+@receiver(post_delete, sender=ScheduleTaskCompletion)
+def schedule_task_completion_changed(sender, instance, raw=False, **kwargs):
+    """
+    Completing or un-completing a task changes the schedule's state.
+    """
+    if raw:
+        return
+    touch_schedules([instance.schedule_id])
+    schedules_changed([instance.schedule_id])
+
+
+@receiver(post_save, sender=TaskCompletion)
+@receiver(post_delete, sender=TaskCompletion)
+def task_completion_changed(sender, instance, raw=False, **kwargs):
+    """
+    Logged time counts towards the statistics of the schedule's month.
+    """
+    if raw:
+        return
+    schedules_changed([instance.schedule_id])
+
+
+@receiver(pre_delete, sender=Home)
+def home_deleting(sender, instance, **kwargs):
+    """
+    Take the home's numbers out of its owner's statistics totals and drop
+    the owner's cached overdue count after commit.
+    """
+    daily_stats.home_deleted(instance.pk)
+    if _pending() is not None:
+        _pending()['deleted_homes'].add(instance.pk)
+    transaction.on_commit(partial(overdue.forget_count, instance.owner_id))
+
+
+@receiver(post_save, sender=ScheduleTaskCustomization)
+@receiver(post_delete, sender=ScheduleTaskCustomization)
+def schedule_task_customization_changed(sender, instance, raw=False, **kwargs):
+    """
+    Customized task text invalidates cached month blocks for that schedule.
+    """
+    if raw:
+        return
+    schedules_changed([instance.schedule_id])
+
+
+@receiver(post_save, sender=MaintenanceTask)
+@receiver(post_delete, sender=MaintenanceTask)
+def maintenance_task_changed(sender, instance, **kwargs):
+    """
+    Task titles and badges appear in every month block that uses the task.
+    """
+    fragment_cache.bump_catalog_version()
+
+
+@receiver(post_init, sender=MaintenanceTask)
+def remember_task_tools(sender, instance, **kwargs):
+    """
+    Remember the tools text a task was loaded with, so saves that don't
+    change it skip re-parsing. Reads __dict__ to avoid loading it if deferred.
+    """
+    instance._tools_origin = instance.__dict__.get('tools_required')
+
+
+@receiver(post_save, sender=MaintenanceTask)
+def task_tools_changed(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Link the task to the tools its tools_required text names.
+    """
+    if 'tools_required' not in instance.__dict__:
+        return
+    if update_fields is not None and 'tools_required' not in update_fields:
+        return
+    if created or instance.tools_required != instance._tools_origin:
+        tools.sync_task_tools([instance])
+    instance._tools_origin = instance.tools_required
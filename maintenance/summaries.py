@@ -0,0 +1,261 @@
+"""
+Maintenance of the MonthlyScheduleSummary read model.
+
+Each (home, year, month) row is recomputed from the source tables with a
+single aggregate query over the schedule/task M2M table whenever a schedule
+in that month is created, completed, rescheduled, deleted or has its tasks
+changed. rebuild_summaries() recreates every row with one grouped query.
+Archived schedules (see maintenance/archive.py) are finished, so their
+task counts are added to total and completed tasks from ArchivedSchedule.
+Overdue counts go stale as days pass without a change; get_summaries()
+recounts every stale row it reads at once with refresh_overdue().
+"""
+
+import calendar
+from datetime import date
+
+from django.db import transaction
+from django.db.models import Count, Exists, F, OuterRef, Q, Sum
+from django.db.models.functions import Coalesce, ExtractMonth, ExtractYear
+
+from .models import ArchivedSchedule, MonthlyScheduleSummary, Schedule, ScheduleTaskCompletion
+
+
+def month_bounds(year, month):
+    """Return the first and last day of a month."""
+    return date(year, month, 1), date(year, month, calendar.monthrange(year, month)[1])
+
+
+def _task_rows():
+    """
+    Schedule/task M2M rows annotated with whether the task was completed
+    individually (ScheduleTaskCompletion).
+    """
+    completed = ScheduleTaskCompletion.objects.filter(
+        schedule_id=OuterRef('schedule_id'),
+        task_id=OuterRef('maintenancetask_id'),
+    )
+    return Schedule.tasks.through.objects.annotate(task_done=Exists(completed))
+
+
+def _aggregates(today):
+    """
+    Aggregate expressions shared by the single-month refresh and the full rebuild.
+    A task counts as completed if it was ticked off or its whole schedule was.
+    """
+    done = Q(task_done=True) | Q(schedule__is_completed=True)
+    return {
+        'total_tasks': Count('id'),
+        'completed_tasks': Count('id', filter=done),
+        'overdue_tasks': Count('id', filter=Q(schedule__scheduled_date__lt=today) & ~done),
+        'estimated_minutes': Coalesce(Sum('maintenancetask__estimated_time'), 0),
+    }
+
+
+def _archived_aggregates():
+    """
+    Aggregate expressions for archived schedules; every archived task is done.
+    """
+    return {
+        'tasks': Coalesce(Sum('task_count'), 0),
+        'minutes': Coalesce(Sum('estimated_minutes'), 0),
+    }
+
+
+def _add_archived(totals, archived):
+    totals['total_tasks'] += archived['tasks']
+    totals['completed_tasks'] += archived['tasks']
+    totals['estimated_minutes'] += archived['minutes']
+    return totals
+
+
+def refresh_month(home_id, year, month):
+    """
+    Recompute the summary row for one home and month.
+    Rows with no tasks are deleted rather than stored as zeros.
+    """
+    today = date.today()
+    first_day, last_day = month_bounds(year, month)
+    totals = _task_rows().filter(
+        schedule__home_id=home_id,
+        schedule__scheduled_date__range=(first_day, last_day),
+    ).aggregate(**_aggregates(today))
+    archived = ArchivedSchedule.objects.filter(
+        home_id=home_id,
+        scheduled_date__range=(first_day, last_day),
+    ).aggregate(**_archived_aggregates())
+    _add_archived(totals, archived)
+    
+    if not totals['total_tasks']:
+        MonthlyScheduleSummary.objects.filter(home_id=home_id, year=year, month=month).delete()
+        return None
+    
+    summary, _ = MonthlyScheduleSummary.objects.update_or_create(
+        home_id=home_id,
+        year=year,
+        month=month,
+        defaults={**totals, 'computed_on': today},
+    )
+    return summary
+
+
+def rebuild_summaries(home_ids=None):
+    """
+    Recreate summary rows from scratch with one grouped aggregate query.
+    Optionally limited to a set of homes. Returns the number of rows written.
+    """
+    today = date.today()
+    rows = _task_rows()
+    if home_ids is not None:
+        rows = rows.filter(schedule__home_id__in=home_ids)
+    grouped = rows.values(
+        home=F('schedule__home_id'),
+        year=ExtractYear('schedule__scheduled_date'),
+        month=ExtractMonth('schedule__scheduled_date'),
+    ).annotate(**_aggregates(today)).order_by()
+    archived = ArchivedSchedule.objects.all()
+    if home_ids is not None:
+        archived = archived.filter(home_id__in=home_ids)
+    archived_grouped = archived.values(
+        'home',
+        year=ExtractYear('scheduled_date'),
+        month=ExtractMonth('scheduled_date'),
+    ).annotate(**_archived_aggregates()).order_by()
+    
+    totals = {}
+    for row in grouped:
+        totals[row['home'], row['year'], row['month']] = {key: row[key] for key in _aggregates(today)}
+    empty = {'total_tasks': 0, 'completed_tasks': 0, 'overdue_tasks': 0, 'estimated_minutes': 0}
+    for row in archived_grouped:
+        key = (row['home'], row['year'], row['month'])
+        totals[key] = _add_archived(totals.get(key, dict(empty)), row)
+    
+    summaries = [
+        MonthlyScheduleSummary(
+            home_id=home_id,
+            year=year,
+            month=month,
+            computed_on=today,
+            **month_totals,
+        )
+        for (home_id, year, month), month_totals in totals.items()
+        if month_totals['total_tasks']
+    ]
+    
+    with transaction.atomic():
+        existing = MonthlyScheduleSummary.objects.all()
+        if home_ids is not None:
+            existing = existing.filter(home_id__in=home_ids)
+        existing.delete()
+        MonthlyScheduleSummary.objects.bulk_create(summaries, batch_size=500)
+    return len(summaries)
+
+
+def refresh_overdue(summaries, today=None):
+    """
+    Bring the overdue counts of stale rows up to date in place. Only the
+    overdue count depends on the date; everything else is kept current by
+    the signal handlers. A row is stale when days have passed since it was
+    computed and its month had started by then. All stale rows are
+    recounted with one grouped query and saved with one bulk UPDATE,
+    however many homes and months they cover.
+    """
+    today = today or date.today()
+    stale = []
+    for summary in summaries:
+        first_day, last_day = month_bounds(summary.year, summary.month)
+        if summary.computed_on < today and first_day < today and last_day >= summary.computed_on:
+            stale.append(summary)
+    if not stale:
+        return
+    
+    done = Q(task_done=True) | Q(schedule__is_completed=True)
+    counts = _task_rows().filter(
+        ~done,
+        schedule__home_id__in={summary.home_id for summary in stale},
+        schedule__scheduled_date__gte=min(date(summary.year, summary.month, 1) for summary in stale),
+        schedule__scheduled_date__lt=today,
+    ).values_list(
+        F('schedule__home_id'),
+        ExtractYear('schedule__scheduled_date'),
+        ExtractMonth('schedule__scheduled_date'),
+    ).annotate(overdue=Count('id')).order_by()
+    overdue = {(home_id, year, month): count for home_id, year, month, count in counts}
+    for summary in stale:
+        summary.overdue_tasks = overdue.get((summary.home_id, summary.year, summary.month), 0)
+        summary.computed_on = today
+    MonthlyScheduleSummary.objects.bulk_update(stale, ['overdue_tasks', 'computed_on'], batch_size=500)
+
+
+def get_summaries(home_ids, start=None, end=None):
+    """
+    Return summary rows for the given homes, optionally limited to a
+    (year, month) range, with stale overdue counts refreshed (see
+    refresh_overdue()). At most three queries.
+    """
+    queryset = MonthlyScheduleSummary.objects.filter(home_id__in=home_ids)
+    if start:
+        queryset = queryset.filter(Q(year__gt=start[0]) | Q(year=start[0], month__gte=start[1]))
+    if end:
+        queryset = queryset.filter(Q(year__lt=end[0]) | Q(year=end[0], month__lte=end[1]))
+    summaries = list(queryset.order_by('year', 'month', 'home_id'))
+    refresh_overdue(summaries)
+    return summaries
+
+
+def combine_by_month(summaries):
+    """
+    Sum per-home rows into one totals dict per (year, month).
+    """
+    combined = {}
+    for summary in summaries:
+        key = (summary.year, summary.month)
+        totals = combined.setdefault(key, {
+            'total_tasks': 0,
+            'completed_tasks': 0,
+            'overdue_tasks': 0,
+            'estimated_minutes': 0,
+        })
+        totals['total_tasks'] += summary.total_tasks
+        totals['completed_tasks'] += summary.completed_tasks
+        totals['overdue_tasks'] += summary.overdue_tasks
+        totals['estimated_minutes'] += summary.estimated_minutes
+    for totals in combined.values():
+        totals['pending_tasks'] = totals['total_tasks'] - totals['completed_tasks']
+        totals['estimated_hours'] = round(totals['estimated_minutes'] / 60, 1)
+    return combined
+
+
+def grand_totals(totals_by_month):
+    """
+    Sum the per-month totals from combine_by_month() into one dict.
+    """
+    keys = ('total_tasks', 'completed_tasks', 'overdue_tasks', 'pending_tasks', 'estimated_minutes')
+    totals = {key: sum(month[key] for month in totals_by_month.values()) for key in keys}
+    totals['estimated_hours'] = round(totals['estimated_minutes'] / 60, 1)
+    return totals
+
+
+def workload_heatmap(summaries, year):
+    """
+    Build a 12-cell year-at-a-glance heatmap from summary rows.
+    Each cell has a 0-4 intensity level relative to the busiest month.
+    """
+    by_month = combine_by_month(s for s in summaries if s.year == year)
+    busiest = max((t['total_tasks'] for t in by_month.values()), default=0)
+    cells = []
+    for month in range(1, 13):
+        totals = by_month.get((year, month), {
+            'total_tasks': 0, 'completed_tasks': 0, 'overdue_tasks': 0,
+            'estimated_minutes': 0, 'pending_tasks': 0, 'estimated_hours': 0,
+        })
+        level = 0
+        if busiest and totals['total_tasks']:
+            level = max(1, round(4 * totals['total_tasks'] / busiest))
+        cells.append({
+            'month': month,
+            'month_abbr': calendar.month_abbr[month],
+            'level': level,
+            **totals,
+        })
+    return cells
@@ -1,3 +1,1471 @@
+import io
+import json
+import tempfile
+from datetime import date, timedelta
+from importlib import import_module
+
+from django.apps import apps
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
 from django.test import TestCase
+from django.urls import reverse
+from openpyxl import load_workbook
+
+from accounts.models import User
+from home_maintenance_compass.test_utils import test_settings
+from homes.models import Appliance, Home
+from . import fragment_cache
+from .agenda import dashboard
+from .archive import archive_schedules
+from .cohorts import compute_benchmarks, home_comparison
+from .cooccurrence import compute_cooccurrence, suggested_tasks
+from .daily_stats import _streaks, owner_statistics, rebuild_stats
+from .lifecycle import scan_appliances, task_priority_bonuses
+from .models import (
+    AgendaItem, ApplianceAlert, ApplianceRecall, ArchivedSchedule, CohortBenchmark, MaintenanceStatTotal, MaintenanceTask,
+    MonthlyScheduleSummary, RecallNotice, Schedule, ScheduleEvent, ScheduleTaskCompletion, ScheduleTaskCustomization,
+    TaskCompletion, TaskCooccurrence, Tool,
+)
+from .overdue import count_cache_key, overdue_count, overdue_tasks
+from .recalls import match_recalls
+from .reminders import send_reminder_digests
+from .search import TaskSearchIndex, search_tasks
+from .summaries import get_summaries
+from .tools import parse_tools, supplies_needed
+from .utils import ScheduleOptimizer
+
+
+@test_settings
+class OwnerScopedViewTests(TestCase):
+    """
+    Schedule views load the schedule and its home once, with the ownership
+    check in the same query. Counts include the session and user lookups;
+    the comments give the count before OwnerScopedObjectMixin.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.task = MaintenanceTask.objects.create(
+            title='Test smoke alarms', slug='test-smoke-alarms', category='safety',
+            description='Press the test button.', frequency='annual',
+        )
+        cls.schedule = Schedule.objects.create(home=cls.home, scheduled_date=date.today())
+        cls.schedule.tasks.add(cls.task)
+    
+    def get_urls(self):
+        pk = self.schedule.pk
+        return {
+            'schedule_detail': (reverse('maintenance:schedule_detail', kwargs={'pk': pk}), 7),
+            'schedule_update': (reverse('maintenance:schedule_update', kwargs={'pk': pk}), 4),  # was 7
+            'schedule_delete': (reverse('maintenance:schedule_delete', kwargs={'pk': pk}), 8),  # was 12
+        }
+    
+    def post_urls(self):
+        pk, missing = self.schedule.pk, self.task.pk + 1000
+        return {
+            # Invalid input, so each request stops right after resolving the schedule
+            'schedule_reschedule': (
+                reverse('maintenance:schedule_reschedule', kwargs={'pk': pk}), {'new_date': 'bad'}, 3,  # was 8
+            ),
+            'schedule_remove_task': (
+                reverse('maintenance:schedule_remove_task', kwargs={'pk': pk, 'task_id': missing}), {}, 4,  # was 9
+            ),
+            'schedule_uncomplete_task': (
+                reverse('maintenance:schedule_uncomplete_task', kwargs={'pk': pk, 'task_id': missing}), {}, 4,  # was 6
+            ),
+            'save_task_customization': (
+                reverse('maintenance:save_task_customization', kwargs={'schedule_pk': pk, 'task_id': missing}), {}, 4,  # was 6
+            ),
+        }
+    
+    def test_owner_query_counts(self):
+        self.client.force_login(self.owner)
+        for name, (url, queries) in self.get_urls().items():
+            with self.subTest(name), self.assertNumQueries(queries):
+                response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+        for name, (url, data, queries) in self.post_urls().items():
+            with self.subTest(name), self.assertNumQueries(queries):
+                response = self.client.post(url, data)
+            self.assertEqual(response.status_code, 302)
+    
+    def test_other_users_get_404(self):
+        self.client.force_login(self.other)
+        for name, (url, _) in self.get_urls().items():
+            with self.subTest(name):
+                self.assertEqual(self.client.get(url).status_code, 404)
+        for name, (url, data, _) in self.post_urls().items():
+            with self.subTest(name):
+                self.assertEqual(self.client.post(url, data).status_code, 404)
+        response = self.client.post(reverse('maintenance:schedule_complete', kwargs={'pk': self.schedule.pk}))
+        self.assertEqual(response.status_code, 404)
+        self.schedule.refresh_from_db()
+        self.assertFalse(self.schedule.is_completed)
+
+
+class ApplianceLifecycleTests(TestCase):
+    """
+    scan_appliances() finds expiring warranties and overdue service with a
+    fixed number of queries, and keeps ApplianceAlert in step with them.
+    """
+    today = date(2026, 10, 19)
+    
+    @classmethod
+    def setUpTestData(cls):
+        owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.home = Home.objects.create(owner=owner, name='Main', year_built=1990)
+        cls.heater = Appliance.objects.create(
+            home=cls.home, appliance_type='water_heater', year_installed=2012,
+            warranty_expiration=cls.today + timedelta(days=30),
+            last_service_date=cls.today - timedelta(days=400),
+        )
+        cls.dishwasher = Appliance.objects.create(
+            home=cls.home, appliance_type='dishwasher', year_installed=2024,
+            warranty_expiration=cls.today + timedelta(days=200),
+            last_service_date=cls.today - timedelta(days=400),
+        )
+    
+    def alerts(self):
+        return set(ApplianceAlert.objects.values_list('appliance_id', 'kind', 'due_date'))
+    
+    def test_scan_records_alerts(self):
+        # One warranty scan, a service scan per interval (two), one insert, one delete
+        with self.assertNumQueries(5):
+            stats = scan_appliances(today=self.today)
+        self.assertEqual(stats, {'warranty': 1, 'service': 1, 'removed': 0})
+        self.assertEqual(self.alerts(), {
+            (self.heater.pk, 'warranty', self.today + timedelta(days=30)),
+            (self.heater.pk, 'service', self.today - timedelta(days=35)),
+        })
+    
+    def test_rerun_is_idempotent_and_drops_resolved_alerts(self):
+        scan_appliances(today=self.today)
+        scan_appliances(today=self.today)
+        self.assertEqual(ApplianceAlert.objects.count(), 2)
+        
+        Appliance.objects.filter(pk=self.heater.pk).update(last_service_date=self.today)
+        stats = scan_appliances(today=self.today + timedelta(days=1))
+        self.assertEqual(stats['removed'], 1)
+        self.assertEqual(self.alerts(), {(self.heater.pk, 'warranty', self.today + timedelta(days=30))})
+    
+    def test_dry_run_writes_nothing(self):
+        stats = scan_appliances(today=self.today, dry_run=True)
+        self.assertEqual(stats['warranty'] + stats['service'], 2)
+        self.assertFalse(ApplianceAlert.objects.exists())
+    
+    def test_aging_appliances_raise_their_tasks(self):
+        flush = MaintenanceTask(pk=1, title='Flush Water Heater', category='plumbing', frequency='annual')
+        rinse = MaintenanceTask(pk=2, title='Clean Dishwasher Filter', category='appliances', frequency='monthly')
+        gutters = MaintenanceTask(pk=3, title='Clean Gutters', category='exterior', frequency='biannual')
+        bonuses = task_priority_bonuses(self.home, [flush, rinse, gutters], today=self.today)
+        # The heater is past its expected life; the dishwasher is new
+        self.assertEqual(bonuses, {flush.pk: 15})
+
+
+@test_settings
+class ScheduleExportTests(TestCase):
+    """
+    The Excel export covers open work, live and archived history,
+    appliances and providers for one home or the whole portfolio.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.cabin = Home.objects.create(owner=cls.owner, name='Cabin', year_built=1950)
+        cls.task = MaintenanceTask.objects.create(
+            title='=Flush water heater', slug='flush-water-heater', category='plumbing',
+            description='Drain a few gallons.', frequency='annual', estimated_time=45,
+        )
+        upcoming = Schedule.objects.create(home=cls.home, scheduled_date=date.today() + timedelta(days=7))
+        upcoming.tasks.add(cls.task)
+        done = Schedule.objects.create(home=cls.home, scheduled_date=date.today() - timedelta(days=30), is_completed=True)
+        done.tasks.add(cls.task)
+        ScheduleTaskCompletion.objects.create(schedule=done, task=cls.task, completed_by=cls.owner)
+        TaskCompletion.objects.create(schedule=done, completed_by=cls.owner, actual_time=50, rating=4)
+        ArchivedSchedule.objects.create(
+            original_id=999, home=cls.home, scheduled_date=date(2021, 5, 1), task_count=1,
+            created_at='2021-04-01T00:00:00Z',
+            payload={
+                'tasks': [{'title': 'Clean gutters', 'category': 'exterior',
+                           'completed_at': '2021-05-01T09:00:00+00:00', 'completed_by': cls.owner.pk}],
+                'completions': [{'completed_by': cls.owner.pk, 'completed_date': '2021-05-01T09:00:00+00:00',
+                                 'actual_time': 90, 'rating': 5, 'feedback': 'Ladder needed'}],
+            },
+        )
+        Appliance.objects.create(home=cls.cabin, appliance_type='furnace')
+    
+    def download(self, *args):
+        response = self.client.get(reverse('maintenance:schedule_export', args=args))
+        self.assertEqual(response.status_code, 200)
+        workbook = load_workbook(io.BytesIO(b''.join(response.streaming_content)), read_only=True)
+        return {sheet.title: list(sheet.iter_rows(min_row=2, values_only=True)) for sheet in workbook.worksheets}
+    
+    def test_home_export(self):
+        self.client.force_login(self.owner)
+        sheets = self.download(self.home.pk)
+        self.assertEqual(len(sheets['Upcoming']), 1)
+        self.assertEqual(sheets['Upcoming'][0][3], '=Flush water heater')  # Text, not a formula
+        self.assertEqual([(row[3], row[4], row[7]) for row in sheets['History']], [(50, 4, 'No'), (90, 5, 'Yes')])
+        self.assertEqual([row[2] for row in sheets['Completed Tasks']], ['=Flush water heater', 'Clean gutters'])
+        self.assertEqual(sheets['Appliances'], [])
+    
+    def test_portfolio_export(self):
+        self.client.force_login(self.owner)
+        sheets = self.download()
+        self.assertEqual([row[:2] for row in sheets['Appliances']], [('Cabin', 'Furnace')])
+    
+    def test_other_users_get_404(self):
+        self.client.force_login(self.other)
+        response = self.client.get(reverse('maintenance:schedule_export', args=[self.home.pk]))
+        self.assertEqual(response.status_code, 404)
+        sheets = self.download()
+        self.assertTrue(all(rows == [] for rows in sheets.values()))
+
+
+@test_settings
+class ToolIndexTests(TestCase):
+    """
+    tools_required text is parsed into Tool rows when a task is saved, and
+    those drive the task list's tool filter and a home's supply list.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.gutters = MaintenanceTask.objects.create(
+            title='Clean gutters', slug='clean-gutters', category='exterior', description='Scoop them out.',
+            tools_required='Ladder, Work gloves, Bucket or tarp (optional)',
+        )
+        cls.filter = MaintenanceTask.objects.create(
+            title='Change HVAC filter', slug='change-hvac-filter', category='hvac', description='Swap it.',
+            tools_required='- New filter (check size, MERV 8)\n- work gloves.',
+        )
+        today = date.today()
+        cls.schedule = Schedule.objects.create(home=cls.home, scheduled_date=today.replace(day=1))
+        cls.schedule.tasks.add(cls.gutters, cls.filter)
+        later = Schedule.objects.create(home=cls.home, scheduled_date=today + timedelta(days=400))
+        later.tasks.add(cls.gutters)
+    
+    def test_parse_tools(self):
+        self.assertEqual(parse_tools('- New filter (check size, MERV 8)\n* screwdriver; Screwdriver.\n2x4 board'), [
+            ('new-filter', 'New filter'), ('screwdriver', 'Screwdriver'), ('2x4-board', '2x4 board'),
+        ])
+        self.assertEqual(parse_tools(''), [])
+    
+    def test_tools_follow_the_text(self):
+        self.assertEqual(Tool.objects.count(), 4)
+        self.assertEqual(list(Tool.objects.get(slug='work-gloves').tasks.order_by('pk')), [self.gutters, self.filter])
+        self.gutters.tools_required = 'Ladder\nGutter scoop'
+        self.gutters.save()
+        self.assertEqual(sorted(self.gutters.tools.values_list('slug', flat=True)), ['gutter-scoop', 'ladder'])
+        task = MaintenanceTask.objects.get(pk=self.gutters.pk)
+        with self.assertNumQueries(1):
+            task.save()  # Unchanged text isn't re-parsed
+    
+    def test_task_list_filters_by_tool(self):
+        response = self.client.get(reverse('maintenance:task_list'), {'tool': 'ladder'})
+        self.assertEqual(list(response.context['task_list']), [self.gutters])
+        self.assertEqual(len(response.context['tools']), 4)
+    
+    def test_supply_list(self):
+        ScheduleTaskCompletion.objects.create(schedule=self.schedule, task=self.filter, completed_by=self.owner)
+        end = date.today() + timedelta(days=31)
+        with self.assertNumQueries(1):
+            supplies = list(supplies_needed(self.home, end))
+        self.assertEqual([row['slug'] for row in supplies], ['bucket-or-tarp', 'ladder', 'work-gloves'])
+        self.assertEqual({row['task_count'] for row in supplies}, {1})
+        
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse('maintenance:supply_list', args=[self.home.pk]), {'period': 'season'})
+        self.assertEqual(len(response.context['supplies']), 3)
+        self.client.force_login(self.other)
+        response = self.client.get(reverse('maintenance:supply_list', args=[self.home.pk]))
+        self.assertEqual(response.status_code, 404)
+
+
+@test_settings
+class TaskSearchTests(TestCase):
+    """
+    Catalog search is ranked and typo-tolerant, and follows catalog changes.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        def task(title, description, steps=''):
+            return MaintenanceTask.objects.create(
+                title=title, slug=title.lower().replace(' ', '-'), category='general',
+                description=description, step_by_step=steps,
+            )
+        cls.gutters = task('Clean gutters', 'Scoop out leaves before the rains.')
+        cls.filter = task('Replace furnace filter', 'Swap the filter in the air handler.')
+        cls.roof = task('Inspect roof', 'Look for lifted shingles.', '<p>Check the <b>guttering</b> too.</p>')
+    
+    def test_index(self):
+        index = TaskSearchIndex([
+            (1, 'Clean gutters', 'Scoop out leaves.', ''),
+            (2, 'Inspect roof', 'Look for lifted shingles.', '<p>Check the guttering too.</p>'),
+            (3, 'Replace furnace filter', 'Swap the filter.', ''),
+        ])
+        self.assertEqual(index.search('gutter'), [1, 2])  # Title beats step text
+        self.assertEqual(index.search('guttering'), [1, 2])
+        self.assertEqual(index.search('furnace filtre'), [3])
+        self.assertEqual(index.search('furn'), [3])
+        self.assertEqual(index.search('shingels roof'), [2])
+        self.assertEqual(index.search('the'), [])
+        self.assertEqual(index.search('p'), [])  # Markup isn't indexed
+    
+    def test_index_follows_catalog_changes(self):
+        self.assertEqual(search_tasks('sump'), [])
+        pump = MaintenanceTask.objects.create(
+            title='Test sump pump', slug='test-sump-pump', category='plumbing', description='Pour in water.',
+        )
+        self.assertEqual(search_tasks('sump'), [pump.pk])
+        pump.is_active = False
+        pump.save()
+        self.assertEqual(search_tasks('sump'), [])
+    
+    def test_task_list_search(self):
+        response = self.client.get(reverse('maintenance:task_list'), {'search': 'gutter'})
+        self.assertEqual(list(response.context['task_list']), [self.gutters, self.roof])
+        response = self.client.get(reverse('maintenance:task_list'), {'search': 'gutter', 'sort': 'title'})
+        self.assertEqual(list(response.context['task_list']), [self.gutters, self.roof])
+        response = self.client.get(reverse('maintenance:task_list'), {'search': 'furnace filtre'})
+        self.assertEqual(list(response.context['task_list']), [self.filter])
+
+
+@test_settings
+class MaintenanceStatsTests(TestCase):
+    """
+    Statistics totals follow schedule changes incrementally and match a
+    full rebuild; the page reads them in a fixed number of queries.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.alarms = MaintenanceTask.objects.create(
+            title='Test smoke alarms', slug='test-smoke-alarms', category='safety', description='Press it.',
+        )
+        cls.filter = MaintenanceTask.objects.create(
+            title='Replace furnace filter', slug='replace-furnace-filter', category='hvac', description='Swap it.',
+        )
+        cls.tomorrow = date.today() + timedelta(days=1)
+    
+    def totals(self):
+        return {
+            row.category: (row.due_tasks, row.completed_tasks, row.on_time_tasks, row.minutes_spent)
+            for row in MaintenanceStatTotal.objects.filter(owner=self.owner)
+        }
+    
+    def make_history(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            upcoming = Schedule.objects.create(home=self.home, scheduled_date=self.tomorrow)
+            upcoming.tasks.add(self.alarms, self.filter)
+            ScheduleTaskCompletion.objects.create(schedule=upcoming, task=self.alarms)
+            past = Schedule.objects.create(home=self.home, scheduled_date=date.today() - timedelta(days=60))
+            past.tasks.add(self.filter)
+            past.mark_complete()
+            TaskCompletion.objects.create(schedule=past, actual_time=90)
+        return upcoming, past
+    
+    def test_counts_follow_changes(self):
+        upcoming, past = self.make_history()
+        stats = owner_statistics(self.owner, self.tomorrow)
+        self.assertEqual(
+            (stats['due_tasks'], stats['completed_tasks'], stats['on_time_tasks'], stats['late_tasks']),
+            (3, 2, 1, 1),
+        )
+        self.assertEqual((stats['missed_tasks'], stats['completion_rate'], stats['hours_spent']), (1, 67, 1.5))
+        self.assertEqual(
+            [(row['category'], row['completion_rate']) for row in stats['categories']],
+            [('hvac', 50), ('safety', 100)],
+        )
+        # Tomorrow's schedule hasn't come due yet
+        self.assertEqual(owner_statistics(self.owner, date.today())['due_tasks'], 1)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            ScheduleTaskCompletion.objects.filter(schedule=upcoming).delete()
+            upcoming.tasks.remove(self.filter)
+        self.assertEqual(self.totals()['safety'], (1, 0, 0, 0))
+        self.assertEqual(self.totals()['hvac'], (1, 1, 0, 0))
+        
+        incremental = self.totals()
+        self.assertEqual(rebuild_stats(), 3)
+        self.assertEqual(self.totals(), incremental)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.home.delete()
+        self.assertFalse(any(any(values) for values in self.totals().values()))
+    
+    def test_rebuild_fills_existing_data(self):
+        # Schedules written before the read model existed: no refresh ran
+        upcoming = Schedule.objects.create(home=self.home, scheduled_date=self.tomorrow)
+        upcoming.tasks.add(self.alarms, self.filter)
+        ScheduleTaskCompletion.objects.create(schedule=upcoming, task=self.alarms)
+        self.assertFalse(MaintenanceStatTotal.objects.exists())
+        
+        call_command('rebuild_maintenance_stats', stdout=io.StringIO())
+        self.assertEqual(self.totals(), {'safety': (1, 1, 1, 0), 'hvac': (1, 0, 0, 0)})
+        self.assertEqual(owner_statistics(self.owner, self.tomorrow)['due_tasks'], 2)
+    
+    def test_archiving_keeps_counts(self):
+        self.make_history()
+        before = self.totals()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.assertEqual(archive_schedules(older_than_days=30)['schedules'], 1)
+        self.assertEqual(self.totals(), before)
+    
+    def test_streaks(self):
+        def month(due, completed):
+            return {'due_tasks': due, 'completed_tasks': completed}
+        today = date(2026, 5, 10)
+        months = [
+            ((2026, 1), month(2, 2)), ((2026, 2), month(3, 1)), ((2026, 3), month(1, 1)),
+            ((2026, 4), month(0, 0)), ((2026, 5), month(2, 1)),
+        ]
+        # April had nothing due and May is still in progress
+        self.assertEqual(_streaks(months, today), (1, 1))
+        months[4] = ((2026, 5), month(2, 2))
+        self.assertEqual(_streaks(months, today), (2, 2))
+    
+    def test_page(self):
+        self.make_history()
+        self.client.force_login(self.owner)
+        self.client.get(reverse('maintenance:maintenance_stats'))
+        with self.assertNumQueries(6):  # Session, user, expert profile, totals, days ahead, months
+            response = self.client.get(reverse('maintenance:maintenance_stats'))
+        self.assertContains(response, 'Monthly Compliance')
+
+
+@test_settings
+class CohortBenchmarkTests(TestCase):
+    """
+    Benchmarks are stored only for cohorts of enough homes, and each home
+    compares against the narrowest of those it belongs to.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        alarms = MaintenanceTask.objects.create(
+            title='Test smoke alarms', slug='test-smoke-alarms', category='safety', description='Press it.',
+        )
+        cls.gutters = MaintenanceTask.objects.create(
+            title='Clean gutters', slug='clean-gutters', category='exterior', description='Scoop them.',
+        )
+        year_built = date.today().year - 20
+        cls.homes = [
+            Home.objects.create(
+                owner=cls.owner, name=f'Frame {number}', year_built=year_built,
+                construction_type='wood_frame', square_footage=2000,
+            )
+            for number in range(5)
+        ]
+        cls.brick = Home.objects.create(
+            owner=cls.owner, name='Brick', year_built=year_built, construction_type='brick',
+        )
+        for number, home in enumerate(cls.homes + [cls.brick]):
+            schedule = Schedule.objects.create(home=home, scheduled_date=date.today() - timedelta(days=30))
+            schedule.tasks.add(alarms, cls.gutters)
+            ScheduleTaskCompletion.objects.create(schedule=schedule, task=alarms)
+            if number < 3:
+                ScheduleTaskCompletion.objects.create(schedule=schedule, task=cls.gutters)
+        rebuild_stats()
+    
+    def test_benchmarks(self):
+        # Frame homes by size, frame homes of any size, then any construction
+        # twice (with and without age); the lone brick home is never enough
+        self.assertEqual(compute_benchmarks(), {'homes': 6, 'cohorts': 4})
+        narrow = CohortBenchmark.objects.get(construction_type='wood_frame', size_band='medium')
+        self.assertEqual((narrow.home_count, narrow.completion_rate), (5, 100))
+        self.assertEqual(
+            narrow.skipped_tasks,
+            [{'id': self.gutters.pk, 'title': 'Clean gutters', 'slug': 'clean-gutters', 'skip_rate': 40}],
+        )
+        
+        comparison = home_comparison(self.homes[3])
+        self.assertEqual(comparison['benchmark'], narrow)
+        self.assertEqual(comparison['completion_rate'], 50)
+        # Too few brick homes, so the broader cohort that ignores construction
+        with self.assertNumQueries(2):
+            comparison = home_comparison(self.brick)
+        self.assertEqual(
+            (comparison['benchmark'].construction_type, comparison['benchmark'].home_count), ('', 6),
+        )
+        
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse('homes:home_detail', kwargs={'pk': self.brick.pk}))
+        self.assertContains(response, 'Compared to Similar Homes')
+
+
+@test_settings
+class TaskCooccurrenceTests(TestCase):
+    """
+    Related tasks come from what similar homes schedule together, and the
+    generate page reads them with one query.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        
+        def task(title, category='general'):
+            return MaintenanceTask.objects.create(
+                title=title, slug=title.lower().replace(' ', '-'), category=category, description=title,
+            )
+        cls.gutters = task('Clean gutters', 'exterior')
+        cls.septic = task('Pump septic tank', 'plumbing')
+        cls.pool = task('Balance pool water', 'exterior')
+        cls.rare = task('Oil weathervane')
+        
+        def home(name, tasks, **features):
+            home = Home.objects.create(owner=cls.owner, name=name, year_built=1990, **features)
+            schedule = Schedule.objects.create(home=home, scheduled_date=date.today() - timedelta(days=30))
+            schedule.tasks.add(*tasks)
+            return home
+        for number in range(3):
+            home(f'Rural {number}', [cls.gutters, cls.septic], has_septic=True, has_well=True)
+            home(
+                f'Suburban {number}', [cls.gutters, cls.pool],
+                climate_zone='tropical', construction_type='brick', has_garage=True,
+            )
+        home('Odd', [cls.gutters, cls.rare], has_septic=True, has_well=True)
+        cls.home = home('Target', [cls.gutters], has_septic=True, has_well=True)
+    
+    def test_cooccurrence(self):
+        stats = compute_cooccurrence()
+        self.assertEqual((stats['homes'], stats['profiles']), (8, 2))
+        related = dict(TaskCooccurrence.objects.filter(task=self.gutters).values_list('related_task_id', 'score'))
+        # Too few homes do the rare task to suggest it
+        self.assertEqual(set(related), {self.septic.pk, self.pool.pk})
+        self.assertFalse(TaskCooccurrence.objects.filter(task=self.septic, related_task=self.pool).exists())
+        
+        with self.assertNumQueries(1):
+            suggestions = list(suggested_tasks(self.home))
+        self.assertEqual(suggestions[0], self.septic)
+        self.assertEqual(suggestions[0].similar_score, related[self.septic.pk])
+        self.assertNotIn(self.gutters, suggestions)
+        
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse('maintenance:generate_schedule', kwargs={'home_pk': self.home.pk}))
+        self.assertIn(self.septic.pk, response.context['similar_home_task_ids'])
+
+
+@test_settings
+class RecallMatchTests(TestCase):
+    """
+    Recalls match appliances on normalized manufacturer and model keys,
+    exactly or by prefix, and reruns only add new notices.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.cabin = Home.objects.create(owner=cls.owner, name='Cabin', year_built=1990)
+        
+        def appliance(home, appliance_type, manufacturer, model_number):
+            return Appliance.objects.create(
+                home=home, appliance_type=appliance_type, manufacturer=manufacturer, model_number=model_number,
+            )
+        cls.dishwasher = appliance(cls.home, 'dishwasher', 'General Electric Co.', 'Model # GDF-510PGR/BB')
+        cls.oven = appliance(cls.home, 'oven', 'GE Appliances', 'GDT100')
+        cls.heater = appliance(cls.cabin, 'water_heater', 'The Whirlpool Corporation', 'wh 40')
+        appliance(cls.cabin, 'water_heater', 'Whirlpool', 'WH400')
+        
+        def recall(manufacturer, model_pattern, appliance_type=''):
+            return ApplianceRecall.objects.create(
+                manufacturer=manufacturer, model_pattern=model_pattern, appliance_type=appliance_type,
+                title=f'{manufacturer} {model_pattern} recall', recall_date=date(2026, 9, 1),
+            )
+        cls.dishwasher_recall = recall('GE', 'GDF510*', 'dishwasher')
+        cls.heater_recall = recall('Whirlpool Inc.', 'WH-40')
+        recall('GE', 'GDT*', 'refrigerator')  # Wrong type for the oven
+    
+    def test_keys(self):
+        self.assertEqual((self.dishwasher.manufacturer_key, self.dishwasher.model_key), ('ge', 'GDF510PGRBB'))
+        self.assertEqual((self.heater_recall.manufacturer_key, self.heater_recall.model_key), ('whirlpool', 'WH40'))
+        self.assertTrue(self.dishwasher_recall.is_prefix)
+        self.oven.model_number = 'gdf-510 x'
+        self.oven.save(update_fields=['model_number'])
+        self.oven.refresh_from_db()
+        self.assertEqual(self.oven.model_key, 'GDF510X')
+    
+    def test_match(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            stats = match_recalls(schedule_days=7)
+        self.assertEqual((stats['recalls'], stats['created'], stats['schedules']), (3, 2, 2))
+        self.assertEqual(
+            set(RecallNotice.objects.values_list('recall_id', 'appliance_id')),
+            {(self.dishwasher_recall.pk, self.dishwasher.pk), (self.heater_recall.pk, self.heater.pk)},
+        )
+        notice = RecallNotice.objects.get(appliance=self.dishwasher)
+        self.assertEqual(notice.schedule.scheduled_date, date.today() + timedelta(days=7))
+        self.assertIn('GE GDF510* recall', notice.schedule.notes)
+        
+        self.assertEqual(match_recalls()['created'], 0)
+        
+        self.client.force_login(self.other)
+        url = reverse('maintenance:recall_dismiss', kwargs={'pk': notice.pk})
+        self.assertEqual(self.client.post(url).status_code, 404)
+        self.client.force_login(self.owner)
+        self.assertContains(self.client.get(reverse('homes:home_detail', kwargs={'pk': self.home.pk})), 'GE GDF510* recall')
+        self.client.post(url)
+        notice.refresh_from_db()
+        self.assertIsNotNone(notice.dismissed_at)
+
+
+@test_settings
+class GenerateScheduleTests(TestCase):
+    """
+    Generating a year of schedules refreshes each month's derived data
+    once, in one transaction, rather than once per row written.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        for slug, category in (('check-gutters', 'exterior'), ('replace-furnace-filter', 'hvac')):
+            MaintenanceTask.objects.create(
+                title=slug.replace('-', ' ').capitalize(), slug=slug, category=category,
+                description='Do it.', frequency='monthly',
+            )
+    
+    def test_annual_generation_query_count(self):
+        self.client.force_login(self.owner)
+        url = reverse('maintenance:generate_schedule', kwargs={'home_pk': self.home.pk})
+        dates = {scheduled_date for _, scheduled_date, _ in ScheduleOptimizer.generate_annual_schedule(self.home)}
+        # Three writes per schedule; everything else is fixed
+        with self.captureOnCommitCallbacks(execute=True) as callbacks, self.assertNumQueries(13 + 3 * len(dates)):
+            response = self.client.post(url, {'generate_annual': '1'})
+        self.assertRedirects(response, reverse('maintenance:schedule_calendar'), fetch_redirect_response=False)
+        
+        rows = Schedule.tasks.through.objects.filter(schedule__home=self.home)
+        months = {(date.year, date.month) for date in rows.values_list('schedule__scheduled_date', flat=True)}
+        self.assertGreater(len(months), 10)
+        # One refresh per month
+        self.assertEqual(len(callbacks), len(months))
+        self.assertEqual(AgendaItem.objects.filter(home=self.home).count(), rows.count())
+        self.assertEqual(
+            sum(MonthlyScheduleSummary.objects.filter(home=self.home).values_list('total_tasks', flat=True)),
+            rows.count(),
+        )
+
+
+@test_settings
+class AgendaTests(TestCase):
+    """
+    The agenda lists each open task once, follows completions, and is
+    filled by rebuild_agenda after fixture loads rather than row by row.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.alarms = MaintenanceTask.objects.create(
+            title='Test smoke alarms', slug='test-smoke-alarms', category='safety', description='Press it.',
+        )
+        cls.filter = MaintenanceTask.objects.create(
+            title='Replace furnace filter', slug='replace-furnace-filter', category='hvac', description='Swap it.',
+        )
+    
+    def sections(self):
+        return {
+            section['key']: [item.task.title for item in section['items']]
+            for section in dashboard(owner=self.owner)['sections']
+        }
+    
+    def test_agenda_follows_changes(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            past = Schedule.objects.create(home=self.home, scheduled_date=date.today() - timedelta(days=3))
+            past.tasks.add(self.alarms)
+            soon = Schedule.objects.create(home=self.home, scheduled_date=date.today() + timedelta(days=2))
+            soon.tasks.add(self.alarms, self.filter)
+        self.assertEqual(self.sections(), {
+            'overdue': ['Test smoke alarms'],
+            'week': ['Test smoke alarms', 'Replace furnace filter'],
+            'month': [],
+        })
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            ScheduleTaskCompletion.objects.create(schedule=soon, task=self.filter)
+            past.mark_complete()
+        self.assertEqual(self.sections(), {'overdue': [], 'week': ['Test smoke alarms'], 'month': []})
+    
+    def test_fixture_load_is_left_to_rebuild(self):
+        fixture = [{
+            'model': 'maintenance.schedule',
+            'pk': 500,
+            'fields': {
+                'home': self.home.pk,
+                'scheduled_date': (date.today() + timedelta(days=10)).isoformat(),
+                'is_completed': False,
+                'notes': '',
+                'created_at': '2026-01-01T00:00:00Z',
+                'updated_at': '2026-01-01T00:00:00Z',
+                'tasks': [self.alarms.pk, self.filter.pk],
+            },
+        }]
+        with tempfile.NamedTemporaryFile('w', suffix='.json') as file:
+            json.dump(fixture, file)
+            file.flush()
+            with self.captureOnCommitCallbacks(execute=True) as callbacks:
+                call_command('loaddata', file.name, verbosity=0)
+        self.assertEqual(callbacks, [])
+        self.assertFalse(AgendaItem.objects.exists())
+        
+        call_command('rebuild_agenda', stdout=io.StringIO())
+        self.assertEqual(self.sections()['month'], ['Test smoke alarms', 'Replace furnace filter'])
+    
+    def test_homepage_shows_agenda(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            schedule = Schedule.objects.create(home=self.home, scheduled_date=date.today() + timedelta(days=2))
+            schedule.tasks.add(self.alarms)
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse('home'))
+        self.assertEqual(
+            [item.task for section in response.context['agenda']['sections'] for item in section['items']],
+            [self.alarms],
+        )
+        self.assertContains(response, 'Test smoke alarms')
+
+
+@test_settings
+class CalendarFragmentCacheTests(TestCase):
+    """
+    Calendar month blocks are served from the cache until something shown
+    in them changes.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.alarms = MaintenanceTask.objects.create(
+            title='Test smoke alarms', slug='test-smoke-alarms', category='safety', description='Press it.',
+        )
+        cls.filter = MaintenanceTask.objects.create(
+            title='Replace furnace filter', slug='replace-furnace-filter', category='hvac', description='Swap it.',
+        )
+    
+    def setUp(self):
+        cache.clear()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.schedule = Schedule.objects.create(home=self.home, scheduled_date=date.today())
+            self.schedule.tasks.add(self.alarms)
+        self.client.force_login(self.owner)
+    
+    def get_calendar(self):
+        return self.client.get(reverse('maintenance:schedule_calendar'))
+    
+    def lookups(self):
+        stats = fragment_cache.get_stats()
+        return stats['hits'], stats['misses']
+    
+    def test_cached_until_changed(self):
+        self.assertContains(self.get_calendar(), 'Test smoke alarms')
+        self.assertContains(self.get_calendar(), 'Test smoke alarms')
+        self.assertEqual(self.lookups(), (1, 1))
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            self.schedule.tasks.add(self.filter)
+        self.assertContains(self.get_calendar(), 'Replace furnace filter')
+        self.assertEqual(self.lookups(), (1, 2))
+        
+        # Catalog edits invalidate every block
+        self.filter.title = 'Change furnace filter'
+        self.filter.save()
+        self.assertContains(self.get_calendar(), 'Change furnace filter')
+        self.assertEqual(self.lookups(), (1, 3))
+    
+    def test_versions_change_on_every_bump(self):
+        key = (self.home.pk, 2026, 1)
+        versions = {fragment_cache.get_month_versions([self.home.pk], [(2026, 1)])[key]}
+        for _ in range(3):
+            fragment_cache.bump_month_version(*key)
+            versions.add(fragment_cache.get_month_versions([self.home.pk], [(2026, 1)])[key])
+        self.assertEqual(len(versions), 4)
+
+
+@test_settings
+class BulkScheduleOperationsTests(TestCase):
+    """
+    The bulk endpoint only touches the user's own schedules, keeps the
+    read models current, and runs the same number of queries however many
+    schedules an operation names.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.other_home = Home.objects.create(owner=cls.other, name='Other', year_built=1990)
+        cls.alarms = MaintenanceTask.objects.create(
+            title='Test smoke alarms', slug='test-smoke-alarms', category='safety',
+            description='Press it.', frequency='annual',
+        )
+        cls.day = date.today() + timedelta(days=40)
+    
+    def setUp(self):
+        self.client.force_login(self.owner)
+    
+    def make_schedules(self, count, home=None):
+        schedules = []
+        with self.captureOnCommitCallbacks(execute=True):
+            for _ in range(count):
+                schedule = Schedule.objects.create(home=home or self.home, scheduled_date=self.day)
+                schedule.tasks.add(self.alarms)
+                schedules.append(schedule)
+        return schedules
+    
+    def post(self, operations):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post(
+                reverse('maintenance:schedule_bulk'), {'operations': operations}, content_type='application/json',
+            )
+        return response.json()
+    
+    def summary(self, day, home=None):
+        return MonthlyScheduleSummary.objects.filter(
+            home=home or self.home, year=day.year, month=day.month,
+        ).values_list('total_tasks', 'completed_tasks').first()
+    
+    def test_complete_task(self):
+        schedules = self.make_schedules(2)
+        response = self.post([
+            {'op': 'complete_task', 'schedule': schedule.pk, 'task': self.alarms.pk} for schedule in schedules
+        ])
+        self.assertTrue(response['success'])
+        next_date = date.fromisoformat(response['results'][0]['next_date'])
+        self.assertEqual(ScheduleTaskCompletion.objects.filter(schedule__in=schedules).count(), 2)
+        self.assertEqual(self.summary(self.day), (2, 2))
+        # Both next occurrences land on one new schedule
+        self.assertEqual(
+            list(AgendaItem.objects.filter(home=self.home).values_list('due_date', flat=True)), [next_date],
+        )
+        self.assertEqual(self.summary(next_date), (1, 0))
+    
+    def test_reschedule(self):
+        schedules = self.make_schedules(2)
+        new_date = self.day + timedelta(days=62)
+        response = self.post([
+            {'op': 'reschedule', 'schedule': schedule.pk, 'date': new_date.isoformat()} for schedule in schedules
+        ])
+        self.assertTrue(response['success'])
+        self.assertEqual(Schedule.objects.filter(home=self.home, scheduled_date=new_date).count(), 2)
+        self.assertEqual(ScheduleEvent.objects.filter(event_type='reschedule', to_date=new_date).count(), 2)
+        self.assertEqual(set(AgendaItem.objects.filter(home=self.home).values_list('due_date', flat=True)), {new_date})
+        self.assertIsNone(self.summary(self.day))
+        self.assertEqual(self.summary(new_date), (2, 0))
+    
+    def test_delete(self):
+        schedules = self.make_schedules(2)
+        response = self.post([{'op': 'delete', 'schedule': schedule.pk} for schedule in schedules])
+        self.assertTrue(response['success'])
+        self.assertFalse(Schedule.objects.filter(home=self.home).exists())
+        self.assertFalse(AgendaItem.objects.filter(home=self.home).exists())
+        self.assertIsNone(self.summary(self.day))
+    
+    def test_other_users_schedules_are_not_found(self):
+        mine, = self.make_schedules(1)
+        theirs, = self.make_schedules(1, home=self.other_home)
+        response = self.post([
+            {'op': 'complete_task', 'schedule': theirs.pk, 'task': self.alarms.pk},
+            {'op': 'reschedule', 'schedule': theirs.pk, 'date': '2030-01-01'},
+            {'op': 'delete', 'schedule': theirs.pk},
+            {'op': 'delete', 'schedule': mine.pk},
+        ])
+        self.assertFalse(response['success'])
+        self.assertEqual(
+            [(result['status'], result.get('error')) for result in response['results']],
+            [('error', 'Schedule not found')] * 3 + [('ok', None)],
+        )
+        theirs.refresh_from_db()
+        self.assertEqual(theirs.scheduled_date, self.day)
+        self.assertFalse(ScheduleTaskCompletion.objects.exists())
+        self.assertEqual(self.summary(self.day, home=self.other_home), (1, 0))
+        self.assertFalse(Schedule.objects.filter(pk=mine.pk).exists())
+    
+    def test_query_counts_do_not_grow(self):
+        # Including the after-commit refresh of the months involved
+        queries = {'complete_task': 56, 'reschedule': 44, 'delete': 34}
+        new_date = self.day + timedelta(days=62)
+        for count in (2, 20):
+            home = Home.objects.create(owner=self.owner, name=f'{count} schedules', year_built=1990)
+            schedules = self.make_schedules(count, home=home)
+            for name, extra in (
+                ('complete_task', {'task': self.alarms.pk}),
+                ('reschedule', {'date': new_date.isoformat()}),
+                ('delete', {}),
+            ):
+                operations = [{'op': name, 'schedule': schedule.pk, **extra} for schedule in schedules]
+                with self.subTest(op=name, count=count), self.assertNumQueries(queries[name]):
+                    self.assertTrue(self.post(operations)['success'])
+
+
+@test_settings
+class ReminderDigestTests(TestCase):
+    """
+    Each user gets one digest for the schedules in their reminder window.
+    Reminded schedules are skipped on reruns until they are rescheduled.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.today = date(2026, 3, 2)
+        cls.owner = User.objects.create_user(
+            'owner', 'owner@example.com', 'pw', schedule_preferences={'reminder_days_before': 3},
+        )
+        cls.quiet = User.objects.create_user('quiet', 'quiet@example.com', 'pw', email_notifications=False)
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.alarms = MaintenanceTask.objects.create(
+            title='Test smoke alarms', slug='test-smoke-alarms', category='safety', description='Press it.',
+        )
+        cls.due = cls.schedule(cls.home, 2)
+        cls.schedule(cls.home, 10)  # Outside the window
+        done = cls.schedule(cls.home, 1)
+        ScheduleTaskCompletion.objects.create(schedule=done, task=cls.alarms)
+        cls.schedule(Home.objects.create(owner=cls.quiet, name='Quiet', year_built=1990), 1)
+    
+    @classmethod
+    def schedule(cls, home, days):
+        schedule = Schedule.objects.create(home=home, scheduled_date=cls.today + timedelta(days=days))
+        schedule.tasks.add(cls.alarms)
+        return schedule
+    
+    def test_digests(self):
+        self.assertEqual(send_reminder_digests(today=self.today, dry_run=True)['emails'], 1)
+        self.assertEqual(len(mail.outbox), 0)
+        
+        stats = send_reminder_digests(today=self.today, site_url='https://example.com')
+        self.assertEqual((stats['users'], stats['emails'], stats['schedules']), (1, 1, 1))
+        self.assertEqual(mail.outbox[0].to, ['owner@example.com'])
+        self.assertIn('Test smoke alarms', mail.outbox[0].body)
+        self.assertIn('https://example.com/', mail.outbox[0].body)
+        
+        # Already reminded for this date
+        self.assertEqual(send_reminder_digests(today=self.today)['emails'], 0)
+        
+        # A new date is reminded again
+        self.due.scheduled_date += timedelta(days=1)
+        self.due.save()
+        self.assertEqual(send_reminder_digests(today=self.today)['schedules'], 1)
+        self.assertEqual(len(mail.outbox), 2)
+
+
+@test_settings
+class ScheduleDetailTests(TestCase):
+    """
+    The schedule page renders in the same number of queries however many
+    tasks it lists; each task's long-form panel is loaded separately.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.tasks = [
+            MaintenanceTask.objects.create(
+                title=f'Task {number}', slug=f'task-{number}', category='general',
+                description='Short.', safety_notes=f'Long safety notes {number}',
+            )
+            for number in range(15)
+        ]
+    
+    def setUp(self):
+        # Counts assume the navbar's overdue count is cached
+        cache.clear()
+        overdue_count(self.owner)
+    
+    def make_schedule(self, tasks):
+        schedule = Schedule.objects.create(home=self.home, scheduled_date=date.today())
+        schedule.tasks.add(*tasks)
+        ScheduleTaskCompletion.objects.create(schedule=schedule, task=tasks[0])
+        ScheduleTaskCustomization.objects.create(schedule=schedule, task=tasks[-1], custom_instructions='Use the ladder')
+        return schedule
+    
+    def test_query_count_is_fixed(self):
+        self.client.force_login(self.owner)
+        for tasks in (self.tasks[:2], self.tasks):
+            schedule = self.make_schedule(tasks)
+            with self.subTest(tasks=len(tasks)), self.assertNumQueries(7):
+                response = self.client.get(reverse('maintenance:schedule_detail', kwargs={'pk': schedule.pk}))
+            self.assertEqual((response.context['completed_count'], response.context['pending_count']), (1, len(tasks) - 1))
+            self.assertEqual(response.context['customized_task_ids'], {tasks[-1].pk})
+            self.assertNotContains(response, 'Long safety notes')
+    
+    def test_task_panel(self):
+        schedule = self.make_schedule(self.tasks[:2])
+        url = reverse('maintenance:schedule_task_panel', kwargs={'pk': schedule.pk, 'task_id': self.tasks[1].pk})
+        self.client.force_login(self.owner)
+        response = self.client.get(url)
+        self.assertContains(response, 'Long safety notes 1')
+        self.assertContains(response, 'Use the ladder')
+        missing = reverse('maintenance:schedule_task_panel', kwargs={'pk': schedule.pk, 'task_id': self.tasks[5].pk})
+        self.assertEqual(self.client.get(missing).status_code, 404)
+        self.client.force_login(self.other)
+        self.assertEqual(self.client.get(url).status_code, 404)
+
+
+@test_settings
+class ScheduleEventTests(TestCase):
+    """
+    Reschedules, completions and undos are logged as ScheduleEvent rows
+    instead of being appended to the schedule's notes.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.alarms = MaintenanceTask.objects.create(
+            title='Test smoke alarms', slug='test-smoke-alarms', category='safety',
+            description='Press it.', frequency='annual',
+        )
+        cls.day = date(2026, 5, 4)
+    
+    def setUp(self):
+        self.schedule = Schedule.objects.create(home=self.home, scheduled_date=self.day, notes='Bring the ladder')
+        self.schedule.tasks.add(self.alarms)
+        self.client.force_login(self.owner)
+    
+    def test_actions_are_logged(self):
+        self.client.post(
+            reverse('maintenance:schedule_reschedule', kwargs={'pk': self.schedule.pk}), {'quick_action': 'week'},
+        )
+        for name in ('schedule_remove_task', 'schedule_uncomplete_task'):
+            self.client.post(reverse(f'maintenance:{name}', kwargs={'pk': self.schedule.pk, 'task_id': self.alarms.pk}))
+        
+        self.schedule.refresh_from_db()
+        self.assertEqual(self.schedule.notes, 'Bring the ladder')
+        events = list(self.schedule.events.order_by('pk').values_list(
+            'event_type', 'actor__username', 'task__title', 'from_date', 'to_date', 'note',
+        ))
+        next_date = events[1][4]
+        self.assertEqual(events, [
+            ('reschedule', 'owner', None, self.day, self.day + timedelta(weeks=1), 'Postponed by 1 week'),
+            ('complete', 'owner', 'Test smoke alarms', None, next_date, ''),
+            ('uncomplete', 'owner', 'Test smoke alarms', None, None, ''),
+        ])
+        
+        response = self.client.get(reverse('maintenance:schedule_history', kwargs={'pk': self.schedule.pk}))
+        self.assertContains(response, 'Postponed by 1 week')
+        self.client.force_login(self.other)
+        self.assertEqual(
+            self.client.get(reverse('maintenance:schedule_history', kwargs={'pk': self.schedule.pk})).status_code, 404,
+        )
+    
+    def test_history_outlives_the_schedule(self):
+        reason = 'Rain all week, ' * 40
+        self.schedule.reschedule(self.day + timedelta(days=1), reason, user=self.owner)
+        self.schedule.delete()
+        event = ScheduleEvent.objects.get()
+        self.assertIsNone(event.schedule_id)
+        self.assertEqual((event.home_id, event.note), (self.home.pk, reason))
+    
+    def test_admin_cannot_edit_or_delete_events(self):
+        self.schedule.reschedule(self.day + timedelta(days=1), 'Rain', user=self.owner)
+        event = ScheduleEvent.objects.get()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'pw'))
+        response = self.client.get(reverse('admin:maintenance_scheduleevent_changelist'))
+        self.assertNotIn('delete_selected', response.context['cl'].model_admin.get_actions(response.wsgi_request))
+        response = self.client.post(reverse('admin:maintenance_scheduleevent_delete', args=[event.pk]), {'post': 'yes'})
+        self.assertEqual(response.status_code, 403)
+        self.assertTrue(ScheduleEvent.objects.filter(pk=event.pk).exists())
+    
+    def test_migration_moves_old_note_lines(self):
+        Schedule.objects.filter(pk=self.schedule.pk).update(notes=(
+            'Bring the ladder\n'
+            '[2025-11-26 20:33] Rescheduled from 2025-12-01 to 2025-12-08 - Reason: Vacation\n'
+            '[2025-12-02 08:00] Rescheduled from 2025-12-08 to 2025-12-09'
+        ))
+        import_module('maintenance.migrations.0010_migrate_reschedule_notes').notes_to_events(apps, None)
+        self.schedule.refresh_from_db()
+        self.assertEqual(self.schedule.notes, 'Bring the ladder')
+        self.assertEqual(
+            list(self.schedule.events.order_by('created_at').values_list('from_date', 'to_date', 'note')),
+            [(date(2025, 12, 1), date(2025, 12, 8), 'Vacation'), (date(2025, 12, 8), date(2025, 12, 9), '')],
+        )
+
+
+@test_settings
+class OverdueTests(TestCase):
+    """
+    Overdue tasks are listed highest priority first; the navbar count is
+    cached and dropped when one of the owner's past schedules changes.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.alarms = MaintenanceTask.objects.create(
+            title='Test smoke alarms', slug='test-smoke-alarms', category='safety', description='Press it.',
+        )
+        cls.gutters = MaintenanceTask.objects.create(
+            title='Clean gutters', slug='clean-gutters', category='exterior', description='Scoop.',
+        )
+        # Run the refreshes now; left queued, they would absorb the tests' own
+        with cls.captureOnCommitCallbacks(execute=True):
+            cls.past = Schedule.objects.create(home=cls.home, scheduled_date=date.today() - timedelta(days=5))
+            cls.past.tasks.add(cls.alarms, cls.gutters)
+            upcoming = Schedule.objects.create(home=cls.home, scheduled_date=date.today() + timedelta(days=5))
+            upcoming.tasks.add(cls.alarms)
+            other_past = Schedule.objects.create(
+                home=Home.objects.create(owner=cls.other, name='Other', year_built=1990),
+                scheduled_date=date.today() - timedelta(days=5),
+            )
+            other_past.tasks.add(cls.alarms)
+    
+    def setUp(self):
+        cache.clear()
+    
+    def test_dashboard(self):
+        ScheduleTaskCompletion.objects.create(schedule=self.past, task=self.gutters)
+        self.assertEqual([row.maintenancetask_id for row in overdue_tasks(self.owner)], [self.alarms.pk])
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse('maintenance:overdue_dashboard'))
+        self.assertEqual([row.days_overdue for row in response.context['rows']], [5])
+        self.assertContains(response, 'Test smoke alarms')
+        self.assertNotContains(response, 'Clean gutters')
+    
+    def test_count_is_cached_until_a_past_schedule_changes(self):
+        self.assertEqual(overdue_count(self.owner), 2)
+        self.assertEqual(cache.get(count_cache_key(self.owner.pk)), 2)
+        with self.assertNumQueries(0):
+            overdue_count(self.owner)
+        
+        # Upcoming schedules can't be overdue, so the count stays cached
+        with self.captureOnCommitCallbacks(execute=True):
+            Schedule.objects.create(home=self.home, scheduled_date=date.today() + timedelta(days=40))
+        self.assertEqual(cache.get(count_cache_key(self.owner.pk)), 2)
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            ScheduleTaskCompletion.objects.create(schedule=self.past, task=self.gutters)
+        self.assertIsNone(cache.get(count_cache_key(self.owner.pk)))
+        self.assertEqual(overdue_count(self.owner), 1)
+
+
+@test_settings
+class ArchiveTests(TestCase):
+    """
+    Finished schedules past the cutoff move to ArchivedSchedule with their
+    history, without changing the monthly summaries.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.alarms = MaintenanceTask.objects.create(
+            title='Test smoke alarms', slug='test-smoke-alarms', category='safety',
+            description='Press it.', estimated_time=15,
+        )
+        cls.old = date.today() - timedelta(days=400)
+    
+    def make_schedule(self, scheduled_date, completed=False, ticked=False):
+        schedule = Schedule.objects.create(home=self.home, scheduled_date=scheduled_date)
+        schedule.tasks.add(self.alarms)
+        if ticked:
+            ScheduleTaskCompletion.objects.create(schedule=schedule, task=self.alarms, completed_by=self.owner)
+        if completed:
+            schedule.mark_complete(user=self.owner)
+        return schedule
+    
+    def summary(self):
+        return MonthlyScheduleSummary.objects.filter(
+            home=self.home, year=self.old.year, month=self.old.month,
+        ).values_list('total_tasks', 'completed_tasks', 'estimated_minutes').get()
+    
+    def test_archive(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            completed = self.make_schedule(self.old, completed=True)
+            ticked = self.make_schedule(self.old, ticked=True)
+            still_open = self.make_schedule(self.old)
+            empty = Schedule.objects.create(home=self.home, scheduled_date=self.old)
+            recent = self.make_schedule(date.today() - timedelta(days=5), completed=True)
+        before = self.summary()
+        
+        self.assertEqual(archive_schedules(older_than_days=365, dry_run=True)['schedules'], 2)
+        self.assertFalse(ArchivedSchedule.objects.exists())
+        
+        with self.captureOnCommitCallbacks(execute=True):
+            stats = archive_schedules(older_than_days=365, chunk_size=1)
+        self.assertEqual((stats['schedules'], stats['chunks']), (2, 2))
+        # An open schedule without tasks isn't finished work either
+        self.assertEqual(set(Schedule.objects.values_list('pk', flat=True)), {still_open.pk, empty.pk, recent.pk})
+        self.assertEqual(
+            set(ArchivedSchedule.objects.values_list('original_id', flat=True)), {completed.pk, ticked.pk},
+        )
+        archived = ArchivedSchedule.objects.get(original_id=completed.pk)
+        self.assertEqual((archived.task_count, archived.estimated_minutes), (1, 15))
+        self.assertEqual([event['event_type'] for event in archived.payload['events']], ['complete'])
+        self.assertEqual(self.summary(), before)
+        self.assertEqual(archive_schedules(older_than_days=365)['schedules'], 0)
+        
+        self.client.force_login(self.owner)
+        response = self.client.get(reverse('maintenance:schedule_archive'))
+        self.assertEqual(len(response.context['archived_schedules']), 2)
+        self.assertContains(response, 'Test smoke alarms')
+        self.client.force_login(self.other)
+        self.assertEqual(len(self.client.get(reverse('maintenance:schedule_archive')).context['archived_schedules']), 0)
+
+
+@test_settings
+class PortfolioCalendarTests(TestCase):
+    """
+    The portfolio grid counts each home's tasks per week and its overdue
+    tasks, in the same number of queries however many homes are shown.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.task = MaintenanceTask.objects.create(
+            title='Clean gutters', slug='clean-gutters', category='exterior', description='Clear them.',
+        )
+        cls.monday = date.today() - timedelta(days=date.today().weekday())
+    
+    def setUp(self):
+        # Counts assume the navbar's overdue count is cached
+        cache.clear()
+        overdue_count(self.owner)
+    
+    def make_home(self, owner, name, city='Springfield', overdue=False):
+        home = Home.objects.create(owner=owner, name=name, city=city, year_built=1990)
+        schedule = Schedule.objects.create(home=home, scheduled_date=self.monday + timedelta(days=7))
+        schedule.tasks.add(self.task)
+        if overdue:
+            schedule = Schedule.objects.create(home=home, scheduled_date=date.today() - timedelta(days=3))
+            schedule.tasks.add(self.task)
+        return home
+    
+    def get(self, **params):
+        return self.client.get(reverse('maintenance:schedule_portfolio'), params)
+    
+    def test_grid(self):
+        late = self.make_home(self.owner, 'Alpha', overdue=True)
+        self.make_home(self.owner, 'Beta', city='Shelbyville')
+        self.make_home(self.other, 'Elsewhere', overdue=True)
+        self.client.force_login(self.owner)
+        
+        response = self.get(weeks=4)
+        rows = response.context['rows']
+        self.assertEqual([row['home'].name for row in rows], ['Alpha', 'Beta'])
+        self.assertEqual([row['overdue'] for row in rows], [1, 0])
+        self.assertEqual((response.context['overdue_total'], response.context['overdue_homes']), (1, 1))
+        self.assertEqual(response.context['totals']['total'], 2)
+        next_week = dict(rows[1]['cells'])[self.monday + timedelta(days=7)]
+        self.assertEqual(next_week['total'], 1)
+        self.assertEqual(list(response.context['cities']), ['Shelbyville', 'Springfield'])
+        
+        response = self.get(city='Springfield', weeks=4)
+        self.assertEqual([row['home'] for row in response.context['rows']], [late])
+    
+    def test_query_count_is_fixed(self):
+        self.client.force_login(self.owner)
+        for count in (2, 20):
+            for number in range(count - Home.objects.filter(owner=self.owner).count()):
+                self.make_home(self.owner, f'Home {number:02}', overdue=number % 2 == 0)
+            with self.subTest(homes=count), self.assertNumQueries(9):
+                response = self.get()
+            self.assertEqual(len(response.context['rows']), count)
+
+
+@test_settings
+class CalendarFragmentResponseTests(TestCase):
+    """
+    Actions posted from the calendar page answer with the months they
+    touched, the totals strip and the heatmap instead of a redirect.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.task = MaintenanceTask.objects.create(
+            title='Clean gutters', slug='clean-gutters', category='exterior', description='Clear them.',
+        )
+        cls.year = date.today().year + 1
+    
+    def make_schedule(self, day):
+        schedule = Schedule.objects.create(home=self.home, scheduled_date=date(self.year, 3, day))
+        schedule.tasks.add(self.task)
+        return schedule
+    
+    def post(self, name, schedule, data=None, **kwargs):
+        return self.client.post(
+            reverse(f'maintenance:{name}', kwargs={'pk': schedule.pk, **kwargs}),
+            {'fragment': 'calendar', 'home': self.home.pk, 'year': self.year, **(data or {})},
+            HTTP_X_REQUESTED_WITH='XMLHttpRequest',
+        )
+    
+    def test_actions_return_touched_months(self):
+        moved = self.make_schedule(10)
+        stays = self.make_schedule(20)
+        self.client.force_login(self.owner)
+        
+        response = self.post('schedule_reschedule', moved, {'new_date': f'{self.year}-05-05'})
+        data = response.json()
+        self.assertTrue(data['success'])
+        self.assertEqual(set(data['months']), {f'{self.year}-03', f'{self.year}-05'})
+        self.assertIn('Mar 20, ' + str(self.year), data['months'][f'{self.year}-03'])
+        self.assertNotIn('Mar 10, ' + str(self.year), data['months'][f'{self.year}-03'])
+        self.assertIn('May 05, ' + str(self.year), data['months'][f'{self.year}-05'])
+        self.assertTrue(data['totals'] and data['heatmap'])
+        
+        response = self.post('schedule_delete', stays)
+        self.assertEqual(response.json()['months'], {f'{self.year}-03': None})
+        self.assertFalse(Schedule.objects.filter(pk=stays.pk).exists())
+        
+        response = self.post('schedule_remove_task', moved, task_id=self.task.pk)
+        self.assertIn(f'{self.year}-05', response.json()['months'])
+        self.assertTrue(ScheduleTaskCompletion.objects.filter(schedule=moved, task=self.task).exists())
+    
+    def test_plain_posts_and_other_users(self):
+        schedule = self.make_schedule(10)
+        self.client.force_login(self.owner)
+        response = self.client.post(
+            reverse('maintenance:schedule_reschedule', kwargs={'pk': schedule.pk}), {'quick_action': 'week'},
+        )
+        self.assertRedirects(
+            response, reverse('maintenance:schedule_detail', kwargs={'pk': schedule.pk}), fetch_redirect_response=False,
+        )
+        self.client.force_login(self.other)
+        self.assertEqual(self.post('schedule_delete', schedule).status_code, 404)
+        self.assertTrue(Schedule.objects.filter(pk=schedule.pk).exists())
+
+
+@test_settings
+class CalendarFeedTests(TestCase):
+    """
+    The iCalendar feed answers 304 only while nothing it shows has changed.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.home = Home.objects.create(owner=cls.owner, name='Main', year_built=1990)
+        cls.task = MaintenanceTask.objects.create(
+            title='Clean gutters', slug='clean-gutters', category='exterior', description='Clear them.',
+        )
+    
+    def setUp(self):
+        cache.clear()
+        self.url = reverse('maintenance:schedule_feed', kwargs={'token': self.owner.get_calendar_feed_token()})
+        self.schedules = []
+        for days in (3, 10):
+            schedule = Schedule.objects.create(home=self.home, scheduled_date=date.today() + timedelta(days=days))
+            schedule.tasks.add(self.task)
+            self.schedules.append(schedule)
+    
+    def fetch(self, etag=None):
+        headers = {'HTTP_IF_NONE_MATCH': etag} if etag else {}
+        response = self.client.get(self.url, **headers)
+        body = b''.join(response.streaming_content).decode() if response.status_code == 200 else ''
+        return response, body
+    
+    def assertChanged(self, etag):
+        response, body = self.fetch(etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response['ETag'], etag)
+        return response['ETag'], body
+    
+    def test_feed(self):
+        response, body = self.fetch()
+        self.assertEqual(response['Content-Type'], 'text/calendar; charset=utf-8')
+        self.assertNotIn('Last-Modified', response)
+        self.assertEqual(body.count('BEGIN:VEVENT'), 2)
+        self.assertIn('Clean gutters - Main', body)
+        self.assertEqual(self.fetch(response['ETag'])[0].status_code, 304)
+        self.assertEqual(self.client.get(reverse('maintenance:schedule_feed', kwargs={'token': 'nope'})).status_code, 404)
+    
+    def test_changes_refresh_the_feed(self):
+        etag = self.fetch()[0]['ETag']
+        
+        self.schedules[0].delete()
+        etag, body = self.assertChanged(etag)
+        self.assertEqual(body.count('BEGIN:VEVENT'), 1)
+        
+        self.home.name = 'Cabin'
+        self.home.save()
+        etag, body = self.assertChanged(etag)
+        self.assertIn('Clean gutters - Cabin', body)
+        
+        self.task.title = 'Clear gutters'
+        self.task.save()
+        etag, body = self.assertChanged(etag)
+        self.assertIn('Clear gutters - Cabin', body)
+        
+        ScheduleTaskCompletion.objects.create(schedule=self.schedules[1], task=self.task)
+        etag, body = self.assertChanged(etag)
+        self.assertIn('[x] Clear gutters', body)
+        self.assertEqual(self.fetch(etag)[0].status_code, 304)
+
 
-# Create your tests here.
+@test_settings
+class SummaryRefreshTests(TestCase):
+    """
+    Stale overdue counts are recounted together, not month by month.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.owner = User.objects.create_user('owner', 'owner@example.com', 'pw')
+        cls.task = MaintenanceTask.objects.create(
+            title='Clean gutters', slug='clean-gutters', category='exterior', description='Clear them.',
+        )
+        cls.other_task = MaintenanceTask.objects.create(
+            title='Test smoke alarms', slug='test-smoke-alarms', category='safety', description='Press it.',
+        )
+        cls.year = date.today().year - 1
+    
+    def make_home(self, name):
+        home = Home.objects.create(owner=self.owner, name=name, year_built=1990)
+        with self.captureOnCommitCallbacks(execute=True):
+            for month in range(1, 13):
+                schedule = Schedule.objects.create(home=home, scheduled_date=date(self.year, month, 15))
+                schedule.tasks.add(self.task, self.other_task)
+                ScheduleTaskCompletion.objects.create(schedule=schedule, task=self.task)
+        return home
+    
+    def test_year_is_refreshed_in_fixed_queries(self):
+        homes = []
+        for count in (1, 3):
+            while len(homes) < count:
+                homes.append(self.make_home(f'Home {len(homes)}'))
+            # As if each month were last computed on its first day
+            for month in range(1, 13):
+                MonthlyScheduleSummary.objects.filter(year=self.year, month=month).update(
+                    overdue_tasks=0, computed_on=date(self.year, month, 1),
+                )
+            home_ids = [home.pk for home in homes]
+            with self.subTest(homes=count), self.assertNumQueries(3):
+                summaries = get_summaries(home_ids, start=(self.year, 1), end=(self.year, 12))
+            self.assertEqual(len(summaries), 12 * count)
+            self.assertEqual({(summary.overdue_tasks, summary.completed_tasks) for summary in summaries}, {(1, 1)})
+            self.assertEqual(
+                set(MonthlyScheduleSummary.objects.values_list('overdue_tasks', 'computed_on')), {(1, date.today())},
+            )
+            with self.assertNumQueries(1):
+                get_summaries(home_ids, start=(self.year, 1), end=(self.year, 12))
@@ -0,0 +1,119 @@
+"""
+Tools and supplies named by maintenance tasks.
+
+MaintenanceTask.tools_required is free text, one item per line or comma
+separated, with notes in parentheses ("New filter (check size)"). When a
+task is saved its text is parsed once into Tool rows, linked through
+MaintenanceTask.tools, so nothing re-parses it per task per render:
+  - the task list filters by tool with the unique slug index and the
+    join table's tool index instead of icontains,
+  - supplies_needed() builds a home's list of tools for a month or
+    season in one aggregate query over its open schedules.
+"""
+
+import re
+from datetime import timedelta
+
+from django.db.models import Count, Exists, F, Min, OuterRef
+from django.utils.text import slugify
+
+from .models import MaintenanceTask, Schedule, ScheduleTaskCompletion, Tool
+from .utils import ScheduleOptimizer
+
+# Items are separated by newlines, semicolons, or commas outside parentheses
+ITEM_SEPARATOR = re.compile(r'[\n;]|,(?![^()]*\))')
+BULLET = re.compile(r'^(?:[-*•]+|\d+[.)])\s*')
+PARENTHETICAL = re.compile(r'\s*\([^)]*\)')
+
+MAX_NAME_LENGTH = Tool._meta.get_field('name').max_length
+
+SUPPLY_PERIODS = [
+    ('month', 'This month'),
+    ('season', 'This season'),
+]
+
+
+def parse_tools(text):
+    """
+    (slug, name) for each distinct item in a tools_required text, in the
+    order written. Bullets, parenthetical notes and trailing periods are
+    dropped, and the slug ignores case and punctuation, so "Work gloves"
+    and "work gloves." are the same tool.
+    """
+    tools = {}
+    for item in ITEM_SEPARATOR.split(text or ''):
+        name = PARENTHETICAL.sub('', BULLET.sub('', item.strip()))
+        name = ' '.join(name.split()).rstrip('.')[:MAX_NAME_LENGTH]
+        slug = slugify(name)[:MAX_NAME_LENGTH]
+        if slug and slug not in tools:
+            tools[slug] = name[0].upper() + name[1:]
+    return list(tools.items())
+
+
+def sync_task_tools(tasks):
+    """
+    Replace the tools linked to each task with those parsed from its
+    tools_required. Creates any new Tool rows; a constant number of
+    queries however many tasks are given.
+    """
+    parsed = {task.pk: parse_tools(task.tools_required) for task in tasks}
+    names = dict(item for items in parsed.values() for item in items)
+    Tool.objects.bulk_create(
+        [Tool(slug=slug, name=name) for slug, name in names.items()],
+        ignore_conflicts=True,
+    )
+    tool_ids = dict(Tool.objects.filter(slug__in=names).values_list('slug', 'pk'))
+    
+    TaskTool = MaintenanceTask.tools.through
+    TaskTool.objects.filter(maintenancetask_id__in=parsed).delete()
+    TaskTool.objects.bulk_create([
+        TaskTool(maintenancetask_id=task_id, tool_id=tool_ids[slug])
+        for task_id, items in parsed.items()
+        for slug, _ in items
+    ])
+
+
+def period_bounds(period, today):
+    """
+    First and last day of the calendar month or season (as in
+    ScheduleOptimizer.SEASON_MONTHS) that contains today.
+    """
+    if period == 'season':
+        months = next(
+            months for months in ScheduleOptimizer.SEASON_MONTHS.values() if today.month in months
+        )
+        back = months.index(today.month)
+        year, month = divmod(today.year * 12 + today.month - 1 - back, 12)
+        start = today.replace(year=year, month=month + 1, day=1)
+        length = len(months)
+    else:
+        start = today.replace(day=1)
+        length = 1
+    year, month = divmod(start.year * 12 + start.month - 1 + length, 12)
+    end = start.replace(year=year, month=month + 1) - timedelta(days=1)
+    return start, end
+
+
+def supplies_needed(home, end):
+    """
+    Tools for the home's open scheduled tasks due on or before `end`,
+    overdue ones included, in one aggregate query. Each row has the tool's
+    name and slug, the number of tasks needing it and the earliest date.
+    Tasks already ticked off on their schedule are left out.
+    """
+    done = ScheduleTaskCompletion.objects.filter(
+        schedule_id=OuterRef('schedule_id'),
+        task_id=OuterRef('maintenancetask_id'),
+    )
+    return Schedule.tasks.through.objects.filter(
+        schedule__home=home,
+        schedule__is_completed=False,
+        schedule__scheduled_date__lte=end,
+        maintenancetask__tools__isnull=False,
+    ).exclude(Exists(done)).values(
+        name=F('maintenancetask__tools__name'),
+        slug=F('maintenancetask__tools__slug'),
+    ).annotate(
+        task_count=Count('maintenancetask', distinct=True),
+        first_date=Min('schedule__scheduled_date'),
+    ).order_by('first_date', 'name')
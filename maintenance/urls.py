@@ -15,11 +15,22 @@ urlpatterns = [
     
     # Schedule management
     path('schedule/', views.ScheduleListView.as_view(), name='schedule_list'),
+    path('schedule/overdue/', views.OverdueDashboardView.as_view(), name='overdue_dashboard'),
+    path('schedule/stats/', views.MaintenanceStatsView.as_view(), name='maintenance_stats'),
+    path('schedule/archive/', views.ArchivedScheduleListView.as_view(), name='schedule_archive'),
+    path('schedule/portfolio/', views.PortfolioCalendarView.as_view(), name='schedule_portfolio'),
     path('schedule/calendar/', views.ScheduleCalendarView.as_view(), name='schedule_calendar'),
+    path('schedule/feed/reset/', views.ScheduleCalendarFeedResetView.as_view(), name='schedule_feed_reset'),
+    path('schedule/feed/<str:token>.ics', views.ScheduleCalendarFeedView.as_view(), name='schedule_feed'),
+    path('schedule/bulk/', views.ScheduleBulkView.as_view(), name='schedule_bulk'),
+    path('schedule/export/', views.ScheduleExportView.as_view(), name='schedule_export'),
+    path('schedule/export/home/<int:pk>/', views.ScheduleExportView.as_view(), name='schedule_export'),
     path('schedule/create/', views.ScheduleCreateView.as_view(), name='schedule_create'),
     path('schedule/<int:pk>/', views.ScheduleDetailView.as_view(), name='schedule_detail'),
     path('schedule/<int:pk>/complete/', views.ScheduleCompleteView.as_view(), name='schedule_complete'),
     path('schedule/<int:pk>/reschedule/', views.ScheduleRescheduleView.as_view(), name='schedule_reschedule'),
+    path('schedule/<int:pk>/task/<int:task_id>/panel/', views.ScheduleTaskPanelView.as_view(), name='schedule_task_panel'),
+    path('schedule/<int:pk>/history/', views.ScheduleHistoryView.as_view(), name='schedule_history'),
     path('schedule/<int:pk>/remove-task/<int:task_id>/', views.ScheduleRemoveTaskView.as_view(), name='schedule_remove_task'),
     path('schedule/<int:pk>/uncomplete-task/<int:task_id>/', views.ScheduleUncompleteTaskView.as_view(), name='schedule_uncomplete_task'),
     path('schedule/<int:schedule_pk>/save-customization/<int:task_id>/', views.SaveTaskCustomizationView.as_view(), name='save_task_customization'),
@@ -28,4 +39,6 @@ urlpatterns = [
     
     # Generate schedule (personalized based on home)
     path('generate-schedule/<int:home_pk>/', views.GenerateScheduleView.as_view(), name='generate_schedule'),
+    path('supplies/<int:pk>/', views.HomeSupplyListView.as_view(), name='supply_list'),
+    path('recalls/<int:pk>/dismiss/', views.RecallNoticeDismissView.as_view(), name='recall_dismiss'),
 ]
@@ -4,7 +4,8 @@ Implements seasonal adjustments, climate zone multipliers, and smart scheduling.
 """
 
 from datetime import datetime, date, timedelta
-from django.db.models import Count, Q
+from django.db.models import Case, Count, ExpressionWrapper, IntegerField, Q, Value, When
+from maintenance.lifecycle import task_priority_bonuses
 from maintenance.models import MaintenanceTask, Schedule, TaskCompletion
 
 
@@ -39,6 +40,31 @@ class ScheduleOptimizer:
         'winter': [12, 1, 2],
     }
     
+    # Base priority by frequency (high frequency = lower base priority)
+    FREQUENCY_SCORES = {
+        'weekly': 40,
+        'monthly': 50,
+        'quarterly': 60,
+        'biannual': 70,
+        'annual': 75,
+        'biennial': 60,
+        'as_needed': 50,
+    }
+    
+    # Priority bonus by category
+    CATEGORY_SCORES = {
+        'safety': 30,       # Safety is critical
+        'hvac': 20,         # Essential systems
+        'plumbing': 20,
+        'electrical': 20,
+        'exterior': 15,     # Structural and exterior protection
+        'yard': 5,          # Equipment and yard maintenance
+        'appliances': 5,
+    }
+    
+    CURRENT_SEASON_SCORE = 15  # Reduced from 20
+    ANY_SEASON_SCORE = 3       # Reduced from 5
+    
     @classmethod
     def get_current_season(cls):
         """Get the current season based on the current month."""
@@ -87,39 +113,17 @@ class ScheduleOptimizer:
         - 30-49: Optional improvements and long-term maintenance
         """
         # Start with frequency-based priority
-        frequency_scores = {
-            'weekly': 40,      # High frequency = lower base priority
-            'monthly': 50,
-            'quarterly': 60,
-            'biannual': 70,
-            'annual': 75,
-            'biennial': 60,
-            'as_needed': 50,
-        }
-        score = frequency_scores.get(task.frequency, 50)
-        
-        # Safety tasks get highest priority
-        if task.category == 'safety':
-            score += 30  # Safety is critical
-        
-        # Essential systems get high priority
-        elif task.category in ['hvac', 'plumbing', 'electrical']:
-            score += 20
-        
-        # Structural and exterior protection
-        elif task.category in ['exterior']:
-            score += 15
+        score = cls.FREQUENCY_SCORES.get(task.frequency, 50)
         
-        # Equipment and yard maintenance
-        elif task.category in ['yard', 'appliances']:
-            score += 5
+        # Category bonus (safety first, then essential systems, exterior, equipment)
+        score += cls.CATEGORY_SCORES.get(task.category, 0)
         
         # Seasonal bonus (prioritize current season tasks)
         current_season = cls.get_current_season()
         if task.seasonal_priority == current_season:
-            score += 15  # Reduced from 20
+            score += cls.CURRENT_SEASON_SCORE
         elif task.seasonal_priority == 'any':
-            score += 3   # Reduced from 5
+            score += cls.ANY_SEASON_SCORE
         
         # Home age relevance (older homes need more attention)
         home_age = home.get_age()
@@ -155,6 +159,32 @@ class ScheduleOptimizer:
         
         return min(score, 100)  # Cap at 100
     
+    @classmethod
+    def get_task_priority_expression(cls, prefix=''):
+        """
+        Database expression for the task-only part of calculate_task_priority()
+        (frequency, category and season), so lists can be ordered by priority
+        in SQL. prefix is the lookup path to the task, e.g. 'maintenancetask__'.
+        """
+        current_season = cls.get_current_season()
+        frequency = Case(
+            *[When(**{f'{prefix}frequency': key}, then=Value(score)) for key, score in cls.FREQUENCY_SCORES.items()],
+            default=Value(50),
+            output_field=IntegerField(),
+        )
+        category = Case(
+            *[When(**{f'{prefix}category': key}, then=Value(score)) for key, score in cls.CATEGORY_SCORES.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        season = Case(
+            When(**{f'{prefix}seasonal_priority': current_season}, then=Value(cls.CURRENT_SEASON_SCORE)),
+            When(**{f'{prefix}seasonal_priority': 'any'}, then=Value(cls.ANY_SEASON_SCORE)),
+            default=Value(0),
+            output_field=IntegerField(),
+        )
+        return ExpressionWrapper(frequency + category + season, output_field=IntegerField())
+    
     @classmethod
     def generate_next_due_date(cls, task, home, base_date=None):
         """
@@ -188,6 +218,8 @@ class ScheduleOptimizer:
     def get_recommended_tasks(cls, home, limit=None):
         """
         Get top recommended tasks for a home, sorted by priority score.
+        Tasks implied by the home's aging appliances get the bonus from
+        lifecycle.task_priority_bonuses().
         Returns: list of (task, priority_score) tuples
         """
         # Get all applicable tasks
@@ -286,9 +318,10 @@ class ScheduleOptimizer:
             # If task passed all filters, it's applicable
             applicable_tasks.append(task)
         
-        # Calculate priority scores
+        # Calculate priority scores, raised for tasks of aging appliances
+        appliance_bonuses = task_priority_bonuses(home, applicable_tasks)
         task_priorities = [
-            (task, cls.calculate_task_priority(task, home, home.owner))
+            (task, min(cls.calculate_task_priority(task, home, home.owner) + appliance_bonuses.get(task.id, 0), 100))
             for task in applicable_tasks
         ]
         
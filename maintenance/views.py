@@ -4,19 +4,40 @@ Handles maintenance tasks, schedules, and task completions.
 Uses ScheduleOptimizer for intelligent schedule generation.
 """
 
+import hashlib
+import json
+import tempfile
 from django.shortcuts import render, redirect, get_object_or_404
-from django.contrib.auth.mixins import LoginRequiredMixin, UserPassesTestMixin
+from django.contrib.auth import get_user_model
+from django.contrib.auth.mixins import LoginRequiredMixin
 from django.views.generic import ListView, DetailView, CreateView, UpdateView, DeleteView, View
-from django.urls import reverse_lazy
+from django.urls import reverse, reverse_lazy
 from django.contrib import messages
-from django.http import JsonResponse
-from datetime import date, timedelta
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Case, Count, IntegerField, Max, Prefetch, Q, Value, When
+from django.http import FileResponse, JsonResponse, StreamingHttpResponse
+from django.middleware.csrf import get_token
+from django.template.loader import render_to_string
+from django.utils.cache import get_conditional_response
+from django.utils.safestring import mark_safe
+from django.utils import timezone
+from django.utils.text import slugify
+from datetime import date, datetime, timedelta
 from collections import defaultdict
 from calendar import month_name
-from .models import MaintenanceTask, Schedule, TaskCompletion, ScheduleTaskCompletion, ScheduleTaskCustomization
+from .models import ArchivedSchedule, MaintenanceTask, RecallNotice, Schedule, ScheduleEvent, TaskCompletion, ScheduleTaskCompletion, ScheduleTaskCustomization, Tool
 from homes.models import Home
+from home_maintenance_compass.mixins import OwnerScopedObjectMixin
 from .forms import ScheduleForm
 from .utils import ScheduleOptimizer
+from . import daily_stats, export, fragment_cache, ical, overdue, portfolio, summaries, tools
+from .bulk import BulkScheduleOperations, OperationError
+from .signals import batch_changes
+from .search import search_tasks
+from .cooccurrence import suggested_tasks
+
+User = get_user_model()
 
 
 class TaskListView(ListView):
@@ -30,7 +51,7 @@ class TaskListView(ListView):
     
     def get_queryset(self):
         """
-        Filter active tasks by category, difficulty, frequency, and search.
+        Filter active tasks by category, difficulty, frequency, tool, and search.
         """
         queryset = MaintenanceTask.objects.filter(is_active=True)
         
@@ -49,18 +70,25 @@ class TaskListView(ListView):
         if frequency:
             queryset = queryset.filter(frequency=frequency)
         
-        # Search filter
-        search = self.request.GET.get('search')
+        # Tool filter, through the parsed tools index
+        tool = self.request.GET.get('tool')
+        if tool:
+            queryset = queryset.filter(tools__slug=tool)
+        
+        # Search filter, ranked by the in-memory catalog index
+        search = self.request.GET.get('search', '').strip()
         if search:
-            queryset = queryset.filter(
-                title__icontains=search
-            ) | queryset.filter(
-                description__icontains=search
-            )
+            ranked = search_tasks(search)
+            queryset = queryset.filter(pk__in=ranked)
         
-        # Sort
-        sort = self.request.GET.get('sort', 'title')
-        if sort == 'difficulty':
+        # Sort (search results default to relevance)
+        sort = self.request.GET.get('sort') or ('relevance' if search else 'title')
+        if sort == 'relevance' and search:
+            queryset = queryset.order_by(Case(
+                *[When(pk=pk, then=Value(rank)) for rank, pk in enumerate(ranked)],
+                output_field=IntegerField(),
+            ))
+        elif sort == 'difficulty':
             queryset = queryset.order_by('difficulty')
         elif sort == 'frequency':
             queryset = queryset.order_by('frequency')
@@ -77,6 +105,7 @@ class TaskListView(ListView):
         context['categories'] = MaintenanceTask.CATEGORY_CHOICES
         context['difficulties'] = MaintenanceTask.DIFFICULTY_LEVELS
         context['frequencies'] = MaintenanceTask.FREQUENCY_CHOICES
+        context['tools'] = Tool.objects.filter(tasks__is_active=True).distinct()
         return context
 
 
@@ -89,6 +118,155 @@ class TaskDetailView(DetailView):
     context_object_name = 'task'
 
 
+class CalendarFragmentMixin:
+    """
+    Render pieces of the calendar page so actions taken there can answer
+    with just the month sections they changed (plus totals and heatmap)
+    instead of a redirect and a full page render.
+    
+    The page posts with X-Requested-With: XMLHttpRequest and fragment=calendar,
+    along with its home filter and heatmap year. Plain form posts still get
+    the usual redirect, so the full page keeps working without JavaScript.
+    """
+    month_template = 'maintenance/partials/calendar_month.html'
+    
+    def wants_fragments(self, request):
+        return (
+            request.headers.get('X-Requested-With') == 'XMLHttpRequest'
+            and request.POST.get('fragment') == 'calendar'
+        )
+    
+    def get_scope_homes(self, request, home_id=None):
+        """
+        Return (user_homes, selected_home, scope_homes) for the home filter.
+        """
+        user_homes = list(Home.objects.filter(owner=request.user))
+        selected_home = None
+        if home_id:
+            selected_home = next((home for home in user_homes if str(home.pk) == str(home_id)), None)
+        return user_homes, selected_home, [selected_home] if selected_home else user_homes
+    
+    def get_heatmap_year(self, value):
+        try:
+            return int(value or date.today().year)
+        except ValueError:
+            return date.today().year
+    
+    def month_sections(self, request, homes, months, totals_by_month):
+        """
+        Return the template context for each month section, in order.
+        """
+        month_blocks = self.get_month_blocks(request, homes, months)
+        return [
+            {
+                'year': year,
+                'month': month,
+                'month_name': month_name[month],
+                'html': month_blocks[(year, month)],
+                'summary': totals_by_month.get((year, month)),
+            }
+            for year, month in months
+        ]
+    
+    def get_month_blocks(self, request, homes, months):
+        """
+        Return {(year, month): html} with the schedule cards for each month.
+        Blocks are served from the versioned fragment cache; only months that
+        miss are loaded from the database (in one query) and rendered.
+        """
+        home_ids = [home.pk for home in homes]
+        scope = f"home-{home_ids[0]}" if len(home_ids) == 1 else f"user-{request.user.pk}"
+        
+        # Anything that changes a block's HTML is part of its key
+        month_versions = fragment_cache.get_month_versions(home_ids, months)
+        common_parts = [fragment_cache.get_catalog_version()] + [
+            f"{home.pk}@{home.updated_at.timestamp()}" for home in homes
+        ]
+        keys = {
+            (year, month): fragment_cache.fragment_key(
+                scope, year, month,
+                common_parts + [month_versions[(home_id, year, month)] for home_id in home_ids],
+            )
+            for year, month in months
+        }
+        
+        cached = cache.get_many(list(keys.values())) if keys else {}
+        blocks = {ym: cached[key] for ym, key in keys.items() if key in cached}
+        missing = [ym for ym in months if ym not in blocks]
+        fragment_cache.record_lookups(hits=len(blocks), misses=len(missing))
+        
+        if missing:
+            month_filter = Q()
+            for year, month in missing:
+                month_filter |= Q(scheduled_date__range=summaries.month_bounds(year, month))
+            schedules_by_month = defaultdict(list)
+            queryset = Schedule.objects.filter(
+                month_filter, home__in=home_ids
+            ).select_related('home').prefetch_related('tasks').order_by('scheduled_date')
+            for schedule in queryset:
+                schedules_by_month[(schedule.scheduled_date.year, schedule.scheduled_date.month)].append(schedule)
+            
+            rendered = {}
+            for ym in missing:
+                # Rendered without the request so the block can be shared between
+                # visits; the CSRF token is filled in per response below.
+                blocks[ym] = rendered[keys[ym]] = render_to_string(self.month_template, {
+                    'schedules': schedules_by_month[ym],
+                    'next_url': reverse('maintenance:schedule_calendar'),
+                    'csrf_token': fragment_cache.CSRF_PLACEHOLDER,
+                })
+            cache.set_many(rendered, fragment_cache.FRAGMENT_TIMEOUT)
+        
+        csrf_token = get_token(request)
+        return {
+            ym: mark_safe(html.replace(fragment_cache.CSRF_PLACEHOLDER, csrf_token))
+            for ym, html in blocks.items()
+        }
+    
+    def fragment_response(self, request, dates, message, level='success'):
+        """
+        JSON with the re-rendered sections for the months containing dates.
+        A month left without schedules comes back as null so the page can
+        drop it; the page reloads if it gets a month it isn't showing yet.
+        """
+        _, _, homes = self.get_scope_homes(request, request.POST.get('home'))
+        home_ids = [home.pk for home in homes]
+        dates = [day for day in dates if day]
+        wanted = {(day.year, day.month) for day in dates}
+        first_day = min(dates).replace(day=1)
+        last_day = summaries.month_bounds(max(dates).year, max(dates).month)[1]
+        present = sorted(
+            (day.year, day.month)
+            for day in Schedule.objects.filter(
+                home__in=home_ids, scheduled_date__range=(first_day, last_day)
+            ).dates('scheduled_date', 'month')
+            if (day.year, day.month) in wanted
+        )
+        
+        month_summaries = summaries.get_summaries(home_ids)
+        totals_by_month = summaries.combine_by_month(month_summaries)
+        sections = self.month_sections(request, homes, present, totals_by_month)
+        heatmap_year = self.get_heatmap_year(request.POST.get('year'))
+        
+        months = {f"{year}-{month:02d}": None for year, month in wanted}
+        for section in sections:
+            months[f"{section['year']}-{section['month']:02d}"] = render_to_string(
+                'maintenance/partials/calendar_month_section.html', {'month_info': section}
+            )
+        return JsonResponse({
+            'success': True,
+            'message': message,
+            'level': level,
+            'months': months,
+            'totals': render_to_string('maintenance/partials/calendar_totals.html', {
+                'calendar_totals': summaries.grand_totals(totals_by_month),
+            }),
+            'heatmap': render_to_string('maintenance/partials/calendar_heatmap.html', {
+                'heatmap': summaries.workload_heatmap(month_summaries, heatmap_year),
+            }),
+        })
+
+
 class ScheduleListView(LoginRequiredMixin, ListView):
     """
     Redirect to calendar view - calendar is now the default and only view.
@@ -97,53 +275,100 @@ class ScheduleListView(LoginRequiredMixin, ListView):
         return redirect('maintenance:schedule_calendar')
 
 
-class ScheduleDetailView(LoginRequiredMixin, UserPassesTestMixin, DetailView):
+class ScheduleDetailView(LoginRequiredMixin, OwnerScopedObjectMixin, DetailView):
     """
     Display details of a specific scheduled task.
+    Renders in a fixed number of queries regardless of task count; the
+    long-form instruction panels are loaded on demand by ScheduleTaskPanelView.
     """
     model = Schedule
     template_name = 'maintenance/schedule_detail.html'
     context_object_name = 'schedule'
+    owner_field = 'home__owner'
+    owner_select_related = ('home',)
     
-    def test_func(self):
-        """
-        Ensure the user owns the home this schedule belongs to.
-        """
-        schedule = self.get_object()
-        return schedule.home.owner == self.request.user
+    # Long text fields only needed by the lazily loaded panels
+    deferred_task_fields = ('description', 'step_by_step', 'tools_required', 'safety_notes', 'video_url')
+    
+    def get_queryset(self):
+        return super().get_queryset().prefetch_related(
+            Prefetch('tasks', queryset=MaintenanceTask.objects.defer(*self.deferred_task_fields))
+        )
     
     def get_context_data(self, **kwargs):
         """
-        Add today's date, completed task info, and task customizations to context.
+        Add today's date, completed task info, and which tasks are customized to context.
         """
         context = super().get_context_data(**kwargs)
         context['today'] = date.today()
         
+        tasks = list(self.object.tasks.all())
+        context['tasks'] = tasks
+        context['task_count'] = len(tasks)
+        
         # Get completed tasks for this schedule
-        completed_task_ids = ScheduleTaskCompletion.objects.filter(
+        completed_task_ids = set(ScheduleTaskCompletion.objects.filter(
             schedule=self.object
-        ).values_list('task_id', flat=True)
-        context['completed_task_ids'] = set(completed_task_ids)
+        ).values_list('task_id', flat=True))
+        context['completed_task_ids'] = completed_task_ids
         
         # Count pending vs completed
-        total_tasks = self.object.tasks.count()
-        completed_count = len(completed_task_ids)
-        context['pending_count'] = total_tasks - completed_count
+        completed_count = sum(1 for task in tasks if task.id in completed_task_ids)
+        context['pending_count'] = len(tasks) - completed_count
         context['completed_count'] = completed_count
         
-        # Get or create customizations for each task in this schedule
-        customizations = {}
-        for task in self.object.tasks.all():
-            customization, created = ScheduleTaskCustomization.objects.get_or_create(
-                schedule=self.object,
-                task=task
-            )
-            customizations[task.id] = customization
-        context['task_customizations'] = customizations
+        # Only flag customized tasks here; the customization itself is shown in the panel
+        context['customized_task_ids'] = set(
+            ScheduleTaskCustomization.objects.filter(schedule=self.object).exclude(
+                custom_description='', custom_instructions=''
+            ).values_list('task_id', flat=True)
+        )
         
         return context
 
 
+class ScheduleTaskPanelView(LoginRequiredMixin, View):
+    """
+    Return the HTML fragment with description, tools, instructions, safety
+    notes and the customization form for one task in a schedule.
+    Fetched by schedule_detail.html when a task's panel is expanded.
+    """
+    template_name = 'maintenance/partials/schedule_task_panel.html'
+    
+    def get(self, request, *args, **kwargs):
+        schedule = get_object_or_404(
+            Schedule.objects.filter(home__owner=request.user),
+            pk=self.kwargs['pk'],
+        )
+        task = get_object_or_404(schedule.tasks.all(), pk=self.kwargs['task_id'])
+        customization = ScheduleTaskCustomization.objects.filter(
+            schedule=schedule, task=task
+        ).first()
+        
+        return render(request, self.template_name, {
+            'schedule': schedule,
+            'task': task,
+            'customization': customization,
+        })
+
+
+class ScheduleHistoryView(LoginRequiredMixin, View):
+    """
+    Return the HTML fragment listing a schedule's most recent events.
+    Fetched by schedule_detail.html when the history panel is opened.
+    """
+    template_name = 'maintenance/partials/schedule_history.html'
+    limit = 50
+    
+    def get(self, request, *args, **kwargs):
+        schedule = get_object_or_404(
+            Schedule.objects.filter(home__owner=request.user).only('id'),
+            pk=self.kwargs['pk'],
+        )
+        events = schedule.events.select_related('task', 'actor').order_by('-created_at')[:self.limit]
+        return render(request, self.template_name, {'schedule': schedule, 'events': events})
+
+
 class ScheduleCreateView(LoginRequiredMixin, CreateView):
     """
     Create a new scheduled task.
@@ -167,20 +392,15 @@ class ScheduleCreateView(LoginRequiredMixin, CreateView):
         return reverse_lazy('maintenance:schedule_list')
 
 
-class ScheduleUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class ScheduleUpdateView(LoginRequiredMixin, OwnerScopedObjectMixin, UpdateView):
     """
     Update a scheduled task.
     """
     model = Schedule
     form_class = ScheduleForm
     template_name = 'maintenance/schedule_form.html'
-    
-    def test_func(self):
-        """
-        Ensure the user owns the home this schedule belongs to.
-        """
-        schedule = self.get_object()
-        return schedule.home.owner == self.request.user
+    owner_field = 'home__owner'
+    owner_select_related = ('home',)
     
     def get_form_kwargs(self):
         """
@@ -197,46 +417,45 @@ class ScheduleUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         return reverse_lazy('maintenance:schedule_detail', kwargs={'pk': self.object.pk})
 
 
-class ScheduleDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class ScheduleDeleteView(CalendarFragmentMixin, LoginRequiredMixin, OwnerScopedObjectMixin, DeleteView):
     """
     Delete a scheduled task.
     """
     model = Schedule
     template_name = 'maintenance/schedule_confirm_delete.html'
     success_url = reverse_lazy('maintenance:schedule_list')
+    owner_field = 'home__owner'
+    owner_select_related = ('home',)
     
-    def test_func(self):
+    def form_valid(self, form):
         """
-        Ensure the user owns the home this schedule belongs to.
+        Answer calendar requests with the refreshed month instead of a redirect.
         """
-        schedule = self.get_object()
-        return schedule.home.owner == self.request.user
+        if not self.wants_fragments(self.request):
+            return super().form_valid(form)
+        scheduled_date = self.object.scheduled_date
+        self.object.delete()
+        return self.fragment_response(
+            self.request, [scheduled_date], f"Schedule for {scheduled_date.strftime('%b %d, %Y')} deleted."
+        )
 
 
-class ScheduleCompleteView(LoginRequiredMixin, UserPassesTestMixin, View):
+class ScheduleCompleteView(LoginRequiredMixin, OwnerScopedObjectMixin, View):
     """
     Mark a scheduled task as complete.
     """
-    def test_func(self):
-        """
-        Ensure the user owns the home this schedule belongs to.
-        """
-        schedule = get_object_or_404(Schedule, pk=self.kwargs['pk'])
-        return schedule.home.owner == self.request.user
+    model = Schedule
+    owner_field = 'home__owner'
+    owner_select_related = ('home',)
     
     def post(self, request, *args, **kwargs):
         """
         Mark the schedule as complete and create a completion record.
         """
-        schedule = get_object_or_404(Schedule, pk=self.kwargs['pk'])
-        
-        # Ensure user owns this schedule
-        if schedule.home.owner != request.user:
-            messages.error(request, "You don't have permission to complete this task.")
-            return redirect('maintenance:schedule_calendar')
+        schedule = self.get_object()
         
         # Mark as complete
-        schedule.mark_complete()
+        schedule.mark_complete(user=request.user)
         
         # Create completion record
         TaskCompletion.objects.create(
@@ -244,34 +463,24 @@ class ScheduleCompleteView(LoginRequiredMixin, UserPassesTestMixin, View):
             completed_by=request.user
         )
         
-        messages.success(request, f"Task '{schedule.task.title}' marked as complete!")
+        messages.success(request, f"Schedule for {schedule.scheduled_date.strftime('%b %d, %Y')} marked as complete!")
         return redirect('maintenance:schedule_calendar')
 
 
-class ScheduleRescheduleView(LoginRequiredMixin, UserPassesTestMixin, View):
+class ScheduleRescheduleView(CalendarFragmentMixin, LoginRequiredMixin, OwnerScopedObjectMixin, View):
     """
     Reschedule a maintenance task to a new date.
     Supports manual date selection, quick actions (+1 week, +1 month), and AJAX drag-and-drop.
     """
-    def test_func(self):
-        """
-        Ensure the user owns the home this schedule belongs to.
-        """
-        schedule = get_object_or_404(Schedule, pk=self.kwargs['pk'])
-        return schedule.home.owner == self.request.user
+    model = Schedule
+    owner_field = 'home__owner'
+    owner_select_related = ('home',)
     
     def post(self, request, *args, **kwargs):
         """
         Reschedule the task to a new date.
         """
-        schedule = get_object_or_404(Schedule, pk=self.kwargs['pk'])
-        
-        # Ensure user owns this schedule
-        if schedule.home.owner != request.user:
-            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                return JsonResponse({'success': False, 'error': 'Permission denied'}, status=403)
-            messages.error(request, "You don't have permission to reschedule this task.")
-            return redirect('maintenance:schedule_calendar')
+        schedule = self.get_object()
         
         # Get new date from form or quick action
         new_date = None
@@ -305,7 +514,11 @@ class ScheduleRescheduleView(LoginRequiredMixin, UserPassesTestMixin, View):
         
         # Reschedule
         old_date = schedule.scheduled_date
-        schedule.reschedule(new_date, reason)
+        schedule.reschedule(new_date, reason, user=request.user)
+        
+        message = f"Successfully rescheduled from {old_date.strftime('%b %d, %Y')} to {new_date.strftime('%b %d, %Y')}."
+        if self.wants_fragments(request):
+            return self.fragment_response(request, [old_date, new_date], message)
         
         # Handle AJAX response
         if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
@@ -317,10 +530,7 @@ class ScheduleRescheduleView(LoginRequiredMixin, UserPassesTestMixin, View):
             })
         
         # Handle standard form submission
-        messages.success(
-            request,
-            f"Successfully rescheduled from {old_date.strftime('%b %d, %Y')} to {new_date.strftime('%b %d, %Y')}."
-        )
+        messages.success(request, message)
         
         # Redirect to referrer or schedule detail
         next_url = request.POST.get('next', request.META.get('HTTP_REFERER'))
@@ -329,6 +539,33 @@ class ScheduleRescheduleView(LoginRequiredMixin, UserPassesTestMixin, View):
         return redirect('maintenance:schedule_detail', pk=schedule.pk)
 
 
+class ScheduleBulkView(LoginRequiredMixin, View):
+    """
+    Apply many schedule operations (complete/uncomplete tasks, reschedule,
+    delete, snooze overdue) in one request and one transaction.
+    Expects a JSON body {"operations": [...]}; see maintenance/bulk.py.
+    """
+    def post(self, request, *args, **kwargs):
+        """
+        Return per-operation results as JSON, in request order.
+        """
+        try:
+            payload = json.loads(request.body)
+        except ValueError:
+            return JsonResponse({'success': False, 'error': 'Invalid JSON'}, status=400)
+        
+        operations = payload.get('operations') if isinstance(payload, dict) else None
+        try:
+            results = BulkScheduleOperations(request.user).apply(operations)
+        except OperationError as exc:
+            return JsonResponse({'success': False, 'error': str(exc)}, status=400)
+        
+        return JsonResponse({
+            'success': all(result['status'] != 'error' for result in results),
+            'results': results,
+        })
+
+
 class GenerateScheduleView(LoginRequiredMixin, View):
     """
     Generate a personalized maintenance schedule based on home characteristics.
@@ -354,6 +591,13 @@ class GenerateScheduleView(LoginRequiredMixin, View):
         medium_priority = [(task, score) for task, score in task_priorities if 55 <= score < 70]
         low_priority = [(task, score) for task, score in task_priorities if score < 55]
         
+        # Tasks homes like this one also schedule: badge the ones already
+        # listed above and offer the rest separately
+        suggestions = list(suggested_tasks(home))
+        recommended_ids = {task.pk for task, _ in task_priorities}
+        similar_home_task_ids = {task.pk for task in suggestions}
+        similar_home_tasks = [task for task in suggestions if task.pk not in recommended_ids]
+        
         # Get current season and climate info
         current_season = ScheduleOptimizer.get_current_season()
         climate_factor = ScheduleOptimizer.get_climate_adjustment_factor(home)
@@ -374,6 +618,8 @@ class GenerateScheduleView(LoginRequiredMixin, View):
             'medium_priority_tasks': medium_priority,
             'low_priority_tasks': low_priority,
             'all_task_priorities': task_priorities,
+            'similar_home_task_ids': similar_home_task_ids,
+            'similar_home_tasks': similar_home_tasks,
             'current_season': current_season.title(),
             'climate_factor': climate_factor,
             'form': form,
@@ -400,25 +646,26 @@ class GenerateScheduleView(LoginRequiredMixin, View):
                     tasks_by_date[scheduled_date] = []
                 tasks_by_date[scheduled_date].append((task, priority))
             
-            # Create one schedule per date with all tasks for that date
+            # Create one schedule per date with all tasks for that date,
+            # refreshing derived data once per month at the end
             created_count = 0
-            for scheduled_date, task_list in sorted(tasks_by_date.items()):
-                # Collect task titles for notes
-                task_titles = [task.title for task, _ in task_list]
-                avg_priority = sum(priority for _, priority in task_list) / len(task_list)
-                
-                schedule = Schedule.objects.create(
-                    home=home,
-                    scheduled_date=scheduled_date,
-                    notes=f"Auto-generated schedule with {len(task_list)} task(s). Average Priority: {avg_priority:.0f}",
-                    is_completed=False
-                )
-                
-                # Add all tasks for this date
-                for task, priority in task_list:
-                    schedule.tasks.add(task)
-                
-                created_count += 1
+            with transaction.atomic(), batch_changes():
+                for scheduled_date, task_list in sorted(tasks_by_date.items()):
+                    # Collect task titles for notes
+                    task_titles = [task.title for task, _ in task_list]
+                    avg_priority = sum(priority for _, priority in task_list) / len(task_list)
+                    
+                    schedule = Schedule.objects.create(
+                        home=home,
+                        scheduled_date=scheduled_date,
+                        notes=f"Auto-generated schedule with {len(task_list)} task(s). Average Priority: {avg_priority:.0f}",
+                        is_completed=False
+                    )
+                    
+                    # Add all tasks for this date
+                    schedule.tasks.add(*[task for task, _ in task_list])
+                    
+                    created_count += 1
             
             messages.success(
                 request,
@@ -441,16 +688,17 @@ class GenerateScheduleView(LoginRequiredMixin, View):
             return self.get(request, *args, **kwargs)
         
         # Create the schedule
-        schedule = Schedule.objects.create(
-            home=home,
-            scheduled_date=form.cleaned_data['scheduled_date'],
-            notes=form.cleaned_data.get('notes', ''),
-            is_completed=False
-        )
-        
-        # Add selected tasks to the schedule
-        tasks = MaintenanceTask.objects.filter(id__in=selected_task_ids)
-        schedule.tasks.set(tasks)
+        with transaction.atomic(), batch_changes():
+            schedule = Schedule.objects.create(
+                home=home,
+                scheduled_date=form.cleaned_data['scheduled_date'],
+                notes=form.cleaned_data.get('notes', ''),
+                is_completed=False
+            )
+            
+            # Add selected tasks to the schedule
+            tasks = MaintenanceTask.objects.filter(id__in=selected_task_ids)
+            schedule.tasks.set(tasks)
         
         messages.success(
             request,
@@ -459,80 +707,391 @@ class GenerateScheduleView(LoginRequiredMixin, View):
         return redirect('maintenance:schedule_detail', pk=schedule.pk)
 
 
-class ScheduleCalendarView(LoginRequiredMixin, View):
+class ScheduleCalendarView(CalendarFragmentMixin, LoginRequiredMixin, View):
     """
     Display maintenance schedules in a calendar view grouped by month.
+    Month blocks are cached per (home, year, month, version).
     """
     def get(self, request, *args, **kwargs):
         """
         Render calendar view with schedules organized by month.
         """
-        # Get user's homes
-        user_homes = Home.objects.filter(owner=request.user)
+        user_homes, selected_home, scope_homes = self.get_scope_homes(request, request.GET.get('home'))
         
-        # Get schedules
-        queryset = Schedule.objects.filter(home__in=user_homes).prefetch_related('tasks', 'home')
+        # Months that have schedules, straight from the (home, scheduled_date) index
+        months = [
+            (first_day.year, first_day.month)
+            for first_day in Schedule.objects.filter(
+                home__in=[home.pk for home in scope_homes]
+            ).dates('scheduled_date', 'month')
+        ]
         
-        # Filter by home if specified
-        home_id = request.GET.get('home')
-        selected_home = None
-        if home_id:
-            try:
-                selected_home = user_homes.get(id=home_id)
-                queryset = queryset.filter(home=selected_home)
-            except Home.DoesNotExist:
-                pass
-        
-        # Group schedules by month
-        schedules_by_month_dict = defaultdict(list)
-        
-        for schedule in queryset.order_by('scheduled_date'):
-            # Create key as (year, month) tuple
-            key = (schedule.scheduled_date.year, schedule.scheduled_date.month)
-            schedules_by_month_dict[key].append(schedule)
-        
-        # Convert to list of dicts for template
-        schedules_by_month = []
-        for (year, month), schedules in sorted(schedules_by_month_dict.items()):
-            schedules_by_month.append({
-                'year': year,
-                'month': month,
-                'month_name': month_name[month],
-                'schedules': schedules,
-            })
+        # Month totals come from the materialized summaries, not per-schedule counts
+        month_summaries = summaries.get_summaries([home.pk for home in scope_homes])
+        totals_by_month = summaries.combine_by_month(month_summaries)
+        schedules_by_month = self.month_sections(request, scope_homes, months, totals_by_month)
+        
+        # Year-at-a-glance workload heatmap
+        heatmap_year = self.get_heatmap_year(request.GET.get('year'))
         
         context = {
             'user_homes': user_homes,
             'selected_home': selected_home,
             'schedules_by_month': schedules_by_month,
+            'calendar_totals': summaries.grand_totals(totals_by_month),
+            'heatmap_year': heatmap_year,
+            'heatmap': summaries.workload_heatmap(month_summaries, heatmap_year),
+            'calendar_feed_url': request.build_absolute_uri(
+                reverse('maintenance:schedule_feed', kwargs={'token': request.user.get_calendar_feed_token()})
+            ),
         }
         
         return render(request, 'maintenance/calendar_view.html', context)
 
 
-class ScheduleRemoveTaskView(LoginRequiredMixin, UserPassesTestMixin, View):
+class PortfolioCalendarView(LoginRequiredMixin, ListView):
     """
-    Remove a specific task from a schedule.
+    Week-by-week grid of task counts per home for users with many homes.
+    Homes are paginated; counts per tier and overdue totals are grouped in
+    the database, so a page costs the same handful of queries whether the
+    portfolio has 5 homes or 500.
+    """
+    template_name = 'maintenance/portfolio_calendar.html'
+    context_object_name = 'homes'
+    paginate_by = 25
+    week_choices = (4, 13, 26, 52)
+    default_weeks = 13
+    
+    def get_filters(self):
+        """
+        Validated filter values from the query string.
+        """
+        params = self.request.GET
+        climate_zone = params.get('climate_zone', '')
+        category = params.get('category', '')
+        try:
+            weeks = int(params.get('weeks', self.default_weeks))
+        except ValueError:
+            weeks = self.default_weeks
+        try:
+            start = date.fromisoformat(params.get('start', ''))
+        except ValueError:
+            start = date.today()
+        return {
+            'city': params.get('city', '').strip(),
+            'climate_zone': climate_zone if climate_zone in dict(Home.CLIMATE_ZONES) else '',
+            'category': category if category in dict(MaintenanceTask.CATEGORY_CHOICES) else '',
+            'weeks': weeks if weeks in self.week_choices else self.default_weeks,
+            'start': portfolio.week_start(start),
+        }
+    
+    def get_queryset(self):
+        self.filters = self.get_filters()
+        homes = Home.objects.filter(owner=self.request.user)
+        if self.filters['city']:
+            homes = homes.filter(city=self.filters['city'])
+        if self.filters['climate_zone']:
+            homes = homes.filter(climate_zone=self.filters['climate_zone'])
+        return homes.only('id', 'name', 'city', 'state', 'climate_zone').order_by('name', 'pk')
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        filters = self.filters
+        today = date.today()
+        start, weeks, category = filters['start'], filters['weeks'], filters['category']
+        all_home_ids = self.object_list.values('id')
+        page_homes = list(context['homes'])
+        
+        grid = portfolio.week_grid([home.pk for home in page_homes], start, weeks, today, category)
+        overdue_counts = portfolio.overdue_by_home(all_home_ids, today, category)
+        week_starts = [start + timedelta(weeks=i) for i in range(weeks)]
+        
+        rows = []
+        for home in page_homes:
+            cells = []
+            for monday in week_starts:
+                counts = grid.get((home.pk, monday))
+                if counts:
+                    counts['tier'] = next(key for key, _, _ in portfolio.TIERS if counts[key])
+                cells.append((monday, counts))
+            rows.append({'home': home, 'overdue': overdue_counts.get(home.pk, 0), 'cells': cells})
+        
+        # Query strings that keep the filters for pagination and window links
+        page_query = self.request.GET.copy()
+        page_query.pop('page', None)
+        window_query = page_query.copy()
+        window_query.pop('start', None)
+        
+        context.update({
+            'rows': rows,
+            'week_starts': week_starts,
+            'current_week': portfolio.week_start(today),
+            'tiers': portfolio.TIERS,
+            'totals': portfolio.tier_totals(all_home_ids, start, weeks, today, category),
+            'overdue_total': sum(overdue_counts.values()),
+            'overdue_homes': len(overdue_counts),
+            'filters': filters,
+            'window_end': start + timedelta(weeks=weeks, days=-1),
+            'previous_start': start - timedelta(weeks=weeks),
+            'next_start': start + timedelta(weeks=weeks),
+            'page_query': page_query.urlencode(),
+            'window_query': window_query.urlencode(),
+            'cities': Home.objects.filter(owner=self.request.user).exclude(city='').values_list(
+                'city', flat=True
+            ).distinct().order_by('city'),
+            'climate_zones': Home.CLIMATE_ZONES,
+            'categories': MaintenanceTask.CATEGORY_CHOICES,
+            'week_choices': self.week_choices,
+        })
+        return context
+
+
+class OverdueDashboardView(LoginRequiredMixin, View):
+    """
+    List every overdue task across the user's homes, highest priority and
+    oldest first, from a single query on the open-schedule index.
     """
-    def test_func(self):
+    template_name = 'maintenance/overdue_dashboard.html'
+    limit = 500
+    
+    def get(self, request, *args, **kwargs):
+        today = date.today()
+        rows = list(overdue.overdue_tasks(request.user, today)[:self.limit])
+        for row in rows:
+            row.days_overdue = (today - row.schedule.scheduled_date).days
+        
+        context = {
+            'rows': rows,
+            'truncated': len(rows) == self.limit,
+            'today': today,
+            'home_count': len({row.schedule.home_id for row in rows}),
+        }
+        return render(request, self.template_name, context)
+
+
+class MaintenanceStatsView(LoginRequiredMixin, View):
+    """
+    Completion rates, on-time share, hours logged, monthly compliance and
+    streaks across the user's homes, read from the incrementally kept
+    totals in daily_stats rather than from the full schedule history.
+    """
+    template_name = 'maintenance/statistics.html'
+    
+    def get(self, request, *args, **kwargs):
+        stats = daily_stats.owner_statistics(request.user, date.today())
+        return render(request, self.template_name, {'stats': stats})
+
+
+class RecallNoticeDismissView(LoginRequiredMixin, OwnerScopedObjectMixin, View):
+    """
+    Hide a recall notice from the home page once the owner has dealt with it.
+    """
+    model = RecallNotice
+    owner_field = 'home__owner'
+    
+    def post(self, request, *args, **kwargs):
+        notice = self.get_object()
+        if notice.dismissed_at is None:
+            notice.dismissed_at = timezone.now()
+            notice.save(update_fields=['dismissed_at'])
+        return redirect('homes:home_detail', pk=notice.home_id)
+
+
+class ArchivedScheduleListView(LoginRequiredMixin, ListView):
+    """
+    Browse completed schedules that archive_schedules has moved out of the
+    live tables, newest first, optionally for one home.
+    """
+    model = ArchivedSchedule
+    template_name = 'maintenance/schedule_archive.html'
+    context_object_name = 'archived_schedules'
+    paginate_by = 25
+    
+    def get_queryset(self):
+        queryset = ArchivedSchedule.objects.filter(
+            home__owner=self.request.user
+        ).select_related('home').order_by('-scheduled_date', '-pk')
+        home_id = self.request.GET.get('home')
+        if home_id and home_id.isdigit():
+            queryset = queryset.filter(home_id=home_id)
+        return queryset
+    
+    def get_context_data(self, **kwargs):
         """
-        Ensure the user owns the home this schedule belongs to.
+        Add the user's homes for the filter and label archived events with
+        the task titles from the snapshot.
         """
-        schedule = get_object_or_404(Schedule, pk=self.kwargs['pk'])
-        return schedule.home.owner == self.request.user
+        context = super().get_context_data(**kwargs)
+        context['user_homes'] = Home.objects.filter(owner=self.request.user).only('id', 'name')
+        context['selected_home_id'] = self.request.GET.get('home', '')
+        for archived in context['archived_schedules']:
+            titles = {task['id']: task['title'] for task in archived.tasks}
+            archived.history = [
+                {
+                    **event,
+                    'task_title': titles.get(event['task_id'], ''),
+                    'from_date': event['from_date'] and date.fromisoformat(event['from_date']),
+                    'to_date': event['to_date'] and date.fromisoformat(event['to_date']),
+                    'created_at': datetime.fromisoformat(event['created_at']),
+                }
+                for event in archived.events
+            ]
+        return context
+
+
+class ScheduleCalendarFeedView(View):
+    """
+    Read-only iCalendar subscription feed of a user's schedules.
+    Authenticated by the private token in the URL so calendar apps can poll it.
+    Answers conditional GETs with 304 Not Modified when nothing has changed.
+    """
+    # Bounded horizon keeps the feed small no matter how much history exists
+    past_days = 30
+    future_days = 365
+    chunk_size = 200
+    
+    def get_queryset(self, user, today):
+        """
+        Return the user's schedules inside the feed horizon.
+        """
+        return Schedule.objects.filter(
+            home__owner=user,
+            scheduled_date__gte=today - timedelta(days=self.past_days),
+            scheduled_date__lte=today + timedelta(days=self.future_days),
+        )
+    
+    def get(self, request, *args, **kwargs):
+        """
+        Validate the token, short-circuit with 304 if possible, otherwise stream the feed.
+        """
+        user = get_object_or_404(User, calendar_feed_token=self.kwargs['token'])
+        today = date.today()
+        queryset = self.get_queryset(user, today)
+        
+        # One aggregate query decides whether the client's copy is still fresh.
+        # The count catches deletions, which don't move the latest updated_at;
+        # home renames and catalog edits change event text without touching
+        # any schedule. There is no Last-Modified: a date can't express a
+        # deletion, so clients revalidate with the ETag alone.
+        stats = queryset.aggregate(latest=Max('updated_at'), homes=Max('home__updated_at'), total=Count('id'))
+        fingerprint = ':'.join([
+            str(user.pk), today.isoformat(), str(stats['total']),
+            stats['latest'].isoformat() if stats['latest'] else '',
+            stats['homes'].isoformat() if stats['homes'] else '',
+            fragment_cache.get_catalog_version(),
+        ])
+        etag = '"%s"' % hashlib.sha256(fingerprint.encode()).hexdigest()[:32]
+        
+        response = get_conditional_response(request, etag=etag)
+        if response is not None:
+            return response
+        
+        schedules = queryset.select_related('home').only(
+            'id', 'scheduled_date', 'is_completed', 'updated_at', 'home__name'
+        ).prefetch_related(
+            Prefetch('tasks', queryset=MaintenanceTask.objects.only('id', 'title', 'estimated_time')),
+            Prefetch('task_completions', queryset=ScheduleTaskCompletion.objects.only('id', 'schedule', 'task')),
+        ).order_by('scheduled_date', 'id')
+        
+        site_root = request.build_absolute_uri('/').rstrip('/')
+        
+        def stream():
+            yield ical.calendar_header(f"Home Maintenance - {user.username}")
+            for schedule in schedules.iterator(chunk_size=self.chunk_size):
+                completed_task_ids = {c.task_id for c in schedule.task_completions.all()}
+                url = site_root + reverse('maintenance:schedule_detail', kwargs={'pk': schedule.pk})
+                yield ical.schedule_event(schedule, url=url, completed_task_ids=completed_task_ids)
+            yield ical.calendar_footer()
+        
+        response = StreamingHttpResponse(stream(), content_type='text/calendar; charset=utf-8')
+        response['ETag'] = etag
+        response['Cache-Control'] = 'private, max-age=300'
+        response['Content-Disposition'] = 'inline; filename="maintenance.ics"'
+        return response
+
+
+class ScheduleExportView(LoginRequiredMixin, OwnerScopedObjectMixin, View):
+    """
+    Download an Excel workbook of upcoming schedules, maintenance history,
+    appliances and providers for one home (pk in the URL) or for all of the
+    user's homes. The workbook is built in constant memory in a temporary
+    file (see maintenance/export.py), which is then streamed back.
+    """
+    model = Home
+    
+    def get(self, request, *args, **kwargs):
+        today = date.today()
+        if 'pk' in self.kwargs:
+            home = self.get_object()
+            homes = Home.objects.filter(pk=home.pk)
+            filename = f"maintenance-{slugify(home.name) or home.pk}-{today.isoformat()}.xlsx"
+        else:
+            homes = Home.objects.filter(owner=request.user)
+            filename = f"maintenance-{today.isoformat()}.xlsx"
+        
+        output = tempfile.TemporaryFile()
+        try:
+            export.write_workbook(output, homes, today=today)
+        except BaseException:
+            output.close()
+            raise
+        output.seek(0)
+        return FileResponse(output, as_attachment=True, filename=filename, content_type=export.CONTENT_TYPE)
+
+
+class HomeSupplyListView(LoginRequiredMixin, OwnerScopedObjectMixin, DetailView):
+    """
+    Tools and supplies a home's open tasks need this month or season,
+    overdue tasks included, from the parsed tools index in one query.
+    """
+    model = Home
+    template_name = 'maintenance/supply_list.html'
+    context_object_name = 'home'
+    
+    def get_context_data(self, **kwargs):
+        context = super().get_context_data(**kwargs)
+        periods = dict(tools.SUPPLY_PERIODS)
+        period = self.request.GET.get('period')
+        if period not in periods:
+            period = 'month'
+        today = date.today()
+        start, end = tools.period_bounds(period, today)
+        context.update({
+            'period': period,
+            'periods': tools.SUPPLY_PERIODS,
+            'start': start,
+            'end': end,
+            'today': today,
+            'supplies': list(tools.supplies_needed(self.object, end)),
+        })
+        return context
+
+
+class ScheduleCalendarFeedResetView(LoginRequiredMixin, View):
+    """
+    Issue a new calendar feed token, invalidating previously shared feed URLs.
+    """
+    def post(self, request, *args, **kwargs):
+        request.user.get_calendar_feed_token(regenerate=True)
+        messages.success(request, "Your calendar subscription link was reset. Re-subscribe using the new link.")
+        return redirect('maintenance:schedule_calendar')
+
+
+class ScheduleRemoveTaskView(CalendarFragmentMixin, LoginRequiredMixin, OwnerScopedObjectMixin, View):
+    """
+    Remove a specific task from a schedule.
+    """
+    model = Schedule
+    owner_field = 'home__owner'
+    owner_select_related = ('home',)
     
     def post(self, request, *args, **kwargs):
         """
         Mark task as complete (keeps task visible) and auto-regenerate next occurrence.
         """
-        schedule = get_object_or_404(Schedule, pk=self.kwargs['pk'])
+        schedule = self.get_object()
         task_id = self.kwargs['task_id']
         
-        # Ensure user owns this schedule
-        if schedule.home.owner != request.user:
-            messages.error(request, "You don't have permission to modify this schedule.")
-            return redirect('maintenance:schedule_calendar')
-        
         # Get the task
         try:
             task = MaintenanceTask.objects.get(pk=task_id)
@@ -543,61 +1102,67 @@ class ScheduleRemoveTaskView(LoginRequiredMixin, UserPassesTestMixin, View):
         # Calculate next due date for this task
         next_due_date = ScheduleOptimizer.generate_next_due_date(task, schedule.home, schedule.scheduled_date)
         
-        # Mark task as complete (don't remove it)
-        completion, created = ScheduleTaskCompletion.objects.get_or_create(
-            schedule=schedule,
-            task=task,
-            defaults={
-                'completed_by': request.user,
-                'next_scheduled_date': next_due_date
-            }
-        )
+        with transaction.atomic(), batch_changes():
+            # Mark task as complete (don't remove it)
+            completion, created = ScheduleTaskCompletion.objects.get_or_create(
+                schedule=schedule,
+                task=task,
+                defaults={
+                    'completed_by': request.user,
+                    'next_scheduled_date': next_due_date
+                }
+            )
+            
+            if created:
+                ScheduleEvent.log(schedule, 'complete', actor=request.user, task=task, to_date=next_due_date)
+                
+                # Auto-regenerate this task for its next occurrence
+                existing_schedule = Schedule.objects.filter(
+                    home=schedule.home,
+                    scheduled_date=next_due_date
+                ).first()
+                
+                if existing_schedule:
+                    existing_schedule.tasks.add(task)
+                else:
+                    new_schedule = Schedule.objects.create(
+                        home=schedule.home,
+                        scheduled_date=next_due_date,
+                        notes=f"Auto-generated: {task.title} ({task.get_frequency_display()} maintenance)",
+                        is_completed=False
+                    )
+                    new_schedule.tasks.add(task)
         
         if not created:
-            messages.info(request, f"Task '{task.title}' was already marked as complete.")
+            message = f"Task '{task.title}' was already marked as complete."
+            if self.wants_fragments(request):
+                return self.fragment_response(request, [schedule.scheduled_date], message, level='info')
+            messages.info(request, message)
             return redirect('maintenance:schedule_detail', pk=schedule.pk)
         
-        # Auto-regenerate this task for its next occurrence
-        existing_schedule = Schedule.objects.filter(
-            home=schedule.home,
-            scheduled_date=next_due_date
-        ).first()
-        
-        if existing_schedule:
-            existing_schedule.tasks.add(task)
-        else:
-            new_schedule = Schedule.objects.create(
-                home=schedule.home,
-                scheduled_date=next_due_date,
-                notes=f"Auto-generated: {task.title} ({task.get_frequency_display()} maintenance)",
-                is_completed=False
-            )
-            new_schedule.tasks.add(task)
-        
-        messages.success(
-            request,
-            f"Task '{task.title}' completed and automatically rescheduled for {next_due_date.strftime('%b %d, %Y')}."
-        )
+        message = f"Task '{task.title}' completed and automatically rescheduled for {next_due_date.strftime('%b %d, %Y')}."
+        if self.wants_fragments(request):
+            return self.fragment_response(request, [schedule.scheduled_date, next_due_date], message)
+        messages.success(request, message)
         
         return redirect('maintenance:schedule_detail', pk=schedule.pk)
 
 
-class ScheduleUncompleteTaskView(LoginRequiredMixin, View):
+class ScheduleUncompleteTaskView(LoginRequiredMixin, OwnerScopedObjectMixin, View):
     """
     Undo task completion - mark task as pending again.
     """
+    model = Schedule
+    owner_field = 'home__owner'
+    owner_select_related = ('home',)
+    
     def post(self, request, *args, **kwargs):
         """
         Remove completion record and delete auto-generated future schedule.
         """
-        schedule = get_object_or_404(Schedule, pk=self.kwargs['pk'])
+        schedule = self.get_object()
         task_id = self.kwargs['task_id']
         
-        # Ensure user owns this schedule
-        if schedule.home.owner != request.user:
-            messages.error(request, "You don't have permission to modify this schedule.")
-            return redirect('maintenance:schedule_calendar')
-        
         # Get the task
         try:
             task = MaintenanceTask.objects.get(pk=task_id)
@@ -607,27 +1172,29 @@ class ScheduleUncompleteTaskView(LoginRequiredMixin, View):
         
         # Find and delete the completion record
         try:
-            completion = ScheduleTaskCompletion.objects.get(schedule=schedule, task=task)
-            next_scheduled_date = completion.next_scheduled_date
-            completion.delete()
-            
-            # Find and remove task from future schedule (if it exists and has no other tasks)
-            if next_scheduled_date:
-                future_schedule = Schedule.objects.filter(
-                    home=schedule.home,
-                    scheduled_date=next_scheduled_date
-                ).first()
+            with transaction.atomic(), batch_changes():
+                completion = ScheduleTaskCompletion.objects.get(schedule=schedule, task=task)
+                next_scheduled_date = completion.next_scheduled_date
+                completion.delete()
+                ScheduleEvent.log(schedule, 'uncomplete', actor=request.user, task=task)
                 
-                if future_schedule:
-                    future_schedule.tasks.remove(task)
+                # Find and remove task from future schedule (if it exists and has no other tasks)
+                if next_scheduled_date:
+                    future_schedule = Schedule.objects.filter(
+                        home=schedule.home,
+                        scheduled_date=next_scheduled_date
+                    ).first()
                     
-                    # Delete future schedule if it has no tasks left
-                    if future_schedule.tasks.count() == 0:
-                        future_schedule.delete()
-                        messages.info(
-                            request,
-                            f"Auto-scheduled occurrence on {next_scheduled_date.strftime('%b %d, %Y')} was removed."
-                        )
+                    if future_schedule:
+                        future_schedule.tasks.remove(task)
+                        
+                        # Delete future schedule if it has no tasks left
+                        if future_schedule.tasks.count() == 0:
+                            future_schedule.delete()
+                            messages.info(
+                                request,
+                                f"Auto-scheduled occurrence on {next_scheduled_date.strftime('%b %d, %Y')} was removed."
+                            )
             
             messages.success(request, f"Task '{task.title}' marked as pending.")
             
@@ -637,22 +1204,21 @@ class ScheduleUncompleteTaskView(LoginRequiredMixin, View):
         return redirect('maintenance:schedule_detail', pk=schedule.pk)
 
 
-class SaveTaskCustomizationView(LoginRequiredMixin, View):
+class SaveTaskCustomizationView(LoginRequiredMixin, OwnerScopedObjectMixin, View):
     """
     Save user's custom instructions for a task in a specific schedule.
     """
+    model = Schedule
+    owner_field = 'home__owner'
+    pk_url_kwarg = 'schedule_pk'
+    
     def post(self, request, *args, **kwargs):
         """
         Save or reset custom instructions.
         """
-        schedule = get_object_or_404(Schedule, pk=self.kwargs['schedule_pk'])
+        schedule = self.get_object()
         task_id = self.kwargs['task_id']
         
-        # Ensure user owns this schedule
-        if schedule.home.owner != request.user:
-            messages.error(request, "You don't have permission to modify this schedule.")
-            return redirect('maintenance:schedule_calendar')
-        
         # Get the task
         try:
             task = MaintenanceTask.objects.get(pk=task_id)
@@ -671,6 +1237,7 @@ class SaveTaskCustomizationView(LoginRequiredMixin, View):
             customization.custom_instructions = ''
             customization.custom_description = ''
             customization.save()
+            ScheduleEvent.log(schedule, 'customize', actor=request.user, task=task, note='Reset to default')
             messages.success(request, f"Instructions and description for '{task.title}' reset to default.")
         else:
             # Save custom instructions and description
@@ -679,9 +1246,11 @@ class SaveTaskCustomizationView(LoginRequiredMixin, View):
             customization.custom_instructions = custom_instructions
             customization.custom_description = custom_description
             customization.save()
+            ScheduleEvent.log(schedule, 'customize', actor=request.user, task=task)
             messages.success(request, f"Custom instructions and description saved for '{task.title}'.")
         
-        return redirect('maintenance:schedule_detail', pk=schedule.pk)
+        # The anchor reopens this task's panel
+        return redirect(f"{reverse('maintenance:schedule_detail', kwargs={'pk': schedule.pk})}#task-{task.pk}")
 
 
 
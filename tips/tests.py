@@ -1,3 +1,88 @@
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from accounts.models import User
+from home_maintenance_compass.test_utils import test_settings
+from .models import BlogComment, BlogPost, LocalTip, TipComment
+
+
+@test_settings
+class OwnerScopedViewTests(TestCase):
+    """
+    Author-only views load their object once, with the author check in the
+    same query. Counts include the session and user lookups; the comments
+    give the count before OwnerScopedObjectMixin.
+    """
+    
+    @classmethod
+    def setUpTestData(cls):
+        cls.author = User.objects.create_user('author', 'author@example.com', 'pw')
+        cls.other = User.objects.create_user('other', 'other@example.com', 'pw')
+        cls.staff = User.objects.create_user('staff', 'staff@example.com', 'pw', is_staff=True)
+        cls.tip = LocalTip.objects.create(
+            author=cls.author, title='Clean gutters', slug='clean-gutters',
+            category=LocalTip.CATEGORY_CHOICES[0][0], content='Before the rains.',
+        )
+        cls.post = BlogPost.objects.create(
+            author=cls.author, title='Winter prep', slug='winter-prep',
+            category=BlogPost._meta.get_field('category').choices[0][0],
+            excerpt='Get ready.', content='Drain the hoses.',
+        )
+    
+    def setUp(self):
+        self.tip_comment = TipComment.objects.create(tip=self.tip, author=self.author, content='Agreed')
+        self.blog_comment = BlogComment.objects.create(blog_post=self.post, author=self.author, content='Thanks')
+    
+    def test_blog_query_counts(self):
+        self.client.force_login(self.author)
+        with self.assertNumQueries(4):  # was 6
+            response = self.client.get(reverse('tips:blog_update', kwargs={'slug': self.post.slug}))
+        self.assertEqual(response.status_code, 200)
+        with self.assertNumQueries(6):  # was 8
+            response = self.client.get(reverse('tips:blog_delete', kwargs={'slug': self.post.slug}))
+        self.assertEqual(response.status_code, 200)
+    
+    def test_comment_delete_query_counts(self):
+        self.client.force_login(self.author)
+        with self.assertNumQueries(4):  # was 7
+            response = self.client.post(reverse('tips:comment_delete', kwargs={'pk': self.tip_comment.pk}))
+        self.assertRedirects(response, reverse('tips:tip_detail', kwargs={'slug': self.tip.slug}),
+                             fetch_redirect_response=False)
+        with self.assertNumQueries(4):  # was 7
+            response = self.client.post(reverse('tips:blog_comment_delete', kwargs={'pk': self.blog_comment.pk}))
+        self.assertRedirects(response, reverse('tips:blog_detail', kwargs={'slug': self.post.slug}),
+                             fetch_redirect_response=False)
+    
+    def test_blog_update_sees_saved_status(self):
+        self.client.force_login(self.author)
+        self.client.post(reverse('tips:blog_update', kwargs={'slug': self.post.slug}), {
+            'title': self.post.title, 'category': self.post.category, 'excerpt': self.post.excerpt,
+            'content': self.post.content, 'status': 'pending',
+        })
+        self.post.refresh_from_db()
+        self.assertEqual(self.post.status, 'pending')
+        self.assertIsNotNone(self.post.published_at)
+    
+    def test_other_users_get_404(self):
+        self.client.force_login(self.other)
+        urls = [
+            reverse('tips:blog_update', kwargs={'slug': self.post.slug}),
+            reverse('tips:blog_delete', kwargs={'slug': self.post.slug}),
+        ]
+        for url in urls:
+            with self.subTest(url):
+                self.assertEqual(self.client.get(url).status_code, 404)
+        posts = [
+            reverse('tips:tip_delete', kwargs={'slug': self.tip.slug}),
+            reverse('tips:comment_delete', kwargs={'pk': self.tip_comment.pk}),
+            reverse('tips:blog_comment_delete', kwargs={'pk': self.blog_comment.pk}),
+        ]
+        for url in posts:
+            with self.subTest(url):
+                self.assertEqual(self.client.post(url).status_code, 404)
+        self.assertTrue(LocalTip.objects.filter(pk=self.tip.pk).exists())
+    
+    def test_staff_can_delete_any_tip_comment(self):
+        self.client.force_login(self.staff)
+        self.client.post(reverse('tips:comment_delete', kwargs={'pk': self.tip_comment.pk}))
+        self.assertFalse(TipComment.objects.filter(pk=self.tip_comment.pk).exists())
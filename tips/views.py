@@ -10,6 +10,7 @@ from django.urls import reverse_lazy
 from django.contrib import messages
 from django.db.models import Count, Q
 from django.utils import timezone
+from home_maintenance_compass.mixins import OwnerScopedObjectMixin
 from .models import LocalTip, TipComment, TipReport, BlogPost, BlogComment
 from .forms import LocalTipForm, TipCommentForm, TipReportForm, BlogPostForm, BlogCommentForm
 
@@ -142,20 +143,14 @@ class TipCreateView(LoginRequiredMixin, CreateView):
         return reverse_lazy('tips:tip_list')
 
 
-class TipUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class TipUpdateView(LoginRequiredMixin, OwnerScopedObjectMixin, UpdateView):
     """
     Edit an existing tip (only by author).
     """
     model = LocalTip
     form_class = LocalTipForm
     template_name = 'tips/tip_form.html'
-    
-    def test_func(self):
-        """
-        Ensure the user is the author.
-        """
-        tip = self.get_object()
-        return tip.author == self.request.user
+    owner_field = 'author'
     
     def form_valid(self, form):
         """
@@ -170,20 +165,14 @@ class TipUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         return super().form_valid(form)
 
 
-class TipDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class TipDeleteView(LoginRequiredMixin, OwnerScopedObjectMixin, DeleteView):
     """
     Delete a tip (only by author).
     """
     model = LocalTip
     template_name = 'tips/tip_confirm_delete.html'
     success_url = reverse_lazy('tips:tip_list')
-    
-    def test_func(self):
-        """
-        Ensure the user is the author.
-        """
-        tip = self.get_object()
-        return tip.author == self.request.user
+    owner_field = 'author'
 
 
 class TipUpvoteView(LoginRequiredMixin, View):
@@ -239,19 +228,23 @@ class TipCommentCreateView(LoginRequiredMixin, CreateView):
         return reverse_lazy('tips:tip_detail', kwargs={'slug': self.tip.slug})
 
 
-class TipCommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class TipCommentDeleteView(LoginRequiredMixin, OwnerScopedObjectMixin, DeleteView):
     """
     Delete a comment (only by author or moderator).
     """
     model = TipComment
     template_name = 'tips/comment_confirm_delete.html'
     
-    def test_func(self):
+    owner_field = 'author'
+    owner_select_related = ('tip',)
+    
+    def get_owner_filter(self):
         """
-        Ensure the user is the comment author or a staff member.
+        Staff members can delete any comment.
         """
-        comment = self.get_object()
-        return comment.author == self.request.user or self.request.user.is_staff
+        if self.request.user.is_staff:
+            return Q()
+        return super().get_owner_filter()
     
     def get_success_url(self):
         """
@@ -465,22 +458,19 @@ class BlogCreateView(LoginRequiredMixin, UserPassesTestMixin, CreateView):
         return reverse_lazy('tips:blog_my_posts')
 
 
-class BlogUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
+class BlogUpdateView(LoginRequiredMixin, OwnerScopedObjectMixin, UpdateView):
     """
     Edit an existing blog post (author only).
     """
     model = BlogPost
     form_class = BlogPostForm
     template_name = 'tips/blog_form.html'
-    
-    def test_func(self):
-        """Only the author can edit their blog post."""
-        blog_post = self.get_object()
-        return self.request.user == blog_post.author
+    owner_field = 'author'
     
     def form_valid(self, form):
         """Handle status changes."""
-        old_status = self.get_object().status
+        # The instance already holds the posted values; initial has the saved ones
+        old_status = form.initial.get('status')
         new_status = form.instance.status
         
         if old_status == 'draft' and new_status == 'pending':
@@ -498,18 +488,14 @@ class BlogUpdateView(LoginRequiredMixin, UserPassesTestMixin, UpdateView):
         return reverse_lazy('tips:blog_my_posts')
 
 
-class BlogDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class BlogDeleteView(LoginRequiredMixin, OwnerScopedObjectMixin, DeleteView):
     """
     Delete a blog post (author only).
     """
     model = BlogPost
     template_name = 'tips/blog_confirm_delete.html'
     success_url = reverse_lazy('tips:blog_my_posts')
-    
-    def test_func(self):
-        """Only the author can delete their blog post."""
-        blog_post = self.get_object()
-        return self.request.user == blog_post.author
+    owner_field = 'author'
     
     def delete(self, request, *args, **kwargs):
         messages.success(request, 'Blog post deleted successfully.')
@@ -575,16 +561,13 @@ class BlogCommentCreateView(LoginRequiredMixin, CreateView):
         return reverse_lazy('tips:blog_detail', kwargs={'slug': self.kwargs['slug']})
 
 
-class BlogCommentDeleteView(LoginRequiredMixin, UserPassesTestMixin, DeleteView):
+class BlogCommentDeleteView(LoginRequiredMixin, OwnerScopedObjectMixin, DeleteView):
     """
     Delete a blog comment (author only).
     """
     model = BlogComment
-    
-    def test_func(self):
-        """Only the comment author can delete it."""
-        comment = self.get_object()
-        return self.request.user == comment.author
+    owner_field = 'author'
+    owner_select_related = ('blog_post',)
     
     def get_success_url(self):
         return reverse_lazy('tips:blog_detail', kwargs={'slug': self.object.blog_post.slug})